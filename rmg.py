@@ -39,6 +39,7 @@ import logging
 import rmgpy
 
 from rmgpy.rmg.main import RMG, initializeLog, processProfileStats, makeProfileGraph
+from rmgpy.data.databasecache import DEFAULT_CACHE_DIRECTORY
 
 ################################################################################
 
@@ -84,6 +85,18 @@ def parseCommandLineArguments():
     parser.add_argument('-t', '--walltime', type=str, nargs=1, default='0',
         metavar='HH:MM:SS', help='set the maximum execution time')
 
+    # Add options for controlling parallel reaction generation
+    parser.add_argument('-b', '--reaction-backend', type=str, choices=['serial', 'scoop', 'pool'], default=None,
+        help='backend used to distribute reaction generation (overrides the input file)')
+    parser.add_argument('-n', '--processes', type=int, default=None,
+        metavar='N', help='use N worker processes with the pool backend')
+
+    # Add options for enabling the compiled database cache
+    parser.add_argument('-c', '--database-cache', action='store_true',
+        help='load the database from a compiled database cache if possible')
+    parser.add_argument('--database-cache-directory', type=str, nargs=1, default=[DEFAULT_CACHE_DIRECTORY],
+        metavar='DIR', help='use DIR as compiled database cache directory (default: {0})'.format(DEFAULT_CACHE_DIRECTORY))
+
     return parser.parse_args()
 
 ################################################################################
@@ -134,7 +147,11 @@ if __name__ == '__main__':
         'scratch_directory': args.scratch_directory,
         'restart': args.restart,
         'walltime': args.walltime,
+        'reaction_backend': args.reaction_backend,
+        'processes': args.processes,
         }
+    if args.database_cache:
+        kwargs['database_cache'] = os.path.abspath(args.database_cache_directory[0])
 
     if args.profile:
         import cProfile, sys, pstats, os
@@ -300,7 +300,7 @@ def pressureDependence(label,
                        Pmin=None, Pmax=None, Pcount=0, Plist=None,
                        maximumGrainSize=None, minimumGrainCount=0,
                        method=None, interpolationModel=None,
-                       activeKRotor=True, activeJRotor=True, rmgmode=False):
+                       activeKRotor=True, activeJRotor=True, rmgmode=False, processes=1):
     global jobList, networkDict
     if isinstance(interpolationModel, str):
         interpolationModel = (interpolationModel,)
@@ -310,7 +310,7 @@ def pressureDependence(label,
         maximumGrainSize=maximumGrainSize, minimumGrainCount=minimumGrainCount,
         method=method, interpolationModel=interpolationModel,
         activeKRotor=activeKRotor, activeJRotor=activeJRotor,
-        rmgmode=rmgmode,
+        rmgmode=rmgmode, processes=processes,
     )
     jobList.append(job)
 
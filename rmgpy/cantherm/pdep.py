@@ -69,9 +69,11 @@ class PressureDependenceJob(object):
     `method`                The method to use to reduce the master equation to :math:`k(T,P)` values
     `interpolationModel`    The interpolation model to fit to the computed :math:`k(T,P)` values
     `maximumAtoms`          The maximum number of atoms to apply pressure dependence to (in RMG jobs)
+    `incrementalTolerance`  The maximum branching to new product channels for which networks are updated incrementally, or 0 to always solve the master equation (in RMG jobs)
     `activeKRotor`          A flag indicating whether to treat the K-rotor as active or adiabatic
     `activeJRotor`          A flag indicating whether to treat the J-rotor as active or adiabatic
     `rmgmode`               A flag that toggles "RMG mode", described below
+    `processes`             The number of worker processes to divide the temperatures between, or ``None`` for one per CPU
     ----------------------- ----------------------------------------------------
     `network`               The unimolecular reaction network
     `Tlist`                 An array of temperatures at which to compute :math:`k(T,P)` values
@@ -102,7 +104,7 @@ class PressureDependenceJob(object):
         Pmin=None, Pmax=None, Pcount=0, Plist=None,
         maximumGrainSize=None, minimumGrainCount=0,
         method=None, interpolationModel=None, maximumAtoms=None,
-        activeKRotor=True, activeJRotor=True, rmgmode=False):
+        activeKRotor=True, activeJRotor=True, rmgmode=False, processes=1, incrementalTolerance=0.0):
         self.network = network
         
         self.Tmin = Tmin
@@ -136,10 +138,12 @@ class PressureDependenceJob(object):
         self.method = method
         self.interpolationModel = interpolationModel
         self.maximumAtoms = maximumAtoms
+        self.incrementalTolerance = incrementalTolerance
         
         self.activeKRotor = activeKRotor
         self.activeJRotor = activeJRotor
         self.rmgmode = rmgmode
+        self.processes = processes
         
     @property
     def Tmin(self):
@@ -218,6 +222,8 @@ class PressureDependenceJob(object):
             activeKRotor = self.activeKRotor, 
             activeJRotor = self.activeJRotor,
             rmgmode = self.rmgmode,
+            processes = self.processes,
+            incrementalTolerance = self.incrementalTolerance,
         )
 
     def execute(self, outputFile, plot, format='pdf'):
@@ -228,7 +234,7 @@ class PressureDependenceJob(object):
         
         self.initialize()
         
-        self.K = self.network.calculateRateCoefficients(self.Tlist.value_si, self.Plist.value_si, self.method)
+        self.K = self.network.calculateRateCoefficients(self.Tlist.value_si, self.Plist.value_si, self.method, processes=self.processes)
 
         self.fitInterpolationModels()
 
@@ -1254,6 +1254,7 @@ def saveHTMLFile(path, readComments = True):
     dictionaryPath = path + 'RMG_Dictionary.txt'
     model = CoreEdgeReactionModel()
     model.core.species, model.core.reactions = loadChemkinFile(chemkinPath,dictionaryPath, readComments = readComments)
+    model.initializeMembershipSets()
     outputPath = path + 'output.html'
     speciesPath = path + '/species/'
     if not os.path.isdir(speciesPath):
@@ -1651,6 +1652,16 @@ def writeKineticsEntry(reaction, speciesList, verbose = True, javaLibrary = Fals
 
 ################################################################################
 
+def getDuplicateKey(reaction):
+    """
+    Return a key for `reaction` that is the same for two reactions if and only
+    if they are of the same class and have the same reactants and products,
+    in either direction and in any order. Chemkin duplicates must have the
+    same key. The species are compared by identity.
+    """
+    sides = [frozenset([(spec, species.count(spec)) for spec in species]) for species in (reaction.reactants, reaction.products)]
+    return (reaction.__class__, frozenset(sides))
+
 def markDuplicateReaction(test_reaction, reaction_list):
     """
     If the test_reaction is a duplicate (in Chemkin terms) of one in reaction_list, then set `duplicate=True` on both instances.
@@ -1658,14 +1669,12 @@ def markDuplicateReaction(test_reaction, reaction_list):
     It does not add the testReaction to the reactionList - you probably want to do this yourself afterwards.
     """
     reaction1 = test_reaction
+    key1 = getDuplicateKey(reaction1)
     for reaction2 in reaction_list:
-        if reaction1.__class__ != reaction2.__class__:
-            # TemplateReaction, LibraryReaction, and PDepReaction cannot be
-            # duplicates of one another.
-            # RHW question: why can't TemplateReaction be duplicate of LibraryReaction, in Chemkin terms? I guess it shouldn't happen in RMG.
-            continue
-        if (reaction1.reactants == reaction2.reactants and reaction1.products == reaction2.products) \
-        or (reaction1.products == reaction2.reactants and reaction1.reactants == reaction2.products):
+        # TemplateReaction, LibraryReaction, and PDepReaction cannot be
+        # duplicates of one another, so their keys differ.
+        # RHW question: why can't TemplateReaction be duplicate of LibraryReaction, in Chemkin terms? I guess it shouldn't happen in RMG.
+        if getDuplicateKey(reaction2) == key1:
             if reaction1.duplicate and reaction2.duplicate:                
                 if reaction1.kinetics.isPressureDependent() != reaction2.kinetics.isPressureDependent():
                     logging.warning('Marked reaction {0} as not duplicate because of mixed pressure dependence for saving to Chemkin file.'.format(reaction1))
@@ -1684,14 +1693,66 @@ def markDuplicateReactions(reactions):
     For a given list of `reactions`, mark all of the duplicate reactions as
     understood by Chemkin.
     
-    This is pretty slow (quadratic in size of reactions list) so only call it if you're really worried
-    you may have undetected duplicate reactions.
+    The reactions are grouped by :func:`getDuplicateKey`, and only the
+    reactions within each group are compared to each other, so this takes
+    time proportional to the number of reactions.
+    """
+    groups = {}
+    for reaction in reactions:
+        groups.setdefault(getDuplicateKey(reaction), []).append(reaction)
+    for group in groups.itervalues():
+        for index1 in range(len(group) - 1):
+            markDuplicateReaction(group[index1], group[index1+1:])
+
+class DuplicateReactionIndex(object):
     """
-    for index1 in range(len(reactions)):
-        reaction1 = reactions[index1]
-        remainingList = reactions[index1+1:]
-        markDuplicateReaction(reaction1, remainingList)
- 
+    An index of reactions by :func:`getDuplicateKey`, which gives the
+    reactions that may be Chemkin duplicates of a reaction in constant time,
+    so that the duplicates of the reactions added to a model can be marked
+    without comparing them to all of the reactions of the model.
+
+    =============== ============================================================
+    Attribute       Description
+    =============== ============================================================
+    `reactions`     A dictionary with duplicate keys as keys, and values equal to the lists of indexed reactions with that key
+    =============== ============================================================
+
+    """
+
+    def __init__(self, reactions=None):
+        self.reactions = {}
+        for reaction in reactions or []:
+            self.add(reaction)
+
+    def __len__(self):
+        return sum([len(reactions) for reactions in self.reactions.itervalues()])
+
+    def add(self, reaction):
+        """
+        Add `reaction` to the index, unless it is already indexed.
+        """
+        reactions = self.reactions.setdefault(getDuplicateKey(reaction), [])
+        if not any([rxn is reaction for rxn in reactions]):
+            reactions.append(reaction)
+
+    def remove(self, reaction):
+        """
+        Remove `reaction` from the index, if it is indexed.
+        """
+        key = getDuplicateKey(reaction)
+        reactions = [rxn for rxn in self.reactions.get(key, []) if rxn is not reaction]
+        if reactions:
+            self.reactions[key] = reactions
+        else:
+            self.reactions.pop(key, None)
+
+    def getCandidates(self, reaction):
+        """
+        Return the list of the indexed reactions other than `reaction` that
+        have the same key as `reaction`, i.e. that are Chemkin duplicates of
+        it if their kinetics allow it.
+        """
+        return [rxn for rxn in self.reactions.get(getDuplicateKey(reaction), []) if rxn is not reaction]
 
 def saveSpeciesDictionary(path, species, oldStyle=False):
     """
@@ -95,4 +95,31 @@ class ChemkinTest(unittest.TestCase):
 		]
 
 		for spc, label in zip(species, expected):
-			self.assertEqual(spc.label, label)
\ No newline at end of file
+			self.assertEqual(spc.label, label)
+
+	def testMarkDuplicateReactions(self):
+		"""
+		Test that reactions with the same reactants and products in either
+		direction and in any order are marked as duplicates, and that the
+		duplicate index only gives such reactions as candidates.
+		"""
+		from rmgpy.kinetics import Arrhenius
+		A, B, C, D = [Species(label=label) for label in 'ABCD']
+		kinetics = Arrhenius(A=(1e6,'m^3/(mol*s)'), n=0, Ea=(0,'kJ/mol'), T0=(1,'K'))
+		reactions = [
+			Reaction(reactants=[A, B], products=[C, D], kinetics=kinetics),
+			Reaction(reactants=[A, C], products=[B, D], kinetics=kinetics),
+			Reaction(reactants=[D, C], products=[B, A], kinetics=kinetics),
+			Reaction(reactants=[A, A], products=[C, D], kinetics=kinetics),
+			LibraryReaction(reactants=[B, A], products=[C, D], kinetics=kinetics),
+		]
+
+		index = DuplicateReactionIndex(reactions)
+		self.assertEqual(len(index), 5)
+		self.assertEqual(index.getCandidates(reactions[0]), [reactions[2]])
+		self.assertEqual(index.getCandidates(reactions[4]), [])
+		index.remove(reactions[2])
+		self.assertEqual(index.getCandidates(reactions[0]), [])
+
+		markDuplicateReactions(reactions)
+		self.assertEqual([reaction.duplicate for reaction in reactions], [True, False, True, False, False])
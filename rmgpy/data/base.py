@@ -43,7 +43,7 @@ try:
 except ImportError:
     logging.warning("Upgrade to Python 2.7 or later to ensure your database entries are read and written in the same order each time!")
     OrderedDict = dict
-from rmgpy.molecule import Molecule, Group
+from rmgpy.molecule import Molecule, Atom, Bond, Group
 from rmgpy.molecule.adjlist import InvalidAdjacencyListError
 
 from reference import Reference, Article, Book, Thesis
@@ -185,6 +185,9 @@ class Database:
         self.solvent = solvent
         self.shortDesc = shortDesc
         self.longDesc = longDesc
+        self.descentCache = DescentCache()
+        self.descentRadius = None
+        self.descentLabels = {}
 
     def load(self, path, local_context=None, global_context=None):
         """
@@ -206,6 +209,7 @@ class Database:
         # Clear any previously-loaded data
         self.entries = OrderedDict()
         self.top = []
+        self.resetDescentCache()
 
         # Set up global and local context
         if global_context is None: global_context = {}
@@ -502,6 +506,7 @@ class Database:
                 # Add node to list of parents for subsequent iteration
                 parents.append(label)
 
+        self.resetDescentCache()
 
     def loadOldTree(self, path):
         """
@@ -976,6 +981,28 @@ class Database:
         Set strict to ``True`` if all labels in final matched node must match that of the
         structure.  This is used in kinetics groups to find the correct reaction template, but
         not generally used in other GAVs due to species generally not being prelabeled.
+
+        The nodes found for molecules are stored in :attr:`descentCache`,
+        keyed by the local environment of `atoms` up to the largest distance
+        spanned by a group in the tree, so the same local environment found in
+        another molecule reuses the previously found node.
+        """
+        environment = self.getLocalEnvironment(structure, atoms, root)
+        if environment is None:
+            return self.__descendTree(structure, atoms, root, strict)
+
+        key = (root.label if root is not None else None, strict, environment.key)
+        found, node = self.descentCache.get(key, environment)
+        if not found:
+            node = self.__descendTree(structure, atoms, root, strict)
+            self.descentCache.add(key, environment, node)
+        return node
+
+    def __descendTree(self, structure, atoms, root=None, strict=False):
+        """
+        Descend the tree from `root` in search of the functional group node
+        that best matches the local structure around `atoms` in `structure`,
+        without using the cache of previously found nodes.
         """
 
         if root is None:
@@ -993,7 +1020,7 @@ class Database:
                 next.append(child)
 
         if len(next) == 1:
-            return self.descendTree(structure, atoms, next[0], strict)
+            return self.__descendTree(structure, atoms, next[0], strict)
         elif len(next) == 0:
             if len(root.children) > 0 and root.children[-1].label.startswith('Others-'):
                 return root.children[-1]
@@ -1001,7 +1028,304 @@ class Database:
                 return root
         else:
             #logging.warning('For {0}, a node {1} with overlapping children {2} was encountered in tree with top level nodes {3}. Assuming the first match is the better one.'.format(structure, root, next, self.top))
-            return self.descendTree(structure, atoms, next[0], strict)
+            return self.__descendTree(structure, atoms, next[0], strict)
+
+    def __getDescentGroups(self, node, groups, visited):
+        """
+        Add the groups of `node` and of all of its descendants, including the
+        components of logic nodes, to the list `groups`. Returns ``False`` if
+        a node is neither a :class:`Group` nor a logic node.
+        """
+        if isinstance(node, str):
+            node = self.entries[node]
+        if id(node) in visited:
+            return True
+        visited.add(id(node))
+        item = node.item if isinstance(node, Entry) else node
+        if isinstance(item, LogicNode):
+            for component in item.components:
+                if not self.__getDescentGroups(component, groups, visited):
+                    return False
+        elif isinstance(item, Group):
+            groups.append(item)
+        else:
+            return False
+        if isinstance(node, Entry):
+            for child in node.children:
+                if not self.__getDescentGroups(child, groups, visited):
+                    return False
+        return True
+
+    def __updateDescentRadius(self):
+        """
+        Determine, for the tree below each top node, the largest distance
+        between a labeled atom and any other atom of a group, which is the
+        radius of the local environment that decides which node a structure
+        descends to. The radius is ``None`` if a group below the top node is
+        not anchored to its labeled atoms, in which case the nodes found are
+        not cached.
+        """
+        self.descentRadius = {}
+        self.descentLabels = {}
+        self.descentCache.clear()
+
+        for top in self.top:
+            self.descentRadius[top.label] = None
+            groups = []
+            if not self.__getDescentGroups(top, groups, set()):
+                continue
+            radii = [getGroupRadius(group) for group in groups]
+            if None in radii:
+                continue
+            self.descentRadius[top.label] = max(radii)
+            self.descentLabels[top.label] = set([frozenset(group.getLabeledAtoms().keys()) for group in groups])
+
+    def resetDescentCache(self):
+        """
+        Remove the nodes found by :meth:`descendTree` from the cache, and
+        determine the radii of the local environments again when the tree is
+        next descended. This is done when the tree is loaded, and must be done
+        by any other code that adds, removes or changes groups or nodes of the
+        tree.
+        """
+        self.descentRadius = None
+        self.descentLabels = {}
+        self.descentCache.clear()
+
+    def getLocalEnvironment(self, structure, atoms, root=None):
+        """
+        Return the :class:`LocalEnvironment` of the labeled `atoms` in the
+        molecule `structure`, which contains every atom that any group below
+        `root` (or below any top node if `root` is ``None``) could be matched
+        to. Returns ``None`` if the environment cannot be used to cache the
+        nodes found by :meth:`descendTree`, for example because `structure` is
+        a :class:`Group`.
+        """
+        if not isinstance(structure, Molecule) or len(atoms) == 0:
+            return None
+        for atom in atoms.values():
+            if not isinstance(atom, Atom):
+                return None
+        if self.descentRadius is None:
+            self.__updateDescentRadius()
+
+        if root is None:
+            tops = self.top
+        else:
+            while root.parent is not None:
+                root = root.parent
+            tops = [root]
+        radius = 0
+        for top in tops:
+            if self.descentRadius.get(top.label) is None:
+                return None
+            # Groups sharing no label with the structure are not anchored to
+            # the atoms and could match anywhere in the structure
+            for labels in self.descentLabels[top.label]:
+                if labels.isdisjoint(atoms):
+                    return None
+            radius = max(radius, self.descentRadius[top.label])
+        return LocalEnvironment(structure, atoms, radius)
+
+################################################################################
+
+def getDistances(graph, centers, maxDistance=None):
+    """
+    Return a dictionary mapping each atom of `graph` connected to the list of
+    atoms `centers` to its shortest distance from any of them, found by a
+    breadth-first search. If `maxDistance` is given, atoms further away than
+    that distance are not included.
+    """
+    distances = dict([(center, 0) for center in centers])
+    frontier = list(centers)
+    distance = 0
+    while frontier and (maxDistance is None or distance < maxDistance):
+        distance += 1
+        nextFrontier = []
+        for atom in frontier:
+            for atom2 in atom.edges:
+                if atom2 not in distances:
+                    distances[atom2] = distance
+                    nextFrontier.append(atom2)
+        frontier = nextFrontier
+    return distances
+
+def getGroupRadius(group):
+    """
+    Return the largest distance between a labeled atom of `group` and any
+    other atom of the group, or ``None`` if the group has no labeled atoms,
+    has duplicate labels, or has atoms not connected to a labeled atom.
+    """
+    centers = group.getLabeledAtoms()
+    if len(centers) == 0:
+        return None
+    radius = 0
+    for center in centers.values():
+        if isinstance(center, list):
+            return None
+        distances = getDistances(group, [center])
+        if len(distances) != len(group.vertices):
+            return None
+        radius = max(radius, max(distances.values()))
+    return radius
+
+class LocalEnvironment(object):
+    """
+    The local environment of a set of labeled atoms in a molecule, used to
+    cache the nodes found when descending a tree. The environment is a
+    fragment of the molecule containing every atom within `radius` bonds of
+    the labeled atoms, as well as their neighbors, so that the atom types of
+    all the atoms a group can be matched to are the same as in the molecule.
+    The multiplicity of the molecule is kept since groups can depend on it.
+
+    The attributes are:
+
+    =================== ========================================================
+    Attribute           Description
+    =================== ========================================================
+    `molecule`          The :class:`Molecule` fragment around the labeled atoms
+    `atoms`             A list of the labels and fragment atoms of the labeled atoms, sorted by label
+    `labeledAtoms`      A dictionary of the fragment atoms labeled in the molecule
+    `key`               A hashable key that is equal for isomorphic environments
+    =================== ========================================================
+
+    """
+
+    def __init__(self, structure, atoms, radius):
+        distances = getDistances(structure, atoms.values(), radius + 1)
+        mapping = {}
+        for atom in distances:
+            mapping[atom] = atom.copy()
+        self.molecule = Molecule(atoms=mapping.values())
+        self.molecule.multiplicity = structure.multiplicity
+        for atom, atom1 in mapping.iteritems():
+            for atom2, bond in atom.edges.iteritems():
+                if atom2 in mapping and not self.molecule.hasBond(atom1, mapping[atom2]):
+                    self.molecule.addBond(Bond(atom1, mapping[atom2], order=bond.order))
+
+        self.atoms = sorted([(label, mapping[atom]) for label, atom in atoms.iteritems()])
+        self.labeledAtoms = {}
+        for atom in mapping.itervalues():
+            if atom.label != '':
+                if atom.label in self.labeledAtoms:
+                    self.labeledAtoms = None
+                    break
+                self.labeledAtoms[atom.label] = atom
+
+        if self.labeledAtoms is None:
+            # Duplicate labels cannot be mapped between environments
+            self.key = None
+        else:
+            self.key = (
+                tuple([label for label, atom in self.atoms]),
+                tuple(sorted(self.labeledAtoms.keys())),
+                self.molecule.multiplicity,
+                self.molecule.getFingerprint(),
+                self.molecule.getInvariants(),
+            )
+
+    def isEquivalent(self, other):
+        """
+        Return ``True`` if this environment is isomorphic with the `other`
+        environment with the labeled atoms of each mapped to one another, or
+        ``False`` otherwise.
+        """
+        if self.key is None or self.key != other.key:
+            return False
+        # Map the labeled atoms by their labels
+        initialMap = {}
+        pairs = [(atom1, atom2) for (label1, atom1), (label2, atom2) in zip(self.atoms, other.atoms)]
+        pairs.extend([(atom, other.labeledAtoms[label]) for label, atom in self.labeledAtoms.iteritems()])
+        for atom1, atom2 in pairs:
+            if initialMap.get(atom1, atom2) is not atom2:
+                return False
+            initialMap[atom1] = atom2
+        if len(set(initialMap.values())) != len(initialMap):
+            return False
+        # The initial mapping is not checked by the isomorphism algorithm, so
+        # make sure the mapped atoms and the bonds between them are equivalent
+        for atom1, atom2 in initialMap.iteritems():
+            if not atom1.equivalent(atom2):
+                return False
+            for atom3, atom4 in initialMap.iteritems():
+                if atom1 is atom3:
+                    continue
+                if self.molecule.hasBond(atom1, atom3) != other.molecule.hasBond(atom2, atom4):
+                    return False
+                elif self.molecule.hasBond(atom1, atom3) and not self.molecule.getBond(atom1, atom3).equivalent(other.molecule.getBond(atom2, atom4)):
+                    return False
+        return self.molecule.isIsomorphic(other.molecule, initialMap)
+
+class DescentCache(object):
+    """
+    A cache of the nodes found by :meth:`Database.descendTree`, keyed by the
+    :class:`LocalEnvironment` of the labeled atoms. Environments with the same
+    key are checked for isomorphism before a cached node is returned. Once
+    more than `maxSize` environments are stored, the least recently used are
+    discarded.
+
+    The attributes are:
+
+    =================== ========================================================
+    Attribute           Description
+    =================== ========================================================
+    `maxSize`           The maximum number of environments to store
+    `hits`              The number of lookups that returned a cached node
+    `misses`            The number of lookups that found no cached node
+    `size`              The number of environments currently stored
+    =================== ========================================================
+
+    """
+
+    def __init__(self, maxSize=10000):
+        self.maxSize = maxSize
+        self.hits = 0
+        self.misses = 0
+        self.size = 0
+        self.entries = OrderedDict()
+
+    def __len__(self):
+        return self.size
+
+    def clear(self):
+        """
+        Remove all of the cached nodes and reset the hit and miss counters.
+        """
+        self.entries.clear()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, environment):
+        """
+        Return a tuple of whether a node is cached for the `environment` with
+        the given `key` and the cached node, which may be ``None`` if the
+        descent found no matching node.
+        """
+        if environment.key is not None:
+            cached = self.entries.get(key)
+            if cached is not None:
+                for environment0, node in cached:
+                    if environment.isEquivalent(environment0):
+                        # Move the key to the end to mark it recently used
+                        del self.entries[key]
+                        self.entries[key] = cached
+                        self.hits += 1
+                        return True, node
+        self.misses += 1
+        return False, None
+
+    def add(self, key, environment, node):
+        """
+        Store the `node` found for the `environment` with the given `key`.
+        """
+        if environment.key is None or self.maxSize <= 0:
+            return
+        self.entries.setdefault(key, []).append((environment, node))
+        self.size += 1
+        while self.size > self.maxSize:
+            key0, cached = self.entries.popitem(last=False)
+            self.size -= len(cached)
 
 ################################################################################
 
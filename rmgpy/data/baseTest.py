@@ -6,7 +6,7 @@ import unittest
 from external.wip import work_in_progress
 
 from rmgpy.data.base import Entry, Database
-from rmgpy.molecule import Group
+from rmgpy.molecule import Molecule, Group
 
 ################################################################################
 
@@ -88,6 +88,68 @@ class TestBaseDatabase(unittest.TestCase):
         )
         self.assertTrue(self.database.matchNodeToNode(entry1,entry1))
         self.assertFalse(self.database.matchNodeToNode(entry1,entry2))
+
+    def testDescendTreeCache(self):
+        """
+        Test that descendTree reuses the nodes found for the same local
+        environment and still finds the right node for other environments.
+        """
+        top = Entry(label='C', item=Group().fromAdjacencyList("1 * C u0"))
+        child1 = Entry(label='C-CsH', parent=top, item=Group().fromAdjacencyList(
+        """
+        1 * C  u0 {2,S}
+        2   Cs u0 {1,S}
+        """))
+        child2 = Entry(label='C-O', parent=top, item=Group().fromAdjacencyList(
+        """
+        1 * C u0 {2,S}
+        2   O u0 {1,S}
+        """))
+        top.children = [child1, child2]
+        database = Database(entries={'C': top, 'C-CsH': child1, 'C-O': child2}, top=[top])
+
+        propane = Molecule().fromSMILES('CCC')
+        pentane = Molecule().fromSMILES('CCCCC')
+        methanol = Molecule().fromSMILES('CO')
+        methane = Molecule().fromSMILES('C')
+        carbons = lambda molecule: [atom for atom in molecule.atoms if atom.isCarbon()]
+
+        # The methyl groups of propane share the same local environment
+        for atom in carbons(propane):
+            self.assertIs(database.descendTree(propane, {'*': atom}), child1)
+        self.assertEqual(database.descentCache.misses, 2)
+        self.assertEqual(database.descentCache.hits, 1)
+
+        # The local environment reaches the neighbors of the neighbors of the
+        # labeled atom, so only the ends of pentane match those of propane
+        for atom in carbons(pentane):
+            self.assertIs(database.descendTree(pentane, {'*': atom}), child1)
+        self.assertEqual(database.descentCache.misses, 4)
+        self.assertEqual(database.descentCache.hits, 4)
+
+        self.assertIs(database.descendTree(methanol, {'*': carbons(methanol)[0]}), child2)
+        self.assertIs(database.descendTree(methane, {'*': carbons(methane)[0]}), top)
+        self.assertEqual(database.descentCache.misses, 6)
+
+        # The cache is bounded
+        database.descentCache.maxSize = 2
+        ethane = Molecule().fromSMILES('CC')
+        self.assertIs(database.descendTree(ethane, {'*': carbons(ethane)[0]}), child1)
+        self.assertEqual(len(database.descentCache), 2)
+
+        # Changing a group in place and resetting the cache gives the new
+        # descent, without any change to the number of entries
+        child1.item = Group().fromAdjacencyList(
+        """
+        1 * C  u0 {2,S}
+        2   O  u0 {1,S}
+        """)
+        database.resetDescentCache()
+        self.assertEqual(len(database.descentCache), 0)
+        self.assertIs(database.descendTree(propane, {'*': carbons(propane)[0]}), top)
+        self.assertEqual(database.descentCache.hits, 0)
+        self.assertEqual(database.descentCache.misses, 1)
+
 ################################################################################
 
 if __name__ == '__main__':
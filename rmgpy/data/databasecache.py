@@ -0,0 +1,222 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+################################################################################
+#
+#   RMG - Reaction Mechanism Generator
+#
+#   Copyright (c) 2002-2010 Prof. William H. Green (whgreen@mit.edu) and the
+#   RMG Team (rmg_dev@mit.edu)
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a
+#   copy of this software and associated documentation files (the 'Software'),
+#   to deal in the Software without restriction, including without limitation
+#   the rights to use, copy, modify, merge, publish, distribute, sublicense,
+#   and/or sell copies of the Software, and to permit persons to whom the
+#   Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included in
+#   all copies or substantial portions of the Software.
+#
+#   THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#   IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#   FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#   AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#   LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#   FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#   DEALINGS IN THE SOFTWARE.
+#
+################################################################################
+
+"""
+This module contains a cache of compiled RMG databases. Loading the RMG
+database means executing every library and tree file and parsing every
+adjacency list in it, which takes a long time for the full set of kinetics
+families. The cache stores a binary (pickled) snapshot of the loaded database
+components, keyed by a hash of the contents of the database files, of the
+options used to load them and of the RMG-Py source code, so the snapshot is
+rebuilt automatically whenever a database file or the code changes.
+"""
+
+import cPickle
+import hashlib
+import logging
+import os
+import os.path
+import sys
+import tempfile
+
+import rmgpy
+
+# The version of the cache file format; increment it when the objects stored
+# in the cache change in a way that makes older snapshots unusable
+CACHE_VERSION = 1
+
+# The default directory the compiled databases are stored in
+DEFAULT_CACHE_DIRECTORY = os.path.join(os.path.expanduser('~'), '.rmg', 'cache')
+
+# The default number of compiled databases kept in a cache directory
+DEFAULT_CACHE_SIZE = 4
+
+# The components of an RMG database stored in the cache
+COMPONENTS = ['thermo', 'transport', 'forbiddenStructures', 'kinetics', 'statmech', 'solvation']
+
+# The extensions of the RMG-Py source and compiled extension files
+SOURCE_EXTENSIONS = ('.py', '.pyx', '.pxd', '.so', '.pyd')
+
+# The hash of the installed RMG-Py package, computed once per process
+sourceHash = None
+
+################################################################################
+
+def getSourceHash(path=None):
+    """
+    Return a hash of the contents of the source and compiled extension files
+    of the RMG-Py package at `path`, or of the installed package if ``None``.
+    Unit test files are skipped. This changes whenever the code that defines
+    or loads the database objects changes, also in a development checkout
+    where the version of RMG stays the same.
+    """
+    global sourceHash
+    if path is None and sourceHash is not None:
+        return sourceHash
+    top = path or os.path.dirname(os.path.abspath(rmgpy.__file__))
+    sha = hashlib.sha1()
+    for root, dirs, files in os.walk(top):
+        dirs[:] = sorted([d for d in dirs if not d.startswith('.')])
+        for filename in sorted(files):
+            if not filename.endswith(SOURCE_EXTENSIONS) or os.path.splitext(filename)[0].endswith('Test'):
+                continue
+            filepath = os.path.join(root, filename)
+            sha.update('file {0}\n'.format(os.path.relpath(filepath, top)))
+            with open(filepath, 'rb') as f:
+                for block in iter(lambda: f.read(1048576), ''):
+                    sha.update(block)
+    if path is None:
+        sourceHash = sha.hexdigest()
+    return sha.hexdigest()
+
+def getDatabaseHash(path, **options):
+    """
+    Return a hash of the contents of all of the files in the database
+    directory at `path`, together with the `options` used to load the
+    database, the cache format, the versions of RMG and Python and the hash
+    of the RMG-Py code given by :func:`getSourceHash`. Any change to a
+    database file, to the options or to the code results in a different hash.
+    """
+    sha = hashlib.sha1()
+    sha.update('RMG {0} Python {1} cache {2:d}\n'.format(rmgpy.__version__, sys.version, CACHE_VERSION))
+    sha.update('source {0}\n'.format(getSourceHash()))
+    for key in sorted(options.keys()):
+        sha.update('{0} = {1!r}\n'.format(key, options[key]))
+    for root, dirs, files in os.walk(path):
+        # Walk the directories in a fixed order and skip hidden ones (e.g. .git)
+        dirs[:] = sorted([d for d in dirs if not d.startswith('.')])
+        for filename in sorted(files):
+            if filename.startswith('.') or filename.endswith('.pyc'):
+                continue
+            filepath = os.path.join(root, filename)
+            sha.update('file {0}\n'.format(os.path.relpath(filepath, path)))
+            with open(filepath, 'rb') as f:
+                for block in iter(lambda: f.read(1048576), ''):
+                    sha.update(block)
+    return sha.hexdigest()
+
+class DatabaseCache(object):
+    """
+    A directory of compiled RMG databases, each stored as a binary snapshot of
+    the database components in a file named after the hash of the database,
+    as given by :func:`getDatabaseHash`. The attributes are:
+
+    =============== ============================================================
+    Attribute       Description
+    =============== ============================================================
+    `directory`     The directory the compiled databases are stored in
+    `maxSize`       The number of compiled databases kept in the directory
+    =============== ============================================================
+
+    Each change to a database file gives a new compiled database, so the least
+    recently used ones are deleted when a new one is saved to keep at most
+    `maxSize` of them.
+    """
+
+    def __init__(self, directory=None, maxSize=DEFAULT_CACHE_SIZE):
+        self.directory = directory or DEFAULT_CACHE_DIRECTORY
+        self.maxSize = maxSize
+
+    def getPath(self, key):
+        """
+        Return the path of the file storing the compiled database with the
+        hash `key`.
+        """
+        return os.path.join(self.directory, 'rmgdatabase-{0}.pkl'.format(key))
+
+    def load(self, key):
+        """
+        Return a dictionary of the database components stored for the hash
+        `key`, or ``None`` if there is no usable compiled database.
+        """
+        path = self.getPath(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'rb') as f:
+                header = f.readline().split()
+                if header != ['RMGDB', str(CACHE_VERSION), key]:
+                    logging.warning('Ignoring compiled database {0} with an unexpected header.'.format(path))
+                    return None
+                components = cPickle.load(f)
+        except Exception, e:
+            logging.warning('Unable to load compiled database {0}: {1}'.format(path, e))
+            return None
+        # Mark the compiled database as recently used so it is pruned last
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        logging.info('Loaded compiled database from {0}'.format(path))
+        return components
+
+    def save(self, key, components):
+        """
+        Store the dictionary of database `components` as the compiled database
+        with the hash `key`. The file is written under a temporary name and
+        then renamed, so other jobs never read a partly written file. Returns
+        ``True`` if the compiled database was saved, or ``False`` otherwise.
+        """
+        path = self.getPath(key)
+        tempPath = None
+        try:
+            if not os.path.exists(self.directory):
+                os.makedirs(self.directory)
+            fd, tempPath = tempfile.mkstemp(prefix='.rmgdatabase-', dir=self.directory)
+            with os.fdopen(fd, 'wb') as f:
+                f.write('RMGDB {0:d} {1}\n'.format(CACHE_VERSION, key))
+                cPickle.dump(components, f, cPickle.HIGHEST_PROTOCOL)
+            os.rename(tempPath, path)
+        except Exception, e:
+            logging.warning('Unable to save compiled database {0}: {1}'.format(path, e))
+            if tempPath is not None and os.path.exists(tempPath):
+                os.remove(tempPath)
+            return False
+        logging.info('Saved compiled database to {0}'.format(path))
+        self.prune()
+        return True
+
+    def prune(self):
+        """
+        Delete the least recently used compiled databases in the cache
+        directory, so that at most `maxSize` of them remain.
+        """
+        try:
+            paths = [os.path.join(self.directory, filename) for filename in os.listdir(self.directory)
+                     if filename.startswith('rmgdatabase-') and filename.endswith('.pkl')]
+            paths.sort(key=os.path.getmtime, reverse=True)
+        except OSError:
+            return
+        for path in paths[max(self.maxSize, 1):]:
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            logging.info('Removed old compiled database {0}'.format(path))
@@ -0,0 +1,120 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from rmgpy.data.databasecache import DatabaseCache, getDatabaseHash, getSourceHash
+from rmgpy.data.base import Entry
+from rmgpy.data.thermo import ThermoLibrary
+from rmgpy.molecule import Molecule
+
+################################################################################
+
+class TestDatabaseCache(unittest.TestCase):
+    """
+    Contains unit tests of the DatabaseCache class.
+    """
+
+    def setUp(self):
+        """
+        A function run before each unit test in this class.
+        """
+        self.directory = tempfile.mkdtemp()
+        self.databaseDirectory = os.path.join(self.directory, 'database')
+        os.makedirs(os.path.join(self.databaseDirectory, 'thermo'))
+        with open(os.path.join(self.databaseDirectory, 'thermo', 'library.py'), 'w') as f:
+            f.write('name = "library"\n')
+        self.cache = DatabaseCache(os.path.join(self.directory, 'cache'))
+
+    def tearDown(self):
+        """
+        A function run after each unit test in this class.
+        """
+        shutil.rmtree(self.directory)
+
+    def testDatabaseHash(self):
+        """
+        Test that the database hash changes with the files and the options.
+        """
+        key = getDatabaseHash(self.databaseDirectory, thermoLibraries=['primaryThermoLibrary'])
+        self.assertEqual(key, getDatabaseHash(self.databaseDirectory, thermoLibraries=['primaryThermoLibrary']))
+        self.assertNotEqual(key, getDatabaseHash(self.databaseDirectory, thermoLibraries=[]))
+
+        with open(os.path.join(self.databaseDirectory, 'thermo', 'library.py'), 'a') as f:
+            f.write('shortDesc = "changed"\n')
+        self.assertNotEqual(key, getDatabaseHash(self.databaseDirectory, thermoLibraries=['primaryThermoLibrary']))
+
+        # Compiled Python files do not change the hash
+        key = getDatabaseHash(self.databaseDirectory)
+        with open(os.path.join(self.databaseDirectory, 'thermo', 'library.pyc'), 'w') as f:
+            f.write('')
+        self.assertEqual(key, getDatabaseHash(self.databaseDirectory))
+
+    def testSourceHash(self):
+        """
+        Test that the source hash changes with the source files only.
+        """
+        sourceDirectory = os.path.join(self.directory, 'rmgpy')
+        os.mkdir(sourceDirectory)
+        with open(os.path.join(sourceDirectory, 'base.py'), 'w') as f:
+            f.write('x = 1\n')
+        key = getSourceHash(sourceDirectory)
+        self.assertEqual(key, getSourceHash(sourceDirectory))
+
+        # Compiled Python files and unit tests do not change the hash
+        for filename in ['base.pyc', 'baseTest.py']:
+            with open(os.path.join(sourceDirectory, filename), 'w') as f:
+                f.write('')
+        self.assertEqual(key, getSourceHash(sourceDirectory))
+
+        with open(os.path.join(sourceDirectory, 'base.py'), 'a') as f:
+            f.write('y = 2\n')
+        self.assertNotEqual(key, getSourceHash(sourceDirectory))
+
+        # The hash of the installed package is computed once
+        self.assertEqual(getSourceHash(), getSourceHash())
+
+    def testSaveAndLoad(self):
+        """
+        Test that a saved database is loaded again for the same hash only.
+        """
+        library = ThermoLibrary(label='library')
+        library.entries['CH4'] = Entry(index=1, label='CH4', item=Molecule().fromSMILES('C'))
+        key = getDatabaseHash(self.databaseDirectory)
+        self.assertIsNone(self.cache.load(key))
+        self.assertTrue(self.cache.save(key, {'thermo': library}))
+
+        components = self.cache.load(key)
+        self.assertEqual(components['thermo'].label, 'library')
+        self.assertTrue(components['thermo'].entries['CH4'].item.isIsomorphic(Molecule().fromSMILES('C')))
+        self.assertIsNone(self.cache.load('0' * 40))
+
+        # A file with a different hash in its header is not used
+        os.rename(self.cache.getPath(key), self.cache.getPath('0' * 40))
+        self.assertIsNone(self.cache.load('0' * 40))
+
+    def testPrune(self):
+        """
+        Test that only the most recently used compiled databases are kept.
+        """
+        self.cache.maxSize = 2
+        keys = [str(i) * 40 for i in range(3)]
+        self.assertTrue(self.cache.save(keys[0], {}))
+        self.assertTrue(self.cache.save(keys[1], {}))
+        # Make the first compiled database older, then use it again
+        os.utime(self.cache.getPath(keys[0]), (0, 0))
+        os.utime(self.cache.getPath(keys[1]), (1, 1))
+        self.assertEqual(self.cache.load(keys[0]), {})
+
+        self.assertTrue(self.cache.save(keys[2], {}))
+        self.assertTrue(os.path.exists(self.cache.getPath(keys[0])))
+        self.assertFalse(os.path.exists(self.cache.getPath(keys[1])))
+        self.assertTrue(os.path.exists(self.cache.getPath(keys[2])))
+
+################################################################################
+
+if __name__ == '__main__':
+    unittest.main(testRunner=unittest.TextTestRunner(verbosity=2))
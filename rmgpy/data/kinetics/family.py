@@ -899,6 +899,9 @@ class KineticsFamily(Database):
                 counter += 1
                 productSet.append(entry)
 
+        # The product groups are new nodes of the tree
+        self.groups.resetDescentCache()
+
         return productSet
 
     def hasRateRule(self, template):
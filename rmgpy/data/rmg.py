@@ -42,6 +42,7 @@ from transport import TransportDatabase
 from rmgpy.data.kinetics.database import KineticsDatabase
 from statmech import StatmechDatabase
 from solvation import SolvationDatabase
+from databasecache import DatabaseCache, getDatabaseHash, COMPONENTS
 
 from rmgpy.scoop_framework.util import get, broadcast
 
@@ -83,6 +84,7 @@ class RMGDatabase:
              statmechLibraries=None,
              depository=True,
              solvation=True,
+             cacheDirectory=None,
              ):
         """
         Load the RMG database from the given `path` on disk, where `path`
@@ -90,7 +92,30 @@ class RMGDatabase:
         optional arguments are provided, then the entire database will be
         loaded. You can use the optional arguments to specify that only certain
         components of the database be loaded.
+
+        If `cacheDirectory` is given, the loaded database is stored there as a
+        compiled database, which is loaded instead of the database files by
+        later calls with the same options as long as none of the files in
+        `path` have changed.
         """
+        if cacheDirectory is not None:
+            cache = DatabaseCache(cacheDirectory)
+            key = getDatabaseHash(path,
+                                  thermoLibraries=thermoLibraries,
+                                  transportLibraries=transportLibraries,
+                                  reactionLibraries=reactionLibraries,
+                                  seedMechanisms=seedMechanisms,
+                                  kineticsFamilies=kineticsFamilies,
+                                  kineticsDepositories=kineticsDepositories,
+                                  statmechLibraries=statmechLibraries,
+                                  depository=depository,
+                                  solvation=solvation,
+                                  )
+            components = cache.load(key)
+            if components is not None:
+                self.loadCompiled(components)
+                return
+            
         self.loadThermo(os.path.join(path, 'thermo'), thermoLibraries, depository)
         self.loadTransport(os.path.join(path, 'transport'), transportLibraries)
         self.loadForbiddenStructures(os.path.join(path, 'forbiddenStructures.py'))
@@ -105,6 +130,23 @@ class RMGDatabase:
         if solvation:
             self.loadSolvation(os.path.join(path, 'solvation'))
 
+        if cacheDirectory is not None:
+            cache.save(key, dict([(name, getattr(self, name)) for name in COMPONENTS]))
+
+    def loadCompiled(self, components):
+        """
+        Set up the RMG database from the dictionary of loaded database
+        `components` of a compiled database, and broadcast them as when the
+        database files are loaded.
+        """
+        for name in COMPONENTS:
+            setattr(self, name, components[name])
+        for name, value in [('thermo', self.thermo), ('transport', self.transport),
+                            ('forbidden', self.forbiddenStructures), ('kinetics', self.kinetics),
+                            ('statmech', self.statmech), ('solvation', self.solvation)]:
+            if value is not None:
+                broadcast(value, name)
+
     def loadThermo(self, path, thermoLibraries=None, depository=True):
         """
         Load the RMG thermo database from the given `path` on disk, where
@@ -261,6 +261,42 @@ def averageThermoData(thermoDataList=[]):
             averagedThermoData.S298.uncertainty_si = 2*numpy.std(SData, ddof=1)
             return averagedThermoData
 
+def getMoleculeKey(molecule):
+    """
+    Return a key for the given `molecule` made of its formula fingerprint and
+    its graph invariants. Isomorphic molecules always have the same key, so
+    the key can be used to index the entries of a thermo library or
+    depository and to shortlist the entries that need an isomorphism check.
+    """
+    return (molecule.getFingerprint(), molecule.getInvariants())
+
+def generateEntryIndex(entries):
+    """
+    Return a dictionary mapping the key of each molecule in the given
+    `entries`, as given by :func:`getMoleculeKey`, to the list of entries with
+    that key.
+    """
+    index = {}
+    for entry in entries:
+        key = getMoleculeKey(entry.item)
+        if key in index:
+            index[key].append(entry)
+        else:
+            index[key] = [entry]
+    return index
+
+def findEntries(database, molecule):
+    """
+    Return the list of entries in the thermo library or depository `database`
+    that may be isomorphic with `molecule`, using the index of the entries.
+    The index is generated if the database does not have one yet. It is kept
+    up to date by :meth:`loadEntry`; code that changes the entries in any
+    other way must call :meth:`generateIndex` of the database afterwards.
+    """
+    if database.index is None:
+        database.generateIndex()
+    return database.index.get(getMoleculeKey(molecule), [])
+
 ################################################################################
 
 class ThermoDepository(Database):
@@ -270,6 +306,7 @@ class ThermoDepository(Database):
 
     def __init__(self, label='', name='', shortDesc='', longDesc=''):
         Database.__init__(self, label=label, name=name, shortDesc=shortDesc, longDesc=longDesc)
+        self.index = None
 
     def loadEntry(self, index, label, molecule, thermo, reference=None, referenceType='', shortDesc='', longDesc='', rank=None):
         entry = Entry(
@@ -284,8 +321,18 @@ class ThermoDepository(Database):
             rank = rank,
         )
         self.entries[label] = entry
+        if self.index is not None:
+            self.index.setdefault(getMoleculeKey(entry.item), []).append(entry)
         return entry
 
+    def generateIndex(self):
+        """
+        Generate the index of the entries used by :func:`findEntries` from
+        scratch. This must be called after entries are replaced, removed or
+        changed in place.
+        """
+        self.index = generateEntryIndex(self.entries.values())
+
     def saveEntry(self, f, entry):
         """
         Write the given `entry` in the thermo database to the file object `f`.
@@ -301,6 +348,7 @@ class ThermoLibrary(Database):
 
     def __init__(self, label='', name='',solvent=None, shortDesc='', longDesc=''):
         Database.__init__(self, label=label, name=name, shortDesc=shortDesc, longDesc=longDesc)
+        self.index = None
 
     def loadEntry(self,
                   index,
@@ -320,12 +368,12 @@ class ThermoLibrary(Database):
         if label in self.entries.keys():
             raise DatabaseError('Found a duplicate molecule with label {0} in the thermo library.  Please correct your library.'.format(label))
         
-        for entry in self.entries.values():
+        for entry in findEntries(self, molecule):
             if molecule.isIsomorphic(entry.item):
                 if molecule.multiplicity == entry.item.multiplicity:
                     raise DatabaseError('Adjacency list and multiplicity of {0} matches that of existing molecule {1} in thermo library.  Please correct your library.'.format(label, entry.label))
         
-        self.entries[label] = Entry(
+        entry = Entry(
             index = index,
             label = label,
             item = molecule,
@@ -336,6 +384,17 @@ class ThermoLibrary(Database):
             longDesc = longDesc.strip(),
             rank = rank,
         )
+        self.entries[label] = entry
+        # Keep the index up to date as entries are loaded
+        self.index.setdefault(getMoleculeKey(molecule), []).append(entry)
+
+    def generateIndex(self):
+        """
+        Generate the index of the entries used by :func:`findEntries` from
+        scratch. This must be called after entries are replaced, removed or
+        changed in place.
+        """
+        self.index = generateEntryIndex(self.entries.values())
 
     def saveEntry(self, f, entry):
         """
@@ -430,6 +489,7 @@ class ThermoDatabase(object):
         self.libraries = {}
         self.groups = {}
         self.libraryOrder = []
+        self.cache = None
         self.local_context = {
             'ThermoData': ThermoData,
             'Wilhoit': Wilhoit,
@@ -458,6 +518,7 @@ class ThermoDatabase(object):
         self.libraries = d['libraries']
         self.groups = d['groups']
         self.libraryOrder = d['libraryOrder']
+        self.cache = None
 
     def load(self, path, libraries=None, depository=True):
         """
@@ -574,6 +635,7 @@ class ThermoDatabase(object):
                     pattern = False,
                 )
                 library.label = os.path.basename(root)
+                library.generateIndex()
                 self.libraries[library.label] = library
 
         self.groups = {}
@@ -652,6 +714,7 @@ class ThermoDatabase(object):
             for label in toDelete:
                 logging.info(" {0}".format(label))
                 library.entries.pop(label)
+            library.generateIndex()
 
     def saveOld(self, path):
         """
@@ -941,16 +1004,14 @@ class ThermoDatabase(object):
         Returns: a list of tuples (thermoData, depository, entry) without any Cp0 or CpInf data.
         """
         items = []
-        for label, entry in self.depository['stable'].entries.iteritems():
-            for molecule in species.molecule:
-                if molecule.isIsomorphic(entry.item):
-                    items.append((deepcopy(entry.data), self.depository['stable'], entry))
-                    break
-        for label, entry in self.depository['radical'].entries.iteritems():
+        for depository in [self.depository['stable'], self.depository['radical']]:
+            found = []
             for molecule in species.molecule:
-                if molecule.isIsomorphic(entry.item):
-                    items.append((deepcopy(entry.data), self.depository['radical'], entry))
-                    break
+                for entry in findEntries(depository, molecule):
+                    if entry not in found and molecule.isIsomorphic(entry.item):
+                        found.append(entry)
+            for entry in found:
+                items.append((deepcopy(entry.data), depository, entry))
         return items
 
     def getThermoDataFromLibrary(self, species, library):
@@ -964,8 +1025,8 @@ class ThermoDatabase(object):
         
         Returns a tuple: (ThermoData, library, entry)  or None.
         """
-        for label, entry in library.entries.iteritems():
-            for molecule in species.molecule:
+        for molecule in species.molecule:
+            for entry in findEntries(library, molecule):
                 if molecule.isIsomorphic(entry.item) and entry.data is not None:
                     thermoData = deepcopy(entry.data)
                     self.findCp0andCpInf(species, thermoData)
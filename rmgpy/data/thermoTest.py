@@ -9,6 +9,7 @@ from rmgpy import settings
 from rmgpy.data.rmg import RMGDatabase, database
 from rmgpy.rmg.main import RMG
 from rmgpy.rmg.model import Species
+from rmgpy.data.base import Entry
 from rmgpy.data.thermo import ThermoDatabase
 from rmgpy.molecule.molecule import Molecule
 
@@ -99,7 +100,42 @@ class TestThermoDatabase(unittest.TestCase):
         
         self.assertAlmostEqual(thermoData_lib.getEntropy(298.), thermoData_ga.getEntropy(298.), 0)
 
-        
+
+    def testLibraryIndex(self):
+        """
+        Test that the indexed library lookup finds the same entries as a
+        search over all of the library entries.
+        """
+        library = self.database.libraries['primaryThermoLibrary']
+        for smiles in ['[H][H]', 'C', '[CH3]', 'O=C=O', 'CCO', 'C=CC=CCC']:
+            spc = Species(molecule=[Molecule().fromSMILES(smiles)])
+            spc.generateResonanceIsomers()
+            expected = None
+            for entry in library.entries.values():
+                if any([mol.isIsomorphic(entry.item) for mol in spc.molecule]):
+                    expected = entry
+                    break
+            thermoData = self.database.getThermoDataFromLibrary(spc, library)
+            if expected is None:
+                self.assertIsNone(thermoData)
+            else:
+                self.assertIs(thermoData[2], expected)
+
+        # Entries changed directly are found once the index is regenerated
+        molecule = Molecule().fromSMILES('CCCCCCCCCCCCCCCCCCCC')
+        library.entries['test'] = Entry(label='test', item=molecule, data=self.database.getThermoDataFromGroups(Species(molecule=[molecule])))
+        try:
+            library.generateIndex()
+            thermoData = self.database.getThermoDataFromLibrary(Species(molecule=[molecule.copy(deep=True)]), library)
+            self.assertIs(thermoData[2], library.entries['test'])
+            # Replacing the item of an entry keeps the number of entries
+            library.entries['test'].item = Molecule().fromSMILES('CCCCCCCCCCCCCCCCCCCO')
+            library.generateIndex()
+            self.assertIsNone(self.database.getThermoDataFromLibrary(Species(molecule=[molecule.copy(deep=True)]), library))
+        finally:
+            del library.entries['test']
+            library.generateIndex()
+
     @work_in_progress
     def testSymmetryNumberGeneration(self):
         """
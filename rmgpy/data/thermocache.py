@@ -0,0 +1,238 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+################################################################################
+#
+#   RMG - Reaction Mechanism Generator
+#
+#   Copyright (c) 2002-2010 Prof. William H. Green (whgreen@mit.edu) and the
+#   RMG Team (rmg_dev@mit.edu)
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a
+#   copy of this software and associated documentation files (the 'Software'),
+#   to deal in the Software without restriction, including without limitation
+#   the rights to use, copy, modify, merge, publish, distribute, sublicense,
+#   and/or sell copies of the Software, and to permit persons to whom the
+#   Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included in
+#   all copies or substantial portions of the Software.
+#
+#   THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#   IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#   FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#   AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#   LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#   FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#   DEALINGS IN THE SOFTWARE.
+#
+################################################################################
+
+"""
+This module contains a persistent cache of thermodynamics estimates, stored in
+an SQLite file on disk, so that related RMG jobs do not need to repeat the
+library search, group additivity and HBI estimation for the same species.
+"""
+
+import cPickle
+import hashlib
+import logging
+import sqlite3
+
+from rmgpy.molecule import Molecule, Group
+
+################################################################################
+
+def getThermoDatabaseHash(database):
+    """
+    Return a hash of the contents of the given :class:`ThermoDatabase`
+    `database`, covering the libraries (in the order they are searched) and
+    the group additivity trees. Any change to the loaded thermo groups or
+    libraries results in a different hash.
+    """
+    sha = hashlib.sha1()
+    for label in database.libraryOrder:
+        sha.update('library {0}\n'.format(label))
+        for entry in database.libraries[label].entries.values():
+            sha.update('{0}\n{1}\n{2!r}\n'.format(entry.label, entry.item.toAdjacencyList(), entry.data))
+    for label in sorted(database.groups.keys()):
+        sha.update('groups {0}\n'.format(label))
+        for entry in database.groups[label].entries.values():
+            parent = entry.parent.label if entry.parent is not None else ''
+            item = entry.item.toAdjacencyList() if isinstance(entry.item, Group) else str(entry.item)
+            sha.update('{0}\n{1}\n{2}\n{3!r}\n'.format(entry.label, parent, item, entry.data))
+    return sha.hexdigest()
+
+class ThermoCache(object):
+    """
+    A persistent cache of the thermodynamics estimates of species, stored in
+    an SQLite file. Estimates are keyed by the augmented InChI of the species
+    and the solvent, and are only valid for the thermo database `version`
+    they were made with, as given by :func:`getThermoDatabaseHash`. The
+    attributes are:
+
+    =============== ============================================================
+    Attribute       Description
+    =============== ============================================================
+    `path`          The path to the SQLite file on disk
+    `version`       The hash of the thermo database the estimates belong to
+    `timeout`       The time in s to wait for other jobs to release the SQLite file
+    `batchSize`     The number of new estimates to collect before writing them to the file
+    `pending`       A dictionary of the new estimates not written to the file yet, indexed by key
+    `hits`          The number of estimates found in the cache
+    `misses`        The number of estimates not found in the cache
+    =============== ============================================================
+
+    The cache is only an aid: if the augmented InChI of a species cannot be
+    generated, or the SQLite file cannot be read or written, for example
+    because other jobs sharing it keep it locked for longer than `timeout`,
+    the error is logged and the species is treated as not cached, so its
+    thermo is estimated by the thermo database as usual. New estimates are
+    written to the file `batchSize` at a time, and by :meth:`flush` and
+    :meth:`close`, so that jobs sharing the file lock it less often.
+
+    Estimates stored by RMG jobs are the thermo returned by the thermo
+    database, before conversion to NASA polynomials and before any solvation
+    correction, so they give exactly the thermo of an uncached job. Entries
+    loaded from Chemkin files by :meth:`loadChemkinFile` are instead marked
+    as *final*: they are the NASA polynomials of the species as written by a
+    previous job, including any solvation correction, and are used as they
+    are.
+    """
+
+    def __init__(self, path, version, timeout=60.0, batchSize=100):
+        self.path = path
+        self.version = version
+        self.timeout = timeout
+        self.batchSize = batchSize
+        self.pending = {}
+        self.hits = 0
+        self.misses = 0
+        self.connection = sqlite3.connect(path, timeout=timeout)
+        self.connection.execute('CREATE TABLE IF NOT EXISTS thermo (key TEXT, version TEXT, molecule TEXT, thermo BLOB, final INTEGER NOT NULL DEFAULT 0, PRIMARY KEY (key, version))')
+        # Caches made before final entries existed only contain estimates
+        columns = [row[1] for row in self.connection.execute('PRAGMA table_info(thermo)')]
+        if 'final' not in columns:
+            self.connection.execute('ALTER TABLE thermo ADD COLUMN final INTEGER NOT NULL DEFAULT 0')
+        self.connection.commit()
+        count = self.connection.execute('SELECT COUNT(*) FROM thermo WHERE version = ?', (self.version,)).fetchone()[0]
+        logging.info('Using thermo cache {0} with {1:d} estimates for the current thermo database'.format(path, count))
+
+    def __reduce__(self):
+        """
+        A helper function used when pickling a ThermoCache object.
+        """
+        return (ThermoCache, (self.path, self.version, self.timeout, self.batchSize))
+
+    def getKey(self, species, solvent=None):
+        """
+        Return the key used to store the thermo estimate of `species` in the
+        given `solvent` (or in the gas phase if ``None``), or ``None`` if the
+        augmented InChI of the species cannot be generated.
+        """
+        try:
+            aug_inchi = species.getAugmentedInChI()
+        except Exception, e:
+            logging.warning('Could not generate the augmented InChI of species {0} for the thermo cache: {1}'.format(species, e))
+            return None
+        return '{0} {1}'.format(aug_inchi, solvent or '')
+
+    def get(self, species, solvent=None):
+        """
+        Return the cached thermo of `species` in the given `solvent`, the
+        :class:`Molecule` (resonance isomer) it was estimated for and
+        ``True`` if it is final thermo loaded from a Chemkin file or ``False``
+        if it is an estimate of the thermo database, or ``None`` if the
+        species is not in the cache.
+        """
+        key = self.getKey(species, solvent)
+        row = None
+        if key in self.pending:
+            row = self.pending[key] + (0,)
+        elif key is not None:
+            try:
+                row = self.connection.execute('SELECT molecule, thermo, final FROM thermo WHERE key = ? AND version = ?',
+                                              (key, self.version)).fetchone()
+            except sqlite3.Error, e:
+                logging.warning('Could not read thermo cache {0}: {1}'.format(self.path, e))
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        adjlist, data, final = row
+        return cPickle.loads(str(data)), Molecule().fromAdjacencyList(str(adjlist)), bool(final)
+
+    def put(self, species, thermo, solvent=None):
+        """
+        Store the thermo estimate `thermo` of `species` in the given `solvent`,
+        estimated for the first molecule (resonance isomer) of the species.
+        The estimate is written to the file with the next batch.
+        """
+        key = self.getKey(species, solvent)
+        if key is None:
+            return
+        self.pending[key] = (species.molecule[0].toAdjacencyList(), sqlite3.Binary(cPickle.dumps(thermo, cPickle.HIGHEST_PROTOCOL)))
+        if len(self.pending) >= self.batchSize:
+            self.flush()
+
+    def flush(self):
+        """
+        Write the new estimates collected by :meth:`put` to the file in a
+        single transaction. If this fails, they are discarded.
+        """
+        if not self.pending:
+            return
+        rows = [(key, self.version, adjlist, data) for key, (adjlist, data) in self.pending.iteritems()]
+        self.pending = {}
+        try:
+            with self.connection:
+                self.connection.executemany('INSERT OR REPLACE INTO thermo (key, version, molecule, thermo, final) VALUES (?, ?, ?, ?, 0)', rows)
+        except sqlite3.Error, e:
+            logging.warning('Could not write {0:d} thermo estimates to thermo cache {1}: {2}'.format(len(rows), self.path, e))
+
+    def purge(self):
+        """
+        Delete all of the estimates made with other versions of the thermo
+        database from the cache.
+        """
+        self.flush()
+        self.connection.execute('DELETE FROM thermo WHERE version != ?', (self.version,))
+        self.connection.commit()
+
+    def loadChemkinFile(self, path, dictionaryPath, thermoPath=None, solvent=None):
+        """
+        Warm up the cache with the thermo of the species in the Chemkin file
+        at `path` with the species dictionary at `dictionaryPath`, and
+        optionally a separate thermo file at `thermoPath`. The thermo is stored
+        for the current thermo database version, so the Chemkin file should
+        have been generated with the same thermo database. The thermo of a
+        Chemkin file is final, so `solvent` must be the solvent of the job
+        that wrote it, or ``None`` for a gas-phase job. Returns the number of
+        species added to the cache.
+        """
+        from rmgpy.chemkin import loadChemkinFile
+        speciesList, reactionList = loadChemkinFile(path, dictionaryPath, thermoPath=thermoPath)
+        count = 0
+        self.flush()
+        for species in speciesList:
+            if species.thermo is None or not species.molecule:
+                continue
+            key = self.getKey(species, solvent)
+            if key is None:
+                continue
+            # Estimates already in the cache are kept
+            cursor = self.connection.execute('INSERT OR IGNORE INTO thermo (key, version, molecule, thermo, final) VALUES (?, ?, ?, ?, 1)',
+                                             (key, self.version, species.molecule[0].toAdjacencyList(),
+                                              sqlite3.Binary(cPickle.dumps(species.thermo, cPickle.HIGHEST_PROTOCOL))))
+            count += cursor.rowcount
+        self.connection.commit()
+        logging.info('Added thermo for {0:d} species from {1} to thermo cache {2}'.format(count, path, self.path))
+        return count
+
+    def close(self):
+        """
+        Write the new estimates to the SQLite file and close the connection
+        to it.
+        """
+        self.flush()
+        self.connection.close()
@@ -0,0 +1,255 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+import rmgpy.rmg.model
+from rmgpy import settings
+from rmgpy.chemkin import saveChemkinFile, saveSpeciesDictionary
+from rmgpy.data.rmg import RMGDatabase
+from rmgpy.data.thermocache import ThermoCache
+from rmgpy.molecule.inchi import InchiException
+from rmgpy.species import Species
+from rmgpy.thermo import ThermoData
+
+################################################################################
+
+class SpeciesWithoutInChI(rmgpy.rmg.model.Species):
+    """
+    A species whose augmented InChI cannot be generated.
+    """
+
+    def getAugmentedInChI(self):
+        raise InchiException('Not a valid InChI')
+
+################################################################################
+
+class TestThermoCache(unittest.TestCase):
+    """
+    Contains unit tests of the ThermoCache class.
+    """
+
+    def setUp(self):
+        """
+        A function run before each unit test in this class.
+        """
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'thermo.sqlite')
+        self.thermo = ThermoData(
+            Tdata = ([300,400,500,600,800,1000,1500],'K'),
+            Cpdata = ([3.0,4.0,5.0,6.0,8.0,10.0,15.0],'cal/(mol*K)'),
+            H298 = (-20.0,'kcal/mol'),
+            S298 = (50.0,'cal/(mol*K)'),
+            Tmin = (300.0,'K'),
+            Tmax = (2000.0,'K'),
+            comment = 'Estimated by group additivity',
+        )
+
+    def tearDown(self):
+        """
+        A function run after each unit test in this class.
+        """
+        shutil.rmtree(self.directory)
+
+    def testPutAndGet(self):
+        """
+        Test that a stored estimate is found again, also from a new cache object.
+        """
+        cache = ThermoCache(self.path, 'version1')
+        species = Species().fromSMILES('C=C[CH2]')
+        species.generateResonanceIsomers()
+        self.assertIsNone(cache.get(species))
+        cache.put(species, self.thermo)
+        cache.close()
+
+        cache = ThermoCache(self.path, 'version1')
+        species2 = Species().fromSMILES('[CH2]C=C')
+        species2.generateResonanceIsomers()
+        thermo, molecule, final = cache.get(species2)
+        self.assertFalse(final)
+        self.assertAlmostEqual(thermo.H298.value_si, self.thermo.H298.value_si)
+        self.assertEqual(thermo.comment, self.thermo.comment)
+        self.assertTrue(molecule.isIsomorphic(species.molecule[0]))
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 0)
+
+        # Estimates are not found in the gas phase cache for a solvent
+        self.assertIsNone(cache.get(species2, 'water'))
+        cache.close()
+
+    def testVersion(self):
+        """
+        Test that estimates made with another thermo database version are ignored and can be purged.
+        """
+        cache = ThermoCache(self.path, 'version1')
+        species = Species().fromSMILES('CCO')
+        cache.put(species, self.thermo)
+        cache.close()
+
+        cache = ThermoCache(self.path, 'version2')
+        self.assertIsNone(cache.get(species))
+        cache.purge()
+        cache.close()
+
+        cache = ThermoCache(self.path, 'version1')
+        self.assertIsNone(cache.get(species))
+        cache.close()
+
+    def testBatch(self):
+        """
+        Test that new estimates are written to the file in batches, and found
+        before they are written.
+        """
+        cache = ThermoCache(self.path, 'version1', batchSize=2)
+        connection = sqlite3.connect(self.path)
+        species1 = Species().fromSMILES('CCO')
+        species2 = Species().fromSMILES('CCC')
+        cache.put(species1, self.thermo)
+        self.assertEqual(connection.execute('SELECT COUNT(*) FROM thermo').fetchone()[0], 0)
+        self.assertIsNotNone(cache.get(species1))
+        cache.put(species2, self.thermo)
+        self.assertEqual(connection.execute('SELECT COUNT(*) FROM thermo').fetchone()[0], 2)
+        self.assertEqual(len(cache.pending), 0)
+        connection.close()
+        cache.close()
+
+    def testErrors(self):
+        """
+        Test that a locked file and species without an augmented InChI are
+        treated as not cached instead of raising errors.
+        """
+        cache = ThermoCache(self.path, 'version1', timeout=0.1, batchSize=1)
+        species = Species().fromSMILES('CCO')
+        cache.put(species, self.thermo)
+        
+        # Another job writing to the file keeps it locked
+        connection = sqlite3.connect(self.path)
+        connection.execute('BEGIN EXCLUSIVE')
+        self.assertIsNone(cache.get(species))
+        cache.put(Species().fromSMILES('CCC'), self.thermo)
+        self.assertEqual(len(cache.pending), 0)
+        connection.rollback()
+        connection.close()
+        self.assertIsNotNone(cache.get(species))
+        self.assertIsNone(cache.get(Species().fromSMILES('CCC')))
+        
+        species = SpeciesWithoutInChI().fromSMILES('CCCO')
+        self.assertIsNone(cache.get(species))
+        cache.put(species, self.thermo)
+        self.assertEqual(len(cache.pending), 0)
+        self.assertEqual(cache.misses, 3)
+        cache.close()
+
+################################################################################
+
+class TestCachedThermo(unittest.TestCase):
+    """
+    Contains unit tests checking that RMG species get the same thermo from a
+    thermo cache as without one.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        A function run once before the unit tests in this class.
+        """
+        cls.database = RMGDatabase()
+        cls.database.loadThermo(os.path.join(settings['database.directory'], 'thermo'), thermoLibraries=['primaryThermoLibrary'], depository=False)
+        cls.database.loadSolvation(os.path.join(settings['database.directory'], 'solvation'))
+
+    def setUp(self):
+        """
+        A function run before each unit test in this class.
+        """
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """
+        A function run after each unit test in this class.
+        """
+        self.database.thermo.cache = None
+        rmgpy.rmg.model.Species.solventData = None
+        rmgpy.rmg.model.Species.solventName = None
+        shutil.rmtree(self.directory)
+
+    def makeSpecies(self):
+        """
+        Return a list of new RMG species to estimate the thermo of.
+        """
+        speciesList = []
+        for index, smiles in enumerate(['CCCCO', 'C[CH]CC', 'C=CC=CCC']):
+            species = rmgpy.rmg.model.Species(index=index+1, label='S{0:d}'.format(index+1)).fromSMILES(smiles)
+            species.generateResonanceIsomers()
+            speciesList.append(species)
+        return speciesList
+
+    def assertSameThermo(self, speciesList1, speciesList2, relative):
+        """
+        Check that the thermo of the species in the two lists agrees to the
+        `relative` precision.
+        """
+        for species1, species2 in zip(speciesList1, speciesList2):
+            for T in [300.0, 500.0, 1000.0, 1500.0]:
+                for method in ['getHeatCapacity', 'getEnthalpy', 'getEntropy']:
+                    value1 = getattr(species1.thermo, method)(T)
+                    value2 = getattr(species2.thermo, method)(T)
+                    self.assertAlmostEqual(value1, value2, delta=relative*abs(value1)+1e-6)
+
+    def checkCachedThermo(self, solvent):
+        """
+        Check that species get the same thermo as without a cache from the
+        estimates stored in a cache and from a cache warmed up with a Chemkin
+        file, for the given `solvent` (or in the gas phase if ``None``).
+        """
+        if solvent is not None:
+            rmgpy.rmg.model.Species.solventData = self.database.solvation.getSolventData(solvent)
+            rmgpy.rmg.model.Species.solventName = solvent
+        
+        uncached = self.makeSpecies()
+        for species in uncached:
+            species.generateThermoData(self.database)
+
+        # Estimates stored by a job give exactly the thermo of an uncached job
+        self.database.thermo.cache = ThermoCache(os.path.join(self.directory, 'estimates.sqlite'), 'version')
+        for species in self.makeSpecies():
+            species.generateThermoData(self.database)
+        cached = self.makeSpecies()
+        for species in cached:
+            species.generateThermoData(self.database)
+        self.assertEqual(self.database.thermo.cache.hits, len(cached))
+        self.assertSameThermo(uncached, cached, 1e-12)
+
+        # Final thermo from a Chemkin file is used as written, without a
+        # second solvation correction
+        chemkinPath = os.path.join(self.directory, 'chem.inp')
+        dictionaryPath = os.path.join(self.directory, 'species_dictionary.txt')
+        saveChemkinFile(chemkinPath, uncached, [], verbose=False, checkForDuplicates=False)
+        saveSpeciesDictionary(dictionaryPath, uncached)
+        self.database.thermo.cache = ThermoCache(os.path.join(self.directory, 'warmed.sqlite'), 'version')
+        self.assertEqual(self.database.thermo.cache.loadChemkinFile(chemkinPath, dictionaryPath, solvent=solvent), len(uncached))
+        warmed = self.makeSpecies()
+        for species in warmed:
+            species.generateThermoData(self.database)
+        self.assertEqual(self.database.thermo.cache.hits, len(warmed))
+        self.assertSameThermo(uncached, warmed, 1e-6)
+
+    def testGasPhase(self):
+        """
+        Test that cached thermo in the gas phase is the same as without a cache.
+        """
+        self.checkCachedThermo(None)
+
+    def testSolvent(self):
+        """
+        Test that cached thermo in a solvent is the same as without a cache.
+        """
+        self.checkCachedThermo('water')
+
+################################################################################
+
+if __name__ == '__main__':
+    unittest.main(testRunner=unittest.TextTestRunner(verbosity=2))
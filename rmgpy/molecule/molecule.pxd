@@ -104,10 +104,13 @@ cdef class Molecule(Graph):
     cdef public object rdMol
     cdef public int rdMolConfId
     cdef str _fingerprint
+    cdef tuple _invariants
     cdef public str InChI
     cdef public dict props
     
     cpdef str getFingerprint(self)
+
+    cpdef tuple getInvariants(self)
     
     cpdef addAtom(self, Atom atom)
 
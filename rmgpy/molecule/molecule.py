@@ -587,6 +587,7 @@ class Molecule(Graph):
         self.symmetryNumber = symmetry
         self.multiplicity = multiplicity
         self._fingerprint = None
+        self._invariants = None
         self.InChI = ''
         if SMILES != '': self.fromSMILES(SMILES)
         self.props = props or {}
@@ -644,6 +645,7 @@ class Molecule(Graph):
         Add an `atom` to the graph. The atom is initialized with no bonds.
         """
         self._fingerprint = None
+        self._invariants = None
         return self.addVertex(atom)
     
     def addBond(self, bond):
@@ -652,6 +654,7 @@ class Molecule(Graph):
         and `atom2`.
         """
         self._fingerprint = None
+        self._invariants = None
         return self.addEdge(bond)
 
     def getBonds(self, atom):
@@ -687,6 +690,7 @@ class Molecule(Graph):
         removal.
         """
         self._fingerprint = None
+        self._invariants = None
         return self.removeVertex(atom)
 
     def removeBond(self, bond):
@@ -696,6 +700,7 @@ class Molecule(Graph):
         this removal.
         """
         self._fingerprint = None
+        self._invariants = None
         return self.removeEdge(bond)
 
     def sortAtoms(self):
@@ -864,6 +869,7 @@ class Molecule(Graph):
                        bond=Bond, atoms=list, zBoundary=float)
                        # groupBond=GroupBond, 
         self._fingerprint = None
+        self._invariants = None
         
         atoms = self.vertices
         
@@ -906,6 +912,7 @@ class Molecule(Graph):
         to ensure they are correct (i.e. accurately describe their local bond
         environment) and complete (i.e. are as detailed as possible).
         """
+        self._invariants = None
         for atom in self.vertices:
             atom.atomType = getAtomType(atom, atom.edges)
             
@@ -972,6 +979,60 @@ class Molecule(Graph):
         if self._fingerprint is None:
             self._fingerprint = self.getFormula()
         return self._fingerprint
+
+    def getInvariants(self):
+        """
+        Return a tuple of graph invariants used to reject non-isomorphic
+        molecules with the same fingerprint before running the full graph
+        isomorphism check. The tuple contains the sorted list of atom
+        signatures, each made of the element, the radical electrons, lone
+        pairs and charge, the connectivity values and the sorted orders of the
+        bonds to the atom, followed by the number of rings (the cycle rank) of
+        the graph. Two invariant tuples matching is a necessary (but not
+        sufficient) condition for the associated molecules to be isomorphic.
+        
+        Only the connectivity values and the cycle rank, which change only
+        when atoms or bonds are added or removed, are cached. The other atom
+        and bond attributes are read each time, since they are also changed
+        in place, e.g. by :meth:`Atom.applyAction` and :meth:`Bond.applyAction`
+        and when generating resonance isomers.
+        """
+        cython.declare(atom=Atom, atom2=Atom, signatures=list, visited=set, stack=list,
+                       connectivity=dict, numBonds=cython.int, numComponents=cython.int)
+        if self._invariants is None:
+            self.updateConnectivityValues()
+            connectivity = {}
+            numBonds = 0
+            numComponents = 0
+            visited = set()
+            for atom in self.vertices:
+                if atom not in visited:
+                    # Found a new connected component, so mark all of its atoms
+                    numComponents += 1
+                    visited.add(atom)
+                    stack = [atom]
+                    while stack:
+                        for atom2 in stack.pop().edges:
+                            if atom2 not in visited:
+                                visited.add(atom2)
+                                stack.append(atom2)
+                connectivity[atom] = (atom.connectivity1, atom.connectivity2, atom.connectivity3)
+                numBonds += len(atom.edges)
+            numBonds = numBonds // 2
+            self._invariants = (connectivity, numBonds - len(self.vertices) + numComponents)
+        connectivity = self._invariants[0]
+        signatures = []
+        for atom in self.vertices:
+            signatures.append((
+                atom.element.number,
+                atom.radicalElectrons,
+                atom.lonePairs,
+                atom.charge,
+                connectivity[atom],
+                tuple(sorted([bond.order for bond in atom.edges.itervalues()])),
+            ))
+        signatures.sort()
+        return (tuple(signatures), self._invariants[1])
     
     def isIsomorphic(self, other, initialMap=None):
         """
@@ -994,6 +1055,9 @@ class Molecule(Graph):
         # check multiplicity
         if self.multiplicity != other.multiplicity:
             return False
+        # Compare the graph invariants, which are also a necessary condition
+        if self.getInvariants() != other.getInvariants():
+            return False
         # Do the full isomorphism comparison
         result = Graph.isIsomorphic(self, other, initialMap)
         return result
@@ -1020,6 +1084,9 @@ class Molecule(Graph):
         # check multiplicity
         if self.multiplicity != other.multiplicity:
             return []
+        # Compare the graph invariants, which are also a necessary condition
+        if self.getInvariants() != other.getInvariants():
+            return []
             
         # Do the isomorphism comparison
         result = Graph.findIsomorphism(self, other, initialMap)
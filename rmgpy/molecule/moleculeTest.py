@@ -694,6 +694,53 @@ class TestMolecule(unittest.TestCase):
         self.assertTrue(molecule1.isIsomorphic(molecule2))
         self.assertTrue(molecule2.isIsomorphic(molecule1))
 
+    def testInvariants(self):
+        """
+        Check that the graph invariants match for isomorphic molecules and
+        distinguish isomers with the same formula.
+        """
+        molecule1 = Molecule().fromSMILES('C=CC=C[CH]C')
+        molecule2 = Molecule().fromSMILES('C[CH]C=CC=C')
+        self.assertEqual(molecule1.getInvariants(), molecule2.getInvariants())
+
+        # Resonance isomers and constitutional isomers have the same formula, but not the same invariants
+        molecule3 = Molecule().fromSMILES('C=C[CH]C=CC')
+        molecule4 = Molecule().fromSMILES('C=CC(=C)[CH]C')
+        for molecule in [molecule3, molecule4]:
+            self.assertEqual(molecule1.getFingerprint(), molecule.getFingerprint())
+            self.assertNotEqual(molecule1.getInvariants(), molecule.getInvariants())
+            self.assertFalse(molecule1.isIsomorphic(molecule))
+
+        # Rings change the invariants
+        molecule5 = Molecule().fromSMILES('C1CCCCC1')
+        molecule6 = Molecule().fromSMILES('CCCC=CC')
+        self.assertNotEqual(molecule5.getInvariants()[1], molecule6.getInvariants()[1])
+
+        # Modifying the molecule resets the invariants
+        invariants = molecule1.getInvariants()
+        molecule1.removeAtom(molecule1.atoms[-1])
+        self.assertNotEqual(invariants, molecule1.getInvariants())
+
+    def testInvariantsInPlaceChanges(self):
+        """
+        Check that the graph invariants follow bond orders and radicals that
+        are changed in place, so the isomorphism checks are not stale.
+        """
+        molecule1 = Molecule().fromSMILES('C=CC')
+        molecule2 = Molecule().fromSMILES('[CH2][CH]C')
+        self.assertFalse(molecule1.isIsomorphic(molecule2))
+        
+        # Turn the double bond of propene into a single bond with a radical on
+        # each of its carbon atoms
+        atom1, atom2 = [atom for atom in molecule1.atoms if atom.isCarbon() and any([bond.isDouble() for bond in atom.edges.values()])]
+        molecule1.getBond(atom1, atom2).decrementOrder()
+        atom1.incrementRadical()
+        atom2.incrementRadical()
+        molecule1.multiplicity = molecule2.multiplicity
+        self.assertEqual(molecule1.getInvariants(), molecule2.getInvariants())
+        self.assertTrue(molecule1.isIsomorphic(molecule2))
+        self.assertTrue(len(molecule1.findIsomorphism(molecule2)) > 0)
+
     def testSubgraphIsomorphism(self):
         """
         Check the graph isomorphism functions.
@@ -0,0 +1,185 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+################################################################################
+#
+#   RMG - Reaction Mechanism Generator
+#
+#   Copyright (c) 2002-2009 Prof. William H. Green (whgreen@mit.edu) and the
+#   RMG Team (rmg_dev@mit.edu)
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a
+#   copy of this software and associated documentation files (the "Software"),
+#   to deal in the Software without restriction, including without limitation
+#   the rights to use, copy, modify, merge, publish, distribute, sublicense,
+#   and/or sell copies of the Software, and to permit persons to whom the
+#   Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included in
+#   all copies or substantial portions of the Software.
+#
+#   THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#   IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#   FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+#   THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#   LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#   FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#   DEALINGS IN THE SOFTWARE.
+#
+################################################################################
+
+"""
+This module contains the :class:`DensityOfStatesCache` class, which stores
+the densities and sums of states of configurations so that they are not
+recomputed each time a network containing the same species is initialized,
+and the process-wide instance of it used by :class:`Network` objects. The
+entries are indexed by object identities, so the cache is not shared with
+other processes; those computed by worker processes are lost with them.
+"""
+
+import logging
+import numpy
+from collections import OrderedDict
+
+################################################################################
+
+class DensityOfStatesCache(object):
+    """
+    A least-recently-used cache of the densities and sums of states of
+    configurations, computed by :meth:`Configuration.calculateDensityOfStates`.
+    The entries are indexed by the identities of the species of a
+    configuration and of their conformers and by the rotor flags and RMG mode,
+    and store the energy grains they were computed at. The attributes are:
+
+    =================== ========================================================
+    Attribute           Description
+    =================== ========================================================
+    `maximumSize`       The maximum total size of the cached arrays in bytes, or 0 to disable the cache
+    `size`              The current total size of the cached arrays in bytes
+    `entries`           An ordered dictionary of the entries, from the least to the most recently used
+    `hits`              The number of densities of states taken from the cache
+    `misses`            The number of densities of states computed
+    =================== ========================================================
+
+    A cached density of states is resampled if it was computed at energy
+    grains that are no coarser than and extend at least as far as the
+    requested ones; otherwise it is computed again and replaces the entry.
+    """
+
+    def __init__(self, maximumSize=64*1024*1024):
+        self.maximumSize = maximumSize
+        self.size = 0
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def clear(self):
+        """
+        Remove all the entries from the cache.
+        """
+        self.entries.clear()
+        self.size = 0
+
+    def getKey(self, configuration, activeJRotor, activeKRotor, rmgmode):
+        """
+        Return the key of the entry for `configuration` with the given rotor
+        flags and RMG mode. The entry keeps references to the species and
+        conformers, so their identities are not reused while it is cached.
+        """
+        return (
+            tuple([(id(spec), id(spec.conformer)) for spec in configuration.species]),
+            bool(activeJRotor), bool(activeKRotor), bool(rmgmode),
+        )
+
+    def calculateDensityOfStates(self, configuration, Elist, activeJRotor=True, activeKRotor=True, rmgmode=False):
+        """
+        Set the density (and sum) of states of `configuration` at the energies
+        above the ground state `Elist` in J/mol, which must start at zero, in
+        the same way as :meth:`Configuration.calculateDensityOfStates`, taking
+        them from the cache if possible.
+        """
+        if self.maximumSize <= 0:
+            configuration.calculateDensityOfStates(Elist, activeJRotor=activeJRotor, activeKRotor=activeKRotor, rmgmode=rmgmode)
+            return
+
+        key = self.getKey(configuration, activeJRotor, activeKRotor, rmgmode)
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            species, Elist0, densStates0, sumStates0 = entry
+            result = self.resample(Elist0, densStates0, sumStates0, Elist)
+            if result is not None:
+                # Mark the entry as the most recently used
+                self.entries[key] = entry
+                self.hits += 1
+                configuration.Elist = Elist
+                configuration.activeJRotor = activeJRotor
+                configuration.activeKRotor = activeKRotor
+                configuration.densStates, configuration.sumStates = result
+                return
+            self.size -= self.getEntrySize(entry)
+
+        self.misses += 1
+        configuration.calculateDensityOfStates(Elist, activeJRotor=activeJRotor, activeKRotor=activeKRotor, rmgmode=rmgmode)
+        entry = (
+            [(spec, spec.conformer) for spec in configuration.species],
+            Elist.copy(),
+            configuration.densStates.copy() if configuration.densStates is not None else None,
+            configuration.sumStates.copy() if configuration.sumStates is not None else None,
+        )
+        entrySize = self.getEntrySize(entry)
+        if entrySize > self.maximumSize:
+            return
+        self.entries[key] = entry
+        self.size += entrySize
+
+        # Evict the least recently used entries until the cache fits
+        while self.size > self.maximumSize:
+            oldKey, oldEntry = self.entries.popitem(last=False)
+            self.size -= self.getEntrySize(oldEntry)
+            logging.debug('Evicted a density of states from the cache; {0:d} entries remain'.format(len(self.entries)))
+
+    def getEntrySize(self, entry):
+        """
+        Return the total size in bytes of the arrays of a cache `entry`.
+        """
+        return sum([array.nbytes for array in entry[1:] if array is not None])
+
+    def resample(self, Elist0, densStates0, sumStates0, Elist):
+        """
+        Return the density and sum of states `densStates0` and `sumStates0`
+        computed at the energies `Elist0` in J/mol mapped to the energies
+        `Elist` in J/mol, or ``None`` if `Elist` extends beyond `Elist0` or
+        has finer grains. Both lists of energies must start at zero. The
+        densities of states are interpolated semi-logarithmically and scaled
+        to the new grain size, as in :meth:`Configuration.mapDensityOfStates`.
+        """
+        if Elist.shape[0] == Elist0.shape[0] and numpy.allclose(Elist, Elist0, rtol=1e-12, atol=0.0):
+            return (
+                densStates0.copy() if densStates0 is not None else None,
+                sumStates0.copy() if sumStates0 is not None else None,
+            )
+
+        dE = Elist[1] - Elist[0]
+        dE0 = Elist0[1] - Elist0[0]
+        if dE < dE0 * (1 - 1e-12) or Elist[-1] > Elist0[-1] * (1 + 1e-12):
+            return None
+
+        densStates = None
+        if densStates0 is not None:
+            densStates = numpy.zeros_like(Elist)
+            nonzero = numpy.flatnonzero(densStates0 > 0)
+            if nonzero.shape[0] > 0:
+                mask = Elist >= Elist0[nonzero[0]]
+                densStates[mask] = numpy.exp(numpy.interp(Elist[mask], Elist0[nonzero], numpy.log(densStates0[nonzero]))) * dE / dE0
+        sumStates = None
+        if sumStates0 is not None:
+            sumStates = numpy.interp(Elist, Elist0, sumStates0)
+        return densStates, sumStates
+
+################################################################################
+
+# The cache shared by all the networks of this process
+densityOfStatesCache = DensityOfStatesCache()
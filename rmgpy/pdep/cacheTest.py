@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+################################################################################
+#
+#   RMG - Reaction Mechanism Generator
+#
+#   Copyright (c) 2002-2009 Prof. William H. Green (whgreen@mit.edu) and the
+#   RMG Team (rmg_dev@mit.edu)
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a
+#   copy of this software and associated documentation files (the "Software"),
+#   to deal in the Software without restriction, including without limitation
+#   the rights to use, copy, modify, merge, publish, distribute, sublicense,
+#   and/or sell copies of the Software, and to permit persons to whom the
+#   Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included in
+#   all copies or substantial portions of the Software.
+#
+#   THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#   IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#   FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+#   THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#   LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#   FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#   DEALINGS IN THE SOFTWARE.
+#
+################################################################################
+
+"""
+This script contains unit tests of the :mod:`rmgpy.pdep.cache` module.
+"""
+
+import numpy
+import unittest
+
+from rmgpy.pdep.cache import DensityOfStatesCache
+from rmgpy.pdep.configuration import Configuration
+from rmgpy.statmech.translation import IdealGasTranslation
+from rmgpy.statmech.rotation import NonlinearRotor
+from rmgpy.statmech.vibration import HarmonicOscillator
+from rmgpy.statmech.conformer import Conformer
+from rmgpy.species import Species
+
+################################################################################
+
+class TestDensityOfStatesCache(unittest.TestCase):
+    """
+    Contains unit tests of the :class:`DensityOfStatesCache` class.
+    """
+
+    def setUp(self):
+        """
+        A function run before each unit test in this class.
+        """
+        self.H2O = Species(
+            label = 'H2O',
+            conformer = Conformer(
+                E0 = (-269.598,'kJ/mol'),
+                modes = [
+                    IdealGasTranslation(mass=(18.01,"g/mol")),
+                    NonlinearRotor(inertia=([0.630578,1.15529,1.78586],"amu*angstrom^2"), symmetry=2),
+                    HarmonicOscillator(frequencies=([1622.09,3771.85,3867.85],"cm^-1")),
+                ],
+                spinMultiplicity = 1,
+                opticalIsomers = 1,
+            ),
+        )
+        self.Elist = numpy.arange(0.0, 400000.0, 1000.0)
+        self.cache = DensityOfStatesCache()
+
+    def test_hit(self):
+        """
+        Test that a density of states at the same energy grains is taken from
+        the cache and is the same as the computed one.
+        """
+        expected = Configuration(self.H2O)
+        expected.calculateDensityOfStates(self.Elist, rmgmode=False)
+        for i in range(2):
+            configuration = Configuration(self.H2O)
+            self.cache.calculateDensityOfStates(configuration, self.Elist, rmgmode=False)
+            self.assertTrue(numpy.array_equal(configuration.densStates, expected.densStates))
+            self.assertTrue(numpy.array_equal(configuration.sumStates, expected.sumStates))
+        self.assertEqual(self.cache.misses, 1)
+        self.assertEqual(self.cache.hits, 1)
+        self.assertEqual(len(self.cache), 1)
+
+    def test_resample(self):
+        """
+        Test that a density of states at coarser energy grains is resampled
+        from the cached one, and that one at finer grains is computed again.
+        """
+        self.cache.calculateDensityOfStates(Configuration(self.H2O), self.Elist, rmgmode=False)
+
+        Elist = numpy.arange(0.0, 300000.0, 2000.0)
+        configuration = Configuration(self.H2O)
+        self.cache.calculateDensityOfStates(configuration, Elist, rmgmode=False)
+        self.assertEqual(self.cache.hits, 1)
+        expected = Configuration(self.H2O)
+        expected.calculateDensityOfStates(Elist, rmgmode=False)
+        for r in range(1, Elist.shape[0]):
+            self.assertAlmostEqual(configuration.densStates[r] / expected.densStates[r], 1.0, 2)
+
+        Elist = numpy.arange(0.0, 300000.0, 500.0)
+        self.cache.calculateDensityOfStates(Configuration(self.H2O), Elist, rmgmode=False)
+        self.assertEqual(self.cache.hits, 1)
+        self.assertEqual(self.cache.misses, 2)
+        self.assertEqual(len(self.cache), 1)
+
+    def test_eviction(self):
+        """
+        Test that the least recently used entries are evicted when the cache
+        is full.
+        """
+        self.cache.maximumSize = 2 * 2 * self.Elist.nbytes + self.Elist.nbytes
+        self.cache.calculateDensityOfStates(Configuration(self.H2O), self.Elist, activeJRotor=True, rmgmode=False)
+        self.cache.calculateDensityOfStates(Configuration(self.H2O), self.Elist, activeJRotor=False, rmgmode=False)
+        self.assertEqual(len(self.cache), 1)
+        self.assertLessEqual(self.cache.size, self.cache.maximumSize)
+        self.assertEqual(self.cache.entries.keys()[0][1], False)
+
+################################################################################
+
+if __name__ == '__main__':
+    unittest.main( testRunner = unittest.TextTestRunner(verbosity=2) )
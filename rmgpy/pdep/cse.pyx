@@ -35,12 +35,14 @@ import numpy
 cimport numpy
 import logging
 import scipy.linalg
+import scipy.sparse
+import scipy.sparse.linalg
 
 from libc.math cimport exp, log, sqrt
 
 import rmgpy.constants as constants
 
-from rmgpy.pdep.me import generateFullMEMatrix
+from rmgpy.pdep.me import generateMEIndices, generateFullMEMatrix, generateSparseMEMatrix
 
 ################################################################################
 
@@ -53,7 +55,16 @@ class ChemicallySignificantEigenvaluesError(Exception):
 
 ################################################################################
 
-def applyChemicallySignificantEigenvaluesMethod(network, list lumpingOrder=None):
+def applyChemicallySignificantEigenvaluesMethod(network, list lumpingOrder=None, bint sparse=False):
+    """
+    Return the matrix of phenomenological rate coefficients :math:`k(T,P)`
+    and the pseudo-steady population distributions of the `network` at its
+    current conditions using the chemically-significant eigenvalues method.
+    If `sparse` is ``True``, the master equation matrix is assembled as a
+    sparse matrix and only its slowest eigenmodes are computed, instead of
+    all eigenmodes of the dense matrix. The collision matrices of the
+    network that it is assembled from are still dense.
+    """
 
     cdef numpy.ndarray[numpy.int_t,ndim=1] Jlist
     cdef numpy.ndarray[numpy.int_t,ndim=3] indices
@@ -88,10 +99,7 @@ def applyChemicallySignificantEigenvaluesMethod(network, list lumpingOrder=None)
     
     ymB = 1.0e-6 * P / constants.R / T
     
-    # Generate the full master equation matrix
-    M, indices = generateFullMEMatrix(network, products=False)
-    Nrows = M.shape[0]
-    M[:,Nrows-Nreac:] *= ymB
+    indices, Nrows = generateMEIndices(network, products=False)
     
     # Generate symmetrization matrix and its inverse
     S = numpy.zeros(Nrows, numpy.float64)
@@ -108,31 +116,36 @@ def applyChemicallySignificantEigenvaluesMethod(network, list lumpingOrder=None)
         S[index] = sqrt(eqRatios[n+Nisom] / ymB)
         Sinv[index] = 1.0 / S[index]
 
-    # Symmetrize master equation matrix: M = S * Msymm * Sinv
-    # Since S and Sinv are diagonal we can do this very efficiently
-    for r in range(Nrows):
-        for s in range(Nrows):
-            M[r,s] = Sinv[r] * M[r,s] * S[s]
-
-    # DEBUG: Check that the matrix has been properly symmetrized
-    properlySymmetrized = True
-    for r in range(Nrows):
-        for s in range(r):
-            if M[r,s] != 0:
-                if abs(M[r,s] - M[s,r]) > 0.01 * M[r,s]:
-                    if M[r,s] > 1e-200 or M[s,r] > 1e-200:
-                        print r, s, M[r,s], M[s,r]
-                        properlySymmetrized = False
-    if not properlySymmetrized:
-        raise ChemicallySignificantEigenvaluesError('Master equation matrix not properly symmetrized.')
-
-    # Get eigenvalues and eigenvectors
-    # We only need the slowest Nchem + 1 eigenmodes, so only compute those
-    try:
-        #W0, V0 = scipy.linalg.eigh(M, eigvals=(Nrows-Nchem-1,Nrows-1), overwrite_a=True, overwrite_b=True)
-        W0, V0 = scipy.linalg.eigh(M, overwrite_a=True, overwrite_b=True)
-    except numpy.linalg.LinAlgError:
-        raise ChemicallySignificantEigenvaluesError('Eigenvalue calculation failed to converge.')
+    if sparse:
+        W0, V0 = getSparseEigenmodes(network, S, Sinv, ymB, Nchem + 1)
+    else:
+        # Generate the full master equation matrix
+        M, indices = generateFullMEMatrix(network, products=False)
+        M[:,Nrows-Nreac:] *= ymB
+        
+        # Symmetrize master equation matrix: M = S * Msymm * Sinv
+        # Since S and Sinv are diagonal we can do this very efficiently
+        for r in range(Nrows):
+            for s in range(Nrows):
+                M[r,s] = Sinv[r] * M[r,s] * S[s]
+    
+        # DEBUG: Check that the matrix has been properly symmetrized
+        properlySymmetrized = True
+        for r in range(Nrows):
+            for s in range(r):
+                if M[r,s] != 0:
+                    if abs(M[r,s] - M[s,r]) > 0.01 * M[r,s]:
+                        if M[r,s] > 1e-200 or M[s,r] > 1e-200:
+                            logging.error('Master equation matrix entries {0:d},{1:d} = {2:g} and {1:d},{0:d} = {3:g} are not symmetric.'.format(r, s, M[r,s], M[s,r]))
+                            properlySymmetrized = False
+        if not properlySymmetrized:
+            raise ChemicallySignificantEigenvaluesError('Master equation matrix not properly symmetrized.')
+    
+        # Get eigenvalues and eigenvectors
+        try:
+            W0, V0 = scipy.linalg.eigh(M, overwrite_a=True, overwrite_b=True)
+        except numpy.linalg.LinAlgError:
+            raise ChemicallySignificantEigenvaluesError('Eigenvalue calculation failed to converge.')
     
     # We can't assume that eigh returns them in sorted order
     ind = W0.argsort()
@@ -230,3 +243,44 @@ def applyChemicallySignificantEigenvaluesMethod(network, list lumpingOrder=None)
 
     # Return the matrix of k(T,P) values and the pseudo-steady population distributions
     return K, pa
+
+def getSparseEigenmodes(network, numpy.ndarray[numpy.float64_t,ndim=1] S, numpy.ndarray[numpy.float64_t,ndim=1] Sinv, double ymB, int Nmodes):
+    """
+    Return the `Nmodes` slowest eigenvalues and the corresponding eigenvectors
+    of the symmetrized master equation matrix of the `network` without
+    product channels, using the symmetrization matrix `S` and its inverse
+    `Sinv` and the bath gas concentration `ymB`. The matrix is assembled as a
+    sparse matrix, and the eigenmodes are computed by the shift-invert mode
+    of the Lanczos method, with a small positive shift since the eigenvalues
+    of the master equation matrix are not positive.
+    """
+    
+    M, indices = generateSparseMEMatrix(network, products=False)
+    Nrows = M.shape[0]
+    Nreac = network.Nreac
+    Nmodes = min(Nmodes, Nrows - 1)
+    
+    # Scale the reactant channel columns and symmetrize: M = S * Msymm * Sinv
+    M = M.tocoo()
+    data = M.data * Sinv[M.row] * S[M.col]
+    data[M.col >= Nrows-Nreac] *= ymB
+    M = scipy.sparse.csc_matrix((data, (M.row, M.col)), shape=(Nrows,Nrows))
+    
+    # Check that the matrix has been properly symmetrized
+    lower = M.tocoo()
+    mask = (lower.row > lower.col) & (lower.data != 0)
+    r = lower.row[mask]; s = lower.col[mask]; value = lower.data[mask]
+    transpose = numpy.asarray(M.T.tocsr()[r,s]).ravel() if r.shape[0] > 0 else numpy.zeros(0)
+    invalid = (numpy.abs(value - transpose) > 0.01 * value) & ((value > 1e-200) | (transpose > 1e-200))
+    if numpy.any(invalid):
+        for index in numpy.flatnonzero(invalid):
+            logging.error('Master equation matrix entries {0:d},{1:d} = {2:g} and {1:d},{0:d} = {3:g} are not symmetric.'.format(r[index], s[index], value[index], transpose[index]))
+        raise ChemicallySignificantEigenvaluesError('Master equation matrix not properly symmetrized.')
+    
+    sigma = 1e-10 * numpy.max(numpy.abs(M.diagonal()))
+    try:
+        W0, V0 = scipy.sparse.linalg.eigsh(M, k=Nmodes, sigma=sigma, which='LM')
+    except (scipy.sparse.linalg.ArpackNoConvergence, scipy.sparse.linalg.ArpackError, RuntimeError):
+        raise ChemicallySignificantEigenvaluesError('Eigenvalue calculation failed to converge.')
+    
+    return W0, V0
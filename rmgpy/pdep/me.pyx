@@ -32,6 +32,7 @@ pressure-dependent reaction network.
 
 import numpy
 cimport numpy
+import scipy.sparse
 
 from libc.math cimport exp
 
@@ -39,6 +40,42 @@ import rmgpy.constants as constants
 
 ################################################################################
 
+cpdef generateMEIndices(network, bint products=True):
+    """
+    Return the accounting matrix relating the isomer, energy grain and angular
+    momentum indices of the network to the rows of its master equation
+    matrix, with -1 for the grains with no states, and the number of rows.
+    The rows of the reactant (and product) channels come after those of the
+    isomers.
+    """
+    
+    cdef numpy.ndarray[numpy.int_t,ndim=3] indices
+    cdef numpy.ndarray[numpy.float64_t,ndim=3] densStates
+    cdef int Nisom, Nreac, Nprod, Ngrains, NJ, Nrows
+    cdef int i, r, s
+    
+    densStates = network.densStates
+    Nisom = network.Nisom
+    Nreac = network.Nreac
+    Nprod = network.Nprod
+    Ngrains = network.Ngrains
+    NJ = network.NJ
+    
+    indices = -numpy.ones((Nisom,Ngrains,NJ), numpy.int)
+    Nrows = 0
+    for r in range(Ngrains):
+        for s in range(NJ):
+            for i in range(Nisom):
+                if densStates[i,r,s] > 0:
+                    indices[i,r,s] = Nrows
+                    Nrows += 1
+    Nrows += Nreac
+    if products:
+        Nrows += Nprod
+    
+    return indices, Nrows
+
+
 cpdef generateFullMEMatrix(network, bint products=True):
     """
     Generate the full master equation matrix for the network.
@@ -52,7 +89,7 @@ cpdef generateFullMEMatrix(network, bint products=True):
     cdef numpy.ndarray[numpy.float64_t,ndim=4] Kij, Gnj, Fim
     cdef numpy.ndarray[numpy.float64_t,ndim=5] Mcoll
     cdef double T, P, beta, val
-    cdef int Nisom, Nreac, Nprod, Ngrains, NJ
+    cdef int Nisom, Nreac, Nprod, Ngrains, NJ, Nrows
     cdef int i, n, r, s, u, v
 
     T = network.T
@@ -73,17 +110,7 @@ cpdef generateFullMEMatrix(network, bint products=True):
     beta = 1. / (constants.R * T)
     
     # Construct accounting matrix
-    indices = -numpy.ones((Nisom,Ngrains,NJ), numpy.int)
-    Nrows = 0
-    for r in range(Ngrains):
-        for s in range(NJ):
-            for i in range(Nisom):
-                if densStates[i,r,s] > 0:
-                    indices[i,r,s] = Nrows
-                    Nrows += 1
-    Nrows += Nreac
-    if products:
-        Nrows += Nprod
+    indices, Nrows = generateMEIndices(network, products)
     
     # Construct full ME matrix
     M = numpy.zeros([Nrows,Nrows], numpy.float64)
@@ -132,3 +159,112 @@ cpdef generateFullMEMatrix(network, bint products=True):
                                 M[v,v] -= val
 
     return M, indices
+
+cpdef generateSparseMEMatrix(network, bint products=True, double tol=1e-12):
+    """
+    Generate the full master equation matrix for the network as a
+    :class:`scipy.sparse.csr_matrix`, with the same terms as the dense
+    matrix of :func:`generateFullMEMatrix`. Collision terms smaller than
+    `tol` times the diagonal term of their column are dropped, as when the
+    half-bandwidth is chosen in the reservoir state method, unless the term
+    transposed to them is kept, so that the matrix can still be symmetrized.
+    The dropped terms are added to the diagonal term of their column to
+    conserve the population. The collision matrices of the network are
+    themselves dense, so only the assembled matrix, and not the memory
+    used to assemble it, scales with their bandwidth; the collision terms
+    are processed a block of columns at a time so that the temporary
+    arrays do not scale with the square of the number of grains.
+    """
+    
+    cdef numpy.ndarray[numpy.int_t,ndim=1] Jlist
+    cdef numpy.ndarray[numpy.int_t,ndim=3] indices
+    cdef numpy.ndarray[numpy.float64_t,ndim=1] Elist
+    cdef numpy.ndarray[numpy.float64_t,ndim=3] densStates
+    cdef numpy.ndarray[numpy.float64_t,ndim=4] Kij, Gnj, Fim
+    cdef numpy.ndarray[numpy.float64_t,ndim=5] Mcoll
+    cdef double T, beta
+    cdef int Nisom, Nreac, Nprod, Ngrains, NJ, Nrows
+    cdef int i, j, n, v, start
+    cdef int blockSize = 256
+    cdef list rows, cols, values
+
+    T = network.T
+    Elist = network.Elist
+    Jlist = network.Jlist
+    densStates = network.densStates
+    Mcoll = network.Mcoll
+    Kij = network.Kij
+    Fim = network.Fim
+    Gnj = network.Gnj
+    Nisom = network.Nisom
+    Nreac = network.Nreac
+    Nprod = network.Nprod
+    Ngrains = network.Ngrains
+    NJ = network.NJ
+    
+    beta = 1. / (constants.R * T)
+    
+    # Construct accounting matrix
+    indices, Nrows = generateMEIndices(network, products)
+    
+    # The entries are collected as (row, column, value) triplets; those
+    # with the same row and column are summed
+    rows = []; cols = []; values = []
+    
+    # The grain indices of the flattened energy and angular momentum grains
+    grains = numpy.arange(Ngrains*NJ)
+    R = numpy.repeat(numpy.arange(Ngrains), NJ)
+    S = numpy.tile(numpy.arange(NJ), Ngrains)
+    
+    # Collision terms, a block of columns at a time
+    for i in range(Nisom):
+        index = indices[i,:,:].reshape(Ngrains*NJ)
+        M = Mcoll[i,:,:,:,:].reshape(Ngrains*NJ, Ngrains*NJ)
+        diagonal = numpy.abs(numpy.diagonal(M))
+        for start in range(0, Ngrains*NJ, blockSize):
+            b = grains[start:start+blockSize]
+            # The pairs of grains (r,s) and (u,v) with u >= r and v >= s set
+            # by the collision terms of the dense matrix, in both directions
+            upper = (R[:,numpy.newaxis] <= R[b]) & (S[:,numpy.newaxis] <= S[b])
+            lower = (R[:,numpy.newaxis] >= R[b]) & (S[:,numpy.newaxis] >= S[b]) & (grains[:,numpy.newaxis] != b)
+            valid = (upper | lower) & (index[:,numpy.newaxis] > -1) & (index[b] > -1) & (M[:,b] != 0)
+            keep = (numpy.abs(M[:,b]) > tol * diagonal[b]) | (numpy.abs(M[b,:].T) > tol * diagonal[:,numpy.newaxis]) | (grains[:,numpy.newaxis] == b)
+            a, c = numpy.nonzero(valid & keep)
+            rows.append(index[a]); cols.append(index[b[c]]); values.append(M[a,b[c]])
+            dropped = numpy.sum(numpy.where(valid & ~keep, M[:,b], 0.0), axis=0)
+            c = numpy.flatnonzero((dropped != 0) & (index[b] > -1))
+            rows.append(index[b[c]]); cols.append(index[b[c]]); values.append(dropped[c])
+    
+    # Isomerization terms
+    for i in range(Nisom):
+        for j in range(i):
+            if Kij[i,j,Ngrains-1,0] > 0 or Kij[j,i,Ngrains-1,0] > 0:
+                u = indices[i,:,:].reshape(Ngrains*NJ)
+                w = indices[j,:,:].reshape(Ngrains*NJ)
+                valid = (u > -1) & (w > -1)
+                u = u[valid]; w = w[valid]
+                kji = Kij[j,i,:,:].reshape(Ngrains*NJ)[valid]
+                kij = Kij[i,j,:,:].reshape(Ngrains*NJ)[valid]
+                rows.extend([w, u, u, w]); cols.extend([u, u, w, w]); values.extend([kji, -kji, kij, -kij])
+    
+    # Association/dissociation terms
+    for i in range(Nisom):
+        for n in range(Nreac+Nprod):
+            if Gnj[n,i,Ngrains-1,0] > 0:
+                if products: 
+                    v = Nrows - Nreac - Nprod + n
+                else:
+                    v = Nrows - Nreac + n
+                u = indices[i,:,:].reshape(Ngrains*NJ)
+                valid = u > -1
+                u = u[valid]
+                g = Gnj[n,i,:,:].reshape(Ngrains*NJ)[valid]
+                rows.append(u); cols.append(u); values.append(-g)
+                if n < Nreac or products:
+                    rows.append(numpy.repeat(v, u.shape[0])); cols.append(u); values.append(g)
+                if n < Nreac:
+                    val = (Fim[i,n,:,:] * densStates[n+Nisom,:,:] * (2*Jlist[numpy.newaxis,:]+1) * numpy.exp(-Elist[:,numpy.newaxis] * beta)).reshape(Ngrains*NJ)[valid]
+                    rows.extend([u, numpy.repeat(v, u.shape[0])]); cols.extend([numpy.repeat(v, u.shape[0]), numpy.repeat(v, u.shape[0])]); values.extend([val, -val])
+
+    M = scipy.sparse.coo_matrix((numpy.concatenate(values), (numpy.concatenate(rows), numpy.concatenate(cols))), shape=(Nrows,Nrows))
+    return M.tocsr(), indices
@@ -36,9 +36,12 @@ pressure-dependent unimolecular reaction network
 import math
 import numpy
 import logging
+import multiprocessing
+from collections import OrderedDict
 
 import rmgpy.constants as constants
 from rmgpy.reaction import Reaction
+from rmgpy.pdep.cache import densityOfStatesCache
 
 ################################################################################
 
@@ -89,8 +92,24 @@ class Network:
     `activeKRotor`          ``True`` if the K-rotor is treated as active, ``False`` if treated as adiabatic
     `activeJRotor`          ``True`` if the J-rotor is treated as active, ``False`` if treated as adiabatic
     `rmgmode`               ``True`` if in RMG mode, ``False`` otherwise
+    ----------------------- ----------------------------------------------------
+    `collKernel`            The collision matrix of each isomer at the current temperature, per unit collision frequency
+    `temperatureCache`      An ordered dictionary of the quantities that depend only on temperature, indexed by temperature in K
+    `temperatureCacheSize`  The maximum number of temperatures in `temperatureCache` (0 to disable it)
     ======================= ====================================================
     
+    The collision matrices depend on pressure only through the collision
+    frequencies, so :meth:`setConditions` computes the collision kernels once
+    per temperature and scales them for each pressure. If
+    `temperatureCacheSize` is set to a positive number, the energy grains,
+    densities of states, equilibrium ratios, microcanonical rate coefficients
+    and collision kernels of the most recently used temperatures are also
+    kept in `temperatureCache`, so they are not computed again if the network
+    returns to one of those temperatures. This is disabled by default, since
+    :meth:`calculateRateCoefficients` visits each temperature only once and
+    each cached temperature holds several arrays as large as the collision
+    matrices.
+    
     """
     
     def __init__(self, label='', isomers=None, reactants=None, products=None, pathReactions=None, bathGas=None):
@@ -120,6 +139,10 @@ class Network:
         self.grainCount = 0
         self.E0 = None
 
+        self.collKernel = None
+        self.temperatureCache = OrderedDict()
+        self.temperatureCacheSize = 0
+
         self.valid = False
 
     def invalidate(self):
@@ -172,6 +195,11 @@ class Network:
         self.Nprod = len(self.products)
         self.Ngrains = 0
         self.NJ = 0
+        
+        # The quantities computed at each temperature depend on the grains
+        self.T = 0.0
+        self.P = 0.0
+        self.clearTemperatureCache()
 
         # Calculate ground-state energies
         self.E0 = numpy.zeros((self.Nisom+self.Nreac+self.Nprod), numpy.float64)
@@ -189,7 +217,20 @@ class Network:
         
         self.calculateDensitiesOfStates()
 
-    def calculateRateCoefficients(self, Tlist, Plist, method, errorCheck=True):
+    def calculateRateCoefficients(self, Tlist, Plist, method, errorCheck=True, processes=1):
+        """
+        Return the array of phenomenological rate coefficients :math:`k(T,P)`
+        of the network at each of the temperatures `Tlist` in K and pressures
+        `Plist` in Pa, computed with the master equation reduction `method`.
+        The network must have been initialized with :meth:`initialize`.
+
+        The rate coefficients at all the pressures of a temperature are
+        computed together. If `processes` is greater than one, the
+        temperatures are divided between that many worker processes, which
+        are started with this network and inherit it, including its densities
+        of states, where processes are forked; this is not done in a worker
+        process.
+        """
         
         Nisom = len(self.isomers)
         Nreac = len(self.reactants)
@@ -205,61 +246,113 @@ class Network:
         logging.info('Calculating phenomenological rate coefficients for {0}...'.format(rxn))
         K = numpy.zeros((len(Tlist),len(Plist),Nisom+Nreac+Nprod,Nisom+Nreac+Nprod), numpy.float64)
         
-        for t, T in enumerate(Tlist):
-            for p, P in enumerate(Plist):
-                self.setConditions(T, P)
-                
-                # Apply method
-                if method.lower() == 'modified strong collision':
-                    self.applyModifiedStrongCollisionMethod()
-                elif method.lower() == 'reservoir state':
-                    self.applyReservoirStateMethod()
-                elif method.lower() == 'chemically-significant eigenvalues':
-                    self.applyChemicallySignificantEigenvaluesMethod()
-                else:
-                    raise NetworkError('Unknown method "{0}".'.format(method))
+        processes = min(processes or multiprocessing.cpu_count(), len(Tlist))
+        if processes > 1 and not multiprocessing.current_process().daemon:
+            pool = multiprocessing.Pool(processes, initializer=initializeWorker, initargs=(self, (Plist, method, errorCheck)))
+            try:
+                results = pool.map(calculateRateCoefficientsAtTemperature, Tlist, chunksize=1)
+            finally:
+                pool.close()
+                pool.join()
+            for t, Kt in enumerate(results):
+                K[t,:,:,:] = Kt
+        else:
+            for t, T in enumerate(Tlist):
+                K[t,:,:,:] = self.calculateRateCoefficientsAtTemperature(T, Plist, method, errorCheck)
 
-                K[t,p,:,:] = self.K
-                
-                # Check that the k(T,P) values satisfy macroscopic equilibrium
-                eqRatios = self.eqRatios
-                for i in range(Nisom+Nreac):
-                    for j in range(i):
-                        Keq0 = K[t,p,j,i] / K[t,p,i,j]
-                        Keq = eqRatios[j] / eqRatios[i]
-                        if Keq0 / Keq < 0.5 or Keq0 / Keq > 2.0:
-                            if i < Nisom:
-                                reactants = self.isomers[i]
-                            elif i < Nisom+Nreac:
-                                reactants = self.reactants[i-Nisom]
-                            else:
-                                reactants = self.products[i-Nisom-Nreac]
-                            if j < Nisom:
-                                products = self.isomers[j]
-                            elif j < Nisom+Nreac:
-                                products = self.reactants[j-Nisom]
-                            else:
-                                products = self.products[j-Nisom-Nreac]
-                            reaction = Reaction(reactants=reactants.species[:], products=products.species[:])
-                            logging.error('For net reaction {0!s}:'.format(reaction))
-                            logging.error('Expected Keq({1:g} K, {2:g} bar) = {0:11.3e}'.format(Keq, T, P*1e-5))
-                            logging.error('  Actual Keq({1:g} K, {2:g} bar) = {0:11.3e}'.format(Keq0, T, P*1e-5))
-                            raise NetworkError('Computed k(T,P) values for reaction {0!s} do not satisfy macroscopic equilibrium.'.format(reaction))
-                            
-                # Reject if any rate coefficients are negative
-                if errorCheck:
-                    negativeRate = False
-                    for i in range(Nisom+Nreac+Nprod):
-                        for j in range(i):
-                            if (K[t,p,i,j] < 0 or K[t,p,j,i] < 0) and not negativeRate:
-                                negativeRate = True
-                                logging.error('Negative rate coefficient generated; rejecting result.')
-                                logging.info(K[t,p,0:Nisom+Nreac+Nprod,0:Nisom+Nreac])
-                                K[t,p,:,:] = 0 * K[t,p,:,:]
-                                self.K = 0 * self.K
+        return K
 
+    def calculateRateCoefficientsAtTemperature(self, T, Plist, method, errorCheck=True):
+        """
+        Return the array of phenomenological rate coefficients :math:`k(T,P)`
+        of the network at the temperature `T` in K and each of the pressures
+        `Plist` in Pa, computed with the master equation reduction `method`.
+        """
+        
+        Nisom = len(self.isomers)
+        Nreac = len(self.reactants)
+        Nprod = len(self.products)
+
+        K = numpy.zeros((len(Plist),Nisom+Nreac+Nprod,Nisom+Nreac+Nprod), numpy.float64)
+        
+        for p, P in enumerate(Plist):
+            self.setConditions(T, P)
+            
+            # Apply method
+            if method.lower() == 'modified strong collision':
+                self.applyModifiedStrongCollisionMethod()
+            elif method.lower() == 'reservoir state':
+                self.applyReservoirStateMethod()
+            elif method.lower() == 'chemically-significant eigenvalues':
+                self.applyChemicallySignificantEigenvaluesMethod()
+            elif method.lower() == 'sparse chemically-significant eigenvalues':
+                self.applyChemicallySignificantEigenvaluesMethod(sparse=True)
+            else:
+                raise NetworkError('Unknown method "{0}".'.format(method))
+
+            K[p,:,:] = self.K
+            
+            self.checkRateCoefficients(K[p,:,:], T, P, errorCheck)
+            
         return K
 
+    def checkRateCoefficients(self, K, T, P, errorCheck=True):
+        """
+        Check that the phenomenological rate coefficients `K` computed at the
+        temperature `T` in K and pressure `P` in Pa satisfy macroscopic
+        equilibrium, and raise a :class:`NetworkError` if not. If `errorCheck`
+        is ``True``, also reject the result by setting `K` to zero in place if
+        any of the rate coefficients are negative.
+        """
+        Nisom = len(self.isomers)
+        Nreac = len(self.reactants)
+        Nprod = len(self.products)
+        
+        # Check that the k(T,P) values satisfy macroscopic equilibrium
+        # Only the pairs with j < i are checked, in the same order as they
+        # would be in a loop over i and then j
+        Nchan = Nisom + Nreac
+        eqRatios = self.eqRatios[:Nchan]
+        i, j = numpy.tril_indices(Nchan, -1)
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            Keq0 = K[j,i] / K[i,j]
+            Keq = eqRatios[j] / eqRatios[i]
+            ratio = Keq0 / Keq
+        invalid = numpy.flatnonzero((ratio < 0.5) | (ratio > 2.0))
+        if invalid.shape[0] > 0:
+            index = invalid[0]
+            reactants = self.getConfiguration(i[index])
+            products = self.getConfiguration(j[index])
+            reaction = Reaction(reactants=reactants.species[:], products=products.species[:])
+            logging.error('For net reaction {0!s}:'.format(reaction))
+            logging.error('Expected Keq({1:g} K, {2:g} bar) = {0:11.3e}'.format(Keq[index], T, P*1e-5))
+            logging.error('  Actual Keq({1:g} K, {2:g} bar) = {0:11.3e}'.format(Keq0[index], T, P*1e-5))
+            raise NetworkError('Computed k(T,P) values for reaction {0!s} do not satisfy macroscopic equilibrium.'.format(reaction))
+                    
+        # Reject if any rate coefficients are negative
+        if errorCheck:
+            Nconf = Nisom + Nreac + Nprod
+            offDiagonal = ~numpy.eye(Nconf, dtype=bool)
+            if numpy.any(K[0:Nconf,0:Nconf][offDiagonal] < 0):
+                logging.error('Negative rate coefficient generated; rejecting result.')
+                logging.info(K[0:Nconf,0:Nisom+Nreac])
+                K[:,:] = 0 * K
+                self.K = 0 * self.K
+
+    def getConfiguration(self, index):
+        """
+        Return the isomer, reactant channel or product channel at `index` in
+        the rows and columns of the arrays of the network.
+        """
+        Nisom = len(self.isomers)
+        Nreac = len(self.reactants)
+        if index < Nisom:
+            return self.isomers[index]
+        elif index < Nisom+Nreac:
+            return self.reactants[index-Nisom]
+        else:
+            return self.products[index-Nisom-Nreac]
+
     def setConditions(self, T, P, ymB=None):
         """
         Set the current network conditions to the temperature `T` in K and
@@ -283,6 +376,13 @@ class Network:
         grainSize = self.grainSize
         grainCount = self.grainCount
         
+        # Restore the parameters that depend on temperature only if they were
+        # computed before at this temperature
+        if temperatureChanged and T in self.temperatureCache:
+            self.restoreTemperatureCache(T)
+            self.calculateCollisionModel()
+            return
+        
         success = False
         previous_error = None
         while not success:
@@ -340,9 +440,51 @@ class Network:
                         Q += numpy.sum(self.densStates[i,:,s] * (2*Jlist[s]+1) * numpy.exp(-Elist / constants.R / T))
                     self.densStates[i,:,:] /= Q
                 
+                # The collision kernels must be computed at this temperature
+                self.collKernel = None
+                
             # Update parameters that depend on temperature and pressure if necessary
             if temperatureChanged or pressureChanged:
                 self.calculateCollisionModel()
+        
+        if temperatureChanged:
+            self.saveTemperatureCache(T)
+
+    def saveTemperatureCache(self, T):
+        """
+        Store the quantities computed at the current temperature `T` in K
+        in the temperature cache, evicting the least recently used
+        temperatures if it is full.
+        """
+        if self.temperatureCacheSize <= 0:
+            return
+        self.temperatureCache.pop(T, None)
+        self.temperatureCache[T] = (
+            self.Elist, self.Jlist, self.densStates, self.eqRatios,
+            self.Kij, self.Gnj, self.Fim, self.collKernel,
+        )
+        while len(self.temperatureCache) > self.temperatureCacheSize:
+            self.temperatureCache.popitem(last=False)
+
+    def restoreTemperatureCache(self, T):
+        """
+        Restore the quantities computed at the temperature `T` in K from the
+        temperature cache, marking them as the most recently used.
+        """
+        entry = self.temperatureCache.pop(T)
+        self.temperatureCache[T] = entry
+        (self.Elist, self.Jlist, self.densStates, self.eqRatios,
+            self.Kij, self.Gnj, self.Fim, self.collKernel) = entry
+        self.Ngrains = len(self.Elist)
+        self.NJ = len(self.Jlist)
+
+    def clearTemperatureCache(self):
+        """
+        Remove all the quantities computed at each temperature, including the
+        collision kernels, from the temperature cache.
+        """
+        self.temperatureCache = OrderedDict()
+        self.collKernel = None
 
     def __getEnergyGrains(self, Emin, Emax, grainSize=0.0, grainCount=0):
         """
@@ -416,6 +558,8 @@ class Network:
         Calculate the densities of states of each configuration that has states
         data. The densities of states are computed such that they can be
         applied to each temperature in the range of interest by interpolation.
+        Densities of states computed for the same species by other networks
+        are taken from the :data:`densityOfStatesCache` of this process.
         """
         
         Tmin = self.Tmin
@@ -453,13 +597,13 @@ class Network:
         # Densities of states for isomers
         for i in range(Nisom):
             logging.debug('Calculating density of states for isomer "{0}"'.format(self.isomers[i]))
-            self.isomers[i].calculateDensityOfStates(Elist, activeKRotor=self.activeKRotor, activeJRotor=self.activeJRotor, rmgmode=self.rmgmode)
+            densityOfStatesCache.calculateDensityOfStates(self.isomers[i], Elist, activeKRotor=self.activeKRotor, activeJRotor=self.activeJRotor, rmgmode=self.rmgmode)
         
         # Densities of states for reactant channels
         for n in range(Nreac):
             if self.reactants[n].hasStatMech():
                 logging.debug('Calculating density of states for reactant channel "{0}"'.format(self.reactants[n]))
-                self.reactants[n].calculateDensityOfStates(Elist, activeKRotor=self.activeKRotor, activeJRotor=self.activeJRotor, rmgmode=self.rmgmode)
+                densityOfStatesCache.calculateDensityOfStates(self.reactants[n], Elist, activeKRotor=self.activeKRotor, activeJRotor=self.activeJRotor, rmgmode=self.rmgmode)
             else:
                 logging.debug('NOT calculating density of states for reactant channel "{0}"'.format(self.reactants[n]))
             
@@ -468,7 +612,7 @@ class Network:
             for n in range(Nprod):
                 if self.products[n].hasStatMech():
                     logging.debug('Calculating density of states for product channel "{0}"'.format(self.products[n]))
-                    self.products[n].calculateDensityOfStates(Elist, activeKRotor=self.activeKRotor, activeJRotor=self.activeJRotor, rmgmode=self.rmgmode)
+                    densityOfStatesCache.calculateDensityOfStates(self.products[n], Elist, activeKRotor=self.activeKRotor, activeJRotor=self.activeJRotor, rmgmode=self.rmgmode)
                 else:
                     logging.debug('NOT calculating density of states for product channel "{0}"'.format(self.products[n]))
 
@@ -719,18 +863,24 @@ class Network:
         """
         Calculate the matrix of first-order rate coefficients for collisional
         population transfer between grains for each isomer, including the
-        corresponding collision frequencies.
+        corresponding collision frequencies. The collision kernels, which
+        depend only on temperature, are reused if they have already been
+        computed at the current temperature.
         """
         Nisom = len(self.isomers)
         Ngrains = len(self.Elist)
         NJ = 1 if self.Jlist is None else len(self.Jlist)
         
-        collFreq = numpy.zeros(Nisom, numpy.float64)
-        Mcoll = numpy.zeros((Nisom,Ngrains,NJ,Ngrains,NJ), numpy.float64)
+        if self.collKernel is None:
+            collKernel = numpy.zeros((Nisom,Ngrains,NJ,Ngrains,NJ), numpy.float64)
+            for i, isomer in enumerate(self.isomers):
+                collKernel[i,:,:,:,:] = isomer.generateCollisionMatrix(self.T, self.densStates[i,:,:], self.Elist, self.Jlist)
+            self.collKernel = collKernel
         
+        collFreq = numpy.zeros(Nisom, numpy.float64)
         for i, isomer in enumerate(self.isomers):
             collFreq[i] = isomer.calculateCollisionFrequency(self.T, self.P, self.bathGas)
-            Mcoll[i,:,:,:,:] = collFreq[i] * isomer.generateCollisionMatrix(self.T, self.densStates[i,:,:], self.Elist, self.Jlist)
+        Mcoll = collFreq[:,numpy.newaxis,numpy.newaxis,numpy.newaxis,numpy.newaxis] * self.collKernel
                         
         self.collFreq = collFreq
         self.Mcoll = Mcoll
@@ -757,24 +907,33 @@ class Network:
         self.K, self.p0 = rs.applyReservoirStateMethod(self)
         return self.K, self.p0
     
-    def applyChemicallySignificantEigenvaluesMethod(self, lumpingOrder=None):
+    def applyChemicallySignificantEigenvaluesMethod(self, lumpingOrder=None, sparse=False):
         """
         Compute the phenomenological rate coefficients :math:`k(T,P)` at the
         current conditions using the chemically-significant eigenvalues method.
         If a `lumpingOrder` is provided, the algorithm will attempt to lump the
         configurations (given by index) in the order provided, and return a
-        reduced set of :math:`k(T,P)` values. 
+        reduced set of :math:`k(T,P)` values. If `sparse` is ``True``, only
+        the slowest eigenmodes of a sparse master equation matrix are
+        computed, which avoids storing and diagonalizing the dense master
+        equation matrix; this is the ``'sparse chemically-significant
+        eigenvalues'`` method. The collision matrices of the network are
+        still dense, so the memory they use is not reduced.
         """
         import rmgpy.pdep.cse as cse
         logging.debug('Applying chemically-significant eigenvalues method at {0:g} K, {1:g} bar...'.format(self.T, self.P))
-        self.K, self.p0 = cse.applyChemicallySignificantEigenvaluesMethod(self, lumpingOrder)
+        self.K, self.p0 = cse.applyChemicallySignificantEigenvaluesMethod(self, lumpingOrder, sparse)
         return self.K, self.p0
     
     def generateFullMEMatrix(self, products=True):
         import rmgpy.pdep.me as me
         return me.generateFullMEMatrix(self, products=products)
 
-    def solveFullME(self, tlist, x0):
+    def generateSparseMEMatrix(self, products=True, tol=1e-12):
+        import rmgpy.pdep.me as me
+        return me.generateSparseMEMatrix(self, products=products, tol=tol)
+
+    def solveFullME(self, tlist, x0, sparse=False):
         """
         Directly solve the full master equation using a stiff ODE solver. Pass the
         reaction `network` to solve, the temperature `T` in K and pressure `P` in
@@ -785,8 +944,17 @@ class Network:
         densities of states `densStates` in mol/J of each isomer.
         Returns the times in s, population distributions for each isomer, and total
         population profiles for each configuration.
+        If `sparse` is ``True``, the master equation matrix is assembled as a
+        sparse matrix, which is used as the Jacobian of the BDF solver of
+        :func:`scipy.integrate.solve_ivp`, which requires SciPy 1.0 or newer.
         """
         import scipy.integrate
+        import scipy.sparse
+        if sparse:
+            try:
+                from scipy.integrate import solve_ivp
+            except ImportError:
+                raise NetworkError('Solving the full master equation with a sparse matrix requires SciPy 1.0 or newer; use sparse=False instead.')
     
         Elist = self.Elist
         Jlist = self.Jlist
@@ -806,17 +974,26 @@ class Network:
             return K
     
         ymB = self.P / constants.R / self.T
-        M, indices = self.generateFullMEMatrix()
+        if sparse:
+            M, indices = self.generateSparseMEMatrix()
+        else:
+            M, indices = self.generateFullMEMatrix()
         Nrows = M.shape[0]
-        M[:,Nrows-Nreac-Nprod:] *= ymB
         
+        # Scale the reactant and product channel columns
+        scale = numpy.ones(Nrows, numpy.float64)
+        scale[Nrows-Nreac-Nprod:] *= ymB
         if self.ymB is not None:
             if isinstance(self.ymB, float):
                 assert Nreac <= 1
-                M[:,Nrows-Nreac-Nprod:] *= self.ymB
+                scale[Nrows-Nreac-Nprod:] *= self.ymB
             else:
                 for n in range(Nreac+Nprod):
-                    M[:,Nrows-Nreac-Nprod+n] *= self.ymB[n]
+                    scale[Nrows-Nreac-Nprod+n] *= self.ymB[n]
+        if sparse:
+            M = M.tocsr().dot(scipy.sparse.diags(scale, 0)).tocsc()
+        else:
+            M *= scale
         
         # Get equilibrium distributions
         eqDist = numpy.zeros_like(densStates)
@@ -836,26 +1013,35 @@ class Network:
         for i in range(Nreac+Nprod):
             p0[-Nreac-Nprod + i] = x0[i+Nisom]
     
-        # Set up ODEs
-        ode = scipy.integrate.ode(residual, jacobian).set_integrator('vode', method='bdf', with_jacobian=True, atol=1e-16, rtol=1e-8)
-        ode.set_initial_value(p0, 0.0).set_f_params(M).set_jac_params(M)
+        # Set up ODEs and generate solution
+        if sparse:
+            solution = solve_ivp(lambda t, y: M.dot(y), (0.0, tlist[-1]), p0, method='BDF', t_eval=tlist, jac=M, atol=1e-16, rtol=1e-8)
+            if not solution.success:
+                raise NetworkError('Integration of the full master equation failed: {0}'.format(solution.message))
+            t = solution.t
+            ylist = [solution.y[:,m] for m in range(Ntime)]
+        else:
+            ode = scipy.integrate.ode(residual, jacobian).set_integrator('vode', method='bdf', with_jacobian=True, atol=1e-16, rtol=1e-8)
+            ode.set_initial_value(p0, 0.0).set_f_params(M).set_jac_params(M)
+            t = numpy.zeros([Ntime], float)
+            ylist = []
+            for m in range(Ntime):
+                ode.integrate(tlist[m])
+                t[m] = ode.t
+                ylist.append(ode.y.copy())
     
-        # Generate solution
-        t = numpy.zeros([Ntime], float)
         p = numpy.zeros([Ntime, Nisom, Ngrains, NJ], float)
         x = numpy.zeros([Ntime, Nisom+Nreac+Nprod], float)
-        for m in range(Ntime):
-            ode.integrate(tlist[m])
-            t[m] = ode.t
+        for m, y in enumerate(ylist):
             for r in range(Ngrains):
                 for s in range(NJ):
                     for i in range(0, Nisom):
                         index = indices[i,r,s]
                         if index > 0:
-                            p[m,i,r,s] += ode.y[index]
-                            x[m,i] += ode.y[index]
+                            p[m,i,r,s] += y[index]
+                            x[m,i] += y[index]
             for n in range(Nisom, Nisom+Nreac+Nprod):
-                x[m,n] = ode.y[-(Nisom+Nreac+Nprod)+n]
+                x[m,n] = y[-(Nisom+Nreac+Nprod)+n]
     
         return t, p, x
 
@@ -952,3 +1138,31 @@ class Network:
             logging.log(level, '    {0:<48s} {1:12g} kJ/mol'.format(rxn, float(rxn.transitionState.conformer.E0.value_si*0.001)))
         logging.log(level, '========================================================================')
         logging.log(level, '')
+
+################################################################################
+
+# The network and the arguments of the current call to
+# Network.calculateRateCoefficients() with several processes in a worker
+# process
+networkToCalculate = None
+rateCoefficientArguments = None
+
+def initializeWorker(network, arguments):
+    """
+    Set up a worker process of the pool with the `network` and the tuple of
+    the pressures, method and error check `arguments` passed to
+    :meth:`Network.calculateRateCoefficients`. When processes are forked,
+    these are inherited from the parent process instead of being pickled.
+    """
+    global networkToCalculate, rateCoefficientArguments
+    networkToCalculate = network
+    rateCoefficientArguments = arguments
+
+def calculateRateCoefficientsAtTemperature(T):
+    """
+    Return the phenomenological rate coefficients of the network passed to
+    :meth:`Network.calculateRateCoefficients` at the temperature `T` in K and
+    each of its pressures, computed in a worker process.
+    """
+    Plist, method, errorCheck = rateCoefficientArguments
+    return networkToCalculate.calculateRateCoefficientsAtTemperature(T, Plist, method, errorCheck)
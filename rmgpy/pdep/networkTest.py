@@ -32,9 +32,11 @@
 This script contains unit tests of the :mod:`rmgpy.pdep.network` module.
 """
 
+import numpy
+import scipy.integrate
 import unittest
 
-from rmgpy.pdep.network import Network
+from rmgpy.pdep.network import Network, NetworkError
 from rmgpy.pdep.configuration import Configuration
 from rmgpy.transport import TransportData
 from rmgpy.statmech.translation import Translation, IdealGasTranslation
@@ -200,6 +202,119 @@ class TestNetwork(unittest.TestCase):
         """
         self.network.initialize(Tmin=300., Tmax=2000., Pmin=1e3, Pmax=1e7, minimumGrainCount=200, maximumGrainSize=4184.0)
     
+    def test_generateSparseMEMatrix(self):
+        """
+        Test that the Network.generateSparseMEMatrix() method gives the same
+        master equation matrix as Network.generateFullMEMatrix().
+        """
+        self.network.initialize(Tmin=300., Tmax=2000., Pmin=1e3, Pmax=1e7, minimumGrainCount=200, maximumGrainSize=4184.0)
+        self.network.setConditions(1000., 1e5)
+        M, indices = self.network.generateFullMEMatrix()
+        Msparse, sparseIndices = self.network.generateSparseMEMatrix(tol=0.0)
+        self.assertTrue(numpy.array_equal(indices, sparseIndices))
+        self.assertEqual(Msparse.shape, M.shape)
+        self.assertTrue(numpy.allclose(Msparse.toarray(), M, rtol=1e-12, atol=0.0))
+        # The default tolerance drops the negligible collision terms
+        Mbanded, sparseIndices = self.network.generateSparseMEMatrix()
+        self.assertLessEqual(Mbanded.nnz, Msparse.nnz)
+        self.assertTrue(numpy.allclose(Mbanded.toarray(), M, rtol=1e-9, atol=1e-11 * numpy.max(numpy.abs(M))))
+    
+    def test_applyChemicallySignificantEigenvaluesMethodSparse(self):
+        """
+        Test that the Network.applyChemicallySignificantEigenvaluesMethod()
+        method gives the same :math:`k(T,P)` values with the sparse master
+        equation matrix as with the dense one.
+        """
+        self.network.initialize(Tmin=300., Tmax=2000., Pmin=1e3, Pmax=1e7, minimumGrainCount=200, maximumGrainSize=4184.0)
+        for T, P in [(1000., 1e5), (1500., 1e4), (2000., 1e6)]:
+            self.network.setConditions(T, P)
+            K, p0 = self.network.applyChemicallySignificantEigenvaluesMethod()
+            Ksparse, p0sparse = self.network.applyChemicallySignificantEigenvaluesMethod(sparse=True)
+            self.assertNotEqual(K[1,0], 0)
+            self.assertTrue(numpy.allclose(Ksparse, K, rtol=1e-4, atol=0.0))
+        
+        # The sparse matrix is used by the sparse method
+        Tlist = numpy.array([1000., 1500.])
+        Plist = numpy.array([1e4, 1e6])
+        K = self.network.calculateRateCoefficients(Tlist, Plist, 'chemically-significant eigenvalues')
+        Ksparse = self.network.calculateRateCoefficients(Tlist, Plist, 'sparse chemically-significant eigenvalues')
+        self.assertTrue(numpy.allclose(Ksparse, K, rtol=1e-4, atol=0.0))
+    
+    @unittest.skipIf(not hasattr(scipy.integrate, 'solve_ivp'), 'solve_ivp requires SciPy 1.0 or newer')
+    def test_solveFullMESparse(self):
+        """
+        Test that the Network.solveFullME() method gives the same population
+        profiles with the sparse master equation matrix as with the dense one.
+        """
+        self.network.initialize(Tmin=300., Tmax=2000., Pmin=1e3, Pmax=1e7, minimumGrainCount=200, maximumGrainSize=4184.0)
+        self.network.setConditions(1500., 1e5)
+        tlist = numpy.logspace(-8, 0, 9)
+        x0 = numpy.array([1.0, 0.0])
+        t, p, x = self.network.solveFullME(tlist, x0)
+        tsparse, psparse, xsparse = self.network.solveFullME(tlist, x0, sparse=True)
+        self.assertTrue(numpy.allclose(tsparse, t, rtol=1e-12, atol=0.0))
+        self.assertTrue(numpy.allclose(xsparse, x, rtol=1e-4, atol=1e-8))
+    
+    def test_setConditions(self):
+        """
+        Test that the Network.setConditions() method scales the collision
+        kernels by the collision frequency at each pressure, and reuses the
+        quantities computed at a temperature it returns to if the temperature
+        cache is enabled.
+        """
+        self.network.initialize(Tmin=300., Tmax=2000., Pmin=1e3, Pmax=1e7, minimumGrainCount=200, maximumGrainSize=4184.0)
+        self.network.setConditions(1000., 1e5)
+        self.assertEqual(len(self.network.temperatureCache), 0)
+        self.network.temperatureCacheSize = 4
+        self.network.setConditions(1200., 1e5)
+        self.network.setConditions(1000., 1e5)
+        collKernel = self.network.collKernel
+        Kij = self.network.Kij
+        self.network.setConditions(1000., 1e6)
+        self.assertTrue(self.network.collKernel is collKernel)
+        isomer = self.network.isomers[0]
+        Mcoll = isomer.calculateCollisionFrequency(1000., 1e6, self.network.bathGas) * isomer.generateCollisionMatrix(1000., self.network.densStates[0,:,:], self.network.Elist, self.network.Jlist)
+        self.assertTrue(numpy.allclose(self.network.Mcoll[0,:,:,:,:], Mcoll, rtol=1e-12, atol=0.0))
+        
+        self.network.setConditions(1500., 1e6)
+        self.assertFalse(self.network.Kij is Kij)
+        self.network.setConditions(1000., 1e6)
+        self.assertTrue(self.network.Kij is Kij)
+        self.assertTrue(self.network.collKernel is collKernel)
+        self.assertTrue(numpy.allclose(self.network.Mcoll[0,:,:,:,:], Mcoll, rtol=1e-12, atol=0.0))
+        self.assertEqual(self.network.temperatureCache.keys(), [1200., 1500., 1000.])
+    
+    def test_checkRateCoefficients(self):
+        """
+        Test that the Network.checkRateCoefficients() method rejects negative
+        rate coefficients and those that do not satisfy equilibrium.
+        """
+        network = Network(
+            label = 'n-butanol',
+            isomers = [Configuration(self.nC4H10O)],
+            reactants = [Configuration(self.nC4H8, self.H2O)],
+            products = [],
+            pathReactions = [self.reaction],
+            bathGas = {self.N2: 1.0},
+        )
+        network.eqRatios = numpy.array([2.0, 1.0])
+        
+        network.K = numpy.array([[-1.0, 2.0], [1.0, -2.0]])
+        K = network.K.copy()
+        network.checkRateCoefficients(K, 1000., 1e5)
+        self.assertTrue(numpy.array_equal(K, network.K))
+        
+        network.K = numpy.array([[1.0, -2.0], [-1.0, 2.0]])
+        K = network.K.copy()
+        network.checkRateCoefficients(K, 1000., 1e5, errorCheck=False)
+        self.assertTrue(numpy.array_equal(K, network.K))
+        network.checkRateCoefficients(K, 1000., 1e5)
+        self.assertTrue(numpy.all(K == 0))
+        self.assertTrue(numpy.all(network.K == 0))
+        
+        network.K = numpy.array([[-1.0, 20.0], [1.0, -20.0]])
+        self.assertRaises(NetworkError, network.checkRateCoefficients, network.K.copy(), 1000., 1e5)
+    
 ################################################################################
 
 if __name__ == '__main__':
@@ -641,6 +641,8 @@ class Reaction:
         """
         Decrease the pre-exponential factor (A) by the diffusion factor
         to account for the diffusion limit at the specified temperature.
+        The kinetics are replaced by a modified copy rather than changed in
+        place.
         """
         if not diffusionLimiter.enabled:
             return
@@ -654,6 +656,7 @@ class Reaction:
         # calculate diffusion factor
         diffusionFactor = k / self.kinetics.getRateCoefficient(T, P=0)
         # update preexponential factor
+        self.kinetics = deepcopy(self.kinetics)
         self.kinetics.A = self.kinetics.A * diffusionFactor
         # Add a comment to self.kinetics.comment
         self.kinetics.comment.append(
@@ -669,6 +672,9 @@ class Reaction:
         of using Evans Polanyi with an exothermic reaction.
         If `forcePositive` is True, then all reactions
         are forced to have a non-negative barrier.
+        Arrhenius kinetics are replaced by a modified copy rather than changed
+        in place, so that values computed from the old kinetics, e.g. the rate
+        coefficients cached by the reaction systems, are not reused.
         """
         cython.declare(H0=cython.double, H298=cython.double, Ea=cython.double)
         H298 = self.getEnthalpyOfReaction(298)
@@ -683,10 +689,12 @@ class Reaction:
         if isinstance(self.kinetics, Arrhenius):
             Ea = self.kinetics.Ea.value_si
             if H0 > 0 and Ea < H0:
+                self.kinetics = deepcopy(self.kinetics)
                 self.kinetics.Ea.value_si = H0
                 self.kinetics.comment += "\nEa raised from {0:.1f} to {1:.1f} kJ/mol to match endothermicity of reaction.".format(Ea/1000,H0/1000)
                 logging.info("For reaction {2!s}, Ea raised from {0:.1f} to {1:.1f} kJ/mol to match endothermicity of reaction.".format(Ea/1000, H0/1000, self))
         if forcePositive and isinstance(self.kinetics, Arrhenius) and self.kinetics.Ea.value_si < 0:
+            self.kinetics = deepcopy(self.kinetics)
             self.kinetics.comment += "\nEa raised from {0:.1f} to 0 kJ/mol.".format(self.kinetics.Ea.value_si/1000)
             logging.info("For reaction {1!s} Ea raised from {0:.1f} to 0 kJ/mol.".format(self.kinetics.Ea.value_si/1000, self))
             self.kinetics.Ea.value_si = 0
@@ -393,6 +393,27 @@ class TestReaction(unittest.TestCase):
         for T in Tlist:
             self.assertAlmostEqual(self.reaction.getRateCoefficient(T, P) / self.reaction.kinetics.getRateCoefficient(T), 1.0, 6)
     
+    def testFixBarrierHeight(self):
+        """
+        Test that Reaction.fixBarrierHeight() raises a negative barrier by
+        replacing the kinetics rather than changing them in place.
+        """
+        for spec in self.reaction2.reactants + self.reaction2.products:
+            spec.thermo.E0 = (0.0, 'kJ/mol')
+        kinetics = Arrhenius(
+            A = (2.65e12, 'cm^3/(mol*s)'),
+            n = 0.0,
+            Ea = (-5.0, 'kJ/mol'),
+            T0 = (1, 'K'),
+        )
+        self.reaction2.kinetics = kinetics
+        self.reaction2.fixBarrierHeight()
+        self.assertIs(self.reaction2.kinetics, kinetics)
+        self.reaction2.fixBarrierHeight(forcePositive=True)
+        self.assertIsNot(self.reaction2.kinetics, kinetics)
+        self.assertEqual(self.reaction2.kinetics.Ea.value_si, 0.0)
+        self.assertAlmostEqual(kinetics.Ea.value_si, -5000.0, 6)
+
     def testGenerateReverseRateCoefficient(self):
         """
         Test the Reaction.generateReverseRateCoefficient() method.
@@ -39,6 +39,7 @@ from rmgpy.quantity import Quantity
 from rmgpy.solver.base import TerminationTime, TerminationConversion
 from rmgpy.solver.simple import SimpleReactor
 from rmgpy.solver.liquid import LiquidReactor
+from rmgpy.solver.snapshot import SNAPSHOT_POLICIES
 
 from model import CoreEdgeReactionModel
 
@@ -209,11 +210,20 @@ def liquidReactor(temperature,
     system = LiquidReactor(T, initialConcentrations, termination, sensitiveSpecies, sensitivityThreshold,constantSpecies)
     rmg.reactionSystems.append(system)
     
-def simulator(atol, rtol, sens_atol=1e-6, sens_rtol=1e-4):
+def simulator(atol, rtol, sens_atol=1e-6, sens_rtol=1e-4, sensitivityMethod='forward', snapshotPolicy='all', snapshotInterval=10):
+    if sensitivityMethod not in ('forward', 'adjoint'):
+        raise InputError("sensitivityMethod should be 'forward' or 'adjoint', not '{0}'".format(sensitivityMethod))
+    if snapshotPolicy not in SNAPSHOT_POLICIES:
+        raise InputError("snapshotPolicy should be one of {0}, not '{1}'".format(', '.join(["'{0}'".format(policy) for policy in SNAPSHOT_POLICIES]), snapshotPolicy))
+    if not isinstance(snapshotInterval, int) or snapshotInterval < 1:
+        raise InputError("snapshotInterval should be a positive integer, not {0!r}".format(snapshotInterval))
     rmg.absoluteTolerance = atol
     rmg.relativeTolerance = rtol
     rmg.sensitivityAbsoluteTolerance = sens_atol
     rmg.sensitivityRelativeTolerance = sens_rtol
+    rmg.sensitivityMethod = sensitivityMethod
+    rmg.snapshotPolicy = snapshotPolicy
+    rmg.snapshotInterval = snapshotInterval
     
 def solvation(solvent):
     # If solvation module in input file, set the RMG solvent variable
@@ -264,6 +274,8 @@ def pressureDependence(
                        minimumNumberOfGrains = 0,
                        interpolation = None,
                        maximumAtoms=None,
+                       processes=1,
+                       incrementalTolerance=0.0,
                        ):
 
     from rmgpy.cantherm.pdep import PressureDependenceJob
@@ -302,11 +314,17 @@ def pressureDependence(
     # Process maximum atoms
     rmg.pressureDependence.maximumAtoms = maximumAtoms
     
+    # Process the number of worker processes used for the temperatures of each network
+    rmg.pressureDependence.processes = processes
+    
+    # Process the tolerance of incremental network updates
+    rmg.pressureDependence.incrementalTolerance = incrementalTolerance
+    
     rmg.pressureDependence.activeJRotor = True
     rmg.pressureDependence.activeKRotor = True
     rmg.pressureDependence.rmgmode = True
 
-def options(units='si', saveRestartPeriod=None, generateOutputHTML=False, generatePlots=False, saveSimulationProfiles=False, verboseComments=False, saveEdgeSpecies=False):
+def options(units='si', saveRestartPeriod=None, generateOutputHTML=False, generatePlots=False, saveSimulationProfiles=False, verboseComments=False, saveEdgeSpecies=False, thermoCache=None, reactionBackend='scoop', processes=None, parallelSimulations=False, parallelNetworks=False):
     rmg.units = units
     rmg.saveRestartPeriod = Quantity(saveRestartPeriod) if saveRestartPeriod else None
     rmg.generateOutputHTML = generateOutputHTML 
@@ -314,6 +332,11 @@ def options(units='si', saveRestartPeriod=None, generateOutputHTML=False, genera
     rmg.saveSimulationProfiles = saveSimulationProfiles
     rmg.verboseComments = verboseComments
     rmg.saveEdgeSpecies = saveEdgeSpecies
+    rmg.thermoCache = thermoCache
+    rmg.reactionBackend = reactionBackend
+    rmg.processes = processes
+    rmg.parallelSimulations = parallelSimulations
+    rmg.parallelNetworks = parallelNetworks
 
 def generatedSpeciesConstraints(**kwargs):
 
@@ -538,6 +561,9 @@ def saveInputFile(path, rmg):
     f.write('    rtol = {0:g},\n'.format(rmg.relativeTolerance))
     f.write('    sens_atol = {0:g},\n'.format(rmg.sensitivityAbsoluteTolerance))
     f.write('    sens_rtol = {0:g},\n'.format(rmg.sensitivityRelativeTolerance))
+    f.write('    sensitivityMethod = \'{0}\',\n'.format(rmg.sensitivityMethod))
+    f.write('    snapshotPolicy = \'{0}\',\n'.format(rmg.snapshotPolicy))
+    f.write('    snapshotInterval = {0:d},\n'.format(rmg.snapshotInterval))
     f.write(')\n\n')
 
     # Model
@@ -571,6 +597,8 @@ def saveInputFile(path, rmg):
         ))
         f.write('    interpolation = {0},\n'.format(rmg.pressureDependence.interpolationModel))     
         f.write('    maximumAtoms = {0}, \n'.format(rmg.pressureDependence.maximumAtoms))
+        f.write('    processes = {0}, \n'.format(rmg.pressureDependence.processes))
+        f.write('    incrementalTolerance = {0:g}, \n'.format(rmg.pressureDependence.incrementalTolerance))
         f.write(')\n\n')
     
     # Quantum Mechanics
@@ -610,6 +638,13 @@ def saveInputFile(path, rmg):
     f.write('    saveSimulationProfiles = {0},\n'.format(rmg.saveSimulationProfiles))
     f.write('    saveEdgeSpecies = {0},\n'.format(rmg.saveEdgeSpecies))
     f.write('    verboseComments = {0},\n'.format(rmg.verboseComments))
+    if rmg.thermoCache:
+        f.write('    thermoCache = {0!r},\n'.format(rmg.thermoCache))
+    f.write('    reactionBackend = {0!r},\n'.format(rmg.reactionBackend))
+    if rmg.processes:
+        f.write('    processes = {0:d},\n'.format(rmg.processes))
+    f.write('    parallelSimulations = {0},\n'.format(rmg.parallelSimulations))
+    f.write('    parallelNetworks = {0},\n'.format(rmg.parallelNetworks))
     f.write(')\n\n')
     
     f.close()
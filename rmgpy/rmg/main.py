@@ -42,12 +42,14 @@ import numpy
 import csv
 import gc
 import copy
+import sqlite3
 
 from rmgpy.constraints import failsSpeciesConstraints
 from rmgpy.molecule import Molecule
 from rmgpy.solver.base import TerminationTime, TerminationConversion
 from rmgpy.solver.simple import SimpleReactor
 from rmgpy.data.rmg import RMGDatabase
+from rmgpy.data.thermocache import ThermoCache, getThermoDatabaseHash
 from rmgpy.data.base import ForbiddenStructureException, DatabaseError
 from rmgpy.data.kinetics.library import KineticsLibrary, LibraryReaction
 from rmgpy.data.kinetics.family import KineticsFamily, TemplateReaction
@@ -56,12 +58,15 @@ from rmgpy.kinetics.diffusionLimited import diffusionLimiter
 
 from model import Species, CoreEdgeReactionModel
 from pdep import PDepNetwork
+from react import setBackend, closePool
+from simulation import simulateAll
 import rmgpy.util as util
 
 from rmgpy.chemkin import ChemkinWriter
 from rmgpy.rmg.output import OutputHTMLWriter
 from rmgpy.rmg.listener import SimulationProfileWriter, SimulationProfilePlotter
 from rmgpy.restart import RestartWriter
+from rmgpy.solver.snapshot import SnapshotFile
 from rmgpy.qm.main import QMDatabaseWriter
 from rmgpy.stats import ExecutionStatsWriter
 from rmgpy.tools.sensitivity import plotSensitivity
@@ -97,6 +102,9 @@ class RMG(util.Subject):
     `relativeTolerance`                 The relative tolerance used in the ODE/DAE solver
     `sensitivityAbsoluteTolerance`      The absolute tolerance used in the ODE/DAE solver for the sensitivities
     `sensitivityRelativeTolerance`      The relative tolerance used in the ODE/DAE solver for the sensitivities
+    `sensitivityMethod`                 The method used for sensitivity analysis: 'forward' or 'adjoint'
+    `snapshotPolicy`                    The solver steps kept in the simulation profiles: 'all', 'off', 'decimated' or 'logarithmic'
+    `snapshotInterval`                  The steps between kept steps ('decimated') or kept steps per decade of time ('logarithmic')
     `fluxToleranceKeepInEdge`           The relative species flux below which species are discarded from the edge
     `fluxToleranceMoveToCore`           The relative species flux above which species are moved from the edge to the core
     `fluxToleranceInterrupt`            The relative species flux above which the simulation will halt
@@ -120,6 +128,12 @@ class RMG(util.Subject):
     `generatePlots`                     ``True`` to generate plots of the job execution statistics after each iteration, ``False`` otherwise
     `verboseComments`                   ``True`` to keep the verbose comments for database estimates, ``False`` otherwise
     `saveEdgeSpecies`                   ``True`` to save chemkin and HTML files of the edge species, ``False`` otherwise
+    `thermoCache`                       The path to a persistent thermo cache file shared between jobs, or ``None`` for no cache
+    `databaseCache`                     The directory compiled databases are stored in and loaded from, or ``None`` (the default) to always load the database files
+    `reactionBackend`                   The backend used to distribute reaction generation: ``'serial'``, ``'scoop'`` or ``'pool'``
+    `processes`                         The number of worker processes of the ``'pool'`` reaction generation backend, of the parallel simulations and of the parallel network updates, or ``None`` for one per CPU
+    `parallelSimulations`               ``True`` to simulate all the reaction systems at the same time in a pool of worker processes, ``False`` otherwise
+    `parallelNetworks`                  ``True`` to compute the :math:`k(T,P)` values of the modified pressure-dependent networks at the same time in a pool of worker processes, ``False`` otherwise
     `pressureDependence`                Whether to process unimolecular (pressure-dependent) reaction networks
     `quantumMechanics`                  Whether to apply quantum mechanical calculations instead of group additivity to certain molecular types.
     `wallTime`                          The maximum amount of CPU time in seconds to expend on this job; used to stop gracefully so we can still get profiling information
@@ -163,6 +177,9 @@ class RMG(util.Subject):
         self.relativeTolerance = 1.0e-4
         self.sensitivityAbsoluteTolerance = 1.0e-6
         self.sensitivityRelativeTolerance = 1.0e-4
+        self.sensitivityMethod = 'forward'
+        self.snapshotPolicy = 'all'
+        self.snapshotInterval = 10
         self.maximumEdgeSpecies = 1000000
         self.minCoreSizeForPrune = 50
         self.minSpeciesExistIterationsForPrune = 2
@@ -183,6 +200,12 @@ class RMG(util.Subject):
         self.saveSimulationProfiles = None
         self.verboseComments = None
         self.saveEdgeSpecies = None
+        self.thermoCache = None
+        self.databaseCache = None
+        self.reactionBackend = 'scoop'
+        self.processes = None
+        self.parallelSimulations = False
+        self.parallelNetworks = False
         self.pressureDependence = None
         self.quantumMechanics = None
         self.speciesConstraints = {}
@@ -298,11 +321,18 @@ class RMG(util.Subject):
             kineticsDepositories = self.kineticsDepositories,
             #frequenciesLibraries = self.statmechLibraries,
             depository = False, # Don't bother loading the depository information, as we don't use it
+            cacheDirectory = self.databaseCache,
         )
         
         #check libraries
         self.checkLibraries()
         
+        if self.thermoCache:
+            try:
+                self.database.thermo.cache = ThermoCache(self.thermoCache, getThermoDatabaseHash(self.database.thermo))
+            except sqlite3.Error, e:
+                logging.warning('Could not open thermo cache {0}, so it will not be used: {1}'.format(self.thermoCache, e))
+        
         #set global variable solvent
         if self.solvent:
             global solvent
@@ -343,6 +373,9 @@ class RMG(util.Subject):
         except KeyError:
             restart = False
 
+        if 'database_cache' in kwargs:
+            self.databaseCache = kwargs['database_cache']
+
         if restart:
             if not os.path.exists(os.path.join(self.outputDirectory,'restart.pkl')):
                 logging.error("Could not find restart file (restart.pkl). Please run without --restart option.")
@@ -353,6 +386,13 @@ class RMG(util.Subject):
 
         # Check input file 
         self.checkInput()
+
+        for index, reactionSystem in enumerate(self.reactionSystems):
+            reactionSystem.sensitivityMethod = self.sensitivityMethod
+            reactionSystem.snapshotPolicy = self.snapshotPolicy
+            reactionSystem.snapshotInterval = self.snapshotInterval
+            # Keep the snapshots of the last simulation in the output directory
+            reactionSystem.snapshots = SnapshotFile(os.path.join(self.outputDirectory, 'solver', 'snapshots_{0:d}.csv'.format(index+1)), self.snapshotPolicy, self.snapshotInterval)
     
         # See if memory profiling package is available
         try:
@@ -371,6 +411,17 @@ class RMG(util.Subject):
 
         # Load databases
         self.loadDatabase()
+
+        # Set up the reaction generation backend; command-line arguments take
+        # precedence over the input file
+        if kwargs.get('reaction_backend'):
+            self.reactionBackend = kwargs['reaction_backend']
+        if kwargs.get('processes'):
+            self.processes = kwargs['processes']
+        setBackend(self.reactionBackend, self.processes)
+        logging.info('Using the {0} backend for reaction generation'.format(self.reactionBackend))
+        self.reactionModel.parallelNetworks = self.parallelNetworks
+        self.reactionModel.processes = self.processes
         
         # Do all liquid-phase startup things:
         if self.solvent:
@@ -403,6 +454,8 @@ class RMG(util.Subject):
         # Initialize reaction model
         if restart:
             self.loadRestartFile(os.path.join(self.outputDirectory,'restart.pkl'))
+            self.reactionModel.parallelNetworks = self.parallelNetworks
+            self.reactionModel.processes = self.processes
         else:
     
             # Seed mechanisms: add species and reactions from seed mechanism
@@ -555,30 +608,29 @@ class RMG(util.Subject):
             objectsToEnlarge = []
             allTerminated = True
             numCoreSpecies = len(self.reactionModel.core.species)
-            for index, reactionSystem in enumerate(self.reactionSystems):
-                
-                # Conduct simulation
-                logging.info('Conducting simulation of reaction system %s...' % (index+1))
-                prune = True
-                if numCoreSpecies < self.minCoreSizeForPrune:
-                    # Turn pruning off if we haven't reached minimum core size.
-                    prune = False
-                    
-                terminated, obj = reactionSystem.simulate(
-                    coreSpecies = self.reactionModel.core.species,
-                    coreReactions = self.reactionModel.core.reactions,
-                    edgeSpecies = self.reactionModel.edge.species,
-                    edgeReactions = self.reactionModel.edge.reactions,
-                    toleranceKeepInEdge = self.fluxToleranceKeepInEdge if prune else 0,
-                    toleranceMoveToCore = self.fluxToleranceMoveToCore,
-                    toleranceInterruptSimulation = self.fluxToleranceInterrupt if prune else self.fluxToleranceMoveToCore,
-                    pdepNetworks = self.reactionModel.networkList,
-                    absoluteTolerance = self.absoluteTolerance,
-                    relativeTolerance = self.relativeTolerance,
-                    filterReactions=False,
-                )
+
+            # Turn pruning off if we haven't reached minimum core size.
+            prune = numCoreSpecies >= self.minCoreSizeForPrune
+
+            # Conduct simulations
+            results = simulateAll(self.reactionSystems,
+                parallel = self.parallelSimulations,
+                processes = self.processes,
+                coreSpecies = self.reactionModel.core.species,
+                coreReactions = self.reactionModel.core.reactions,
+                edgeSpecies = self.reactionModel.edge.species,
+                edgeReactions = self.reactionModel.edge.reactions,
+                toleranceKeepInEdge = self.fluxToleranceKeepInEdge if prune else 0,
+                toleranceMoveToCore = self.fluxToleranceMoveToCore,
+                toleranceInterruptSimulation = self.fluxToleranceInterrupt if prune else self.fluxToleranceMoveToCore,
+                pdepNetworks = self.reactionModel.networkList,
+                absoluteTolerance = self.absoluteTolerance,
+                relativeTolerance = self.relativeTolerance,
+                filterReactions=False,
+            )
+
+            for reactionSystem, (terminated, obj) in zip(self.reactionSystems, results):
                 allTerminated = allTerminated and terminated
-                logging.info('')
                 
                 # If simulation is invalid, note which species should be added to
                 # the core
@@ -619,21 +671,23 @@ class RMG(util.Subject):
                     # If there were no new core species, it means the pdep network needs be updated through another enlarge core step
                     if self.filterReactions:
                         # Run a raw simulation to get updated reaction system threshold values
-                        for index, reactionSystem in enumerate(self.reactionSystems):
-                            # Run with the same conditions as with pruning off
-                            reactionSystem.simulate(
-                                coreSpecies = self.reactionModel.core.species,
-                                coreReactions = self.reactionModel.core.reactions,
-                                edgeSpecies = [],
-                                edgeReactions = [],
-                                toleranceKeepInEdge = 0,
-                                toleranceMoveToCore = self.fluxToleranceMoveToCore,
-                                toleranceInterruptSimulation = self.fluxToleranceMoveToCore,
-                                pdepNetworks = self.reactionModel.networkList,
-                                absoluteTolerance = self.absoluteTolerance,
-                                relativeTolerance = self.relativeTolerance,
-                                filterReactions=True,
-                            )
+                        # Run with the same conditions as with pruning off
+                        simulateAll(self.reactionSystems,
+                            parallel = self.parallelSimulations,
+                            processes = self.processes,
+                            coreSpecies = self.reactionModel.core.species,
+                            coreReactions = self.reactionModel.core.reactions,
+                            edgeSpecies = [],
+                            edgeReactions = [],
+                            toleranceKeepInEdge = 0,
+                            toleranceMoveToCore = self.fluxToleranceMoveToCore,
+                            toleranceInterruptSimulation = self.fluxToleranceMoveToCore,
+                            pdepNetworks = self.reactionModel.networkList,
+                            absoluteTolerance = self.absoluteTolerance,
+                            relativeTolerance = self.relativeTolerance,
+                            filterReactions=True,
+                        )
+                        for reactionSystem in self.reactionSystems:
                             self.updateReactionThresholdAndReactFlags(
                                 rxnSysUnimolecularThreshold = reactionSystem.unimolecularThreshold,
                                 rxnSysBimolecularThreshold = reactionSystem.bimolecularThreshold)
@@ -789,6 +843,10 @@ class RMG(util.Subject):
         
         self.execTime.append(time.time() - self.initializationTime)
 
+        # Write the new thermo estimates to the thermo cache
+        if self.database.thermo.cache is not None:
+            self.database.thermo.cache.flush()
+
         # Notify registered listeners:
         self.notify()
             
@@ -796,6 +854,12 @@ class RMG(util.Subject):
         """
         Complete the model generation.
         """
+        # Stop any reaction generation worker processes
+        closePool()
+
+        if self.database.thermo.cache is not None:
+            self.database.thermo.cache.close()
+
         # Log end timestamp
         logging.info('')
         logging.info('RMG execution terminated at ' + time.asctime())
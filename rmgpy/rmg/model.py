@@ -48,15 +48,16 @@ from rmgpy.pdep import SingleExponentialDown
 from rmgpy.statmech import  Conformer
 
 from rmgpy.data.base import ForbiddenStructureException
+from rmgpy.molecule.inchi import InchiException
 from rmgpy.data.kinetics.depository import DepositoryReaction
 from rmgpy.data.kinetics.family import KineticsFamily, TemplateReaction
 from rmgpy.data.kinetics.library import KineticsLibrary, LibraryReaction
 
 from rmgpy.kinetics import KineticsData
 import rmgpy.data.rmg
-from .react import react
+from .react import reactAll
 
-from pdep import PDepReaction, PDepNetwork
+from pdep import PDepReaction, PDepNetwork, updateNetworks
 # generateThermoDataFromQM under the Species class imports the qm package
 
 ################################################################################
@@ -99,7 +100,10 @@ class Species(rmgpy.species.Species):
         Generates thermo data, first checking Libraries, then using either QM or Database.
         
         If quantumMechanics is not None, it is asked to calculate the thermo.
-        Failing that, the database is used.
+        Failing that, the database is used. Otherwise, if the thermo database
+        has a persistent thermo cache, it is checked before the database, and
+        new estimates are stored in it. Final NASA thermo in the cache, loaded
+        from a Chemkin file, is used as it is by :meth:`processFinalThermoData`.
         
         The database generates the thermo data for each structure (resonance isomer),
         picks that with lowest H298 value.
@@ -110,10 +114,45 @@ class Species(rmgpy.species.Species):
         Result stored in `self.thermo` and returned.
         """
 
-        thermo0 = database.thermo.getThermoData(self, trainingSet=None, quantumMechanics=quantumMechanics)
+        thermoCache = database.thermo.cache
+        thermo0 = None
+        if thermoCache is not None and quantumMechanics is None:
+            # Check the persistent thermo cache first
+            cached = thermoCache.get(self, Species.solventName)
+            if cached is not None and not (cached[2] and thermoClass is not NASA):
+                thermo0, molecule, final = cached
+                # Put the resonance isomer the estimate was made for first,
+                # as the thermo database would have done
+                for index, mol in enumerate(self.molecule):
+                    if mol.isIsomorphic(molecule):
+                        self.molecule.insert(0, self.molecule.pop(index))
+                        break
+                if final:
+                    return self.processFinalThermoData(thermo0)
+
+        if thermo0 is None:
+            thermo0 = database.thermo.getThermoData(self, trainingSet=None, quantumMechanics=quantumMechanics)
+            if thermoCache is not None and quantumMechanics is None:
+                thermoCache.put(self, thermo0, Species.solventName)
         
         return self.processThermoData(database, thermo0, thermoClass)
 
+    def processFinalThermoData(self, thermo):
+        """
+        Set the final NASA `thermo` of the species, which already includes any
+        solvation correction, as `self.thermo` and set `E0` from it.
+        
+        Resulting thermo is stored (`self.thermo`) and returned.
+        """
+        wilhoit = thermo.toWilhoit(Cp0=self.calculateCp0(), CpInf=self.calculateCpInf())
+        if self.conformer is None:
+            self.conformer = Conformer()
+        self.conformer.E0 = wilhoit.E0
+        self.thermo = thermo
+        if self.thermo.E0 is None:
+            self.thermo.E0 = wilhoit.E0
+        return self.thermo
+
     def processThermoData(self, database, thermo0, thermoClass=NASA):
         """
         Converts via Wilhoit into required `thermoClass` and sets `E0`.
@@ -357,8 +396,26 @@ class CoreEdgeReactionModel:
     `networkList`              A list of pressure-dependent reaction networks (:class:`Network` objects)
     `networkCount`             A counter for the number of pressure-dependent networks created
     `indexSpeciesDict`         A dictionary with a unique index pointing to the species objects
+    `speciesDict`              A dictionary of the species lists indexed by canonical species key
+    `speciesKeyDict`           A dictionary of the canonical keys each species is stored under
+    `reactionDict`             A dictionary of the lists of reactions indexed by family and reactant keys
+    `reactionKeyDict`          A dictionary of the lists of reactions indexed by :func:`generateReactionIndexKey`
+    `libraryReactionDict`      A dictionary of the lists of seed mechanism and library reactions indexed by their reactant and product indices, in either direction
+    `coreSpeciesSet`           A set of the species in the core, for fast membership checks
+    `coreReactionSet`          A set of the reactions in the core, for fast membership checks
+    `edgeSpeciesSet`           A set of the species in the edge, for fast membership checks
+    `edgeReactionSet`          A set of the reactions in the edge, for fast membership checks
+    `duplicateIndex`           A :class:`DuplicateReactionIndex` of the core and edge reactions, for marking Chemkin duplicates
+    `parallelNetworks`         ``True`` to compute the :math:`k(T,P)` values of the invalid pressure-dependent networks in a pool of worker processes, ``False`` otherwise
+    `processes`                The number of worker processes used to update the networks, or ``None`` for one per CPU
     =========================  ==============================================================
 
+    The membership sets and the duplicate index are kept in sync with the core and edge lists by the
+    :meth:`addSpeciesToCore`, :meth:`addSpeciesToEdge`,
+    :meth:`removeSpeciesFromEdge`, :meth:`addReactionToCore` and
+    :meth:`addReactionToEdge` methods. If the core or edge lists are modified
+    directly, call :meth:`initializeMembershipSets` afterwards.
+
 
     """
 
@@ -378,8 +435,10 @@ class CoreEdgeReactionModel:
         self.networkList = []
         self.networkCount = 0
         self.speciesDict = {}
+        self.speciesKeyDict = {}
         self.reactionDict = {}
-        self.speciesCache = [None for i in range(4)]
+        self.reactionKeyDict = {}
+        self.libraryReactionDict = {}
         self.speciesCounter = 0
         self.reactionCounter = 0
         self.newSpeciesList = []
@@ -389,8 +448,24 @@ class CoreEdgeReactionModel:
         self.pressureDependence = None
         self.quantumMechanics = None
         self.verboseComments = False
+        self.parallelNetworks = False
+        self.processes = None
         self.kineticsEstimator = 'group additivity'
         self.indexSpeciesDict = {}
+        self.initializeMembershipSets()
+
+    def initializeMembershipSets(self):
+        """
+        (Re)build the sets of core and edge species and reactions from the
+        current contents of the core and edge lists. These sets mirror the
+        lists and are used for constant-time membership checks.
+        """
+        from rmgpy.chemkin import DuplicateReactionIndex
+        self.coreSpeciesSet = set(self.core.species)
+        self.coreReactionSet = set(self.core.reactions)
+        self.edgeSpeciesSet = set(self.edge.species)
+        self.edgeReactionSet = set(self.edge.reactions)
+        self.duplicateIndex = DuplicateReactionIndex(self.core.reactions + self.edge.reactions)
 
     def checkForExistingSpecies(self, molecule):
         """
@@ -417,29 +492,53 @@ class CoreEdgeReactionModel:
             aromaticIsomers = generateAromaticResonanceIsomers(molecule)
             obj.molecule.extend(aromaticIsomers)
 
-        # First check cache and return if species is found
-        for i, spec in enumerate(self.speciesCache):
-            if spec is not None:
-                for mol in spec.molecule:
-                    if obj.isIsomorphic(mol):
-                        self.speciesCache.pop(i)
-                        self.speciesCache.insert(0, spec)
-                        return True, spec
-
-        # Return an existing species if a match is found
-        formula = molecule.getFormula()
-        try:
-            speciesList = self.speciesDict[formula]
-        except KeyError:
-            return False, None
-        for spec in speciesList:
-            if spec.isIsomorphic(obj):
-                self.speciesCache.pop()
-                self.speciesCache.insert(0, spec)
-                return True, spec
+        # Existing species are stored under the canonical keys of all of
+        # their resonance isomers, so only the species sharing a key with
+        # the structure need to be checked; the isomorphism check guards
+        # against key collisions
+        if isinstance(obj, Species):
+            keys = set([generateSpeciesKey(mol) for mol in obj.molecule])
+        else:
+            keys = [generateSpeciesKey(obj)]
+        checked = set()
+        for key in keys:
+            for spec in self.speciesDict.get(key, []):
+                if spec in checked:
+                    continue
+                checked.add(spec)
+                if spec.isIsomorphic(obj):
+                    return True, spec
         # At this point we can conclude that the structure does not exist
         return False, None
 
+    def registerSpecies(self, spec):
+        """
+        Store the species `spec` in the species dictionary under the
+        canonical keys of each of its resonance isomers, so that it can be
+        found by :meth:`checkForExistingSpecies`.
+        """
+        keys = []
+        for mol in spec.molecule:
+            key = generateSpeciesKey(mol)
+            if key not in keys:
+                keys.append(key)
+        for key in keys:
+            if key in self.speciesDict:
+                self.speciesDict[key].append(spec)
+            else:
+                self.speciesDict[key] = [spec]
+        self.speciesKeyDict[spec] = keys
+
+    def unregisterSpecies(self, spec):
+        """
+        Remove the species `spec` from the species dictionary.
+        """
+        for key in self.speciesKeyDict.pop(spec, []):
+            speciesList = self.speciesDict[key]
+            speciesList.remove(spec)
+            if not speciesList:
+                del self.speciesDict[key]
+
     def makeNewSpecies(self, object, label='', reactive=True, checkForExisting=True):
         """
         Formally create a new species from the specified `object`, which can be
@@ -488,11 +587,7 @@ class CoreEdgeReactionModel:
         spec.molecularWeight = Quantity(spec.molecule[0].getMolecularWeight()*1000.,"amu")
         # spec.generateTransportData(database)
         spec.generateEnergyTransferModel()
-        formula = molecule.getFormula()
-        if formula in self.speciesDict:
-            self.speciesDict[formula].append(spec)
-        else:
-            self.speciesDict[formula] = [spec]
+        self.registerSpecies(spec)
 
 
         # Since the species is new, add it to the list of new species
@@ -509,17 +604,17 @@ class CoreEdgeReactionModel:
         family as `rxn`. Returns :data:`True` or :data:`False` and the matched
         reaction (if found).
 
-        First, a shortlist of reaction is retrieved that have the same reaction keys
-        as the parameter reaction.
-
-        Next, the reaction ID containing an identifier (e.g. label) of the reactants
-        and products is compared between the parameter reaction and the each of the
-        reactions in the shortlist. If a match is found, the discovered reaction is 
-        returned.
+        First, the reactions of the same family with the same reactants and
+        products are looked up in the reaction index by the key of
+        :func:`generateReactionIndexKey`, as well as those with the reactants
+        and products swapped if the family is its own reverse. If one of them
+        has identical species references, it is returned.
 
-        If a match is not yet found, the Library (seed mechs, reaction libs)
-        in the reaction database are iterated over to check if a reaction was overlooked
-        (a reaction with a different "family" key as the parameter reaction).
+        If a match is not yet found, the reactions of the other seed
+        mechanisms and reaction libraries with the same reactants and
+        products, in either direction, are looked up in the library reaction
+        index to check if a reaction was overlooked (a reaction with a
+        different "family" key as the parameter reaction).
 
         """
 
@@ -534,57 +629,27 @@ class CoreEdgeReactionModel:
             return True, None
         
         familyObj = getFamilyLibraryObject(rxn.family)
-        shortlist = self.searchRetrieveReactions(rxn)
+        family, reactants, products = generateReactionIndexKey(rxn)
 
-        # Now use short-list to check for matches. All should be in same forward direction.
+        # Check the reactions of the same family in the forward direction, and
+        # in the reverse direction if the family is its own reverse
+        for rxn0 in self.reactionKeyDict.get((family, reactants, products), []):
+            if areIdenticalSpeciesReferences(rxn, rxn0):
+                # If the reaction comes from a kinetics library, then we can retain duplicates if they are marked
+                if not (isinstance(familyObj, KineticsLibrary) and rxn.duplicate):
+                    return True, rxn0
 
-        # Make sure the reactant and product lists are sorted before performing the check
-        rxn_id = generateReactionId(rxn)
-
-        for rxn0 in shortlist:
-            rxn_id0 = generateReactionId(rxn0)
-
-            if (rxn_id == rxn_id0):
-                if isinstance(familyObj, KineticsLibrary):
-                    # If the reaction comes from a kinetics library, then we can retain duplicates if they are marked
-                    if areIdenticalSpeciesReferences(rxn, rxn0):
-                        if not rxn.duplicate:
-                            return True, rxn0
-                else:
-                    if areIdenticalSpeciesReferences(rxn, rxn0):
-                        return True, rxn0
-            
-            if isinstance(familyObj, KineticsFamily) and familyObj.ownReverse:
-                if (rxn_id == rxn_id0[::-1]):
-                    if areIdenticalSpeciesReferences(rxn, rxn0):
-                        return True, rxn0
+        if isinstance(familyObj, KineticsFamily) and familyObj.ownReverse:
+            for rxn0 in self.reactionKeyDict.get((family, products, reactants), []):
+                if areIdenticalSpeciesReferences(rxn, rxn0):
+                    return True, rxn0
 
         # Now check seed mechanisms
         # We want to check for duplicates in *other* seed mechanisms, but allow
         # duplicated *within* the same seed mechanism
-        _, r1_fwd, r2_fwd = generateReactionKey(rxn)
-        _, r1_rev, r2_rev = generateReactionKey(rxn, useProducts=True)
-
-        for library in self.reactionDict:
-            libObj = getFamilyLibraryObject(library)
-            if isinstance(libObj, KineticsLibrary) and library != rxn.family:
-
-                # First check seed short-list in forward direction                
-                shortlist = self.retrieve(library, r1_fwd, r2_fwd)
-                
-                for rxn0 in shortlist:
-                    rxn_id0 = generateReactionId(rxn0)
-                    if (rxn_id == rxn_id0) or (rxn_id == rxn_id0[::-1]):
-                        if areIdenticalSpeciesReferences(rxn, rxn0):
-                            return True, rxn0
-                
-                # Now get the seed short-list of the reverse reaction
-
-                shortlist = self.retrieve(library, r1_rev, r2_rev)
-                
-                for rxn0 in shortlist:
-                    if areIdenticalSpeciesReferences(rxn, rxn0):
-                        return True, rxn0
+        for rxn0 in self.libraryReactionDict.get(tuple(sorted([reactants, products])), []):
+            if rxn0.family != rxn.family and areIdenticalSpeciesReferences(rxn, rxn0):
+                return True, rxn0
 
         return False, None
 
@@ -711,7 +776,7 @@ class CoreEdgeReactionModel:
                 
                 newSpecies = newObject
 
-                objectWasInEdge = newSpecies in self.edge.species
+                objectWasInEdge = newSpecies in self.edgeSpeciesSet
                 
                 if not newSpecies.reactive:
                     logging.info('NOT generating reactions for unreactive species {0}'.format(newSpecies))
@@ -764,23 +829,14 @@ class CoreEdgeReactionModel:
         else:
             # We are reacting the edge
 
-            for i in xrange(numOldCoreSpecies):
-                if unimolecularReact[i]:
-                    # Find reactions involving the species that are unimolecular
-                    reactions = list(react(self.core.species[i].copy(deep=True)))
-                    reactions = [self.inflate(reaction) for reaction in reactions]
-                    self.processNewReactions(reactions, self.core.species[i], None)
-
-            for i in xrange(numOldCoreSpecies):
-                for j in xrange(i,numOldCoreSpecies):
-                    # Find reactions involving the species that are bimolecular
-                    # This includes a species reacting with itself (if its own concentration is high enough)
-                    
-                    if bimolecularReact[i,j]:
-                        reactions = list(react(self.core.species[i].copy(deep=True), [self.core.species[j]]))
-                        # Consider the latest added core species as the 'new' species
-                        reactions = [self.inflate(reaction) for reaction in reactions]
-                        self.processNewReactions(reactions, self.core.species[j], None)
+            # Find the unimolecular reactions of the flagged species and the
+            # bimolecular reactions of the flagged pairs of species, including
+            # a species reacting with itself (if its own concentration is high
+            # enough), in a single batch; the reactions of each pair are
+            # processed with the latest added core species as the 'new' species
+            for species, reactions in reactAll(self.core.species[:numOldCoreSpecies], unimolecularReact, bimolecularReact):
+                reactions = [self.inflate(reaction) for reaction in reactions]
+                self.processNewReactions(reactions, species, None)
 
         ################################################################
         # Begin processing the new species and reactions
@@ -837,16 +893,15 @@ class CoreEdgeReactionModel:
         # Check new core and edge reactions for Chemkin duplicates
         # The same duplicate reaction gets brought into the core
         # at the same time, so there is no danger in checking all of the edge.
+        # Each new reaction is only checked against the reactions with the
+        # same duplicate key that are old or have already been checked
         newCoreReactions = self.core.reactions[numOldCoreReactions:]
         newEdgeReactions = self.edge.reactions[numOldEdgeReactions:]
-        checkedReactions = self.core.reactions[:numOldCoreReactions] + self.edge.reactions[:numOldEdgeReactions]
+        uncheckedReactions = set(newCoreReactions + newEdgeReactions)
         from rmgpy.chemkin import markDuplicateReaction
-        for rxn in newCoreReactions:
-            markDuplicateReaction(rxn, checkedReactions)
-            checkedReactions.append(rxn)
-        for rxn in newEdgeReactions:
-            markDuplicateReaction(rxn, checkedReactions)
-            checkedReactions.append(rxn)
+        for rxn in newCoreReactions + newEdgeReactions:
+            uncheckedReactions.discard(rxn)
+            markDuplicateReaction(rxn, [rxn2 for rxn2 in self.duplicateIndex.getCandidates(rxn) if rxn2 not in uncheckedReactions])
         self.printEnlargeSummary(
             newCoreSpecies=self.core.species[numOldCoreSpecies:],
             newCoreReactions=self.core.reactions[numOldCoreReactions:],
@@ -877,14 +932,14 @@ class CoreEdgeReactionModel:
                 # Add the reactant and product species to the edge if necessary
                 # At the same time, check if all reactants and products are in the core
                 for spec in rxn.reactants:
-                    if spec not in self.core.species:
+                    if spec not in self.coreSpeciesSet:
                         allSpeciesInCore = False
-                        if spec not in self.edge.species:
+                        if spec not in self.edgeSpeciesSet:
                             self.addSpeciesToEdge(spec)
                 for spec in rxn.products:
-                    if spec not in self.core.species:
+                    if spec not in self.coreSpeciesSet:
                         allSpeciesInCore = False
-                        if spec not in self.edge.species:
+                        if spec not in self.edgeSpeciesSet:
                             self.addSpeciesToEdge(spec)
             
             isomerAtoms = sum([len(spec.molecule[0].atoms) for spec in rxn.reactants])
@@ -932,10 +987,13 @@ class CoreEdgeReactionModel:
                 if isinstance(rxn, LibraryReaction):
                     # If reaction came from a reaction library, omit it from the core and edge so that it does 
                     # not get double-counted with the pdep network
-                    if rxn in self.core.reactions:
+                    if rxn in self.coreReactionSet:
                         self.core.reactions.remove(rxn)
-                    if rxn in self.edge.reactions:
+                        self.coreReactionSet.remove(rxn)
+                    if rxn in self.edgeReactionSet:
                         self.edge.reactions.remove(rxn)
+                        self.edgeReactionSet.remove(rxn)
+                    self.duplicateIndex.remove(rxn)
 
     def generateKinetics(self, reaction):
         """
@@ -1091,26 +1149,28 @@ class CoreEdgeReactionModel:
         If this are any such reactions, they are returned in a list.
         """
 
-        assert spec not in self.core.species, "Tried to add species {0} to core, but it's already there".format(spec.label)
+        assert spec not in self.coreSpeciesSet, "Tried to add species {0} to core, but it's already there".format(spec.label)
 
         # Add the species to the core
         self.core.species.append(spec)
+        self.coreSpeciesSet.add(spec)
         
         rxnList = []
-        if spec in self.edge.species:
+        if spec in self.edgeSpeciesSet:
 
             # If species was in edge, remove it
             logging.debug("Removing species {0} from edge.".format(spec))
             self.edge.species.remove(spec)
+            self.edgeSpeciesSet.remove(spec)
 
             # Search edge for reactions that now contain only core species;
             # these belong in the model core and will be moved there
             for rxn in self.edge.reactions:
                 allCore = True
                 for reactant in rxn.reactants:
-                    if reactant not in self.core.species: allCore = False
+                    if reactant not in self.coreSpeciesSet: allCore = False
                 for product in rxn.products:
-                    if product not in self.core.species: allCore = False
+                    if product not in self.coreSpeciesSet: allCore = False
                 if allCore: rxnList.append(rxn)
 
             # Move any identified reactions to the core
@@ -1124,6 +1184,7 @@ class CoreEdgeReactionModel:
         Add a species `spec` to the reaction model edge.
         """
         self.edge.species.append(spec)
+        self.edgeSpeciesSet.add(spec)
 
     def prune(self, reactionSystems, toleranceKeepInEdge, maximumEdgeSpecies, minSpeciesExistIterationsForPrune):
         """
@@ -1131,16 +1192,19 @@ class CoreEdgeReactionModel:
         the list of `reactionSystems`.
         """
 
-        ineligibleSpecies = []     # A list of the species which are not eligible for pruning, for any reason
+        ineligibleSpecies = set()     # The species which are not eligible for pruning, for any reason
 
         numCoreSpecies = len(self.core.species)
         numEdgeSpecies = len(self.edge.species)
 
+        # Map each edge species to its position in the edge species list
+        edgeSpeciesIndex = dict([(spec, index) for index, spec in enumerate(self.edge.species)])
+
         # All edge species that have not existed for more than two enlarge
         # iterations are ineligible for pruning
         for spec in self.edge.species:
             if numCoreSpecies - spec.coreSizeAtCreation <= minSpeciesExistIterationsForPrune:
-                ineligibleSpecies.append(spec)
+                ineligibleSpecies.add(spec)
 
         # Get the maximum species rates (and network leak rates)
         # across all reaction systems
@@ -1159,13 +1223,11 @@ class CoreEdgeReactionModel:
                 # This is to ensure we have an overestimate of that species flux
                 ratios = network.getLeakBranchingRatios(reactionSystem.T.value_si,reactionSystem.P.value_si)
                 for spec, frac in ratios.iteritems():
-                    if spec in self.edge.species:
-                        index = self.edge.species.index(spec)
+                    if spec in edgeSpeciesIndex:
+                        index = edgeSpeciesIndex[spec]
                         maxEdgeSpeciesRateRatios[index] += frac * rateRatio
                 # Mark any species that is explored in any partial network as ineligible for pruning
-                for spec in network.explored:
-                    if spec not in ineligibleSpecies:
-                        ineligibleSpecies.append(spec)
+                ineligibleSpecies.update(network.explored)
 
         # Sort the edge species rates by index
         indices = numpy.argsort(maxEdgeSpeciesRateRatios)
@@ -1228,14 +1290,19 @@ class CoreEdgeReactionModel:
 
         # remove the species
         self.edge.species.remove(spec)
+        self.edgeSpeciesSet.discard(spec)
         # identify any reactions it's involved in
         rxnList = []
         for rxn in self.edge.reactions:
             if spec in rxn.reactants or spec in rxn.products:
                 rxnList.append(rxn)
         # remove those reactions
-        for rxn in rxnList:
-            self.edge.reactions.remove(rxn)
+        if rxnList:
+            rxnSet = set(rxnList)
+            self.edge.reactions[:] = [rxn for rxn in self.edge.reactions if rxn not in rxnSet]
+            self.edgeReactionSet.difference_update(rxnSet)
+            for rxn in rxnList:
+                self.duplicateIndex.remove(rxn)
         
         # Remove the species from any unirxn networks it is in
         if self.pressureDependence:
@@ -1275,13 +1342,10 @@ class CoreEdgeReactionModel:
                             tempRxnDeleteList.append(templateReaction)
                     for tempRxnToBeDeleted in tempRxnDeleteList:
                         self.reactionDict[family][reactant1][reactant2].remove(tempRxnToBeDeleted)
+                        self.unregisterReaction(tempRxnToBeDeleted)
 
         # remove from the global list of species, to free memory
-        formula = spec.molecule[0].getFormula()
-        self.speciesDict[formula].remove(spec)
-        if spec in self.speciesCache:
-            self.speciesCache.remove(spec)
-            self.speciesCache.append(None)
+        self.unregisterSpecies(spec)
 
     def addReactionToCore(self, rxn):
         """
@@ -1290,10 +1354,13 @@ class CoreEdgeReactionModel:
         ensure it is supposed to be a core reaction (i.e. all of its reactants
         AND all of its products are in the list of core species).
         """
-        if rxn not in self.core.reactions:
+        if rxn not in self.coreReactionSet:
             self.core.reactions.append(rxn)
-        if rxn in self.edge.reactions:
+            self.coreReactionSet.add(rxn)
+            self.duplicateIndex.add(rxn)
+        if rxn in self.edgeReactionSet:
             self.edge.reactions.remove(rxn)
+            self.edgeReactionSet.remove(rxn)
         
     def addReactionToEdge(self, rxn):
         """
@@ -1304,6 +1371,8 @@ class CoreEdgeReactionModel:
         edge).
         """
         self.edge.reactions.append(rxn)
+        self.edgeReactionSet.add(rxn)
+        self.duplicateIndex.add(rxn)
 
     def getModelSize(self):
         """
@@ -1494,7 +1563,7 @@ class CoreEdgeReactionModel:
                     self.outputReactionList.append(rxn)
                     
                     for species in rxn.reactants + rxn.products:
-                        if species not in self.core.species and species not in self.outputSpeciesList:
+                        if species not in self.coreSpeciesSet and species not in self.outputSpeciesList:
                             self.outputSpeciesList.append(species)
                             
 
@@ -1607,11 +1676,13 @@ class CoreEdgeReactionModel:
         
         # Iterate over all the networks, updating the invalid ones as necessary
         # self = reactionModel object
-        updatedNetworks = []
-        for network in self.networkList:
-            if not network.valid:
-                network.update(self, database, self.pressureDependence)
-                updatedNetworks.append(network)
+        updatedNetworks = [network for network in self.networkList if not network.valid]
+        updateNetworks(updatedNetworks, self, database, self.pressureDependence, parallel=self.parallelNetworks, processes=self.processes)
+        if getattr(self.pressureDependence, 'incrementalTolerance', 0.0):
+            logging.info('Unimolecular reaction networks have had {0:d} full and {1:d} incremental updates'.format(
+                sum([network.fullUpdates for network in self.networkList]),
+                sum([network.incrementalUpdates for network in self.networkList]),
+            ))
             
         # PDepReaction objects generated from partial networks are irreversible
         # However, it makes more sense to have reversible reactions in the core
@@ -1621,10 +1692,9 @@ class CoreEdgeReactionModel:
         # that they skip over is not itself in the core
         for network in updatedNetworks:
             for reaction in network.netReactions:
-                try:
-                    index = self.core.reactions.index(reaction)
-                except ValueError:
+                if reaction not in self.coreReactionSet:
                     continue
+                index = self.core.reactions.index(reaction)
                 for index2, reaction2 in enumerate(self.core.reactions):
                     if isinstance(reaction2, PDepReaction) and reaction.reactants == reaction2.products and reaction.products == reaction2.reactants:
                         # We've found the PDepReaction for the reverse direction
@@ -1646,9 +1716,13 @@ class CoreEdgeReactionModel:
                         # Delete the PDepReaction that we aren't keeping
                         if keepFirst:
                             self.core.reactions.remove(reaction2)
+                            self.coreReactionSet.remove(reaction2)
+                            self.duplicateIndex.remove(reaction2)
                             reaction.reversible = True
                         else:
                             self.core.reactions.remove(reaction)
+                            self.coreReactionSet.remove(reaction)
+                            self.duplicateIndex.remove(reaction)
                             self.core.reactions.remove(reaction2)
                             self.core.reactions.insert(index, reaction2)
                             reaction2.reversible = True
@@ -1693,6 +1767,10 @@ class CoreEdgeReactionModel:
 
         Finally, the reaction is inserted as the first element in the 
         list.
+
+        The reaction is also inserted in the reaction index used by
+        :meth:`checkForExistingReaction`, and in the library reaction index
+        if it comes from a seed mechanism or reaction library.
         """
 
         key_family, key1, key2 = generateReactionKey(rxn)
@@ -1710,6 +1788,23 @@ class CoreEdgeReactionModel:
         # store this reaction at the top of the relevant short-list
         self.reactionDict[key_family][key1][key2].insert(0, rxn)
 
+        key = generateReactionIndexKey(rxn)
+        self.reactionKeyDict.setdefault(key, []).insert(0, rxn)
+        if isinstance(getFamilyLibraryObject(key_family), KineticsLibrary):
+            self.libraryReactionDict.setdefault(tuple(sorted(key[1:])), []).insert(0, rxn)
+
+    def unregisterReaction(self, rxn):
+        """
+        Remove the reaction from the reaction index and the library reaction
+        index.
+        """
+        key = generateReactionIndexKey(rxn)
+        for dictionary, dictKey in [(self.reactionKeyDict, key), (self.libraryReactionDict, tuple(sorted(key[1:])))]:
+            if dictKey in dictionary:
+                dictionary[dictKey] = [rxn0 for rxn0 in dictionary[dictKey] if rxn0 is not rxn]
+                if not dictionary[dictKey]:
+                    del dictionary[dictKey]
+
 
     def searchRetrieveReactions(self, rxn):
         """
@@ -1831,6 +1926,21 @@ def generateReactionKey(rxn, useProducts=False):
 
     return (key_family, key1, key2)
 
+def generateReactionIndexKey(rxn):
+    """
+    Returns a tuple of the reaction family (or library) the reaction belongs
+    to, the sorted tuple of the indices of its reactants and the sorted tuple
+    of the indices of its products.
+
+    The key of the reverse reaction has the reactant and product tuples
+    swapped.
+    """
+
+    reactants = tuple(sorted([reactant.index for reactant in rxn.reactants]))
+    products = tuple(sorted([product.index for product in rxn.products]))
+
+    return (rxn.family, reactants, products)
+
 def generateReactionId(rxn):
     """
     Returns a tuple of the reactions reactant and product
@@ -1879,6 +1989,31 @@ def getKey(spc):
 
     return spc.label
 
+def generateSpeciesKey(molecule):
+    """
+    Returns a tuple of the molecular formula and the augmented InChI of
+    `molecule` that can serve as a canonical key in a dictionary of species.
+
+    Isomorphic molecules always have the same key, so the key can be used to
+    shortlist candidates before an isomorphism check. If the augmented InChI
+    cannot be generated, only the formula is used.
+
+    The key is stored in the `props` of `molecule` the first time it is
+    generated, so the molecule must not be modified afterwards.
+    """
+
+    key = molecule.props.get('speciesKey')
+    if key is None:
+        formula = molecule.getFormula()
+        try:
+            aug_inchi = molecule.toAugmentedInChI()
+        except InchiException, e:
+            logging.debug('Could not generate the augmented InChI of {0}: {1}'.format(molecule, e))
+            aug_inchi = None
+        key = (formula, aug_inchi)
+        molecule.props['speciesKey'] = key
+    return key
+
 def areIdenticalSpeciesReferences(rxn1, rxn2):
     """
     Checks if the references of the reactants and products of the two reactions
@@ -34,6 +34,7 @@ import unittest
 from rmgpy import settings
 from rmgpy.data.rmg import RMGDatabase, database
 from rmgpy.rmg.main import RMG
+from rmgpy.molecule import Molecule
 from rmgpy.reaction import Reaction
 
 from rmgpy.rmg.model import *
@@ -144,6 +145,48 @@ class TestCoreEdgeReactionModel(unittest.TestCase):
         self.assertEquals(len(cerm.speciesDict), len(spcs) - 1)    
         self.assertEquals(len(cerm.indexSpeciesDict), len(spcs) - 1)
 
+    def testCheckForExistingSpecies(self):
+        """
+        Test that CoreEdgeReactionModel.checkForExistingSpecies finds existing species by canonical key.
+        """
+        cerm = CoreEdgeReactionModel()
+
+        spcs = [Species().fromSMILES('C=C[CH2]'),
+                Species().fromSMILES('CCC'),
+                Species().fromSMILES('C=CC')]
+        for spc in spcs:
+            cerm.makeNewSpecies(spc)
+
+        # The allyl radical is found from either of its resonance isomers
+        found, spec = cerm.checkForExistingSpecies(Molecule().fromSMILES('[CH2]C=C'))
+        self.assertTrue(found)
+        self.assertTrue(spec.isIsomorphic(spcs[0]))
+
+        # Cyclopropane has the same formula as propene, but is a different species
+        found, spec = cerm.checkForExistingSpecies(Molecule().fromSMILES('C1CC1'))
+        self.assertFalse(found)
+        self.assertIsNone(spec)
+
+        # Unregistered species are no longer found
+        found, spec = cerm.checkForExistingSpecies(Molecule().fromSMILES('CCC'))
+        self.assertTrue(found)
+        cerm.unregisterSpecies(spec)
+        found, spec = cerm.checkForExistingSpecies(Molecule().fromSMILES('CCC'))
+        self.assertFalse(found)
+
+    def testGenerateSpeciesKey(self):
+        """
+        Test that generateSpeciesKey gives the same key for resonance isomers
+        and stores it on the molecule.
+        """
+        molecule = Molecule().fromSMILES('C=C[CH2]')
+        key = generateSpeciesKey(molecule)
+        self.assertEqual(key, generateSpeciesKey(Molecule().fromSMILES('[CH2]C=C')))
+        self.assertEqual(key[0], 'C3H5')
+        self.assertIsNotNone(key[1])
+        self.assertTrue(molecule.props['speciesKey'] is key)
+        self.assertTrue(generateSpeciesKey(molecule) is key)
+
     def testMakeNewReaction(self):
         """
         Test that CoreEdgeReactionModel.makeNewReaction method correctly works.
@@ -175,6 +218,33 @@ class TestCoreEdgeReactionModel(unittest.TestCase):
 
         self.assertEquals(counter, 3)
 
+    def testCheckForExistingReaction(self):
+        """
+        Test that CoreEdgeReactionModel.checkForExistingReaction finds the
+        registered reactions in either direction for families that are their
+        own reverse.
+        """
+        spcA = Species().fromSMILES('[OH]')
+        spcs = [Species().fromSMILES('CC'), Species().fromSMILES('[CH3]')]
+
+        cerm = CoreEdgeReactionModel()
+        for rxn in react(spcA, spcs):
+            cerm.makeNewReaction(rxn)
+        self.assertEquals(sum([len(rxnList) for rxnList in cerm.reactionKeyDict.itervalues()]), 3)
+
+        for rxn in react(spcA, spcs):
+            rxn0, isNew = cerm.makeNewReaction(rxn)
+            self.assertFalse(isNew)
+            found, rxn1 = cerm.checkForExistingReaction(rxn0)
+            self.assertTrue(found)
+            self.assertIs(rxn1, rxn0)
+
+            # H_Abstraction is its own reverse
+            reverse = TemplateReaction(reactants=rxn0.products[:], products=rxn0.reactants[:], family=rxn0.family)
+            found, rxn1 = cerm.checkForExistingReaction(reverse)
+            self.assertTrue(found)
+            self.assertIs(rxn1, rxn0)
+
     def testInflate(self):
         """
         Test that CoreEdgeReactionModel.inflate method correctly works.
@@ -201,6 +271,43 @@ class TestCoreEdgeReactionModel(unittest.TestCase):
         for rxn in rxns:
             self.assertTrue(rxn.isBalanced())
 
+    def testMembershipSets(self):
+        """
+        Test that the core and edge membership sets stay in sync with the core and edge lists.
+        """
+        spcA = Species().fromSMILES('[OH]')
+        spcB = Species().fromSMILES('CC')
+        spcC = Species().fromSMILES('[CH3]')
+
+        cerm = CoreEdgeReactionModel()
+        cerm.addSpeciesToCore(spcA)
+        cerm.addSpeciesToEdge(spcB)
+        cerm.addSpeciesToEdge(spcC)
+
+        rxn = Reaction(reactants=[spcA, spcB], products=[spcC])
+        cerm.addReactionToEdge(rxn)
+
+        self.assertEqual(cerm.coreSpeciesSet, set([spcA]))
+        self.assertEqual(cerm.edgeSpeciesSet, set([spcB, spcC]))
+        self.assertEqual(cerm.edgeReactionSet, set([rxn]))
+
+        # Moving the last species to the core moves the reaction to the core too
+        cerm.addSpeciesToCore(spcB)
+        cerm.addSpeciesToCore(spcC)
+        self.assertEqual(cerm.coreSpeciesSet, set(cerm.core.species))
+        self.assertEqual(cerm.edgeSpeciesSet, set())
+        self.assertEqual(cerm.coreReactionSet, set([rxn]))
+        self.assertEqual(cerm.edgeReactionSet, set())
+
+        # Removing a species from the edge removes its edge reactions
+        spcD = Species().fromSMILES('C')
+        cerm.addSpeciesToEdge(spcD)
+        rxn2 = Reaction(reactants=[spcA, spcD], products=[spcC])
+        cerm.addReactionToEdge(rxn2)
+        cerm.removeSpeciesFromEdge(spcD)
+        self.assertEqual(cerm.edgeSpeciesSet, set())
+        self.assertEqual(cerm.edgeReactionSet, set())
+        self.assertEqual(cerm.edge.reactions, [])
 
     def tearDown(self):
         """
@@ -34,6 +34,8 @@ functionality to RMG.
 """
 
 import logging
+import multiprocessing
+import numpy
 import os.path
 
 import rmgpy.pdep.network
@@ -116,13 +118,34 @@ class PDepNetwork(rmgpy.pdep.network.Network):
     reactant. Multiple partial networks can have the same source, but networks
     with the same source and any explored isomers must be combined.
 
-    =================== ======================= ================================
-    Attribute           Type                    Description
-    =================== ======================= ================================
-    `source`            ``list``                The isomer or reactant channel that acts as the source
-    `explored`          ``list``                A list of the unimolecular isomers whose reactions have been fully explored
-    =================== ======================= ================================
-
+    ======================== ======================= ================================
+    Attribute                Type                    Description
+    ======================== ======================= ================================
+    `source`                 ``list``                The isomer or reactant channel that acts as the source
+    `explored`               ``list``                A list of the unimolecular isomers whose reactions have been fully explored
+    ------------------------ ----------------------- --------------------------------
+    `solvedPathReactions`    ``list``                The path reactions at the last update of the :math:`k(T,P)` values
+    `solvedConfigurations`   ``tuple``               The species of the isomers, reactant channels and product channels at the last update
+    `solvedRates`            :class:`numpy.ndarray`  The :math:`k(T,P)` values from the source to each of `solvedConfigurations` at the last update
+    `incrementalUpdate`      ``bool``                ``True`` if the next update is incremental, ``False`` if it solves the master equation
+    `incrementalBranching`   ``float``               The largest high-pressure-limit branching to the new product channels of an incremental update
+    `incrementalDeviation`   ``float``               The deviation of the estimated :math:`k(T,P)` values of the last incremental update from the master equation
+    `incrementalError`       ``float``               The total branching to the product channels added incrementally since the master equation was last solved
+    `fullUpdates`            ``int``                 The number of updates that solved the master equation
+    `incrementalUpdates`     ``int``                 The number of incremental updates
+    ======================== ======================= ================================
+
+    If the `incrementalTolerance` of the pressure dependence settings is
+    nonzero, an update that only adds new product channels to the isomers is
+    incremental as long as the high-pressure-limit branching to them, added
+    up since the master equation was last solved, does not exceed it. The
+    :math:`k(T,P)` values to the new product channels are then estimated
+    from those of the last update by :meth:`estimateRateCoefficients`
+    instead of solving the master equation at every temperature and
+    pressure. The estimate is checked against the master equation at the
+    highest temperature and lowest pressure only, where the network is
+    furthest from the high-pressure limit, and the master equation is solved
+    at all of them if it deviates by more than the tolerance.
     """
 
     def __init__(self, index=-1, source=None):
@@ -130,6 +153,16 @@ class PDepNetwork(rmgpy.pdep.network.Network):
         self.index = index
         self.source = source
         self.explored = []
+        
+        self.solvedPathReactions = []
+        self.solvedConfigurations = None
+        self.solvedRates = None
+        self.incrementalUpdate = False
+        self.incrementalBranching = 0.0
+        self.incrementalDeviation = 0.0
+        self.incrementalError = 0.0
+        self.fullUpdates = 0
+        self.incrementalUpdates = 0
     
     def __str__(self):
         return "PDepNetwork #{0}".format(self.index)
@@ -170,6 +203,7 @@ class PDepNetwork(rmgpy.pdep.network.Network):
         self.Fim = None
         self.Gnj = None
         self.E0 = None
+        self.clearTemperatureCache()
         self.Ngrains = 0
         self.NJ = 0
         
@@ -416,7 +450,7 @@ class PDepNetwork(rmgpy.pdep.network.Network):
                 products.append(rxn.reactants)
             elif len(rxn.reactants) > 1 and rxn.reactants not in reactants and rxn.reactants not in products:
                 # We've encountered bimolecular reactants that are not classified
-                if all([reactant in reactionModel.core.species for reactant in rxn.reactants]):
+                if all([reactant in reactionModel.coreSpeciesSet for reactant in rxn.reactants]):
                     # Both reactants are in the core, so treat as reactant channel
                     reactants.append(rxn.reactants)
                 else:
@@ -429,7 +463,7 @@ class PDepNetwork(rmgpy.pdep.network.Network):
                 products.append(rxn.products)
             elif len(rxn.products) > 1 and rxn.products not in reactants and rxn.products not in products:
                 # We've encountered bimolecular products that are not classified
-                if all([product in reactionModel.core.species for product in rxn.products]):
+                if all([product in reactionModel.coreSpeciesSet for product in rxn.products]):
                     # Both products are in the core, so treat as reactant channel
                     reactants.append(rxn.products)
                 else:
@@ -454,9 +488,21 @@ class PDepNetwork(rmgpy.pdep.network.Network):
         Regenerate the :math:`k(T,P)` values for this partial network if the
         network is marked as invalid.
         """
+        if self.prepareUpdate(reactionModel, database, pdepSettings):
+            K, netKinetics, incremental = self.calculateNetKinetics(pdepSettings)
+            self.applyNetKinetics(reactionModel, pdepSettings, K, netKinetics, incremental)
+
+    def prepareUpdate(self, reactionModel, database, pdepSettings):
+        """
+        Prepare the regeneration of the :math:`k(T,P)` values for this partial
+        network by generating the states data of its species, the transition
+        state energies of its path reactions and its collision model. Return
+        ``True`` if the :math:`k(T,P)` values must then be computed by
+        :meth:`calculateNetKinetics`, or ``False`` if the network is valid or
+        has no explored wells.
+        """
         from rmgpy.kinetics import Arrhenius, KineticsData, MultiArrhenius
         from rmgpy.pdep.collision import SingleExponentialDown
-        from rmgpy.pdep.reaction import fitInterpolationModel
         
         # Get the parameters for the pressure dependence calculation
         job = pdepSettings
@@ -465,17 +511,6 @@ class PDepNetwork(rmgpy.pdep.network.Network):
         
         Tmin = job.Tmin.value_si
         Tmax = job.Tmax.value_si
-        Pmin = job.Pmin.value_si
-        Pmax = job.Pmax.value_si
-        Tlist = job.Tlist.value_si
-        Plist = job.Plist.value_si
-        maximumGrainSize = job.maximumGrainSize.value_si if job.maximumGrainSize is not None else 0.0
-        minimumGrainCount = job.minimumGrainCount
-        method = job.method
-        interpolationModel = job.interpolationModel
-        activeJRotor = job.activeJRotor
-        activeKRotor = job.activeKRotor
-        rmgmode = job.rmgmode
         
         # Figure out which configurations are isomers, reactant channels, and product channels
         self.updateConfigurations(reactionModel)
@@ -488,9 +523,9 @@ class PDepNetwork(rmgpy.pdep.network.Network):
                 raise PressureDependenceError('Pressure-dependent kinetics encountered for path reaction {0} in PDepNetwork #{1:d}.'.format(rxn, self.index))
         
         # Do nothing if the network is already valid
-        if self.valid: return
+        if self.valid: return False
         # Do nothing if there are no explored wells
-        if len(self.explored) == 0 and len(self.source) > 1: return
+        if len(self.explored) == 0 and len(self.source) > 1: return False
 
         # Generate states data for unimolecular isomers and reactants if necessary
         for isomer in self.isomers:
@@ -548,15 +583,282 @@ class PDepNetwork(rmgpy.pdep.network.Network):
             self.bathGas[spec] = 1.0 / len(bathGas)
             spec.collisionModel = SingleExponentialDown(alpha0=(4.86,'kcal/mol'))
 
+        # Decide whether the k(T,P) values can be updated without solving the
+        # master equation
+        self.incrementalUpdate = self.checkIncrementalUpdate(pdepSettings)
+        if self.incrementalUpdate:
+            logging.info('Updating PDepNetwork #{0:d} incrementally (branching to new product channels {1:.3g})'.format(self.index, self.incrementalBranching))
+            return True
+
         # Save input file
         if not self.label: self.label = str(self.index)
         job.saveInputFile(os.path.join(outputDirectory, 'pdep', 'network{0:d}_{1:d}.py'.format(self.index, len(self.isomers))))
         
         self.printSummary(level=logging.INFO)
 
+        return True
+
+    def getPathRateCoefficient(self, pathReaction, reactants, T):
+        """
+        Return the high-pressure-limit rate coefficient of `pathReaction` in
+        the direction from the configuration with the species `reactants` at
+        the temperature `T` in K.
+        """
+        k = pathReaction.kinetics.getRateCoefficient(T)
+        if pathReaction.reactants == reactants:
+            return k
+        else:
+            return k / pathReaction.getEquilibriumConstant(T)
+
+    def getPathRateCoefficients(self, T):
+        """
+        Return the array of the high-pressure-limit rate coefficients of the
+        path reactions from each isomer (rows) to each configuration (columns)
+        at the temperature `T` in K, in the order of the isomers, reactant
+        channels and product channels of the network.
+        """
+        configurations = []
+        configurations.extend([isom.species for isom in self.isomers])
+        configurations.extend([reactant.species for reactant in self.reactants])
+        configurations.extend([product.species for product in self.products])
+        Nisom = len(self.isomers)
+        
+        kinf = numpy.zeros((Nisom, len(configurations)), numpy.float64)
+        for rxn in self.pathReactions:
+            reac = configurations.index(rxn.reactants)
+            prod = configurations.index(rxn.products)
+            if reac < Nisom:
+                kinf[reac,prod] += self.getPathRateCoefficient(rxn, rxn.reactants, T)
+            if prod < Nisom:
+                kinf[prod,reac] += self.getPathRateCoefficient(rxn, rxn.products, T)
+        return kinf
+
+    def checkIncrementalUpdate(self, pdepSettings):
+        """
+        Return ``True`` if the :math:`k(T,P)` values of this partial network,
+        which must have been prepared by :meth:`prepareUpdate`, can be updated
+        incrementally from those of the last update, or ``False`` if the
+        master equation must be solved. This requires that the only changes
+        are new path reactions from the isomers to new product channels, that
+        each isomer they start from has a path reaction to another channel
+        than the source, and that the largest high-pressure-limit branching
+        to the new channels, added to `incrementalError`, does not exceed the
+        `incrementalTolerance` of `pdepSettings`.
+        """
+        tolerance = getattr(pdepSettings, 'incrementalTolerance', 0.0)
+        if not tolerance or self.solvedRates is None:
+            return False
+        
+        isomers = [isom.species for isom in self.isomers]
+        reactants = [reactant.species for reactant in self.reactants]
+        products = [product.species for product in self.products]
+        solvedIsomers, solvedReactants, solvedProducts = self.solvedConfigurations
+        if isomers != solvedIsomers or reactants != solvedReactants:
+            return False
+        if not all([product in products for product in solvedProducts]):
+            return False
+        newProducts = [product for product in products if product not in solvedProducts]
+        if len(newProducts) == 0:
+            return False
+        
+        # All of the previous path reactions must remain, and each new one must
+        # connect an isomer to a new product channel
+        solvedIDs = set([id(rxn) for rxn in self.solvedPathReactions])
+        newReactions = [rxn for rxn in self.pathReactions if id(rxn) not in solvedIDs]
+        if len(self.pathReactions) - len(newReactions) != len(self.solvedPathReactions):
+            return False
+        for rxn in newReactions:
+            if not ((rxn.reactants in isomers and rxn.products in newProducts) or
+                    (rxn.products in isomers and rxn.reactants in newProducts)):
+                return False
+        
+        Nisom = len(isomers)
+        configurations = isomers + reactants + products
+        new = [configurations.index(product) for product in newProducts]
+        exits = [m for m in range(Nisom, len(configurations)) if m not in new and configurations[m] != self.source]
+        branching = 0.0
+        for T in pdepSettings.Tlist.value_si:
+            kinf = self.getPathRateCoefficients(T)
+            knew = numpy.sum(kinf[:,new], axis=1)
+            connected = knew > 0
+            if not numpy.any(connected):
+                continue
+            if numpy.any(numpy.sum(kinf[connected,:][:,exits], axis=1) <= 0):
+                return False
+            branching = max(branching, numpy.max(knew[connected] / numpy.sum(kinf[connected,:], axis=1)))
+        if self.incrementalError + branching > tolerance:
+            return False
+        
+        self.incrementalBranching = branching
+        return True
+
+    def estimateRateCoefficients(self, Tlist, Plist):
+        """
+        Return the array of :math:`k(T,P)` values of this partial network at
+        the temperatures `Tlist` in K and pressures `Plist` in Pa for an
+        incremental update, in which only the net reactions from the source
+        are set. The flux from the source through each isomer to the other
+        channels is estimated by dividing the :math:`k(T,P)` value of the last
+        update to each channel between the isomers in proportion to their
+        high-pressure-limit path reaction rates to it. This flux is then
+        divided between the old and new channels by their high-pressure-limit
+        branching ratios from each isomer, so the :math:`k(T,P)` values to
+        the old channels are reduced by as much as those to the new channels
+        add up to, and the total flux from the source is conserved. The
+        :math:`k(T,P)` values to the isomers and reactant channels are kept.
+        """
+        configurations = []
+        configurations.extend([isom.species for isom in self.isomers])
+        configurations.extend([reactant.species for reactant in self.reactants])
+        configurations.extend([product.species for product in self.products])
+        solvedConfigurations = []
+        for solved in self.solvedConfigurations:
+            solvedConfigurations.extend(solved)
+        Nisom = len(self.isomers)
+        Nconf = len(configurations)
+        j = configurations.index(self.source)
+        
+        K = numpy.zeros((len(Tlist),len(Plist),Nconf,Nconf), numpy.float64)
+        new = []
+        for i, configuration in enumerate(configurations):
+            if configuration in solvedConfigurations:
+                K[:,:,i,j] = self.solvedRates[:,:,solvedConfigurations.index(configuration)]
+            else:
+                new.append(i)
+        exits = [m for m in range(Nisom, Nconf) if m not in new and m != j]
+        
+        for t, T in enumerate(Tlist):
+            kinf = self.getPathRateCoefficients(T)
+            kexit = kinf[:,exits]
+            # Divide the k(T,P) value to each channel between the isomers
+            ktotal = numpy.sum(kexit, axis=0)
+            weights = numpy.zeros_like(kexit)
+            weights[:,ktotal > 0] = kexit[:,ktotal > 0] / ktotal[ktotal > 0]
+            flux = numpy.dot(K[t,:,exits,j].T, weights.T)
+            # Branch the flux through each isomer between the old and new
+            # channels
+            kisom = numpy.sum(kexit, axis=1) + numpy.sum(kinf[:,new], axis=1)
+            ratio = numpy.zeros((Nisom,len(new)), numpy.float64)
+            ratio[kisom > 0,:] = kinf[kisom > 0,:][:,new] / kisom[kisom > 0,numpy.newaxis]
+            K[t,:,exits,j] *= (1.0 - numpy.dot(numpy.sum(ratio, axis=1), weights))[:,numpy.newaxis]
+            for index, n in enumerate(new):
+                K[t,:,n,j] = numpy.dot(flux, ratio[:,index])
+        
+        return K
+
+    def getIncrementalDeviation(self, K, Tlist, Plist, method):
+        """
+        Return the deviation of the :math:`k(T,P)` values `K` estimated by
+        :meth:`estimateRateCoefficients` at the temperatures `Tlist` in K and
+        pressures `Plist` in Pa from those computed by solving the master
+        equation with `method` at the highest temperature and lowest pressure,
+        where the high-pressure-limit branching ratios the estimate relies on
+        are least accurate. The deviation is the largest difference in the
+        fraction of the flux from the source to the reactant and product
+        channels that goes to any one of them. The network must have been
+        initialized.
+        """
+        configurations = []
+        configurations.extend([isom.species for isom in self.isomers])
+        configurations.extend([reactant.species for reactant in self.reactants])
+        configurations.extend([product.species for product in self.products])
+        j = configurations.index(self.source)
+        channels = [m for m in range(len(self.isomers), len(configurations)) if m != j]
+        
+        t = numpy.argmax(Tlist)
+        p = numpy.argmin(Plist)
+        Kme = self.calculateRateCoefficientsAtTemperature(Tlist[t], Plist[p:p+1], method)
+        kme = Kme[0,channels,j]
+        kest = K[t,p,channels,j]
+        total = numpy.sum(kme)
+        if total <= 0:
+            return 0.0 if numpy.sum(kest) <= 0 else float('inf')
+        return float(numpy.max(numpy.abs(kest - kme)) / total)
+
+    def calculateNetKinetics(self, pdepSettings):
+        """
+        Compute the :math:`k(T,P)` values of this partial network, which must
+        have been prepared by :meth:`prepareUpdate`, and fit the interpolation
+        model of `pdepSettings` to those of the net reaction from the source to
+        each configuration. Return the array of :math:`k(T,P)` values, the
+        list of the fitted kinetics, with ``None`` for the source, and whether
+        the update was incremental. Only the network itself is modified, so
+        this can be done in a worker process.
+        
+        For an incremental update, the :math:`k(T,P)` values are estimated by
+        :meth:`estimateRateCoefficients`, and only those to the reactant and
+        product channels, which it changes, are fitted, with ``None`` for the
+        isomers. If the estimate deviates from the master equation by more
+        than the `incrementalTolerance` of `pdepSettings`, as given by
+        :meth:`getIncrementalDeviation`, the master equation is solved
+        instead.
+        """
+        job = pdepSettings
+        
+        Tmin = job.Tmin.value_si
+        Tmax = job.Tmax.value_si
+        Pmin = job.Pmin.value_si
+        Pmax = job.Pmax.value_si
+        Tlist = job.Tlist.value_si
+        Plist = job.Plist.value_si
+        maximumGrainSize = job.maximumGrainSize.value_si if job.maximumGrainSize is not None else 0.0
+        minimumGrainCount = job.minimumGrainCount
+        method = job.method
+        activeJRotor = job.activeJRotor
+        activeKRotor = job.activeKRotor
+        rmgmode = job.rmgmode
+
+        configurations = []
+        configurations.extend([isom.species[:] for isom in self.isomers])
+        configurations.extend([reactant.species[:] for reactant in self.reactants])
+        configurations.extend([product.species[:] for product in self.products])
+        j = configurations.index(self.source)
+
         # Calculate the rate coefficients
         self.initialize(Tmin, Tmax, Pmin, Pmax, maximumGrainSize, minimumGrainCount, activeJRotor, activeKRotor, rmgmode)
-        K = self.calculateRateCoefficients(Tlist, Plist, method)
+        incremental = self.incrementalUpdate
+        if incremental:
+            K = self.estimateRateCoefficients(Tlist, Plist)
+            self.incrementalDeviation = self.getIncrementalDeviation(K, Tlist, Plist, method)
+            if self.incrementalDeviation > job.incrementalTolerance:
+                logging.info('Solving the master equation for PDepNetwork #{0:d}, since the incremental k(T,P) values deviate from it by {1:.3g}'.format(self.index, self.incrementalDeviation))
+                incremental = False
+        if incremental:
+            fitted = range(len(self.isomers), K.shape[2])
+        else:
+            K = self.calculateRateCoefficients(Tlist, Plist, method, processes=job.processes)
+            fitted = range(K.shape[2])
+
+        # Fit the net reaction kinetics using the interpolation model
+        netKinetics = []
+        for i in range(K.shape[2]):
+            if i == j or i not in fitted:
+                netKinetics.append(None)
+                continue
+            kdata = K[:,:,i,j].copy()
+            order = len(configurations[j])
+            kdata *= 1e6 ** (order-1)
+            kunits = {1: 's^-1', 2: 'cm^3/(mol*s)', 3: 'cm^6/(mol^2*s)'}[order]
+            netKinetics.append(job.fitInterpolationModel(Tlist, Plist, kdata, kunits))
+
+        # Delete intermediate arrays to conserve memory
+        self.cleanup()
+
+        return K, netKinetics, incremental
+
+    def applyNetKinetics(self, reactionModel, pdepSettings, K, netKinetics, incremental=False):
+        """
+        Set the kinetics of the net reactions of this partial network to the
+        `netKinetics` fitted to the :math:`k(T,P)` values `K` by
+        :meth:`calculateNetKinetics`, whose update was `incremental` or not,
+        creating the net reactions and adding
+        them to the core or edge of `reactionModel` if necessary, and mark the
+        network as valid. The kinetics of the net reactions are kept if they
+        are ``None`` in `netKinetics`. The path reactions, configurations and
+        :math:`k(T,P)` values from the source are saved for the next update.
+        """
+        Tlist = pdepSettings.Tlist.value_si
+        Plist = pdepSettings.Plist.value_si
 
         # Generate PDepReaction objects
         configurations = []
@@ -585,19 +887,14 @@ class PDepNetwork(rmgpy.pdep.network.Network):
 
                     # Place the net reaction in the core or edge if necessary
                     # Note that leak reactions are not placed in the edge
-                    if all([s in reactionModel.core.species for s in netReaction.reactants]) and all([s in reactionModel.core.species for s in netReaction.products]):
+                    if all([s in reactionModel.coreSpeciesSet for s in netReaction.reactants]) and all([s in reactionModel.coreSpeciesSet for s in netReaction.products]):
                         reactionModel.addReactionToCore(netReaction)
                     else:
                         reactionModel.addReactionToEdge(netReaction)
 
-                # Set/update the net reaction kinetics using interpolation model
-                Tdata = job.Tlist.value_si
-                Pdata = job.Plist.value_si
-                kdata = K[:,:,i,j].copy()
-                order = len(netReaction.reactants)
-                kdata *= 1e6 ** (order-1)
-                kunits = {1: 's^-1', 2: 'cm^3/(mol*s)', 3: 'cm^6/(mol^2*s)'}[order]
-                netReaction.kinetics = job.fitInterpolationModel(Tlist, Plist, kdata, kunits)
+                # Set/update the net reaction kinetics
+                if netKinetics[i] is not None:
+                    netReaction.kinetics = netKinetics[i]
 
                 # Check: For each net reaction that has a path reaction, make
                 # sure the k(T,P) values for the net reaction do not exceed
@@ -628,8 +925,89 @@ class PDepNetwork(rmgpy.pdep.network.Network):
                             logging.info('    k(T,P) = {0:9.2e}    k(T) = {1:9.2e}'.format(K[t,p,i,j], kinf))
                         break
         
-        # Delete intermediate arrays to conserve memory
-        self.cleanup()
-        
+        # Save the state of this update, from which the next one may be
+        # incremental
+        self.solvedPathReactions = self.pathReactions[:]
+        self.solvedConfigurations = (
+            [isom.species[:] for isom in self.isomers],
+            [reactant.species[:] for reactant in self.reactants],
+            [product.species[:] for product in self.products],
+        )
+        self.solvedRates = K[:,:,:,j].copy()
+        if incremental:
+            self.incrementalUpdates += 1
+            self.incrementalError += self.incrementalBranching
+        else:
+            self.fullUpdates += 1
+            self.incrementalError = 0.0
+        self.incrementalUpdate = False
+
         # We're done processing this network, so mark it as valid
         self.valid = True
+
+################################################################################
+
+# The networks and the pressure dependence settings of the current call to
+# updateNetworks() in a worker process
+networksToUpdate = None
+networkSettings = None
+
+def updateNetworks(networks, reactionModel, database, pdepSettings, parallel=False, processes=None):
+    """
+    Update each of the invalid partial networks in `networks` in the same way
+    as :meth:`PDepNetwork.update`.
+
+    If `parallel` is ``True``, the networks are prepared in this process, and
+    their :math:`k(T,P)` values are then computed and fitted at the same time
+    in a pool of `processes` worker processes (by default, one per CPU and no
+    more than the number of networks to compute). The workers are started with
+    the networks after they are prepared, which they inherit from this process
+    where processes are forked, and they send back the fitted kinetics, which
+    are applied to the networks of this process in the order of `networks`,
+    so the results are the same as those of serial updates.
+
+    The densities of states computed by the workers are stored in the
+    :data:`densityOfStatesCache` of each worker, which is discarded with the
+    pool when the networks are updated. The cache is therefore only shared
+    between the networks updated by the same worker, and between those
+    updated one after another by serial updates.
+    """
+    if not parallel:
+        for network in networks:
+            network.update(reactionModel, database, pdepSettings)
+        return
+
+    networks = [network for network in networks if network.prepareUpdate(reactionModel, database, pdepSettings)]
+    numProcesses = min(processes or multiprocessing.cpu_count(), len(networks))
+    if numProcesses <= 1:
+        results = [network.calculateNetKinetics(pdepSettings) for network in networks]
+    else:
+        logging.info('Calculating the k(T,P) values of {0:d} networks in {1:d} processes...'.format(len(networks), numProcesses))
+        pool = multiprocessing.Pool(numProcesses, initializer=initializeWorker, initargs=(networks, pdepSettings))
+        try:
+            results = pool.map(calculateNetworkKinetics, range(len(networks)), chunksize=1)
+        finally:
+            pool.close()
+            pool.join()
+
+    for network, (K, netKinetics, incremental) in zip(networks, results):
+        network.applyNetKinetics(reactionModel, pdepSettings, K, netKinetics, incremental)
+
+def initializeWorker(networks, pdepSettings):
+    """
+    Set up a worker process of the pool with the list of prepared `networks`
+    and the pressure dependence settings `pdepSettings` passed to
+    :func:`updateNetworks`. When processes are forked, these are inherited
+    from the parent process instead of being pickled.
+    """
+    global networksToUpdate, networkSettings
+    networksToUpdate = networks
+    networkSettings = pdepSettings
+
+def calculateNetworkKinetics(index):
+    """
+    Compute and fit the :math:`k(T,P)` values of the network at `index` in the
+    list passed to :func:`updateNetworks` in a worker process, and return the
+    results of :meth:`PDepNetwork.calculateNetKinetics`.
+    """
+    return networksToUpdate[index].calculateNetKinetics(networkSettings)
@@ -0,0 +1,330 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+################################################################################
+#
+#   RMG - Reaction Mechanism Generator
+#
+#   Copyright (c) 2002-2010 Prof. William H. Green (whgreen@mit.edu) and the
+#   RMG Team (rmg_dev@mit.edu)
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a
+#   copy of this software and associated documentation files (the 'Software'),
+#   to deal in the Software without restriction, including without limitation
+#   the rights to use, copy, modify, merge, publish, distribute, sublicense,
+#   and/or sell copies of the Software, and to permit persons to whom the
+#   Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included in
+#   all copies or substantial portions of the Software.
+#
+#   THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#   IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#   FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#   AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#   LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#   FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#   DEALINGS IN THE SOFTWARE.
+#
+################################################################################
+
+"""
+This script contains unit tests of the :mod:`rmgpy.rmg.pdep` module.
+"""
+
+import copy
+import numpy
+import os
+import shutil
+import tempfile
+import unittest
+
+from rmgpy.cantherm.pdep import PressureDependenceJob
+from rmgpy.kinetics import Arrhenius
+from rmgpy.pdep import Configuration
+from rmgpy.pdep.collision import SingleExponentialDown
+from rmgpy.reaction import Reaction
+from rmgpy.rmg.model import CoreEdgeReactionModel
+from rmgpy.rmg.pdep import PDepNetwork, updateNetworks
+from rmgpy.species import Species
+from rmgpy.statmech import Conformer, IdealGasTranslation, NonlinearRotor, HarmonicOscillator
+from rmgpy.thermo import ThermoData
+from rmgpy.transport import TransportData
+
+################################################################################
+
+class TestIncrementalUpdate(unittest.TestCase):
+    """
+    Contains unit tests of the incremental updates of :class:`PDepNetwork`
+    objects.
+    """
+
+    def setUp(self):
+        """
+        A function run before each unit test in this class.
+        """
+        self.A, self.B, self.C, self.D, self.E = [Species(label=label) for label in 'ABCDE']
+        self.Tlist = numpy.array([300., 1000.])
+        self.Plist = numpy.array([1e4, 1e5, 1e6])
+        self.job = PressureDependenceJob(network=None, Tlist=(self.Tlist,'K'), Plist=(self.Plist*1e-5,'bar'), incrementalTolerance=0.05)
+
+        self.network = PDepNetwork(index=1, source=[self.A])
+        self.network.explored = [self.A]
+        self.network.pathReactions = [self.makePathReaction([self.A], [self.B, self.C], 1e10)]
+        self.network.isomers = [Configuration(self.A)]
+        self.network.products = [Configuration(self.B, self.C)]
+
+        # The state of the last update, with k(T,P) = 5 s^-1 to B + C
+        self.network.solvedPathReactions = self.network.pathReactions[:]
+        self.network.solvedConfigurations = ([[self.A]], [], [[self.B, self.C]])
+        self.network.solvedRates = numpy.zeros((len(self.Tlist), len(self.Plist), 2))
+        self.network.solvedRates[:,:,1] = 5.0
+
+    def makePathReaction(self, reactants, products, k):
+        """
+        Return a path reaction from `reactants` to `products` with a rate
+        coefficient `k` in s^-1.
+        """
+        return Reaction(reactants=reactants, products=products, kinetics=Arrhenius(A=(k,'s^-1'), n=0, Ea=(0,'kJ/mol'), T0=(1,'K')))
+
+    def addProductChannel(self, k):
+        """
+        Add a path reaction from A to the new product channel D + E with a
+        rate coefficient `k` in s^-1.
+        """
+        self.network.pathReactions.append(self.makePathReaction([self.A], [self.D, self.E], k))
+        self.network.products.append(Configuration(self.D, self.E))
+
+    def test_checkIncrementalUpdate(self):
+        """
+        Test that an update is incremental only if the branching to the new
+        product channels does not exceed the tolerance.
+        """
+        self.assertFalse(self.network.checkIncrementalUpdate(self.job))
+        self.addProductChannel(1e8)
+        self.assertTrue(self.network.checkIncrementalUpdate(self.job))
+        self.assertAlmostEqual(self.network.incrementalBranching, 1e8 / (1e10 + 1e8), 6)
+        self.network.incrementalError = 0.045
+        self.assertFalse(self.network.checkIncrementalUpdate(self.job))
+        self.network.incrementalError = 0.0
+        self.job.incrementalTolerance = 0.0
+        self.assertFalse(self.network.checkIncrementalUpdate(self.job))
+
+    def test_checkIncrementalUpdateNewPath(self):
+        """
+        Test that an update is not incremental if a new path reaction does not
+        connect an isomer to a new product channel.
+        """
+        self.addProductChannel(1e8)
+        self.network.pathReactions.append(self.makePathReaction([self.B, self.C], [self.D, self.E], 1e2))
+        self.assertFalse(self.network.checkIncrementalUpdate(self.job))
+
+    def test_estimateRateCoefficients(self):
+        """
+        Test that the k(T,P) values to a new product channel follow its
+        branching ratio, and those to the existing product channels are
+        reduced so that the total flux from the source is conserved.
+        """
+        self.addProductChannel(1e8)
+        K = self.network.estimateRateCoefficients(self.Tlist, self.Plist)
+        self.assertEqual(K.shape, (2, 3, 3, 3))
+        branching = 1e8 / (1e10 + 1e8)
+        self.assertTrue(numpy.allclose(K[:,:,1,0], 5.0 * (1 - branching)))
+        self.assertTrue(numpy.allclose(K[:,:,2,0], 5.0 * branching))
+        self.assertTrue(numpy.allclose(K[:,:,1,0] + K[:,:,2,0], 5.0))
+
+################################################################################
+
+class TestUpdateNetworks(unittest.TestCase):
+    """
+    Contains unit tests of the updates of :class:`PDepNetwork` objects by
+    :func:`updateNetworks`.
+    """
+
+    def setUp(self):
+        """
+        A function run before each unit test in this class.
+        """
+        self.outputDirectory = tempfile.mkdtemp()
+        os.mkdir(os.path.join(self.outputDirectory, 'pdep'))
+
+    def tearDown(self):
+        """
+        A function run after each unit test in this class.
+        """
+        shutil.rmtree(self.outputDirectory)
+
+    def makeSpecies(self, label, E0, mass, inertia, frequencies, reactive=True):
+        """
+        Return a species with the given ground-state energy `E0` in kJ/mol,
+        `mass` in g/mol, moments of `inertia` in amu*angstrom^2 and vibrational
+        `frequencies` in cm^-1, and the thermo computed from its conformer.
+        """
+        conformer = Conformer(
+            E0 = (E0,'kJ/mol'),
+            modes = [
+                IdealGasTranslation(mass=(mass,'g/mol')),
+                NonlinearRotor(inertia=(inertia,'amu*angstrom^2'), symmetry=1),
+                HarmonicOscillator(frequencies=(frequencies,'cm^-1')),
+            ],
+            spinMultiplicity = 1,
+            opticalIsomers = 1,
+        )
+        Tdata = [300., 400., 500., 600., 800., 1000., 1500.]
+        thermo = ThermoData(
+            Tdata = (Tdata,'K'),
+            Cpdata = ([conformer.getHeatCapacity(T) for T in Tdata],'J/(mol*K)'),
+            H298 = ((conformer.getEnthalpy(298.) + conformer.E0.value_si) * 0.001,'kJ/mol'),
+            S298 = (conformer.getEntropy(298.),'J/(mol*K)'),
+            E0 = (E0,'kJ/mol'),
+        )
+        return Species(
+            label = label,
+            conformer = conformer,
+            thermo = thermo,
+            molecularWeight = (mass,'g/mol'),
+            transportData = TransportData(sigma=(5.94,'angstrom'), epsilon=(559,'K')),
+            energyTransferModel = SingleExponentialDown(alpha0=(5.35,'kJ/mol'), T0=(300,'K'), n=0.85),
+            reactive = reactive,
+        )
+
+    def makeNetworks(self):
+        """
+        Return a reaction model and a list of two new invalid networks for the
+        dissociation of two isomers of C4H10O to C4H8 + H2O.
+        """
+        C4H8 = self.makeSpecies('C4H8', -17.8832, 56.06, [22.2748,122.4,125.198],
+            [308.537,418.67,636.246,788.665,848.906,936.762,979.97,1009.48,1024.22,1082.96,1186.38,1277.55,1307.65,1332.87,1396.67,1439.09,1469.71,1484.45,1493.19,1691.49,2972.12,2994.31,3018.48,3056.87,3062.76,3079.38,3093.54,3174.52])
+        H2O = self.makeSpecies('H2O', -269.598, 18.01, [0.630578,1.15529,1.78586], [1622.09,3771.85,3867.85])
+        N2 = Species(label='N2', molecularWeight=(28.04,'g/mol'), transportData=TransportData(sigma=(3.41,'angstrom'), epsilon=(124,'K')), reactive=False)
+        frequencies = [240.915,341.933,500.066,728.41,809.987,833.93,926.308,948.571,1009.3,1031.46,1076,1118.4,1184.66,1251.36,1314.36,1321.42,1381.17,1396.5,1400.54,1448.08,1480.18,1485.34,1492.24,1494.99,1586.16,2949.01,2963.03,2986.19,2988.1,2995.27,3026.03,3049.05,3053.47,3054.83,3778.88]
+
+        reactionModel = CoreEdgeReactionModel()
+        reactionModel.addSpeciesToCore(N2)
+        reactionModel.addSpeciesToEdge(C4H8)
+        reactionModel.addSpeciesToEdge(H2O)
+
+        networks = []
+        for index, (label, E0, Ea) in enumerate([('C4H10O-1', -317.807, 275.), ('C4H10O-2', -310.0, 260.)]):
+            isomer = self.makeSpecies(label, E0, 74.07, [41.5091,215.751,233.258], frequencies)
+            reactionModel.addSpeciesToCore(isomer)
+            network = PDepNetwork(index=index+1, source=[isomer])
+            network.explored = [isomer]
+            network.pathReactions = [Reaction(
+                reactants = [isomer],
+                products = [C4H8, H2O],
+                kinetics = Arrhenius(A=(1e13,'s^-1'), n=0, Ea=(Ea,'kJ/mol'), T0=(1,'K')),
+            )]
+            networks.append(network)
+
+        return reactionModel, networks
+
+    def makeJob(self, method='modified strong collision', incrementalTolerance=0.0):
+        """
+        Return the pressure dependence settings of the updates, which use the
+        master equation reduction `method` and `incrementalTolerance`.
+        """
+        job = PressureDependenceJob(network=None,
+            Tmin=(500,'K'), Tmax=(1500,'K'), Tcount=4,
+            Pmin=(0.1,'bar'), Pmax=(10,'bar'), Pcount=3,
+            maximumGrainSize=(2.0,'kcal/mol'), minimumGrainCount=100,
+            method=method, interpolationModel=('chebyshev', 4, 3),
+            rmgmode=True, incrementalTolerance=incrementalTolerance,
+        )
+        job.generateTemperatureList()
+        job.generatePressureList()
+        job.outputFile = self.outputDirectory
+        return job
+
+    def test_updateNetworksParallel(self):
+        """
+        Test that updating networks in worker processes gives the same net
+        reactions and k(T,P) values as updating them one after another.
+        """
+        serialModel, serialNetworks = self.makeNetworks()
+        updateNetworks(serialNetworks, serialModel, None, self.makeJob())
+        parallelModel, parallelNetworks = self.makeNetworks()
+        updateNetworks(parallelNetworks, parallelModel, None, self.makeJob(), parallel=True, processes=2)
+
+        for serialNetwork, parallelNetwork in zip(serialNetworks, parallelNetworks):
+            self.assertTrue(serialNetwork.valid)
+            self.assertTrue(parallelNetwork.valid)
+            self.assertEqual(len(parallelNetwork.netReactions), len(serialNetwork.netReactions))
+            self.assertTrue(len(serialNetwork.netReactions) > 0)
+            for serialReaction, parallelReaction in zip(serialNetwork.netReactions, parallelNetwork.netReactions):
+                self.assertEqual([spec.label for spec in parallelReaction.reactants], [spec.label for spec in serialReaction.reactants])
+                self.assertEqual(sorted([spec.label for spec in parallelReaction.products]), sorted([spec.label for spec in serialReaction.products]))
+                self.assertTrue(numpy.array_equal(parallelReaction.kinetics.coeffs.value_si, serialReaction.kinetics.coeffs.value_si))
+            self.assertTrue(numpy.array_equal(parallelNetwork.solvedRates, serialNetwork.solvedRates))
+        self.assertEqual(len(parallelModel.edge.reactions), len(serialModel.edge.reactions))
+
+    def test_updateNetworksSparse(self):
+        """
+        Test that updating networks with the sparse chemically-significant
+        eigenvalues method gives the same k(T,P) values as the dense method.
+        """
+        denseModel, denseNetworks = self.makeNetworks()
+        updateNetworks(denseNetworks, denseModel, None, self.makeJob('chemically-significant eigenvalues'))
+        sparseModel, sparseNetworks = self.makeNetworks()
+        updateNetworks(sparseNetworks, sparseModel, None, self.makeJob('sparse chemically-significant eigenvalues'))
+
+        for denseNetwork, sparseNetwork in zip(denseNetworks, sparseNetworks):
+            self.assertTrue(sparseNetwork.valid)
+            self.assertTrue(numpy.all(denseNetwork.solvedRates[:,:,1] > 0))
+            self.assertTrue(numpy.allclose(sparseNetwork.solvedRates, denseNetwork.solvedRates, rtol=1e-4, atol=0.0))
+
+    def addProductChannel(self, reactionModel, network, Ea):
+        """
+        Add a path reaction with the activation energy `Ea` in kJ/mol from the
+        isomer of `network` to a new product channel, and mark the network as
+        invalid.
+        """
+        C4H8 = [spec for spec in network.pathReactions[0].products if spec.label == 'C4H8'][0]
+        H2O = [spec for spec in network.pathReactions[0].products if spec.label == 'H2O'][0]
+        C4H8b = copy.deepcopy(C4H8)
+        C4H8b.label = 'C4H8-2'
+        reactionModel.addSpeciesToEdge(C4H8b)
+        network.pathReactions.append(Reaction(
+            reactants = network.source[:],
+            products = [C4H8b, H2O],
+            kinetics = Arrhenius(A=(1e13,'s^-1'), n=0, Ea=(Ea,'kJ/mol'), T0=(1,'K')),
+        ))
+        network.valid = False
+
+    def test_updateNetworksIncremental(self):
+        """
+        Test that an update that adds a new product channel is incremental if
+        the estimated k(T,P) values are close to those of the master equation
+        at the highest temperature and lowest pressure, and that the master
+        equation is solved otherwise.
+        """
+        job = self.makeJob(incrementalTolerance=0.5)
+        reactionModel, networks = self.makeNetworks()
+        network = networks[0]
+        updateNetworks([network], reactionModel, None, job)
+        self.assertEqual(network.fullUpdates, 1)
+
+        self.addProductChannel(reactionModel, network, 315.)
+        updateNetworks([network], reactionModel, None, job)
+        self.assertEqual(network.incrementalUpdates, 1)
+        self.assertTrue(0 < network.incrementalBranching < 0.5)
+        self.assertTrue(network.incrementalDeviation <= 0.5)
+        self.assertTrue(numpy.all(network.solvedRates[:,:,2] > 0))
+        self.assertEqual(len(network.netReactions), 2)
+
+        # Estimates from k(T,P) values that are far from those of the master
+        # equation are rejected
+        reactionModel, networks = self.makeNetworks()
+        network = networks[0]
+        updateNetworks([network], reactionModel, None, job)
+        network.solvedRates *= 2
+        self.addProductChannel(reactionModel, network, 315.)
+        updateNetworks([network], reactionModel, None, job)
+        self.assertEqual(network.incrementalUpdates, 0)
+        self.assertEqual(network.fullUpdates, 2)
+        self.assertTrue(network.incrementalDeviation > 0.5)
+
+################################################################################
+
+if __name__ == '__main__':
+    unittest.main(testRunner=unittest.TextTestRunner(verbosity=2))
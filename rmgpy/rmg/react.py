@@ -33,12 +33,106 @@ Contains functions for generating reactions.
 """
 import logging
 import itertools
+import multiprocessing
 
+import rmgpy.data.rmg
 from rmgpy.molecule.molecule import Molecule
 from rmgpy.data.rmg import getDB
 from rmgpy.scoop_framework.util import map_, WorkerWrapper
 from rmgpy.species import Species
-        
+
+# The backends available to distribute the reaction generation work
+BACKENDS = ['serial', 'scoop', 'pool']
+
+# The current backend and its settings, as set by setBackend()
+backend = 'scoop'
+processes = None
+batchSize = None
+
+# The pool of worker processes used by the 'pool' backend
+pool = None
+
+def setBackend(name, numProcesses=None, numCombosPerTask=None):
+    """
+    Set the backend used to distribute the reaction generation work to
+    `name`, which is one of:
+
+    * ``'serial'``: generate all reactions in the current process
+
+    * ``'scoop'``: distribute single combinations of molecules to the SCOOP
+      workers, or run serially if SCOOP was not started
+
+    * ``'pool'``: distribute batches of `numCombosPerTask` combinations to a
+      pool of `numProcesses` worker processes on this machine (by default,
+      one per CPU and enough batches to balance the load)
+
+    Any existing worker pool is closed.
+    """
+    global backend, processes, batchSize
+    if name not in BACKENDS:
+        raise ValueError('Invalid reaction generation backend "{0}"; expected one of {1}.'.format(name, ', '.join(BACKENDS)))
+    closePool()
+    backend = name
+    processes = numProcesses
+    batchSize = numCombosPerTask
+
+def initializeWorker(database):
+    """
+    Set up a worker process of the pool with the loaded RMG `database`. When
+    processes are forked, the database is inherited from the parent process
+    instead of being pickled.
+    """
+    rmgpy.data.rmg.database = database
+
+def getNumberOfProcesses():
+    """
+    Return the number of worker processes used by the 'pool' backend.
+    """
+    return processes or multiprocessing.cpu_count()
+
+def getPool():
+    """
+    Return the pool of worker processes used by the 'pool' backend, starting
+    it with the currently loaded RMG database if needed.
+    """
+    global pool
+    if pool is None:
+        pool = multiprocessing.Pool(getNumberOfProcesses(), initializer=initializeWorker, initargs=(rmgpy.data.rmg.database,))
+        logging.info('Started a pool of {0:d} processes for reaction generation'.format(getNumberOfProcesses()))
+    return pool
+
+def closePool():
+    """
+    Close the pool of worker processes used by the 'pool' backend, if any.
+    Call this whenever the loaded kinetics database changes, so the workers
+    are started again with the new database.
+    """
+    global pool
+    if pool is not None:
+        pool.close()
+        pool.join()
+        pool = None
+
+def splitCombos(combos, numWorkers):
+    """
+    Split the list of `combos` into batches to be processed as single tasks.
+    Unless a batch size was set, aim for four batches per worker so the load
+    stays balanced even if some combinations react slower than others.
+    """
+    size = batchSize or max(1, -(-len(combos) // (4 * numWorkers)))
+    return [combos[i:i+size] for i in xrange(0, len(combos), size)]
+
+def reactCombos(comboList):
+    """
+    Generate the reactions for every combination of molecules in
+    `comboList`, as :func:`reactMolecules` does for a single one, and return
+    them as a single list of deflated reactions.
+    """
+    reactionList = []
+    for moleculeTuples in comboList:
+        reactionList.extend(reactMolecules(moleculeTuples))
+    return reactionList
+
 def react(spcA, speciesList=[]):
     """
     Generate reactions between spcA and the list of 
@@ -60,6 +154,9 @@ def react(spcA, speciesList=[]):
     Possible combinations between the spcA, and a species from the 
     speciesList is obtained by taking the combinatorial product of the
     two generated [(Molecule, index)] lists.
+
+    The combinations are distributed according to the current backend, as set
+    by :func:`setBackend`.
     """
     if not spcA.reactive: return []
     
@@ -78,14 +175,99 @@ def react(spcA, speciesList=[]):
     else:
         combos = list(itertools.product(molsA, molsB))
 
-    results = map_(
-                WorkerWrapper(reactMolecules),
-                combos
-            )
+    if backend == 'serial':
+        results = [reactCombos(combos)]
+    elif backend == 'pool':
+        batches = splitCombos(combos, getNumberOfProcesses())
+        if len(batches) == 1:
+            # Not worth sending to the workers
+            results = [reactCombos(combos)]
+        else:
+            results = getPool().map(WorkerWrapper(reactCombos), batches)
+    else:
+        results = map_(
+                    WorkerWrapper(reactMolecules),
+                    combos
+                )
 
     reactionList = itertools.chain.from_iterable(results)
     return reactionList
 
+def reactAll(speciesList, unimolecularReact, bimolecularReact):
+    """
+    Generate the reactions of the species in `speciesList` for a whole edge
+    reaction step: each species `i` reacts on its own if
+    ``unimolecularReact[i]`` is set, and with each species `j >= i` if
+    ``bimolecularReact[i,j]`` is set.
+
+    The unimolecular and bimolecular tasks are grouped into work units with
+    similar numbers of molecule combinations, which are distributed
+    according to the current backend, as set by :func:`setBackend`. The
+    molecules of each species are copied only once.
+
+    This is a generator of tuples (species, reactions), in the same order as
+    reacting each species and pair of species separately with :func:`react`,
+    where `reactions` is the list of deflated reactions of a task and
+    `species` the species that should be considered new when processing them
+    (species `i` for unimolecular and species `j` for bimolecular reactions).
+    The results of each work unit are yielded as soon as they are available.
+    """
+    # The first reactant of each task uses a copy of the molecules, as react()
+    # does, so that a species reacting with itself uses distinct objects
+    molsA, molsB = {}, {}
+    for index, spc in enumerate(speciesList):
+        if spc.reactive:
+            molsA[index] = [(mol.copy(deep=True), spc.index) for mol in spc.molecule]
+            molsB[index] = [(mol, spc.index) for mol in spc.molecule]
+
+    tasks = []
+    for i in xrange(len(speciesList)):
+        if unimolecularReact[i] and i in molsA:
+            tasks.append((i, [(t,) for t in molsA[i]]))
+    for i in xrange(len(speciesList)):
+        for j in xrange(i, len(speciesList)):
+            if bimolecularReact[i,j] and i in molsA and j in molsB:
+                tasks.append((j, list(itertools.product(molsA[i], molsB[j]))))
+    if not tasks:
+        return
+
+    units = splitTasks(tasks, getNumberOfProcesses())
+    if backend == 'serial' or len(units) == 1:
+        results = itertools.imap(reactTasks, units)
+    elif backend == 'pool':
+        results = getPool().imap(WorkerWrapper(reactTasks), units)
+    else:
+        results = map_(WorkerWrapper(reactTasks), units)
+
+    for result in results:
+        for index, reactionList in result:
+            yield speciesList[index], reactionList
+
+def splitTasks(tasks, numWorkers):
+    """
+    Group the list of `tasks`, each a tuple (index, combos), into work units
+    of consecutive tasks with about the same total number of combinations.
+    Unless a batch size was set, aim for four work units per worker.
+    """
+    total = sum([len(combos) for index, combos in tasks])
+    size = batchSize or max(1, -(-total // (4 * numWorkers)))
+    units = [[]]
+    count = 0
+    for task in tasks:
+        if count >= size:
+            units.append([])
+            count = 0
+        units[-1].append(task)
+        count += len(task[1])
+    return units
+
+def reactTasks(unit):
+    """
+    Generate the reactions of each task in the work `unit`, a list of tuples
+    (index, combos), and return a list of tuples (index, reactions).
+    """
+    return [(index, reactCombos(combos)) for index, combos in unit]
+
 def reactMolecules(moleculeTuples):
     """
     Performs a reaction between
@@ -30,6 +30,7 @@
 
 import os
 import unittest 
+import numpy
 
 from rmgpy import settings
 from rmgpy.data.kinetics import TemplateReaction
@@ -89,6 +90,75 @@ class TestReact(unittest.TestCase):
         self.assertIsNotNone(reactionList)
         self.assertTrue(all([isinstance(rxn, TemplateReaction) for rxn in reactionList]))
 
+    def testReactBackends(self):
+        """
+        Test that the serial and pool backends generate the same reactions.
+        """
+        spcA = Species().fromSMILES('[OH]')
+        spcs = [Species().fromSMILES('CC'), Species().fromSMILES('[CH3]')]
+        expected = sorted([str(rxn) for rxn in react(spcA, spcs)])
+
+        try:
+            for backend in ['serial', 'pool']:
+                # One combination per task, so the work is sent to the workers
+                setBackend(backend, numProcesses=2, numCombosPerTask=1)
+                reactionList = list(react(spcA, spcs))
+                self.assertTrue(all([isinstance(rxn, TemplateReaction) for rxn in reactionList]))
+                self.assertEqual(sorted([str(rxn) for rxn in reactionList]), expected)
+        finally:
+            setBackend('scoop')
+
+        self.assertRaises(ValueError, setBackend, 'threads')
+
+    def testSplitCombos(self):
+        """
+        Test that combinations are split into balanced batches.
+        """
+        combos = range(10)
+        batches = splitCombos(combos, 2)
+        self.assertEqual(len(batches), 5)
+        self.assertEqual(sum(batches, []), combos)
+        self.assertEqual(len(splitCombos(combos, 4)), 10)
+
+    def testReactAll(self):
+        """
+        Test that reacting a batch of species and pairs of species gives the
+        same reactions as reacting them one at a time.
+        """
+        spcs = [Species(index=1).fromSMILES('[OH]'),
+                Species(index=2).fromSMILES('CC'),
+                Species(index=3).fromSMILES('[CH3]')]
+        unimolecularReact = numpy.array([True, True, False])
+        bimolecularReact = numpy.zeros((3,3), bool)
+        bimolecularReact[0,1] = bimolecularReact[0,2] = bimolecularReact[2,2] = True
+
+        expected = []
+        for i in xrange(3):
+            if unimolecularReact[i]:
+                expected.append((i, sorted([str(rxn) for rxn in react(spcs[i].copy(deep=True))])))
+        for i in xrange(3):
+            for j in xrange(i, 3):
+                if bimolecularReact[i,j]:
+                    expected.append((j, sorted([str(rxn) for rxn in react(spcs[i].copy(deep=True), [spcs[j]])])))
+
+        try:
+            for backend in ['serial', 'pool']:
+                setBackend(backend, numProcesses=2, numCombosPerTask=1)
+                result = [(spcs.index(spc), sorted([str(rxn) for rxn in reactionList]))
+                          for spc, reactionList in reactAll(spcs, unimolecularReact, bimolecularReact)]
+                self.assertEqual(result, expected)
+        finally:
+            setBackend('scoop')
+
+    def testSplitTasks(self):
+        """
+        Test that tasks are grouped into work units of similar size.
+        """
+        tasks = [(0, range(5)), (1, range(1)), (2, range(1)), (3, range(3)), (4, range(2))]
+        units = splitTasks(tasks, 1)
+        self.assertEqual(sum(units, []), tasks)
+        self.assertEqual([[index for index, combos in unit] for unit in units], [[0], [1, 2, 3], [4]])
+
     def testDeflate(self):
         """
         Test that reaction deflate function works.
@@ -91,11 +91,7 @@ class TestRMGWorkFlow(unittest.TestCase):
         rmg_test.reactionModel = CoreEdgeReactionModel()
         DPP = Species().fromSMILES('C1=CC=C(C=C1)CCCC1C=CC=CC=1')
         DPP.generateResonanceIsomers()
-        formula = DPP.molecule[0].getFormula()
-        if formula in rmg_test.reactionModel.speciesDict:
-            rmg_test.reactionModel.speciesDict[formula].append(DPP)
-        else:
-            rmg_test.reactionModel.speciesDict[formula] = [DPP]
+        rmg_test.reactionModel.registerSpecies(DPP)
 
         mol_test = Molecule().fromAdjacencyList(
 """
@@ -0,0 +1,164 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+################################################################################
+#
+#	RMG - Reaction Mechanism Generator
+#
+#	Copyright (c) 2002-2009 Prof. William H. Green (whgreen@mit.edu) and the
+#	RMG Team (rmg_dev@mit.edu)
+#
+#	Permission is hereby granted, free of charge, to any person obtaining a
+#	copy of this software and associated documentation files (the 'Software'),
+#	to deal in the Software without restriction, including without limitation
+#	the rights to use, copy, modify, merge, publish, distribute, sublicense,
+#	and/or sell copies of the Software, and to permit persons to whom the
+#	Software is furnished to do so, subject to the following conditions:
+#
+#	The above copyright notice and this permission notice shall be included in
+#	all copies or substantial portions of the Software.
+#
+#	THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#	IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#	FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#	AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#	LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#	FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#	DEALINGS IN THE SOFTWARE.
+#
+################################################################################
+
+"""
+Contains functions for simulating all the reaction systems of an RMG job with
+the current model, either one after another or at the same time in a pool of
+worker processes.
+"""
+import logging
+import multiprocessing
+
+from rmgpy.solver.snapshot import SnapshotFile
+
+# The attributes of a reaction system that are set by a simulation and used
+# afterwards by RMG, which the worker processes send back
+SIMULATION_RESULTS = [
+    'maxCoreSpeciesRates',
+    'maxEdgeSpeciesRates',
+    'maxNetworkLeakRates',
+    'maxEdgeSpeciesRateRatios',
+    'maxNetworkLeakRateRatios',
+    'unimolecularThreshold',
+    'bimolecularThreshold',
+    'snapshots',
+]
+
+# The attributes of a reaction system that are reused when it is initialized
+# again, which the worker processes also send back; the ones that refer to
+# species and reactions are then rebuilt by ReactionSystem.restore_model()
+MODEL_STATE = [
+    'cachedRateCoefficients',
+    'rateCoefficientConditions',
+    'pdepColliderReactionIndices',
+    'colliderEfficiencies',
+    'colliderReactionRows',
+    'colliderPressures',
+]
+
+# The reaction systems and the simulation arguments of the current call to
+# simulateAll() in a worker process
+reactionSystems = None
+simulationArguments = None
+
+def simulateAll(systems, parallel=False, processes=None, **kwargs):
+    """
+    Simulate each of the reaction systems in `systems` with the keyword
+    arguments of :meth:`ReactionSystem.simulate`, and return the list of
+    the ``(terminated, obj)`` tuples they return, in the same order.
+
+    If `parallel` is ``True``, the reaction systems are simulated at the same
+    time in a pool of `processes` worker processes (by default, one per CPU
+    and no more than the number of reaction systems). The workers are started
+    with the reaction systems and the arguments when this function is called,
+    which they inherit from this process where processes are forked, and
+    they send back the results of each simulation and the state reused by
+    the next initialization, which are set on the reaction systems of this
+    process in the order of `systems`.
+    """
+    numProcesses = min(processes or multiprocessing.cpu_count(), len(systems))
+    if not parallel or numProcesses <= 1:
+        results = []
+        for index, reactionSystem in enumerate(systems):
+            logging.info('Conducting simulation of reaction system %s...' % (index+1))
+            results.append(reactionSystem.simulate(**kwargs))
+            logging.info('')
+        return results
+
+    logging.info('Conducting simulations of {0:d} reaction systems in {1:d} processes...'.format(len(systems), numProcesses))
+    # Create the snapshot files in this process, so the workers write to them
+    # and any temporary files are deleted by this process
+    for reactionSystem in systems:
+        if reactionSystem.snapshots is None:
+            reactionSystem.snapshots = SnapshotFile(None, reactionSystem.snapshotPolicy, reactionSystem.snapshotInterval)
+        reactionSystem.snapshots.create()
+
+    pool = multiprocessing.Pool(numProcesses, initializer=initializeWorker, initargs=(systems, kwargs))
+    try:
+        results = pool.map(simulateReactionSystem, range(len(systems)), chunksize=1)
+    finally:
+        pool.close()
+        pool.join()
+
+    coreSpecies = kwargs.get('coreSpecies') or []
+    coreReactions = kwargs.get('coreReactions') or []
+    edgeSpecies = kwargs.get('edgeSpecies') or []
+    edgeReactions = kwargs.get('edgeReactions') or []
+    pdepNetworks = kwargs.get('pdepNetworks') or []
+    for index, (reactionSystem, (terminated, obj, state)) in enumerate(zip(systems, results)):
+        for attribute, value in state:
+            if attribute == 'snapshots':
+                reactionSystem.snapshots.update(value)
+            else:
+                setattr(reactionSystem, attribute, value)
+        reactionSystem.restore_model(coreSpecies, coreReactions, edgeSpecies, edgeReactions)
+        # Replace the index of the invalid object with the object itself
+        if obj is not None:
+            objectType, objectIndex = obj
+            obj = edgeSpecies[objectIndex] if objectType == 'species' else pdepNetworks[objectIndex]
+        results[index] = (terminated, obj)
+    logging.info('')
+    return results
+
+def initializeWorker(systems, arguments):
+    """
+    Set up a worker process of the pool with the list of reaction `systems`
+    and the dictionary of simulation `arguments` passed to
+    :func:`simulateAll`. When processes are forked, these are inherited from
+    the parent process instead of being pickled.
+    """
+    global reactionSystems, simulationArguments
+    reactionSystems = systems
+    simulationArguments = arguments
+
+def simulateReactionSystem(index):
+    """
+    Simulate the reaction system at `index` in the list passed to
+    :func:`simulateAll` in a worker process. Return whether the simulation
+    terminated, the invalid object as a ``('species', index)`` or
+    ``('network', index)`` tuple giving its position in the edge species or
+    the pressure-dependent networks (or ``None``), and the list of the
+    ``(attribute, value)`` pairs of the results of the simulation and of the
+    state reused when the reaction system is initialized again.
+    """
+    reactionSystem = reactionSystems[index]
+    terminated, obj = reactionSystem.simulate(**simulationArguments)
+
+    if obj is not None:
+        for objectType, objects in [('species', simulationArguments.get('edgeSpecies') or []), ('network', simulationArguments.get('pdepNetworks') or [])]:
+            matches = [i for i, item in enumerate(objects) if item is obj]
+            if matches:
+                obj = (objectType, matches[0])
+                break
+        else:
+            raise ValueError('Invalid object {0} of reaction system {1:d} is not an edge species or network.'.format(obj, index+1))
+
+    state = [(attribute, getattr(reactionSystem, attribute)) for attribute in SIMULATION_RESULTS + MODEL_STATE if hasattr(reactionSystem, attribute)]
+    return terminated, obj, state
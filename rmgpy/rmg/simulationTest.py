@@ -0,0 +1,84 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import os
+import unittest
+
+from rmgpy.chemkin import loadChemkinFile
+from rmgpy.molecule import Molecule
+from rmgpy.solver.simple import SimpleReactor
+from rmgpy.solver.base import TerminationTime
+from rmgpy.rmg.simulation import simulateAll
+
+################################################################################
+
+class TestSimulateAll(unittest.TestCase):
+    """
+    Contains unit tests of the simulation of all the reaction systems of a
+    job.
+    """
+
+    def setUp(self):
+        """
+        A function run before each unit test in this class.
+        """
+        directory = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'solver', 'files', 'collider_model')
+        speciesList, reactionList = loadChemkinFile(os.path.join(directory, 'chem.inp'), os.path.join(directory, 'species_dictionary.txt'))
+
+        self.edgeSpecies = [species for species in speciesList if species.isIsomorphic(Molecule(SMILES='C'))]
+        self.coreSpecies = [species for species in speciesList if species not in self.edgeSpecies]
+        self.coreReactions = [rxn for rxn in reactionList if all([species in self.coreSpecies for species in rxn.reactants + rxn.products])]
+        self.edgeReactions = [rxn for rxn in reactionList if rxn not in self.coreReactions]
+
+    def simulate(self, parallel):
+        """
+        Simulate three reaction systems at different temperatures and return
+        them with the results of their simulations.
+        """
+        initialMoleFractions = dict([(species, 1.0) for species in self.coreSpecies])
+        reactionSystems = [SimpleReactor(T, 1.0e5, initialMoleFractions, [TerminationTime((1e-3,'s'))]) for T in [1000, 1200, 1400]]
+        results = simulateAll(reactionSystems,
+            parallel = parallel,
+            processes = 2,
+            coreSpecies = self.coreSpecies,
+            coreReactions = self.coreReactions,
+            edgeSpecies = self.edgeSpecies,
+            edgeReactions = self.edgeReactions,
+            toleranceKeepInEdge = 0,
+            toleranceMoveToCore = 1e-3,
+            toleranceInterruptSimulation = 1e-3,
+        )
+        return reactionSystems, results
+
+    def testParallelSimulations(self):
+        """
+        Test that simulating the reaction systems in worker processes gives
+        the same results and sets the same rates as simulating them serially,
+        that the invalid objects are those of this process, and that the
+        cached rate coefficients are kept for the next simulation.
+        """
+        serialSystems, serialResults = self.simulate(parallel=False)
+        parallelSystems, parallelResults = self.simulate(parallel=True)
+
+        self.assertEqual(len(parallelResults), 3)
+        for serialSystem, (serialTerminated, serialObj), parallelSystem, (parallelTerminated, parallelObj) in zip(serialSystems, serialResults, parallelSystems, parallelResults):
+            self.assertEqual(parallelTerminated, serialTerminated)
+            self.assertIs(parallelObj, serialObj)
+            if parallelObj is not None:
+                self.assertIn(parallelObj, self.edgeSpecies)
+            self.assertEqual(parallelSystem.maxEdgeSpeciesRateRatios.tolist(), serialSystem.maxEdgeSpeciesRateRatios.tolist())
+            self.assertEqual(parallelSystem.maxCoreSpeciesRates.tolist(), serialSystem.maxCoreSpeciesRates.tolist())
+            self.assertEqual(len(parallelSystem.snapshots), len(serialSystem.snapshots))
+            self.assertEqual(parallelSystem.cachedRateCoefficients.tolist(), serialSystem.cachedRateCoefficients.tolist())
+            self.assertEqual(set(parallelSystem.rateCoefficientCache.keys()), set(self.coreReactions + self.edgeReactions))
+            self.assertEqual(parallelSystem.rateCoefficientConditions, serialSystem.rateCoefficientConditions)
+            for rxn, (kinetics, thermo, j) in parallelSystem.rateCoefficientCache.iteritems():
+                self.assertIs(kinetics, rxn.kinetics)
+                self.assertEqual(thermo, tuple([spec.thermo for spec in rxn.reactants + rxn.products]))
+                self.assertEqual(j, serialSystem.reactionIndex[rxn])
+            self.assertEqual(parallelSystem.pdepColliderKinetics, serialSystem.pdepColliderKinetics)
+
+################################################################################
+
+if __name__ == '__main__':
+    unittest.main(testRunner=unittest.TextTestRunner(verbosity=2))
@@ -53,6 +53,9 @@ cdef class ReactionSystem(DASx):
     # variables that store stoichiometry data
     cdef public dict speciesIndex
     cdef public dict reactionIndex
+    cdef public dict rateCoefficientCache
+    cdef public numpy.ndarray cachedRateCoefficients
+    cdef public tuple rateCoefficientConditions
     cdef public numpy.ndarray reactantIndices
     cdef public numpy.ndarray productIndices
     cdef public numpy.ndarray networkIndices
@@ -63,6 +66,8 @@ cdef class ReactionSystem(DASx):
     cdef public numpy.ndarray Keq # equilibrium constants
     cdef public numpy.ndarray networkLeakCoefficients
     cdef public numpy.ndarray jacobianMatrix
+    cdef public object sparseJacobian
+    cdef public object rateKernel
 
     cdef public numpy.ndarray coreSpeciesConcentrations
     
@@ -87,13 +92,18 @@ cdef class ReactionSystem(DASx):
     cdef public numpy.ndarray sensitivityCoefficients
     cdef public list sensitiveSpecies
     cdef public double sensitivityThreshold
+    cdef public list sensitiveParameters
+    cdef public numpy.ndarray sensitivityParameterIndices
+    cdef public str sensitivityMethod
     # cdef public numpy.ndarray senpar
 
     # tolerance settings
     cdef public numpy.ndarray atol_array
     cdef public numpy.ndarray rtol_array
     
-    cdef public list snapshots
+    cdef public object snapshots
+    cdef public str snapshotPolicy
+    cdef public int snapshotInterval
 
     cdef public list termination
     
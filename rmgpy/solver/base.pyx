@@ -48,9 +48,12 @@ import cython
 import logging
 import csv
 import itertools
+import scipy.sparse
+import scipy.sparse.linalg
 
 from rmgpy.quantity import Quantity
 from rmgpy.chemkin import getSpeciesIdentifier
+from rmgpy.solver.snapshot import SnapshotFile
 
 ################################################################################
 
@@ -122,6 +125,34 @@ cdef class ReactionSystem(DASx):
         self.Keq = None # equilibrium constants
         self.networkLeakCoefficients = None
         self.jacobianMatrix = None
+
+        """
+        rateCoefficientCache is a dictionary with reactions as keys, and
+        values equal to a tuple of the kinetics and the thermo of the reactants
+        and products the coefficients were computed from and the index of the
+        reaction in the cachedRateCoefficients array, whose rows are the
+        forward rate coefficients, equilibrium constants and reverse rate
+        coefficients, so that they are only computed for the new reactions
+        when the model is initialized again. rateCoefficientConditions are the
+        conditions of the reaction system the cached values were computed at.
+        """
+        self.rateCoefficientCache = {}
+        self.cachedRateCoefficients = None
+        self.rateCoefficientConditions = None
+
+        """
+        The sparsity structure of the Jacobian of the core species, which is
+        generated from the core reactions in initializeModel.
+        """
+        self.sparseJacobian = None
+
+        """
+        The stoichiometric matrices of the core and edge reactions used to
+        evaluate the rates in the residual, which are generated from the
+        reactions in initializeModel.
+        """
+        self.rateKernel = None
+
         
         self.coreSpeciesConcentrations = None
         
@@ -148,6 +179,24 @@ cdef class ReactionSystem(DASx):
         self.sensitivityThreshold = sensitivityThreshold
         self.senpar = None
 
+        """
+        sensitiveParameters is a list of the core reactions and species whose
+        rate coefficients and Gibbs free energies are the parameters of the
+        sensitivity analysis, or None to use those of all of them.
+        sensitivityParameterIndices is the array of the indices of these
+        parameters, with the core reactions first and then the core species.
+        """
+        self.sensitiveParameters = None
+        self.sensitivityParameterIndices = None
+
+        """
+        sensitivityMethod is 'forward' to integrate the sensitivities to all
+        parameters along with the model, or 'adjoint' to integrate the model
+        alone and then the adjoint equations of the sensitive species backward
+        in time, which only gives the sensitivities at the final time.
+        """
+        self.sensitivityMethod = 'forward'
+
         # tolerance settings
 
         """
@@ -158,6 +207,24 @@ cdef class ReactionSystem(DASx):
         self.atol_array = None
         self.rtol_array = None
 
+        """
+        snapshots is the :class:`SnapshotFile` of the time, volume and core
+        species mole fractions after the solver steps of the last simulation,
+        which are written to disk as the solver steps. snapshotPolicy selects
+        the steps that are kept: 'all', 'off', 'decimated' to keep one step
+        in snapshotInterval, or 'logarithmic' to keep snapshotInterval steps
+        per decade of time. The policy also applies to the rows of the
+        sensitivity worksheets. Unless the policy is 'off', the last step is
+        always kept, and so is the last row of the sensitivity worksheets.
+        The same file is written in each simulation; it is a temporary file,
+        deleted with the reaction system, unless snapshots is set to a
+        SnapshotFile with a path beforehand, as RMG does to keep it in the
+        output directory.
+        """
+        self.snapshots = None
+        self.snapshotPolicy = 'all'
+        self.snapshotInterval = 10
+
         self.termination = termination or []
         
         
@@ -186,8 +253,6 @@ cdef class ReactionSystem(DASx):
         self.numEdgeSpecies = len(edgeSpecies)
         self.numEdgeReactions = len(edgeReactions)
 
-        self.initiate_tolerances(atol, rtol, sensitivity, sens_atol, sens_rtol)
-
         pdepNetworks = pdepNetworks or []
         self.numPdepNetworks = len(pdepNetworks)
 
@@ -197,7 +262,11 @@ cdef class ReactionSystem(DASx):
 
         self.generate_species_indices(coreSpecies, edgeSpecies)
         self.generate_reaction_indices(coreReactions, edgeReactions)
+        self.generate_sensitivity_parameter_indices()
+        self.initiate_tolerances(atol, rtol, sensitivity, sens_atol, sens_rtol)
         self.generate_reactant_product_indices(coreReactions, edgeReactions)
+        self.sparseJacobian = SparseJacobian(self.reactantIndices, self.productIndices, self.numCoreSpecies, self.numCoreReactions)
+        self.rateKernel = RateKernel(self.reactantIndices, self.productIndices, self.numCoreSpecies, self.numCoreReactions, self.numEdgeSpecies)
 
         self.coreSpeciesConcentrations = numpy.zeros((self.numCoreSpecies), numpy.float64)
         self.coreReactionRates = numpy.zeros((self.numCoreReactions), numpy.float64)
@@ -222,12 +291,15 @@ cdef class ReactionSystem(DASx):
         """
         Computes the number of differential equations and initializes the tolerance arrays.        
         """
+        cdef int numParameters
+
         # Compute number of equations    
         if sensitivity:    
             # Set DASPK sensitivity analysis to ON
             self.sensitivity = True
             # Compute number of variables
-            self.neq = self.numCoreSpecies * (self.numCoreReactions + self.numCoreSpecies + 1)
+            numParameters = len(self.sensitivityParameterIndices)
+            self.neq = self.numCoreSpecies * (numParameters + 1)
             
             self.atol_array = numpy.ones(self.neq, numpy.float64) * sens_atol
             self.atol_array[:self.numCoreSpecies] = atol
@@ -235,7 +307,7 @@ cdef class ReactionSystem(DASx):
             self.rtol_array = numpy.ones(self.neq, numpy.float64) * sens_rtol
             self.rtol_array[:self.numCoreSpecies] = rtol
             
-            self.senpar = numpy.zeros(self.numCoreReactions + self.numCoreSpecies, numpy.float64)
+            self.senpar = numpy.zeros(numParameters, numpy.float64)
             
         else:
             self.neq = self.numCoreSpecies
@@ -275,6 +347,7 @@ cdef class ReactionSystem(DASx):
         store the (species, index) pair in a dictionary.
         """
         
+        self.speciesIndex = {}
         for index, spec in enumerate(itertools.chain(coreSpecies, edgeSpecies)):
             self.speciesIndex[spec] = index
 
@@ -284,9 +357,127 @@ cdef class ReactionSystem(DASx):
         store the (reaction, index) pair in a dictionary.
         """
         
+        self.reactionIndex = {}
         for index, rxn in enumerate(itertools.chain(coreReactions, edgeReactions)):
             self.reactionIndex[rxn] = index
 
+    def generate_sensitivity_parameter_indices(self):
+        """
+        Assign an index to each sensitivity parameter: the rate coefficients
+        of the core reactions, followed by the Gibbs free energies of the core
+        species. Only the parameters of the reactions and species in
+        `sensitiveParameters` are used, if it is given.
+        """
+        cdef list indices
+
+        if self.sensitiveParameters is None:
+            self.sensitivityParameterIndices = numpy.arange(self.numCoreReactions + self.numCoreSpecies)
+            return
+
+        indices = []
+        for parameter in self.sensitiveParameters:
+            if self.reactionIndex.get(parameter, self.numCoreReactions) < self.numCoreReactions:
+                indices.append(self.reactionIndex[parameter])
+            elif self.speciesIndex.get(parameter, self.numCoreSpecies) < self.numCoreSpecies:
+                indices.append(self.numCoreReactions + self.speciesIndex[parameter])
+            else:
+                raise ValueError('Sensitivity parameter {0} is not a core reaction or species.'.format(parameter))
+        self.sensitivityParameterIndices = numpy.array(indices, numpy.int)
+
+    def restore_model(self, coreSpecies, coreReactions, edgeSpecies, edgeReactions):
+        """
+        Rebuild the species and reaction indices and the other attributes
+        that refer to the species and reactions of the model, after the
+        simulation of the reaction system with this model was run by a copy of
+        it in another process, and the attributes that do not refer to them,
+        e.g. the cached rate coefficients, were set from the copy.
+        """
+        self.generate_species_indices(coreSpecies, edgeSpecies)
+        self.generate_reaction_indices(coreReactions, edgeReactions)
+        self.rateCoefficientCache = {}
+        if self.cachedRateCoefficients is not None:
+            for rxn, j in self.reactionIndex.iteritems():
+                self.rateCoefficientCache[rxn] = (rxn.kinetics, get_reaction_thermo(rxn), j)
+
+    def clear_rate_coefficient_cache(self):
+        """
+        Discard the cached rate coefficients, so that they are all computed
+        again the next time the model is initialized. This must be called
+        after the kinetics or thermo of a reaction in the model are changed in
+        place, e.g. with :meth:`changeRate`.
+        """
+        self.rateCoefficientCache = {}
+        self.cachedRateCoefficients = None
+        self.rateCoefficientConditions = None
+
+    def get_rate_coefficient_conditions(self):
+        """
+        Return a tuple of the conditions of the reaction system that the rate
+        coefficients depend on, e.g. its temperature and pressure. The cached
+        rate coefficients are only reused if the conditions are equal to those
+        they were computed at.
+        """
+        raise NotImplementedError('get_rate_coefficient_conditions() is not implemented for {0}.'.format(self.__class__.__name__))
+
+    def generate_rate_coefficients(self, coreReactions, edgeReactions):
+        """
+        Populates the forward rate coefficients (kf), reverse rate coefficients (kb)
+        and equilibrium constants (Keq) arrays with the values computed by
+        calculate_rate_coefficients at the conditions of the reaction system.
+
+        The values are reused for the reactions that were in the model the
+        last time it was initialized, unless the conditions of the reaction
+        system changed or the kinetics of the reaction or the thermo of one of
+        its reactants or products was replaced. Code that changes kinetics or
+        thermo in place rather than assigning a new object, as
+        :meth:`Reaction.fixBarrierHeight` does, must call
+        :meth:`clear_rate_coefficient_cache`. The reused values are moved
+        from their old indices to the new, compacted reaction indices in a
+        single step, so the reactions that are no longer in the model, e.g.
+        pruned edge reactions, are dropped from the cache.
+        """
+        cdef dict cache, rateCoefficientCache
+        cdef list oldIndices, newIndices
+        cdef tuple conditions, thermo
+        cdef int j
+
+        conditions = self.get_rate_coefficient_conditions()
+        if conditions == self.rateCoefficientConditions:
+            cache = self.rateCoefficientCache
+        else:
+            cache = {}
+        rateCoefficientCache = {}
+        oldIndices = []; newIndices = []
+        for rxn in itertools.chain(coreReactions, edgeReactions):
+            j = self.reactionIndex[rxn]
+            thermo = get_reaction_thermo(rxn)
+            cached = cache.get(rxn)
+            if cached is not None and cached[0] is rxn.kinetics and all([a is b for a, b in zip(cached[1], thermo)]):
+                oldIndices.append(cached[2])
+                newIndices.append(j)
+            else:
+                self.kf[j], self.Keq[j], self.kb[j] = self.calculate_rate_coefficients(rxn)
+            rateCoefficientCache[rxn] = (rxn.kinetics, thermo, j)
+
+        # Compact the reused values into the new reaction indices
+        if newIndices:
+            self.kf[newIndices] = self.cachedRateCoefficients[0, oldIndices]
+            self.Keq[newIndices] = self.cachedRateCoefficients[1, oldIndices]
+            self.kb[newIndices] = self.cachedRateCoefficients[2, oldIndices]
+
+        self.rateCoefficientCache = rateCoefficientCache
+        self.cachedRateCoefficients = numpy.array([self.kf, self.Keq, self.kb])
+        self.rateCoefficientConditions = conditions
+
+    def calculate_rate_coefficients(self, rxn):
+        """
+        Return the forward rate coefficient, equilibrium constant and reverse
+        rate coefficient of the reaction `rxn` at the conditions of the
+        reaction system. The equilibrium constant and reverse rate coefficient
+        of irreversible reactions are zero.
+        """
+        raise NotImplementedError('calculate_rate_coefficients() is not implemented for {0}.'.format(self.__class__.__name__))
+
     def set_initial_conditions(self):
         """
         Sets the common initial conditions of the rate equations that 
@@ -342,6 +533,8 @@ cdef class ReactionSystem(DASx):
                 i = self.get_species_index(spec)
                 self.networkIndices[j,l] = i
 
+        self.rateKernel.setNetworkIndices(self.networkIndices)
+
     @cython.boundscheck(False)
     cpdef simulate(self, list coreSpecies, list coreReactions, list edgeSpecies, list edgeReactions,
         double toleranceKeepInEdge, double toleranceMoveToCore, double toleranceInterruptSimulation,
@@ -374,9 +567,12 @@ cdef class ReactionSystem(DASx):
         cdef double  prevTime, totalMoles, c, volume, RTP, unimolecularThresholdVal, bimolecularThresholdVal
         
         # cython declations for sensitivity analysis
-        cdef numpy.ndarray[numpy.int_t, ndim=1] sensSpeciesIndices
-        cdef numpy.ndarray[numpy.float64_t, ndim=1] moleSens, dVdk, normSens
-        cdef list time_array, normSens_array 
+        cdef numpy.ndarray[numpy.int_t, ndim=1] sensSpeciesIndices, parameters
+        cdef numpy.ndarray[numpy.float64_t, ndim=1] dVdk, normSens
+        cdef numpy.ndarray[numpy.float64_t, ndim=2] moleSens
+        cdef numpy.ndarray[numpy.float64_t, ndim=2] maxNormSens
+        cdef list sensFiles, normSensList, checkpoints
+        cdef bint adjoint, keep
         
         pdepNetworks = pdepNetworks or []
 
@@ -389,7 +585,12 @@ cdef class ReactionSystem(DASx):
         for index, spec in enumerate(coreSpecies):
             speciesIndex[spec] = index
         
-        self.initializeModel(coreSpecies, coreReactions, edgeSpecies, edgeReactions, pdepNetworks, absoluteTolerance, relativeTolerance, sensitivity, sensitivityAbsoluteTolerance, sensitivityRelativeTolerance, filterReactions)
+        if self.sensitivityMethod not in ('forward', 'adjoint'):
+            raise ValueError('Invalid sensitivity method "{0}"; expected "forward" or "adjoint".'.format(self.sensitivityMethod))
+        # The adjoint method integrates the model without the sensitivities
+        adjoint = sensitivity and self.sensitivityMethod == 'adjoint'
+
+        self.initializeModel(coreSpecies, coreReactions, edgeSpecies, edgeReactions, pdepNetworks, absoluteTolerance, relativeTolerance, sensitivity and not adjoint, sensitivityAbsoluteTolerance, sensitivityRelativeTolerance, filterReactions)
 
         invalidObject = None
         terminated = False
@@ -413,15 +614,25 @@ cdef class ReactionSystem(DASx):
         # Copy the initial conditions to use in evaluating conversions
         y0 = self.y.copy()
         
-        # a list with the time, Volume, mole fractions of core species
-        self.snapshots = []
+        # the time, volume and mole fractions of the core species, which are
+        # written to the file of the previous simulation (if any)
+        if self.snapshots is None:
+            self.snapshots = SnapshotFile(None, self.snapshotPolicy, self.snapshotInterval)
+        else:
+            self.snapshots.reset(self.snapshotPolicy, self.snapshotInterval)
+        keep = True
 
         if sensitivity:
-            time_array = []
-            normSens_array = [[] for spec in self.sensitiveSpecies]    
+            # the rows of the sensitivity worksheets, and the largest absolute
+            # normalized sensitivity to each parameter over all the steps
+            sensFiles = [SnapshotFile() for spec in self.sensitiveSpecies]
+            maxNormSens = numpy.zeros((len(self.sensitiveSpecies), self.sensitivityParameterIndices.shape[0]), numpy.float64)
             RTP = constants.R * self.T.value_si / self.P.value_si
             # identify sensitive species indices
             sensSpeciesIndices = numpy.array([speciesIndex[spec] for spec in self.sensitiveSpecies], numpy.int)  # index within coreSpecies list of the sensitive species
+            parameters = self.sensitivityParameterIndices
+            # the states after each step, from which the adjoint equations are integrated backward
+            checkpoints = [(self.t, self.y.copy())]
                 
         
         stepTime = 1e-12
@@ -432,29 +643,25 @@ cdef class ReactionSystem(DASx):
             
             y_coreSpecies = self.y[:numCoreSpecies]
             totalMoles = numpy.sum(y_coreSpecies)
-            if sensitivity:
-                time_array.append(self.t)
-                moleSens = self.y[numCoreSpecies:]#   
-                volume = self.V
+            keep = self.snapshots.keep(self.t)
+            if adjoint:
+                checkpoints.append((self.t, self.y.copy()))
+            elif sensitivity:
+                moleSens = self.y[numCoreSpecies:].reshape(-1, numCoreSpecies)  # one row for each parameter
                 
-                dVdk = numpy.zeros(numCoreReactions + numCoreSpecies, numpy.float64)
+                dVdk = numpy.zeros(parameters.shape[0], numpy.float64)
                 if not self.constantVolume:
-                    for j in xrange(numCoreReactions + numCoreSpecies):
-                        dVdk[j] = numpy.sum(moleSens[j*numCoreSpecies:(j+1)*numCoreSpecies])*RTP   # Contains [ dV_dk and dV_dG ]
-                for i in xrange(len(self.sensitiveSpecies)):
-                    normSens = numpy.zeros(numCoreReactions + numCoreSpecies, numpy.float64)
-                    c = self.coreSpeciesConcentrations[sensSpeciesIndices[i]]
-                    if c != 0:                        
-                        for j in xrange(numCoreReactions):
-                            normSens[j] = 1/volume*(moleSens[j*numCoreSpecies+sensSpeciesIndices[i]]-c*dVdk[j])*forwardRateCoefficients[j]/c
-                        for j in xrange(numCoreReactions,numCoreReactions+numCoreSpecies):
-                            normSens[j] = 1/volume*(moleSens[j*numCoreSpecies+sensSpeciesIndices[i]]-c*dVdk[j])/c*4184   # no normalization against dG, converstion to kcal/mol units
-                    normSens_array[i].append(normSens)
-
-
-            snapshot = [self.t, self.V]
-            snapshot.extend(y_coreSpecies / numpy.sum(y_coreSpecies))
-            self.snapshots.append(snapshot)            
+                    dVdk = numpy.sum(moleSens, axis=1)*RTP   # Contains [ dV_dk and dV_dG ]
+                normSensList = self.get_normalized_sensitivities(moleSens, dVdk, sensSpeciesIndices)
+                for i, normSens in enumerate(normSensList):
+                    maxNormSens[i] = numpy.maximum(maxNormSens[i], numpy.abs(normSens))
+                    if keep:
+                        sensFiles[i].append([self.t] + normSens.tolist())
+
+            if keep:
+                snapshot = [self.t, self.V]
+                snapshot.extend(y_coreSpecies / numpy.sum(y_coreSpecies))
+                self.snapshots.append(snapshot)
 
             # Get the characteristic flux
             charRate = sqrt(numpy.sum(self.coreSpeciesRates * self.coreSpeciesRates))
@@ -559,31 +766,54 @@ cdef class ReactionSystem(DASx):
             # Increment destination step time if necessary
             if self.t >= 0.9999 * stepTime:
                 stepTime *= 10.0
-                
+
+        # Keep the last step if the policy skipped it
+        if not keep:
+            if self.snapshotPolicy != 'off':
+                snapshot = [self.t, self.V]
+                snapshot.extend(y_coreSpecies / numpy.sum(y_coreSpecies))
+                self.snapshots.append(snapshot)
+            if sensitivity and not adjoint:
+                for i, normSens in enumerate(normSensList):
+                    sensFiles[i].append([self.t] + normSens.tolist())
+        self.snapshots.close()
         
         # notify reaction system listeners
         self.notify()
 
+        if adjoint:
+            # The observables are the numbers of moles of the sensitive
+            # species and the total number of moles, which gives the volume
+            observables = numpy.zeros((numCoreSpecies, len(self.sensitiveSpecies) + 1), numpy.float64)
+            observables[sensSpeciesIndices, numpy.arange(len(self.sensitiveSpecies))] = 1.0
+            observables[:,-1] = 1.0
+            derivatives = self.solve_adjoint(checkpoints, observables)
+
+            moleSens = numpy.zeros((parameters.shape[0], numCoreSpecies), numpy.float64)
+            moleSens[:,sensSpeciesIndices] = derivatives[:,:-1]
+            dVdk = numpy.zeros(parameters.shape[0], numpy.float64)
+            if not self.constantVolume:
+                dVdk = derivatives[:,-1]*RTP
+            for i, normSens in enumerate(self.get_normalized_sensitivities(moleSens, dVdk, sensSpeciesIndices)):
+                maxNormSens[i] = numpy.abs(normSens)
+                sensFiles[i].append([self.t] + normSens.tolist())
+
         if sensitivity:   
             for i in xrange(len(self.sensitiveSpecies)):
                 with open(sensWorksheet[i], 'wb') as outfile:
                     worksheet = csv.writer(outfile)
-                    reactionsAboveThreshold = []
-                    for j in xrange(numCoreReactions + numCoreSpecies):
-                        for k in xrange(len(time_array)):
-                            if abs(normSens_array[i][k][j]) > self.sensitivityThreshold:
-                                reactionsAboveThreshold.append(j)
-                                break
+                    reactionsAboveThreshold = numpy.flatnonzero(maxNormSens[i] > self.sensitivityThreshold).tolist()
                     species_name = getSpeciesIdentifier(self.sensitiveSpecies[i])
                     headers = ['Time (s)']
-                    headers.extend(['dln[{0}]/dln[k{1}]: {2}'.format(species_name, j+1, coreReactions[j].toChemkin(kinetics=False)) if j < numCoreReactions 
-                                    else 'dln[{0}]/dG[{1}]'.format(species_name, getSpeciesIdentifier(coreSpecies[j-numCoreReactions])) for j in reactionsAboveThreshold])
+                    headers.extend(['dln[{0}]/dln[k{1}]: {2}'.format(species_name, parameters[j]+1, coreReactions[parameters[j]].toChemkin(kinetics=False)) if parameters[j] < numCoreReactions 
+                                    else 'dln[{0}]/dG[{1}]'.format(species_name, getSpeciesIdentifier(coreSpecies[parameters[j]-numCoreReactions])) for j in reactionsAboveThreshold])
                     worksheet.writerow(headers)               
                 
-                    for k in xrange(len(time_array)):
-                        row = [time_array[k]]
-                        row.extend([normSens_array[i][k][j] for j in reactionsAboveThreshold])       
-                        worksheet.writerow(row)  
+                    for sensRow in sensFiles[i]:
+                        row = [sensRow[0]]
+                        row.extend([sensRow[j+1] for j in reactionsAboveThreshold])
+                        worksheet.writerow(row)
+                sensFiles[i].remove()
         
         self.maxCoreSpeciesRates = maxCoreSpeciesRates
         self.maxEdgeSpeciesRates = maxEdgeSpeciesRates
@@ -622,91 +852,524 @@ cdef class ReactionSystem(DASx):
                 X = 1 - (self.y[index] / y0[index])
                 logging.info('    {0} conversion: {1:<10.4g}'.format(term.species, X))
 
-    @cython.boundscheck(False)
-    def computeRateDerivative(self):
+    def get_normalized_sensitivities(self, numpy.ndarray[numpy.float64_t, ndim=2] moleSens, numpy.ndarray[numpy.float64_t, ndim=1] dVdk, numpy.ndarray[numpy.int_t, ndim=1] sensSpeciesIndices):
         """
-        Returns derivative vector df/dk_j where dy/dt = f(y, t, k) and
-        k_j is the rate parameter for the jth core reaction.
+        Return a list with the array of the normalized sensitivities of the
+        concentration of each sensitive species, given the derivatives
+        `moleSens` of the numbers of moles of the core species, with one row
+        for each sensitivity parameter, and `dVdk` of the volume with respect
+        to the parameters. The sensitivities to rate coefficients are
+        dln[X]/dln[k], and those to Gibbs free energies are dln[X]/dG in
+        mol/kcal.
         """
-        cdef numpy.ndarray[numpy.int_t, ndim=2] ir, ip
-        cdef numpy.ndarray[numpy.float64_t, ndim=1] kf, kr, C, deriv
-        cdef numpy.ndarray[numpy.float64_t, ndim=2] rateDeriv
-        cdef double fderiv, rderiv, flux, V
-        cdef int j, numCoreReactions, numCoreSpecies
-        
-        cdef double RT_inverse, gderiv
-        
-        ir = self.reactantIndices
-        ip = self.productIndices
-        
-        kf = self.kf
-        kr = self.kb    
-        
-        numCoreReactions = len(self.coreReactionRates)
-        numCoreSpecies = len(self.coreSpeciesConcentrations)      
-        
+        cdef numpy.ndarray[numpy.float64_t, ndim=1] normSens
+        cdef numpy.ndarray parameters, isReaction
+        cdef double c, volume
+        cdef list normSensList
+        cdef int i
+
+        parameters = self.sensitivityParameterIndices
+        isReaction = parameters < self.numCoreReactions
+        volume = self.V
+
+        normSensList = []
+        for i in xrange(sensSpeciesIndices.shape[0]):
+            normSens = numpy.zeros(parameters.shape[0], numpy.float64)
+            c = self.coreSpeciesConcentrations[sensSpeciesIndices[i]]
+            if c != 0:                        
+                normSens = 1/volume*(moleSens[:,sensSpeciesIndices[i]]-c*dVdk)
+                normSens[isReaction] *= self.kf[parameters[isReaction]]/c
+                normSens[~isReaction] *= 4184/c   # no normalization against dG, converstion to kcal/mol units
+            normSensList.append(normSens)
+        return normSensList
+
+    def computeRateDerivative(self, parameters=None):
+        """
+        Returns derivative matrix df/dp where dy/dt = f(y, t, p) and the
+        parameters p are the rate coefficients of the core reactions followed
+        by the Gibbs free energies of the core species. Only the columns of
+        the parameters with the given indices are returned if `parameters` is
+        given.
+        """
+        return self.get_rate_derivative_matrix(parameters).toarray()
+
+    def get_rate_derivative_matrix(self, parameters=None):
+        """
+        Return the derivative matrix df/dp of :meth:`computeRateDerivative`
+        as a :class:`scipy.sparse.csc_matrix`.
+        """
+        cdef numpy.ndarray[numpy.float64_t, ndim=1] kf, kr, C, fderiv, rderiv, flux, gderiv
+        cdef double V, RT_inverse
+        cdef int numCoreReactions, numCoreSpecies
+
+        kernel = self.rateKernel
+        numCoreReactions = self.numCoreReactions
+        numCoreSpecies = self.numCoreSpecies
+        if parameters is None:
+            parameters = numpy.arange(numCoreReactions + numCoreSpecies)
+
+        kf = self.kf[:numCoreReactions]
+        kr = self.kb[:numCoreReactions]
+
         # Use stored volume, since this function is only called from residual function. 
         RT_inverse = 1/(constants.R * self.T.value_si)
         V = self.V
 
-        C = self.coreSpeciesConcentrations
+        # Empty slots point to a concentration of one
+        C = numpy.append(self.coreSpeciesConcentrations, 1.0)
+        fderiv = C[kernel.reactants[0][:numCoreReactions]] * C[kernel.reactants[1][:numCoreReactions]] * C[kernel.reactants[2][:numCoreReactions]]
+        rderiv = kr / kf * C[kernel.products[0][:numCoreReactions]] * C[kernel.products[1][:numCoreReactions]] * C[kernel.products[2][:numCoreReactions]]
+        flux = fderiv - rderiv
+        gderiv = rderiv * kf * RT_inverse
 
-        rateDeriv = numpy.zeros((numCoreSpecies,numCoreReactions+numCoreSpecies), numpy.float64)
-        
-        for j in xrange(numCoreReactions):
-            if ir[j,1] == -1: # only one reactant
-                fderiv = C[ir[j,0]]
-            elif ir[j,2] == -1: # only two reactants
-                fderiv = C[ir[j,0]] * C[ir[j,1]]                             
-            else: # three reactants!! (really?)
-                fderiv = C[ir[j,0]] * C[ir[j,1]] * C[ir[j,2]]          
-                
-            if ip[j,1] == -1: # only one reactant
-                rderiv = kr[j] / kf[j] * C[ip[j,0]]
-            elif ip[j,2] == -1: # only two reactants
-                rderiv = kr[j] / kf[j] * C[ip[j,0]] * C[ip[j,1]]
-            else: # three reactants!! (really?)
-                rderiv = kr[j] / kf[j] * C[ip[j,0]] * C[ip[j,1]] * C[ip[j,2]]
-            
-            flux = fderiv - rderiv
-            gderiv = rderiv * kf[j] * RT_inverse
-            
-            deriv = numpy.zeros(numCoreSpecies, numpy.float64) # derivative for reaction j with respect to dG_species i
+        # The derivative with respect to the rate coefficient of reaction j
+        # is its net stoichiometry times the flux
+        fluxes = scipy.sparse.csr_matrix((kernel.coreCoefficients * flux[kernel.coreColumns], (kernel.coreRows, kernel.coreColumns)), shape=(numCoreSpecies, numCoreReactions))
+
+        # The derivative with respect to the Gibbs free energy of species i
+        # sums the net stoichiometry of each reaction times its reverse flux
+        # derivative and the net stoichiometric coefficient of species i
+        gderivs = scipy.sparse.csr_matrix((kernel.coreCoefficients * gderiv[kernel.coreColumns], (kernel.coreRows, kernel.coreColumns)), shape=(numCoreSpecies, numCoreReactions))
+        thermo = -gderivs.dot(kernel.coreStoichiometry.T)
+
+        rateDeriv = scipy.sparse.hstack([fluxes, thermo], format='csc')[:,parameters]
 
-            deriv[ir[j,0]] += gderiv
-            if ir[j,1] != -1: # only two reactants
-                deriv[ir[j,1]] += gderiv
-                if ir[j,2] != -1: # three reactants!! (really?)
-                    deriv[ir[j,2]] += gderiv
-            
-            deriv[ip[j,0]] -= gderiv
-            if ip[j,1] != -1: # only two reactants
-                deriv[ip[j,1]] -= gderiv
-                if ip[j,2] != -1: # three reactants!! (really?)
-                    deriv[ip[j,2]] -= gderiv
-            
-            rateDeriv[ir[j,0], j] -= flux
-            rateDeriv[ir[j,0], numCoreReactions:numCoreReactions+numCoreSpecies] -= deriv
-            if ir[j,1] != -1:
-                rateDeriv[ir[j,1], j] -= flux
-                rateDeriv[ir[j,1], numCoreReactions:numCoreReactions+numCoreSpecies] -= deriv
-                if ir[j,2] != -1:
-                    rateDeriv[ir[j,2], j] -= flux
-                    rateDeriv[ir[j,2], numCoreReactions:numCoreReactions+numCoreSpecies] -= deriv
-                
-            rateDeriv[ip[j,0], j] += flux
-            rateDeriv[ip[j,0], numCoreReactions:numCoreReactions+numCoreSpecies] += deriv
-            if ip[j,1] != -1:
-                rateDeriv[ip[j,1], j] += flux
-                rateDeriv[ip[j,1], numCoreReactions:numCoreReactions+numCoreSpecies] += deriv
-                if ip[j,2] != -1:
-                    rateDeriv[ip[j,2], j] += flux  
-                    rateDeriv[ip[j,2], numCoreReactions:numCoreReactions+numCoreSpecies] += deriv
-                        
         rateDeriv = V * rateDeriv
 
         return rateDeriv
-        
+
+    def get_sparse_jacobian(self, numpy.ndarray[numpy.float64_t, ndim=1] y):
+        """
+        Return the Jacobian of the core species mole balances as a
+        :class:`scipy.sparse.csr_matrix` given the state `y`, and the vector
+        :math:`\\mathbf{u}` of its rank-one update :math:`\\mathbf{u} \\mathbf{1}^T`
+        or None if there is none. You must implement this in the derived
+        class.
+        """
+        raise NotImplementedError('get_sparse_jacobian() is not implemented for {0}.'.format(self.__class__.__name__))
+
+    def compute_sensitivity_residual(self, y, matrix, correction=None):
+        """
+        Return the right-hand side of the sensitivity equations
+        :math:`d\\mathbf{S}/dt = \\mathbf{J} \\mathbf{S} + \\partial \\mathbf{f} / \\partial \\mathbf{p}`,
+        given the state `y`, in which the sensitivities to each parameter
+        follow the numbers of moles of the core species, and the sparse
+        Jacobian `matrix`. The Jacobian of a constant-pressure reactor also
+        has the rank-one update :math:`\\mathbf{u} \\mathbf{1}^T` given by the
+        vector `correction`. The sensitivities to all parameters are
+        evaluated with a single sparse matrix product.
+        """
+        cdef numpy.ndarray[numpy.float64_t, ndim=2] sensitivities, derivatives
+        cdef int numCoreSpecies
+
+        numCoreSpecies = self.numCoreSpecies
+        sensitivities = y[numCoreSpecies:].reshape(-1, numCoreSpecies).T
+        derivatives = matrix.dot(sensitivities)
+        if correction is not None:
+            derivatives += numpy.outer(correction, numpy.sum(sensitivities, axis=0))
+        derivatives += self.computeRateDerivative(self.sensitivityParameterIndices)
+        return derivatives.T.ravel()
+
+    def solve_adjoint(self, list checkpoints, numpy.ndarray[numpy.float64_t, ndim=2] observables):
+        """
+        Return the derivatives with respect to the sensitivity parameters of
+        the observables at the end of a simulation, with one row for each
+        parameter and one column for each observable. The observables are the
+        sums of the numbers of moles of the core species weighted by the
+        columns of `observables`, and `checkpoints` is the list of the times
+        and states after each step of the simulation.
+
+        The adjoint equations :math:`d\\boldsymbol{\\lambda}/dt = -\\mathbf{J}^T \\boldsymbol{\\lambda}`
+        of all observables are integrated backward from the final state over
+        the steps between the checkpoints, and the derivatives are accumulated
+        as the integral of
+        :math:`(\\partial \\mathbf{f} / \\partial \\mathbf{p})^T \\boldsymbol{\\lambda}`.
+        Each step is taken with the extrapolated implicit Euler method: the
+        results of one implicit Euler step and of two half steps, using the
+        state at the middle of the step interpolated linearly between the
+        checkpoints, are combined by Richardson extrapolation. This is second
+        order accurate and, like implicit Euler, damps the fast modes of stiff
+        models. The cost scales with the number of observables instead of the
+        number of parameters.
+        """
+        cdef numpy.ndarray[numpy.float64_t, ndim=2] adjoint, derivatives, full, half
+        cdef numpy.ndarray[numpy.float64_t, ndim=1] y0, y1, dydt
+        cdef double t0, t1, h
+        cdef int k
+
+        dydt = numpy.zeros(self.numCoreSpecies, numpy.float64)
+
+        adjoint = observables.copy()
+        derivatives = numpy.zeros((self.sensitivityParameterIndices.shape[0], observables.shape[1]), numpy.float64)
+        for k in xrange(len(checkpoints) - 2, -1, -1):
+            t0, y0 = checkpoints[k]
+            t1, y1 = checkpoints[k+1]
+            h = t1 - t0
+
+            # Two half steps, the first from the state in the middle of the step
+            matrix, correction, rateDeriv = self.get_adjoint_matrices(0.5 * (t0 + t1), 0.5 * (y0 + y1), dydt)
+            half = self.solve_adjoint_step(matrix, correction, 0.5 * h, adjoint)
+            halfDerivatives = 0.5 * h * rateDeriv.T.dot(half)
+            matrix, correction, rateDeriv = self.get_adjoint_matrices(t0, y0, dydt)
+            half = self.solve_adjoint_step(matrix, correction, 0.5 * h, half)
+            halfDerivatives += 0.5 * h * rateDeriv.T.dot(half)
+
+            # One full step
+            full = self.solve_adjoint_step(matrix, correction, h, adjoint)
+            fullDerivatives = h * rateDeriv.T.dot(full)
+
+            # Richardson extrapolation of the first order results
+            adjoint = 2.0 * half - full
+            derivatives += 2.0 * halfDerivatives - fullDerivatives
+
+        # Restore the rates at the final state
+        t1, y1 = checkpoints[-1]
+        self.residual(t1, y1, dydt)
+
+        return derivatives
+
+    def get_adjoint_matrices(self, double t, numpy.ndarray[numpy.float64_t, ndim=1] y, numpy.ndarray[numpy.float64_t, ndim=1] dydt):
+        """
+        Return the sparse Jacobian, the vector of its rank-one update or None,
+        and the transposed derivative matrix of the rates with respect to the
+        sensitivity parameters at the time `t` and state `y`, as used by
+        :meth:`solve_adjoint`. The rates are evaluated into `dydt` first,
+        which also updates the concentrations, the volume and the rate
+        coefficients that depend on the state.
+        """
+        self.residual(t, y, dydt)
+        matrix, correction = self.get_sparse_jacobian(y)
+        return matrix, correction, self.get_rate_derivative_matrix(self.sensitivityParameterIndices)
+
+    def solve_adjoint_step(self, matrix, correction, double h, numpy.ndarray[numpy.float64_t, ndim=2] adjoint):
+        """
+        Return the adjoint after one backward implicit Euler step of size `h`
+        from `adjoint`, i.e. the solution of
+        :math:`(\\mathbf{I} - h \\mathbf{J}^T) \\boldsymbol{\\lambda}_k = \\boldsymbol{\\lambda}_{k+1}`,
+        where the Jacobian is the sparse `matrix` plus the rank-one update
+        :math:`\\mathbf{u} \\mathbf{1}^T` given by the vector `correction`,
+        if any. The rank-one update is handled by the Sherman-Morrison formula.
+        """
+        cdef numpy.ndarray[numpy.float64_t, ndim=2] x
+        cdef numpy.ndarray[numpy.float64_t, ndim=1] z
+
+        identity = scipy.sparse.identity(self.numCoreSpecies, format='csc')
+        lu = scipy.sparse.linalg.splu(scipy.sparse.csc_matrix(identity - h * matrix.T))
+        x = lu.solve(adjoint)
+        if correction is not None:
+            z = lu.solve(numpy.ones(self.numCoreSpecies, numpy.float64))
+            x += numpy.outer(z, h * numpy.dot(correction, x) / (1.0 - h * numpy.dot(correction, z)))
+        return x
+
+################################################################################
+
+class SparseJacobian(object):
+    """
+    The sparsity structure of the Jacobian of the core species mole balances,
+    generated once from the core reactions so that the Jacobian can be
+    assembled in time proportional to its number of nonzero entries rather
+    than to the number of reactions times the number of species.
+
+    The derivative of the rate of one direction of a reaction with respect to
+    the concentration of the reactant in one of its slots is called a term.
+    Each term is added to the entries in its column for the species whose net
+    stoichiometric coefficient in that direction is nonzero. The attributes
+    are:
+
+    ======================== ===================================================
+    Attribute                Description
+    ======================== ===================================================
+    `numCoreSpecies`         The number of core species
+    `numCoreReactions`       The number of core reactions
+    `termRates`              The index of the rate coefficient of each term in the forward rate coefficients followed by the reverse rate coefficients
+    `termSpecies`            The indices of the other reactants of each term, or `numCoreSpecies` for an empty slot
+    `entryTerms`             The term of each entry
+    `entryCoefficients`      The net stoichiometric coefficient of each entry
+    `entryPositions`         The position of each entry in the data of the sparse matrix
+    `indices`                The column indices of the nonzero entries in compressed sparse row format
+    `indptr`                 The index of the first nonzero entry of each row in compressed sparse row format
+    `directionRates`         The index of the rate coefficient of each reaction direction with two or more reactants
+    `directionSpecies`       The indices of the reactants of each of those directions, or `numCoreSpecies` for an empty slot
+    `directionOrders`        The number of reactants of each of those directions
+    `correctionRows`         The species of each contribution to the constant-pressure correction
+    `correctionDirections`   The reaction direction of each contribution to the constant-pressure correction
+    `correctionCoefficients` The net stoichiometric coefficient of each contribution to the constant-pressure correction
+    ======================== ===================================================
+
+    The diagonal is always part of the sparsity structure, since the solver
+    adds to it.
+    """
+
+    def __init__(self, reactantIndices, productIndices, numCoreSpecies, numCoreReactions):
+        self.numCoreSpecies = numCoreSpecies
+        self.numCoreReactions = numCoreReactions
+
+        termRates = []; termSpecies = []
+        entryTerms = []; entryRows = []; entryColumns = []; entryCoefficients = []
+        directionRates = []; directionSpecies = []; directionOrders = []
+        correctionRows = []; correctionDirections = []; correctionCoefficients = []
+
+        for j in xrange(numCoreReactions):
+            for direction in xrange(2):
+                if direction == 0:
+                    reactants, products = reactantIndices[j], productIndices[j]
+                else:
+                    reactants, products = productIndices[j], reactantIndices[j]
+                reactants = [int(i) for i in reactants if i != -1]
+                products = [int(i) for i in products if i != -1]
+                rate = j + direction * numCoreReactions
+
+                # The net stoichiometric coefficients of this direction
+                stoichiometry = {}
+                for i in reactants:
+                    stoichiometry[i] = stoichiometry.get(i, 0) - 1
+                for i in products:
+                    stoichiometry[i] = stoichiometry.get(i, 0) + 1
+                stoichiometry = [(i, nu) for i, nu in sorted(stoichiometry.iteritems()) if nu != 0]
+
+                for slot, column in enumerate(reactants):
+                    others = reactants[:slot] + reactants[slot+1:]
+                    term = len(termRates)
+                    termRates.append(rate)
+                    termSpecies.append(others + [numCoreSpecies] * (2 - len(others)))
+                    for row, nu in stoichiometry:
+                        entryTerms.append(term)
+                        entryRows.append(row)
+                        entryColumns.append(column)
+                        entryCoefficients.append(nu)
+
+                if len(reactants) > 1:
+                    index = len(directionRates)
+                    directionRates.append(rate)
+                    directionSpecies.append(reactants + [numCoreSpecies] * (3 - len(reactants)))
+                    directionOrders.append(len(reactants))
+                    for row, nu in stoichiometry:
+                        correctionRows.append(row)
+                        correctionDirections.append(index)
+                        correctionCoefficients.append(nu)
+
+        self.termRates = numpy.array(termRates, numpy.int)
+        self.termSpecies = numpy.array(termSpecies, numpy.int).reshape(-1, 2)
+        self.entryTerms = numpy.array(entryTerms, numpy.int)
+        self.entryCoefficients = numpy.array(entryCoefficients, numpy.float64)
+        self.directionRates = numpy.array(directionRates, numpy.int)
+        self.directionSpecies = numpy.array(directionSpecies, numpy.int).reshape(-1, 3)
+        self.directionOrders = numpy.array(directionOrders, numpy.float64)
+        self.correctionRows = numpy.array(correctionRows, numpy.int)
+        self.correctionDirections = numpy.array(correctionDirections, numpy.int)
+        self.correctionCoefficients = numpy.array(correctionCoefficients, numpy.float64)
+
+        # Merge the entries into the compressed sparse row structure
+        rows = numpy.concatenate((numpy.array(entryRows, numpy.int), numpy.arange(numCoreSpecies)))
+        columns = numpy.concatenate((numpy.array(entryColumns, numpy.int), numpy.arange(numCoreSpecies)))
+        keys, positions = numpy.unique(rows * numCoreSpecies + columns, return_inverse=True)
+        self.entryPositions = positions[:len(entryRows)]
+        self.indices = keys % numCoreSpecies
+        self.indptr = numpy.searchsorted(keys // numCoreSpecies, numpy.arange(numCoreSpecies + 1))
+
+    def getMatrix(self, C, kf, kb):
+        """
+        Return the Jacobian of the core species mole balances with respect to
+        the numbers of moles of the core species at constant volume as a
+        :class:`scipy.sparse.csr_matrix`, given the core species
+        concentrations `C` and the forward and reverse rate coefficients `kf`
+        and `kb`.
+        """
+        k = numpy.concatenate((kf[:self.numCoreReactions], kb[:self.numCoreReactions]))
+        C = numpy.append(C, 1.0)
+        values = k[self.termRates] * C[self.termSpecies[:,0]] * C[self.termSpecies[:,1]]
+        data = numpy.bincount(self.entryPositions, weights=self.entryCoefficients * values[self.entryTerms], minlength=self.indices.shape[0])
+        return scipy.sparse.csr_matrix((data, self.indices, self.indptr), shape=(self.numCoreSpecies, self.numCoreSpecies))
+
+    def getVolumeCorrection(self, C, kf, kb, Ctot):
+        """
+        Return the vector `u` such that adding the rank-one matrix
+        :math:`\\mathbf{u} \\mathbf{1}^T` to the matrix from :meth:`getMatrix`
+        gives the Jacobian of a constant-pressure reactor with total
+        concentration `Ctot`, in which the volume is proportional to the
+        total number of moles. A reaction direction with :math:`n` reactants
+        and rate :math:`r` contributes :math:`-(n-1) r / C_\\mathrm{tot}` times
+        the net stoichiometric coefficient of each species.
+        """
+        k = numpy.concatenate((kf[:self.numCoreReactions], kb[:self.numCoreReactions]))
+        C = numpy.append(C, 1.0)
+        species = self.directionSpecies
+        rates = k[self.directionRates] * C[species[:,0]] * C[species[:,1]] * C[species[:,2]]
+        corrections = -(self.directionOrders - 1) * rates / Ctot
+        return numpy.bincount(self.correctionRows, weights=self.correctionCoefficients * corrections[self.correctionDirections], minlength=self.numCoreSpecies)
+
+    def getIterationMatrix(self, matrix, cj, correction=None, out=None):
+        """
+        Return the dense iteration matrix :math:`\\mathbf{J} - c_j \\mathbf{I}`
+        used by DASPK/DASSL, given the sparse Jacobian `matrix` from
+        :meth:`getMatrix` and optionally the vector `correction` of its
+        rank-one update from :meth:`getVolumeCorrection`. The matrix is
+        assembled in place in the array `out` if it has the right shape, so
+        that no other dense arrays are allocated.
+        """
+        N = self.numCoreSpecies
+        if out is None or out.shape != (N, N):
+            out = numpy.empty((N, N), numpy.float64)
+        out.fill(0.0)
+        matrix.toarray(out=out)
+        if correction is not None:
+            out += correction[:,numpy.newaxis]
+        out.flat[::N+1] -= cj
+        return out
+
+################################################################################
+
+class RateKernel(object):
+    """
+    The stoichiometry of the core and edge reactions, generated once from the
+    reactant and product indices so that the residual can evaluate the
+    reaction and species rates with vectorized gather, product and scatter
+    operations instead of a loop over the reactions.
+
+    The stoichiometric matrices are stored in coordinate format, with one
+    entry for each reactant and product of each reaction in the order of the
+    reactant and product indices; the species rates are accumulated in that
+    same order, so they are identical to those of a loop over the reactions.
+    The attributes are:
+
+    ==================== =======================================================
+    Attribute            Description
+    ==================== =======================================================
+    `numCoreSpecies`     The number of core species
+    `numCoreReactions`   The number of core reactions
+    `numEdgeSpecies`     The number of edge species
+    `reactants`          The indices of the concentrations of the reactants in each of the three slots, with `numCoreSpecies` for an empty slot
+    `products`           The indices of the concentrations of the products in each of the three slots, with `numCoreSpecies` for an empty slot
+    `forwardEdge`        Whether each reaction has an edge species as reactant, so that its forward rate is zero
+    `reverseEdge`        Whether each reaction has an edge species as product, so that its reverse rate is zero
+    `coreRows`           The core species of each entry of the core stoichiometric matrix
+    `coreColumns`        The core reaction of each entry of the core stoichiometric matrix
+    `coreCoefficients`   The stoichiometric coefficient of each entry of the core stoichiometric matrix
+    `edgeRows`           The edge species of each entry of the edge stoichiometric matrix
+    `edgeColumns`        The edge reaction of each entry of the edge stoichiometric matrix
+    `edgeCoefficients`   The stoichiometric coefficient of each entry of the edge stoichiometric matrix
+    `coreStoichiometry`  The net stoichiometric matrix of the core species and reactions as a :class:`scipy.sparse.csr_matrix`
+    `networks`           The indices of the concentrations of the source species of each pressure-dependent network in each of the three slots
+    ==================== =======================================================
+
+    The concentrations, the forward and reverse rates and the weights of the
+    stoichiometric matrices are computed in work buffers that are allocated
+    once; the rates returned are new arrays.
+    """
+
+    def __init__(self, reactantIndices, productIndices, numCoreSpecies, numCoreReactions, numEdgeSpecies):
+        self.numCoreSpecies = numCoreSpecies
+        self.numCoreReactions = numCoreReactions
+        self.numEdgeSpecies = numEdgeSpecies
+        numReactions = reactantIndices.shape[0]
+
+        # Empty slots and edge species point to a concentration of one, and
+        # the rates of reactions with edge species are zeroed afterwards
+        self.reactants = [numpy.where((reactantIndices[:,l] == -1) | (reactantIndices[:,l] >= numCoreSpecies), numCoreSpecies, reactantIndices[:,l]) for l in xrange(3)]
+        self.products = [numpy.where((productIndices[:,l] == -1) | (productIndices[:,l] >= numCoreSpecies), numCoreSpecies, productIndices[:,l]) for l in xrange(3)]
+        self.forwardEdge = numpy.any(reactantIndices >= numCoreSpecies, axis=1)
+        self.reverseEdge = numpy.any(productIndices >= numCoreSpecies, axis=1)
+
+        coreRows = []; coreColumns = []; coreCoefficients = []
+        edgeRows = []; edgeColumns = []; edgeCoefficients = []
+        for j in xrange(numReactions):
+            for indices, coefficient in [(reactantIndices[j], -1.0), (productIndices[j], 1.0)]:
+                for i in indices:
+                    if i == -1:
+                        break
+                    if j < numCoreReactions:
+                        coreRows.append(i); coreColumns.append(j); coreCoefficients.append(coefficient)
+                    elif i >= numCoreSpecies:
+                        edgeRows.append(i - numCoreSpecies); edgeColumns.append(j); edgeCoefficients.append(coefficient)
+        self.coreRows = numpy.array(coreRows, numpy.int)
+        self.coreColumns = numpy.array(coreColumns, numpy.int)
+        self.coreCoefficients = numpy.array(coreCoefficients, numpy.float64)
+        self.edgeRows = numpy.array(edgeRows, numpy.int)
+        self.edgeColumns = numpy.array(edgeColumns, numpy.int)
+        self.edgeCoefficients = numpy.array(edgeCoefficients, numpy.float64)
+        self.coreStoichiometry = scipy.sparse.csr_matrix((self.coreCoefficients, (self.coreRows, self.coreColumns)), shape=(numCoreSpecies, numCoreReactions))
+        self.networks = [numpy.zeros(0, numpy.int)] * 3
+
+        # Work buffers
+        self.concentrations = numpy.ones(numCoreSpecies + 1, numpy.float64)
+        self.gather = numpy.zeros(numReactions, numpy.float64)
+        self.forwardRates = numpy.zeros(numReactions, numpy.float64)
+        self.reverseRates = numpy.zeros(numReactions, numpy.float64)
+        self.coreWeights = numpy.zeros(self.coreRows.shape[0], numpy.float64)
+        self.edgeWeights = numpy.zeros(self.edgeRows.shape[0], numpy.float64)
+
+    def setNetworkIndices(self, networkIndices):
+        """
+        Set the indices of the source species of the pressure-dependent
+        networks from the n x 3 matrix `networkIndices`.
+        """
+        self.networks = [numpy.where(networkIndices[:,l] == -1, self.numCoreSpecies, networkIndices[:,l]) for l in xrange(3)]
+
+    def getRates(self, C, kf, kb):
+        """
+        Return the rates of all reactions and the rates of production of the
+        core and edge species, given the core species concentrations `C` and
+        the forward and reverse rate coefficients `kf` and `kb`.
+        """
+        concentrations = self.concentrations
+        gather = self.gather
+        forwardRates = self.forwardRates
+        reverseRates = self.reverseRates
+        concentrations[:self.numCoreSpecies] = C
+
+        numpy.take(concentrations, self.reactants[0], out=gather)
+        numpy.multiply(kf, gather, out=forwardRates)
+        numpy.take(concentrations, self.reactants[1], out=gather)
+        forwardRates *= gather
+        numpy.take(concentrations, self.reactants[2], out=gather)
+        forwardRates *= gather
+        forwardRates[self.forwardEdge] = 0.0
+
+        numpy.take(concentrations, self.products[0], out=gather)
+        numpy.multiply(kb, gather, out=reverseRates)
+        numpy.take(concentrations, self.products[1], out=gather)
+        reverseRates *= gather
+        numpy.take(concentrations, self.products[2], out=gather)
+        reverseRates *= gather
+        reverseRates[self.reverseEdge] = 0.0
+
+        reactionRates = forwardRates - reverseRates
+
+        numpy.take(reactionRates, self.coreColumns, out=self.coreWeights)
+        self.coreWeights *= self.coreCoefficients
+        coreSpeciesRates = scatter(self.coreRows, self.coreWeights, self.numCoreSpecies)
+
+        numpy.take(reactionRates, self.edgeColumns, out=self.edgeWeights)
+        self.edgeWeights *= self.edgeCoefficients
+        edgeSpeciesRates = scatter(self.edgeRows, self.edgeWeights, self.numEdgeSpecies)
+
+        return reactionRates, coreSpeciesRates, edgeSpeciesRates
+
+    def getNetworkLeakRates(self, C, knet):
+        """
+        Return the leak rates of the pressure-dependent networks, given the
+        core species concentrations `C` and the leak coefficients `knet`.
+        """
+        concentrations = self.concentrations
+        concentrations[:self.numCoreSpecies] = C
+        return knet * concentrations[self.networks[0]] * concentrations[self.networks[1]] * concentrations[self.networks[2]]
+
+def scatter(rows, weights, length):
+    """
+    Return the array of the given `length` whose elements are the sums of the
+    `weights` with the corresponding `rows`, added in order.
+    """
+    if length == 0:
+        return numpy.zeros(0, numpy.float64)
+    return numpy.bincount(rows, weights=weights, minlength=length)
+
+def get_reaction_thermo(rxn):
+    """
+    Return the tuple of the thermo of the reactants and products of the
+    reaction `rxn`, which its equilibrium constant is computed from.
+    """
+    return tuple([spec.thermo for spec in itertools.chain(rxn.reactants, rxn.products)])
+
 ################################################################################
 
 class TerminationTime:
@@ -49,6 +49,7 @@ def loadRMGPyJob(inputFile, chemkinFile, speciesDict):
     # Set reaction model to match model loaded from Chemkin file
     rmg.reactionModel.core.species = speciesList
     rmg.reactionModel.core.reactions = reactionList
+    rmg.reactionModel.initializeMembershipSets()
 
     return rmg
 
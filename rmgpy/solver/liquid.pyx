@@ -115,19 +115,23 @@ cdef class LiquidReactor(ReactionSystem):
         # Initialize the model
         ReactionSystem.initialize_solver(self)
 
-    def generate_rate_coefficients(self, coreReactions, edgeReactions):
+    def get_rate_coefficient_conditions(self):
         """
-        Populates the forwardRateCoefficients, reverseRateCoefficients and equilibriumConstants
-        arrays with the values computed at the temperature and (effective) pressure of the 
-        reacion system.
+        Return the temperature and pressure of the reactor.
         """
-        
-        for rxn in itertools.chain(coreReactions, edgeReactions):
-            j = self.reactionIndex[rxn]
-            self.kf[j] = rxn.getRateCoefficient(self.T.value_si, self.P.value_si)
-            if rxn.reversible:
-                self.Keq[j] = rxn.getEquilibriumConstant(self.T.value_si)
-                self.kb[j] = self.kf[j] / self.Keq[j]
+        return (self.T.value_si, self.P.value_si)
+
+    def calculate_rate_coefficients(self, rxn):
+        """
+        Return the forward rate coefficient, equilibrium constant and reverse
+        rate coefficient of the reaction `rxn` at the temperature and
+        pressure of the reaction system.
+        """
+        kf = rxn.getRateCoefficient(self.T.value_si, self.P.value_si)
+        if rxn.reversible:
+            Keq = rxn.getEquilibriumConstant(self.T.value_si)
+            return kf, Keq, kf / Keq
+        return kf, 0.0, 0.0
 
     def set_initial_conditions(self):
         """
@@ -164,141 +168,38 @@ cdef class LiquidReactor(ReactionSystem):
         Return the residual function for the governing DAE system for the
         liquid reaction system.
         """
-        cdef numpy.ndarray[numpy.int_t, ndim=2] ir, ip, inet
-        cdef numpy.ndarray[numpy.float64_t, ndim=1] res, kf, kr, knet, delta, equilibriumConstants
-        cdef int numCoreSpecies, numCoreReactions, numEdgeSpecies, numEdgeReactions, numPdepNetworks
-        cdef int i, j, z, first, second, third
-        cdef double k, V, reactionRate
-        cdef numpy.ndarray[numpy.float64_t, ndim=1] coreSpeciesConcentrations, coreSpeciesRates, coreReactionRates, edgeSpeciesRates, edgeReactionRates, networkLeakRates
+        cdef numpy.ndarray[numpy.float64_t, ndim=1] res, kf, kr, knet, delta
+        cdef int numCoreSpecies, numCoreReactions
+        cdef int i, j, z
+        cdef double V
+        cdef numpy.ndarray[numpy.float64_t, ndim=1] reactionRates, coreSpeciesRates, edgeSpeciesRates, networkLeakRates
         cdef numpy.ndarray[numpy.float64_t, ndim=1] C
-        cdef numpy.ndarray[numpy.float64_t, ndim=2] jacobian, dgdk
-
-        ir = self.reactantIndices
-        ip = self.productIndices
-        equilibriumConstants = self.Keq
 
         kf = self.kf
         kr = self.kb
         
-        inet = self.networkIndices
         knet = self.networkLeakCoefficients
 
         numCoreSpecies = len(self.coreSpeciesRates)
         numCoreReactions = len(self.coreReactionRates)
-        numEdgeSpecies = len(self.edgeSpeciesRates)
-        numEdgeReactions = len(self.edgeReactionRates)
-        numPdepNetworks = len(self.networkLeakRates)
-        
-        
-        res = numpy.zeros(numCoreSpecies, numpy.float64)
-
-        coreSpeciesConcentrations = numpy.zeros_like(self.coreSpeciesConcentrations)
-        coreSpeciesRates = numpy.zeros_like(self.coreSpeciesRates)
-        coreReactionRates = numpy.zeros_like(self.coreReactionRates)
-        edgeSpeciesRates = numpy.zeros_like(self.edgeSpeciesRates)
-        edgeReactionRates = numpy.zeros_like(self.edgeReactionRates)
-        networkLeakRates = numpy.zeros_like(self.networkLeakRates)
-        
 
-        C = numpy.zeros_like(self.coreSpeciesConcentrations)
         V =  self.V # constant volume reactor
 
-        for j in xrange(numCoreSpecies):
-            C[j] = y[j] / V
-            coreSpeciesConcentrations[j] = C[j]
-        
-        for j in xrange(ir.shape[0]):
-            k = kf[j]
-            if ir[j,0] >= numCoreSpecies or ir[j,1] >= numCoreSpecies or ir[j,2] >= numCoreSpecies:
-                reactionRate = 0.0
-            elif ir[j,1] == -1: # only one reactant
-                reactionRate = k * C[ir[j,0]]
-            elif ir[j,2] == -1: # only two reactants
-                reactionRate = k * C[ir[j,0]] * C[ir[j,1]]
-            else: # three reactants!! (really?)
-                reactionRate = k * C[ir[j,0]] * C[ir[j,1]] * C[ir[j,2]]
-            k = kr[j]
-            if ip[j,0] >= numCoreSpecies or ip[j,1] >= numCoreSpecies or ip[j,2] >= numCoreSpecies:
-                pass
-            elif ip[j,1] == -1: # only one reactant
-                reactionRate -= k * C[ip[j,0]]
-            elif ip[j,2] == -1: # only two reactants
-                reactionRate -= k * C[ip[j,0]] * C[ip[j,1]]
-            else: # three reactants!! (really?)
-                reactionRate -= k * C[ip[j,0]] * C[ip[j,1]] * C[ip[j,2]]
-
-            # Set the reaction and species rates
-            if j < numCoreReactions:
-                # The reaction is a core reaction
-                coreReactionRates[j] = reactionRate
-
-                # Add/substract the total reaction rate from each species rate
-                # Since it's a core reaction we know that all of its reactants
-                # and products are core species
-                first = ir[j,0]
-                coreSpeciesRates[first] -= reactionRate
-                second = ir[j,1]
-                if second != -1:
-                    coreSpeciesRates[second] -= reactionRate
-                    third = ir[j,2]
-                    if third != -1:
-                        coreSpeciesRates[third] -= reactionRate
-                first = ip[j,0]
-                coreSpeciesRates[first] += reactionRate
-                second = ip[j,1]
-                if second != -1:
-                    coreSpeciesRates[second] += reactionRate
-                    third = ip[j,2]
-                    if third != -1:
-                        coreSpeciesRates[third] += reactionRate
-
-            else:
-                # The reaction is an edge reaction
-                edgeReactionRates[j-numCoreReactions] = reactionRate
-
-                # Add/substract the total reaction rate from each species rate
-                # Since it's an edge reaction its reactants and products could
-                # be either core or edge species
-                # We're only interested in the edge species
-                first = ir[j,0]
-                if first >= numCoreSpecies: edgeSpeciesRates[first-numCoreSpecies] -= reactionRate
-                second = ir[j,1]
-                if second != -1:
-                    if second >= numCoreSpecies: edgeSpeciesRates[second-numCoreSpecies] -= reactionRate
-                    third = ir[j,2]
-                    if third != -1:
-                        if third >= numCoreSpecies: edgeSpeciesRates[third-numCoreSpecies] -= reactionRate
-                first = ip[j,0]
-                if first >= numCoreSpecies: edgeSpeciesRates[first-numCoreSpecies] += reactionRate
-                second = ip[j,1]
-                if second != -1:
-                    if second >= numCoreSpecies: edgeSpeciesRates[second-numCoreSpecies] += reactionRate
-                    third = ip[j,2]
-                    if third != -1:
-                        if third >= numCoreSpecies: edgeSpeciesRates[third-numCoreSpecies] += reactionRate
-
-        for j in xrange(inet.shape[0]):
-            k = knet[j]
-            if inet[j,1] == -1: # only one reactant
-                reactionRate = k * C[inet[j,0]]
-            elif inet[j,2] == -1: # only two reactants
-                reactionRate = k * C[inet[j,0]] * C[inet[j,1]]
-            else: # three reactants!! (really?)
-                reactionRate = k * C[inet[j,0]] * C[inet[j,1]] * C[inet[j,2]]
-            networkLeakRates[j] = reactionRate
+        C = y[:numCoreSpecies] / V
 
+        reactionRates, coreSpeciesRates, edgeSpeciesRates = self.rateKernel.getRates(C, kf, kr)
+        networkLeakRates = self.rateKernel.getNetworkLeakRates(C, knet)
 
         #chatelak: Same as in Java, coreSpecies rate = 0 if declared as constatn 
         if self.constSPCIndices is not None:
             for spcIndice in self.constSPCIndices:
                 coreSpeciesRates[spcIndice] = 0
 
-
-        self.coreSpeciesConcentrations = coreSpeciesConcentrations
+        self.coreSpeciesConcentrations = C
         self.coreSpeciesRates = coreSpeciesRates
-        self.coreReactionRates = coreReactionRates
+        self.coreReactionRates = reactionRates[:numCoreReactions]
         self.edgeSpeciesRates = edgeSpeciesRates
-        self.edgeReactionRates = edgeReactionRates
+        self.edgeReactionRates = reactionRates[numCoreReactions:]
         self.networkLeakRates = networkLeakRates
 
         res = coreSpeciesRates * V 
@@ -307,20 +208,47 @@ cdef class LiquidReactor(ReactionSystem):
         if self.sensitivity:
             delta = numpy.zeros(len(y), numpy.float64)
             delta[:numCoreSpecies] = res
-            if self.jacobianMatrix is None:
-                jacobian = self.jacobian(t,y,dydt,0,senpar)
-            else:
-                jacobian = self.jacobianMatrix
-            dgdk = ReactionSystem.computeRateDerivative(self)
-            for j in xrange(numCoreReactions+numCoreSpecies):
-                for i in xrange(numCoreSpecies):
-                    for z in xrange(numCoreSpecies):
-                        delta[(j+1)*numCoreSpecies + i] += jacobian[i,z]*y[(j+1)*numCoreSpecies + z] 
-                    delta[(j+1)*numCoreSpecies + i] += dgdk[i,j]
+            matrix, correction = self.get_sparse_jacobian(y)
+            delta[numCoreSpecies:] = self.compute_sensitivity_residual(y, matrix, correction)
 
         else:
             delta = res
         delta = delta - dydt
         
         # Return DELTA, IRES.  IRES is set to 1 in order to tell DASPK to evaluate the sensitivity residuals
-        return delta, 1
\ No newline at end of file
+        return delta, 1
+
+    @cython.boundscheck(False)
+    def jacobian(self, double t, numpy.ndarray[numpy.float64_t, ndim=1] y, numpy.ndarray[numpy.float64_t, ndim=1] dydt, double cj, numpy.ndarray[numpy.float64_t, ndim=1] senpar = numpy.zeros(1, numpy.float64)):
+        """
+        Return the analytical Jacobian for the reaction system.
+
+        The iteration matrix is assembled from the sparse Jacobian in the
+        array `jacobianMatrix`, which is reused by the next call.
+        """
+        matrix, correction = self.get_sparse_jacobian(y)
+
+        self.jacobianMatrix = self.sparseJacobian.getIterationMatrix(matrix, cj, correction, self.jacobianMatrix)
+        return self.jacobianMatrix
+
+    def get_sparse_jacobian(self, numpy.ndarray[numpy.float64_t, ndim=1] y):
+        """
+        Return the Jacobian of the core species mole balances as a
+        :class:`scipy.sparse.csr_matrix` given the state `y`, and None for
+        its rank-one update, since the volume is constant.
+        """
+        cdef numpy.ndarray[numpy.float64_t, ndim=1] C
+        cdef int numCoreSpecies
+
+        numCoreSpecies = len(self.coreSpeciesConcentrations)
+
+        C = y[:numCoreSpecies] / self.V # constant volume reactor
+
+        matrix = self.sparseJacobian.getMatrix(C, self.kf, self.kb)
+
+        # The rates of species held constant are zero
+        if self.constSPCIndices is not None:
+            for i in self.constSPCIndices:
+                matrix.data[matrix.indptr[i]:matrix.indptr[i+1]] = 0.0
+
+        return matrix, None
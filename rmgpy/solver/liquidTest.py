@@ -4,7 +4,6 @@
 import unittest
 import numpy
 import os
-from external.wip import work_in_progress
 
 import rmgpy.quantity
 
@@ -111,7 +110,6 @@ class LiquidReactorCheck(unittest.TestCase):
         self.assertAlmostEqual(reactionRates[-1,0], 0.0, delta=1e-2)
         
 
-    @work_in_progress
     def test_jacobian(self):
         """
         Unit test for the jacobian function:
@@ -177,6 +175,30 @@ class LiquidReactorCheck(unittest.TestCase):
         #print 'Numerical jacobian'
         #print jacobian
 
+
+    def test_iterationMatrix(self):
+        """
+        Test that the jacobian function returns the iteration matrix
+        J - cj*I, assembled in an array that is reused by the next call.
+        """
+        coreSpecies = [self.CH4,self.CH3,self.C2H6,self.C2H5,self.H2]
+        coreReactions = [
+            Reaction(reactants=[self.C2H6], products=[self.CH3,self.CH3], kinetics=Arrhenius(A=(686.375*6,'1/s'), n=4.40721, Ea=(7.82799,'kcal/mol'), T0=(298.15,'K'))),
+            Reaction(reactants=[self.C2H6,self.CH3], products=[self.C2H5,self.CH4], kinetics=Arrhenius(A=(46.375*6,'m^3/(mol*s)'), n=3.40721, Ea=(6.82799,'kcal/mol'), T0=(298.15,'K'))),
+        ]
+        numCoreSpecies = len(coreSpecies)
+        c0={self.CH4:0.2,self.CH3:0.1,self.C2H6:0.35,self.C2H5:0.15, self.H2:0.2}
+
+        rxnSystem = LiquidReactor(self.T, c0, termination=[])
+        rxnSystem.initializeModel(coreSpecies, coreReactions, [], [])
+        dydt = numpy.zeros(rxnSystem.y.shape)
+        jacobian = rxnSystem.jacobian(0.0, rxnSystem.y, dydt, 0.0).copy()
+        pd = rxnSystem.jacobian(0.0, rxnSystem.y, dydt, 10.0)
+        self.assertTrue(numpy.allclose(pd, jacobian - 10.0 * numpy.identity(numCoreSpecies), rtol=1e-12, atol=0.0))
+        self.assertTrue(rxnSystem.jacobian(0.0, rxnSystem.y, dydt, 10.0) is pd)
+        # H2 is not coupled to any other species
+        self.assertTrue(numpy.all(jacobian[4,:] == 0))
+        self.assertTrue(numpy.all(jacobian[:,4] == 0))
      
     def test_compute_derivative(self):
 
@@ -34,6 +34,7 @@ import numpy
 cimport numpy
 
 import itertools
+import logging
     
 from base cimport ReactionSystem
 cimport cython
@@ -84,6 +85,24 @@ cdef class SimpleReactor(ReactionSystem):
     """
     cdef public numpy.ndarray pdepColliderReactionIndices
 
+    """
+    colliderReactionRows:
+    a dictionary with the indices of the reactions that have pressure dependent
+    kinetics as keys, and values equal to the index of the reaction in
+    pdepColliderReactionIndices, i.e. the row of its collider efficiencies.
+    """
+    cdef public dict colliderReactionRows
+
+    """
+    colliderPressures:
+    array that contains the effective pressures at which the forward rate
+    coefficients of the pressure dependent reactions were last evaluated.
+    They are evaluated again when the effective pressure changes by more
+    than the relative colliderPressureTolerance.
+    """
+    cdef public numpy.ndarray colliderPressures
+    cdef public double colliderPressureTolerance
+
 
     def __init__(self, T, P, initialMoleFractions, termination, sensitiveSpecies=None, sensitivityThreshold=1e-3):
         ReactionSystem.__init__(self, termination, sensitiveSpecies, sensitivityThreshold)
@@ -97,6 +116,9 @@ cdef class SimpleReactor(ReactionSystem):
         self.pdepColliderReactionIndices = None
         self.pdepColliderKinetics = None
         self.colliderEfficiencies = None
+        self.colliderReactionRows = None
+        self.colliderPressures = None
+        self.colliderPressureTolerance = 1e-6
         
 
     def __reduce__(self):
@@ -145,6 +167,18 @@ cdef class SimpleReactor(ReactionSystem):
         # Initialize the model
         ReactionSystem.initialize_solver(self)
 
+    def restore_model(self, coreSpecies, coreReactions, edgeSpecies, edgeReactions):
+        """
+        Rebuild the attributes that refer to the species and reactions of the
+        model, including the kinetics of the reactions with collider
+        efficiencies, after a simulation run by a copy of the reaction system
+        in another process.
+        """
+        ReactionSystem.restore_model(self, coreSpecies, coreReactions, edgeSpecies, edgeReactions)
+        if self.pdepColliderReactionIndices is not None:
+            reactions = list(itertools.chain(coreReactions, edgeReactions))
+            self.pdepColliderKinetics = [reactions[j].kinetics for j in self.pdepColliderReactionIndices]
+
     def calculate_effective_pressure(self, rxn):
         """
         Computes the effective pressure for a reaction as:
@@ -153,54 +187,66 @@ cdef class SimpleReactor(ReactionSystem):
             - P the pressure of the reactor,
             - y the array of initial moles of the core species
 
+        The effective pressures are computed for all the reactions at once
+        by set_colliders.
         """
+        i = self.colliderReactionRows.get(self.reactionIndex[rxn])
+        if i is None:
+            return self.P.value_si
+        return self.colliderPressures[i]
 
-        y0_coreSpecies = self.y0[:self.numCoreSpecies]
-        sum_core_species = numpy.sum(y0_coreSpecies)
-        
-        j = self.reactionIndex[rxn]
-        for i in xrange(self.pdepColliderReactionIndices.shape[0]):
-            if j == self.pdepColliderReactionIndices[i]:
-                # Calculate effective pressure
-                Peff = self.P.value_si * numpy.sum(self.colliderEfficiencies[i]*y0_coreSpecies / sum_core_species)
-                return Peff          
-        return self.P.value_si
-
-    def generate_rate_coefficients(self, coreReactions, edgeReactions):
+    def get_rate_coefficient_conditions(self):
         """
-        Populates the forward rate coefficients (kf), reverse rate coefficients (kb)
-        and equilibrium constants (Keq) arrays with the values computed at the temperature
-        and (effective) pressure of the reacion system.
+        Return the temperature and pressure of the reactor and its initial
+        mole fractions, which the effective pressures of the reactions with
+        collider efficiencies are computed from.
         """
+        initialMoleFractions = tuple(sorted([(spec.label, moleFrac) for spec, moleFrac in self.initialMoleFractions.iteritems()]))
+        return (self.T.value_si, self.P.value_si, initialMoleFractions)
 
-        for rxn in itertools.chain(coreReactions, edgeReactions):
-            j = self.reactionIndex[rxn]
-            Peff = self.calculate_effective_pressure(rxn)
-            self.kf[j] = rxn.getRateCoefficient(self.T.value_si, Peff)
-
-            if rxn.reversible:
-                self.Keq[j] = rxn.getEquilibriumConstant(self.T.value_si)
-                self.kb[j] = self.kf[j] / self.Keq[j]
+    def calculate_rate_coefficients(self, rxn):
+        """
+        Return the forward rate coefficient, equilibrium constant and reverse
+        rate coefficient of the reaction `rxn` at the temperature and
+        (effective) pressure of the reaction system.
+        """
+        kf = rxn.getRateCoefficient(self.T.value_si, self.calculate_effective_pressure(rxn))
+        if rxn.reversible:
+            Keq = rxn.getEquilibriumConstant(self.T.value_si)
+            return kf, Keq, kf / Keq
+        return kf, 0.0, 0.0
 
 
     def set_colliders(self, coreReactions, edgeReactions, coreSpecies):
         """
-        Store collider efficiencies and reaction indices for pdep reactions that have specific collider efficiencies.
+        Store collider efficiencies and reaction indices for pdep reactions that have specific collider efficiencies,
+        and compute their effective pressures at the initial conditions.
         """
         pdepColliderReactionIndices = []
         self.pdepColliderKinetics = []
+        self.colliderReactionRows = {}
         colliderEfficiencies = []
 
         for rxn in itertools.chain(coreReactions, edgeReactions):
             if rxn.kinetics.isPressureDependent():
                 if rxn.kinetics.efficiencies:
                     j = self.reactionIndex[rxn]
+                    self.colliderReactionRows[j] = len(pdepColliderReactionIndices)
                     pdepColliderReactionIndices.append(j)
                     self.pdepColliderKinetics.append(rxn.kinetics)
                     colliderEfficiencies.append(rxn.kinetics.getEffectiveColliderEfficiencies(coreSpecies))
         
         self.pdepColliderReactionIndices = numpy.array(pdepColliderReactionIndices, numpy.int)
-        self.colliderEfficiencies = numpy.array(colliderEfficiencies, numpy.float64)
+        self.colliderEfficiencies = numpy.array(colliderEfficiencies, numpy.float64).reshape(-1, len(coreSpecies))
+        self.colliderPressures = self.calculate_effective_pressures(self.y0[:self.numCoreSpecies])
+
+    def calculate_effective_pressures(self, numpy.ndarray[numpy.float64_t, ndim=1] y_coreSpecies):
+        """
+        Return the array of the effective pressures of the pdep reactions that
+        have specific collider efficiencies, for the numbers of moles of the
+        core species `y_coreSpecies`.
+        """
+        return self.P.value_si * self.colliderEfficiencies.dot(y_coreSpecies) / numpy.sum(y_coreSpecies)
 
 
     def set_initial_conditions(self):
@@ -237,153 +283,54 @@ cdef class SimpleReactor(ReactionSystem):
         Return the residual function for the governing DAE system for the
         simple reaction system.
         """
-        cdef numpy.ndarray[numpy.int_t, ndim=2] ir, ip, inet
         cdef numpy.ndarray[numpy.float64_t, ndim=1] res, kf, kr, knet, delta, equilibriumConstants
-        cdef int numCoreSpecies, numCoreReactions, numEdgeSpecies, numEdgeReactions, numPdepNetworks
-        cdef int i, j, z, first, second, third
-        cdef double k, V, reactionRate, T, P, Peff
-        cdef numpy.ndarray[numpy.float64_t, ndim=1] coreSpeciesConcentrations, coreSpeciesRates, coreReactionRates, edgeSpeciesRates, edgeReactionRates, networkLeakRates
-        cdef numpy.ndarray[numpy.float64_t, ndim=1] C, y_coreSpecies
-        cdef numpy.ndarray[numpy.float64_t, ndim=2] jacobian, dgdk, colliderEfficiencies
+        cdef int numCoreSpecies, numCoreReactions
+        cdef int i, j, z
+        cdef double V, T, Peff
+        cdef numpy.ndarray[numpy.float64_t, ndim=1] reactionRates, coreSpeciesRates, edgeSpeciesRates, networkLeakRates
+        cdef numpy.ndarray[numpy.float64_t, ndim=1] C, y_coreSpecies, Peffs, colliderPressures
         cdef numpy.ndarray[numpy.int_t, ndim=1] pdepColliderReactionIndices
         cdef list pdepColliderKinetics
 
-        ir = self.reactantIndices
-        ip = self.productIndices
-        
         numCoreSpecies = len(self.coreSpeciesRates)
         numCoreReactions = len(self.coreReactionRates)
-        numEdgeSpecies = len(self.edgeSpeciesRates)
-        numEdgeReactions = len(self.edgeReactionRates)
-        numPdepNetworks = len(self.networkLeakRates)
         kf = self.kf
         kr = self.kb
         
         y_coreSpecies = y[:numCoreSpecies]
         
-        # Recalculate any forward and reverse rate coefficients that involve pdep collision efficiencies
+        # Recalculate any forward and reverse rate coefficients that involve pdep collision efficiencies,
+        # if the effective pressure has changed since they were last calculated
         if self.pdepColliderReactionIndices.shape[0] != 0:
             T = self.T.value_si
-            P = self.P.value_si
             equilibriumConstants = self.Keq
             pdepColliderReactionIndices = self.pdepColliderReactionIndices
             pdepColliderKinetics = self.pdepColliderKinetics
-            colliderEfficiencies = self.colliderEfficiencies
-            for i in xrange(pdepColliderReactionIndices.shape[0]):
-                # Calculate effective pressure
-                Peff = P*numpy.sum(colliderEfficiencies[i]*y_coreSpecies / numpy.sum(y_coreSpecies))
+            colliderPressures = self.colliderPressures
+            Peffs = self.calculate_effective_pressures(y_coreSpecies)
+            for i in numpy.flatnonzero(numpy.abs(Peffs - colliderPressures) > self.colliderPressureTolerance * colliderPressures):
+                Peff = Peffs[i]
+                colliderPressures[i] = Peff
                 j = pdepColliderReactionIndices[i]
                 kf[j] = pdepColliderKinetics[i].getRateCoefficient(T, Peff)
-                kr[j] = kf[j] / equilibriumConstants[j]
+                kr[j] = kf[j] / equilibriumConstants[j] if equilibriumConstants[j] != 0 else 0.0
             
-        inet = self.networkIndices
         knet = self.networkLeakCoefficients
-        
-        
-        res = numpy.zeros(numCoreSpecies, numpy.float64)
-
-        coreSpeciesConcentrations = numpy.zeros_like(self.coreSpeciesConcentrations)
-        coreSpeciesRates = numpy.zeros_like(self.coreSpeciesRates)
-        coreReactionRates = numpy.zeros_like(self.coreReactionRates)
-        edgeSpeciesRates = numpy.zeros_like(self.edgeSpeciesRates)
-        edgeReactionRates = numpy.zeros_like(self.edgeReactionRates)
-        networkLeakRates = numpy.zeros_like(self.networkLeakRates)
 
-        C = numpy.zeros_like(self.coreSpeciesConcentrations)
-        
         # Use ideal gas law to compute volume
         V = constants.R * self.T.value_si * numpy.sum(y_coreSpecies) / self.P.value_si
         self.V = V
 
-        for j in xrange(numCoreSpecies):
-            C[j] = y[j] / V
-            coreSpeciesConcentrations[j] = C[j]
-        
-        for j in xrange(ir.shape[0]):
-            k = kf[j]
-            if ir[j,0] >= numCoreSpecies or ir[j,1] >= numCoreSpecies or ir[j,2] >= numCoreSpecies:
-                reactionRate = 0.0
-            elif ir[j,1] == -1: # only one reactant
-                reactionRate = k * C[ir[j,0]]
-            elif ir[j,2] == -1: # only two reactants
-                reactionRate = k * C[ir[j,0]] * C[ir[j,1]]
-            else: # three reactants!! (really?)
-                reactionRate = k * C[ir[j,0]] * C[ir[j,1]] * C[ir[j,2]]
-            k = kr[j]
-            if ip[j,0] >= numCoreSpecies or ip[j,1] >= numCoreSpecies or ip[j,2] >= numCoreSpecies:
-                pass
-            elif ip[j,1] == -1: # only one reactant
-                reactionRate -= k * C[ip[j,0]]
-            elif ip[j,2] == -1: # only two reactants
-                reactionRate -= k * C[ip[j,0]] * C[ip[j,1]]
-            else: # three reactants!! (really?)
-                reactionRate -= k * C[ip[j,0]] * C[ip[j,1]] * C[ip[j,2]]
-
-            # Set the reaction and species rates
-            if j < numCoreReactions:
-                # The reaction is a core reaction
-                coreReactionRates[j] = reactionRate
-
-                # Add/substract the total reaction rate from each species rate
-                # Since it's a core reaction we know that all of its reactants
-                # and products are core species
-                first = ir[j,0]
-                coreSpeciesRates[first] -= reactionRate
-                second = ir[j,1]
-                if second != -1:
-                    coreSpeciesRates[second] -= reactionRate
-                    third = ir[j,2]
-                    if third != -1:
-                        coreSpeciesRates[third] -= reactionRate
-                first = ip[j,0]
-                coreSpeciesRates[first] += reactionRate
-                second = ip[j,1]
-                if second != -1:
-                    coreSpeciesRates[second] += reactionRate
-                    third = ip[j,2]
-                    if third != -1:
-                        coreSpeciesRates[third] += reactionRate
-
-            else:
-                # The reaction is an edge reaction
-                edgeReactionRates[j-numCoreReactions] = reactionRate
-
-                # Add/substract the total reaction rate from each species rate
-                # Since it's an edge reaction its reactants and products could
-                # be either core or edge species
-                # We're only interested in the edge species
-                first = ir[j,0]
-                if first >= numCoreSpecies: edgeSpeciesRates[first-numCoreSpecies] -= reactionRate
-                second = ir[j,1]
-                if second != -1:
-                    if second >= numCoreSpecies: edgeSpeciesRates[second-numCoreSpecies] -= reactionRate
-                    third = ir[j,2]
-                    if third != -1:
-                        if third >= numCoreSpecies: edgeSpeciesRates[third-numCoreSpecies] -= reactionRate
-                first = ip[j,0]
-                if first >= numCoreSpecies: edgeSpeciesRates[first-numCoreSpecies] += reactionRate
-                second = ip[j,1]
-                if second != -1:
-                    if second >= numCoreSpecies: edgeSpeciesRates[second-numCoreSpecies] += reactionRate
-                    third = ip[j,2]
-                    if third != -1:
-                        if third >= numCoreSpecies: edgeSpeciesRates[third-numCoreSpecies] += reactionRate
-
-        for j in xrange(inet.shape[0]):
-            k = knet[j]
-            if inet[j,1] == -1: # only one reactant
-                reactionRate = k * C[inet[j,0]]
-            elif inet[j,2] == -1: # only two reactants
-                reactionRate = k * C[inet[j,0]] * C[inet[j,1]]
-            else: # three reactants!! (really?)
-                reactionRate = k * C[inet[j,0]] * C[inet[j,1]] * C[inet[j,2]]
-            networkLeakRates[j] = reactionRate
-
-        self.coreSpeciesConcentrations = coreSpeciesConcentrations
+        C = y_coreSpecies / V
+
+        reactionRates, coreSpeciesRates, edgeSpeciesRates = self.rateKernel.getRates(C, kf, kr)
+        networkLeakRates = self.rateKernel.getNetworkLeakRates(C, knet)
+
+        self.coreSpeciesConcentrations = C
         self.coreSpeciesRates = coreSpeciesRates
-        self.coreReactionRates = coreReactionRates
+        self.coreReactionRates = reactionRates[:numCoreReactions]
         self.edgeSpeciesRates = edgeSpeciesRates
-        self.edgeReactionRates = edgeReactionRates
+        self.edgeReactionRates = reactionRates[numCoreReactions:]
         self.networkLeakRates = networkLeakRates
 
         res = coreSpeciesRates * V 
@@ -392,16 +339,8 @@ cdef class SimpleReactor(ReactionSystem):
         if self.sensitivity:
             delta = numpy.zeros(len(y), numpy.float64)
             delta[:numCoreSpecies] = res
-            if self.jacobianMatrix is None:
-                jacobian = self.jacobian(t,y,dydt,0,senpar)
-            else:
-                jacobian = self.jacobianMatrix
-            dgdk = ReactionSystem.computeRateDerivative(self)
-            for j in xrange(numCoreReactions+numCoreSpecies):
-                for i in xrange(numCoreSpecies):
-                    for z in xrange(numCoreSpecies):
-                        delta[(j+1)*numCoreSpecies + i] += jacobian[i,z]*y[(j+1)*numCoreSpecies + z] 
-                    delta[(j+1)*numCoreSpecies + i] += dgdk[i,j]
+            matrix, correction = self.get_sparse_jacobian(y)
+            delta[numCoreSpecies:] = self.compute_sensitivity_residual(y, matrix, correction)
 
         else:
             delta = res
@@ -410,492 +349,41 @@ cdef class SimpleReactor(ReactionSystem):
         # Return DELTA, IRES.  IRES is set to 1 in order to tell DASPK to evaluate the sensitivity residuals
         return delta, 1
     
-    @cython.boundscheck(False)
-    def jacobian(self, double t, numpy.ndarray[numpy.float64_t, ndim=1] y, numpy.ndarray[numpy.float64_t, ndim=1] dydt, double cj, numpy.ndarray[numpy.float64_t, ndim=1] senpar = numpy.zeros(1, numpy.float64)):
+    def get_sparse_jacobian(self, numpy.ndarray[numpy.float64_t, ndim=1] y):
         """
-        Return the analytical Jacobian for the reaction system.
+        Return the Jacobian of the core species mole balances at constant
+        volume as a :class:`scipy.sparse.csr_matrix`, and the vector of its
+        rank-one update from the change in volume with the total number of
+        moles at constant pressure, given the state `y`.
         """
-        cdef numpy.ndarray[numpy.int_t, ndim=2] ir, ip
-        cdef numpy.ndarray[numpy.float64_t, ndim=1] kf, kr, C
-        cdef numpy.ndarray[numpy.float64_t, ndim=2] pd
-        cdef int numCoreReactions, numCoreSpecies, i, j
-        cdef double k, V, Ctot, deriv, corr
-        
-        ir = self.reactantIndices
-        ip = self.productIndices
+        cdef numpy.ndarray[numpy.float64_t, ndim=1] C
+        cdef int numCoreSpecies
+        cdef double V, Ctot
 
-        kf = self.kf
-        kr = self.kb
-        numCoreReactions = len(self.coreReactionRates)
         numCoreSpecies = len(self.coreSpeciesConcentrations)
-        
-        pd = -cj * numpy.identity(numCoreSpecies, numpy.float64)
-        
+
         V = constants.R * self.T.value_si * numpy.sum(y[:numCoreSpecies]) / self.P.value_si
-        
+
         Ctot = self.P.value_si /(constants.R * self.T.value_si)
 
-        C = numpy.zeros_like(self.coreSpeciesConcentrations)
-        for j in xrange(numCoreSpecies):
-            C[j] = y[j] / V
-
-        for j in xrange(numCoreReactions):
-           
-            k = kf[j]
-            if ir[j,1] == -1: # only one reactant
-                deriv = k
-                pd[ir[j,0], ir[j,0]] -= deriv
-                
-                pd[ip[j,0], ir[j,0]] += deriv                
-                if ip[j,1] != -1:
-                    pd[ip[j,1], ir[j,0]] += deriv
-                    if ip[j,2] != -1:
-                        pd[ip[j,2], ir[j,0]] += deriv
-                
-                                
-            elif ir[j,2] == -1: # only two reactants
-                corr = - k * C[ir[j,0]] * C[ir[j,1]] / Ctot
-                if ir[j,0] == ir[j,1]:  # reactants are the same
-                    deriv = 2 * k * C[ir[j,0]]
-                    pd[ir[j,0], ir[j,0]] -= 2 * deriv
-                    for i in xrange(numCoreSpecies):
-                        pd[ir[j,0], i] -= 2 * corr
-                    
-                    pd[ip[j,0], ir[j,0]] += deriv                       
-                    for i in xrange(numCoreSpecies):
-                        pd[ip[j,0], i] += corr    
-                    if ip[j,1] != -1:
-                        pd[ip[j,1], ir[j,0]] += deriv                                               
-                        for i in xrange(numCoreSpecies):
-                            pd[ip[j,1], i] += corr    
-                        if ip[j,2] != -1:
-                            pd[ip[j,2], ir[j,0]] += deriv                                          
-                            for i in xrange(numCoreSpecies):
-                                pd[ip[j,2], i] += corr    
-                    
-                else:
-                    # Derivative with respect to reactant 1
-                    deriv = k * C[ir[j, 1]]
-                    pd[ir[j,0], ir[j,0]] -= deriv                    
-                    pd[ir[j,1], ir[j,0]] -= deriv                        
-                    
-                    pd[ip[j,0], ir[j,0]] += deriv       
-                    if ip[j,1] != -1:
-                        pd[ip[j,1], ir[j,0]] += deriv
-                        if ip[j,2] != -1:
-                            pd[ip[j,2], ir[j,0]] += deriv
-                    
-                    # Derivative with respect to reactant 2
-                    deriv = k * C[ir[j, 0]] 
-                    pd[ir[j,0], ir[j,1]] -= deriv                    
-                    pd[ir[j,1], ir[j,1]] -= deriv                                           
-                    for i in xrange(numCoreSpecies):
-                        pd[ir[j,0], i] -= corr
-                        pd[ir[j,1], i] -= corr     
-                            
-                    pd[ip[j,0], ir[j,1]] += deriv                       
-                    for i in xrange(numCoreSpecies):
-                        pd[ip[j,0], i] += corr    
-                    if ip[j,1] != -1:
-                        pd[ip[j,1], ir[j,1]] += deriv                                               
-                        for i in xrange(numCoreSpecies):
-                            pd[ip[j,1], i] += corr    
-                        if ip[j,2] != -1:
-                            pd[ip[j,2], ir[j,1]] += deriv                                          
-                            for i in xrange(numCoreSpecies):
-                                pd[ip[j,2], i] += corr               
-                    
-                    
-            else: # three reactants!! (really?)
-                corr = - 2* k * C[ir[j,0]] * C[ir[j,1]] * C[ir[j,2]] / Ctot
-                if (ir[j,0] == ir[j,1] & ir[j,0] == ir[j,2]):
-                    deriv = 3 * k * C[ir[j,0]] * C[ir[j,0]] 
-                    pd[ir[j,0], ir[j,0]] -= 3 * deriv                                                           
-                    for i in xrange(numCoreSpecies):
-                        pd[ir[j,0], i] -= 3 * corr
-                    
-                    pd[ip[j,0], ir[j,0]] += deriv                       
-                    for i in xrange(numCoreSpecies):
-                        pd[ip[j,0], i] += corr    
-                    if ip[j,1] != -1:
-                        pd[ip[j,1], ir[j,0]] += deriv                                               
-                        for i in xrange(numCoreSpecies):
-                            pd[ip[j,1], i] += corr    
-                        if ip[j,2] != -1:
-                            pd[ip[j,2], ir[j,0]] += deriv                                          
-                            for i in xrange(numCoreSpecies):
-                                pd[ip[j,2], i] += corr        
-                    
-                elif ir[j,0] == ir[j,1]:
-                    # derivative with respect to reactant 1
-                    deriv = 2 * k * C[ir[j,0]] * C[ir[j,2]]
-                    pd[ir[j,0], ir[j,0]] -= 2 * deriv                  
-                    pd[ir[j,2], ir[j,0]] -= deriv    
-                    
-                    pd[ip[j,0], ir[j,0]] += deriv       
-                    if ip[j,1] != -1:
-                        pd[ip[j,1], ir[j,0]] += deriv
-                        if ip[j,2] != -1:
-                            pd[ip[j,2], ir[j,0]] += deriv
-                    
-                    # derivative with respect to reactant 3
-                    deriv = k * C[ir[j,0]] * C[ir[j,0]] 
-                    pd[ir[j,0], ir[j,2]] -= 2 * deriv                  
-                    pd[ir[j,2], ir[j,2]] -= deriv                                                                                           
-                    for i in xrange(numCoreSpecies):
-                        pd[ir[j,0], i] -= 2 * corr
-                        pd[ir[j,2], i] -= corr
-                        
-                    pd[ip[j,0], ir[j,2]] += deriv                       
-                    for i in xrange(numCoreSpecies):
-                        pd[ip[j,0], i] += corr    
-                    if ip[j,1] != -1:
-                        pd[ip[j,1], ir[j,2]] += deriv                                               
-                        for i in xrange(numCoreSpecies):
-                            pd[ip[j,1], i] += corr    
-                        if ip[j,2] != -1:
-                            pd[ip[j,2], ir[j,2]] += deriv                                          
-                            for i in xrange(numCoreSpecies):
-                                pd[ip[j,2], i] += corr    
-                    
-                    
-                elif ir[j,1] == ir[j,2]:                    
-                    # derivative with respect to reactant 1
-                    deriv = k * C[ir[j,1]] * C[ir[j,1]] 
-                    pd[ir[j,0], ir[j,0]] -= deriv                    
-                    pd[ir[j,1], ir[j,0]] -= 2 * deriv
-                    
-                    pd[ip[j,0], ir[j,0]] += deriv       
-                    if ip[j,1] != -1:
-                        pd[ip[j,1], ir[j,0]] += deriv
-                        if ip[j,2] != -1:
-                            pd[ip[j,2], ir[j,0]] += deriv  
-                    # derivative with respect to reactant 2
-                    deriv = 2 * k * C[ir[j,0]] * C[ir[j,1]]
-                    pd[ir[j,0], ir[j,1]] -= deriv                    
-                    pd[ir[j,1], ir[j,1]] -= 2 * deriv                                                                                                         
-                    for i in xrange(numCoreSpecies):
-                        pd[ir[j,0], i] -= corr
-                        pd[ir[j,1], i] -= 2 * corr
-
-                    pd[ip[j,0], ir[j,1]] += deriv                       
-                    for i in xrange(numCoreSpecies):
-                        pd[ip[j,0], i] += corr    
-                    if ip[j,1] != -1:
-                        pd[ip[j,1], ir[j,1]] += deriv                                               
-                        for i in xrange(numCoreSpecies):
-                            pd[ip[j,1], i] += corr    
-                        if ip[j,2] != -1:
-                            pd[ip[j,2], ir[j,1]] += deriv                                          
-                            for i in xrange(numCoreSpecies):
-                                pd[ip[j,2], i] += corr     
-                
-                elif ir[j,0] == ir[j,2]:                    
-                    # derivative with respect to reactant 1
-                    deriv = 2 * k * C[ir[j,0]] * C[ir[j,1]]
-                    pd[ir[j,0], ir[j,0]] -= 2 * deriv                  
-                    pd[ir[j,1], ir[j,0]] -= deriv    
-                    
-                    pd[ip[j,0], ir[j,0]] += deriv       
-                    if ip[j,1] != -1:
-                        pd[ip[j,1], ir[j,0]] += deriv
-                        if ip[j,2] != -1:
-                            pd[ip[j,2], ir[j,0]] += deriv
-                    # derivative with respect to reactant 2
-                    deriv = k * C[ir[j,0]] * C[ir[j,0]] 
-                    pd[ir[j,0], ir[j,1]] -= 2 * deriv                    
-                    pd[ir[j,1], ir[j,1]] -= deriv                                                                                                         
-                    for i in xrange(numCoreSpecies):
-                        pd[ir[j,0], i] -= 2 * corr
-                        pd[ir[j,1], i] -= corr
-
-                    pd[ip[j,0], ir[j,1]] += deriv                       
-                    for i in xrange(numCoreSpecies):
-                        pd[ip[j,0], i] += corr    
-                    if ip[j,1] != -1:
-                        pd[ip[j,1], ir[j,1]] += deriv                                               
-                        for i in xrange(numCoreSpecies):
-                            pd[ip[j,1], i] += corr    
-                        if ip[j,2] != -1:
-                            pd[ip[j,2], ir[j,1]] += deriv                                          
-                            for i in xrange(numCoreSpecies):
-                                pd[ip[j,2], i] += corr     
-                                
-                else:
-                    # derivative with respect to reactant 1
-                    deriv = k * C[ir[j,1]] * C[ir[j,2]]
-                    pd[ir[j,0], ir[j,0]] -= deriv                    
-                    pd[ir[j,1], ir[j,0]] -= deriv
-                    pd[ir[j,2], ir[j,0]] -= deriv
-                    
-                    pd[ip[j,0], ir[j,0]] += deriv       
-                    if ip[j,1] != -1:
-                        pd[ip[j,1], ir[j,0]] += deriv
-                        if ip[j,2] != -1:
-                            pd[ip[j,2], ir[j,0]] += deriv     
-                                    
-                    # derivative with respect to reactant 2
-                    deriv = k * C[ir[j,0]] * C[ir[j,2]]
-                    pd[ir[j,0], ir[j,1]] -= deriv                    
-                    pd[ir[j,1], ir[j,1]] -= deriv   
-                    pd[ir[j,2], ir[j,1]] -= deriv
-                    
-                    pd[ip[j,0], ir[j,1]] += deriv       
-                    if ip[j,1] != -1:
-                        pd[ip[j,1], ir[j,1]] += deriv
-                        if ip[j,2] != -1:
-                            pd[ip[j,2], ir[j,1]] += deriv 
-                                 
-                    # derivative with respect to reactant 3
-                    deriv = k * C[ir[j,0]] * C[ir[j,1]]             
-                    pd[ir[j,0], ir[j,2]] -= deriv                    
-                    pd[ir[j,1], ir[j,2]] -= deriv   
-                    pd[ir[j,2], ir[j,2]] -= deriv
-                    for i in xrange(numCoreSpecies):
-                        pd[ir[j,0], i] -= corr
-                        pd[ir[j,1], i] -= corr
-                        pd[ir[j,2], i] -= corr
-                        
-                    pd[ip[j,0], ir[j,2]] += deriv                       
-                    for i in xrange(numCoreSpecies):
-                        pd[ip[j,0], i] += corr    
-                    if ip[j,1] != -1:
-                        pd[ip[j,1], ir[j,2]] += deriv                                               
-                        for i in xrange(numCoreSpecies):
-                            pd[ip[j,1], i] += corr    
-                        if ip[j,2] != -1:
-                            pd[ip[j,2], ir[j,2]] += deriv                                          
-                            for i in xrange(numCoreSpecies):
-                                pd[ip[j,2], i] += corr     
-                    
-            
-            
-            k = kr[j]         
-            if ip[j,1] == -1: # only one reactant
-                deriv = k
-                pd[ip[j,0], ip[j,0]] -= deriv
-                
-                pd[ir[j,0], ip[j,0]] += deriv                
-                if ir[j,1] != -1:
-                    pd[ir[j,1], ip[j,0]] += deriv
-                    if ir[j,2] != -1:
-                        pd[ir[j,2], ip[j,0]] += deriv
-                
-                                
-            elif ip[j,2] == -1: # only two reactants
-                corr = -k * C[ip[j,0]] * C[ip[j,1]] / Ctot
-                if ip[j,0] == ip[j,1]:
-                    deriv = 2 * k * C[ip[j,0]] 
-                    pd[ip[j,0], ip[j,0]] -= 2 * deriv                 
-                    for i in xrange(numCoreSpecies):
-                        pd[ip[j,0], i] -= 2 * corr
-                        
-                    pd[ir[j,0], ip[j,0]] += deriv                
-                    for i in xrange(numCoreSpecies):
-                        pd[ir[j,0], i] += corr   
-                    if ir[j,1] != -1:
-                        pd[ir[j,1], ip[j,0]] += deriv          
-                        for i in xrange(numCoreSpecies):
-                            pd[ir[j,1], i] += corr   
-                        if ir[j,2] != -1:
-                            pd[ir[j,2], ip[j,0]] += deriv  
-                            for i in xrange(numCoreSpecies):
-                                pd[ir[j,2], i] += corr   
-                    
-                else:
-                    # Derivative with respect to reactant 1
-                    deriv = k * C[ip[j, 1]]
-                    pd[ip[j,0], ip[j,0]] -= deriv                    
-                    pd[ip[j,1], ip[j,0]] -= deriv
-                    
-                    pd[ir[j,0], ip[j,0]] += deriv       
-                    if ir[j,1] != -1:
-                        pd[ir[j,1], ip[j,0]] += deriv
-                        if ir[j,2] != -1:
-                            pd[ir[j,2], ip[j,0]] += deriv
-                    
-                    # Derivative with respect to reactant 2
-                    deriv = k * C[ip[j, 0]] 
-                    pd[ip[j,0], ip[j,1]] -= deriv                    
-                    pd[ip[j,1], ip[j,1]] -= deriv              
-                    for i in xrange(numCoreSpecies):
-                        pd[ip[j,0], i] -= corr
-                        pd[ip[j,1], i] -= corr
-                      
-                    pd[ir[j,0], ip[j,1]] += deriv                
-                    for i in xrange(numCoreSpecies):
-                         pd[ir[j,0], i] += corr   
-                    if ir[j,1] != -1:
-                        pd[ir[j,1], ip[j,1]] += deriv          
-                        for i in xrange(numCoreSpecies):
-                            pd[ir[j,1], i] += corr   
-                        if ir[j,2] != -1:
-                            pd[ir[j,2], ip[j,1]] += deriv  
-                            for i in xrange(numCoreSpecies):
-                                pd[ir[j,2], i] += corr              
-                    
-                    
-            else: # three reactants!! (really?)
-                corr = - 2 * k * C[ip[j,0]] * C[ip[j,1]] * C[ip[j,2]] / Ctot
-                if (ip[j,0] == ip[j,1] & ip[j,0] == ip[j,2]):
-                    deriv = 3 * k * C[ip[j,0]] * C[ip[j,0]] 
-                    pd[ip[j,0], ip[j,0]] -= 3 * deriv          
-                    for i in xrange(numCoreSpecies):
-                        pd[ip[j,0], i] -= 3 * corr
-                    
-                    pd[ir[j,0], ip[j,0]] += deriv                
-                    for i in xrange(numCoreSpecies):
-                        pd[ir[j,0], i] += corr   
-                    if ir[j,1] != -1:
-                        pd[ir[j,1], ip[j,0]] += deriv          
-                        for i in xrange(numCoreSpecies):
-                            pd[ir[j,1], i] += corr   
-                        if ir[j,2] != -1:
-                            pd[ir[j,2], ip[j,0]] += deriv  
-                            for i in xrange(numCoreSpecies):
-                                pd[ir[j,2], i] += corr       
-                    
-                elif ip[j,0] == ip[j,1]:
-                    # derivative with respect to reactant 1
-                    deriv = 2 * k * C[ip[j,0]] * C[ip[j,2]] 
-                    pd[ip[j,0], ip[j,0]] -= 2 * deriv                    
-                    pd[ip[j,2], ip[j,0]] -= deriv
-                    
-                    pd[ir[j,0], ip[j,0]] += deriv       
-                    if ir[j,1] != -1:
-                        pd[ir[j,1], ip[j,0]] += deriv
-                        if ir[j,2] != -1:
-                            pd[ir[j,2], ip[j,0]] += deriv
-                    # derivative with respect to reactant 3
-                    deriv = k * C[ip[j,0]] * C[ip[j,0]] 
-                    pd[ip[j,0], ip[j,2]] -= 2 * deriv                    
-                    pd[ip[j,2], ip[j,2]] -= deriv                       
-                    for i in xrange(numCoreSpecies):
-                        pd[ip[j,0], i] -= 2 * corr
-                        pd[ip[j,2], i] -= corr
-
-                    pd[ir[j,0], ip[j,2]] += deriv                
-                    for i in xrange(numCoreSpecies):
-                        pd[ir[j,0], i] += corr   
-                    if ir[j,1] != -1:
-                        pd[ir[j,1], ip[j,2]] += deriv          
-                        for i in xrange(numCoreSpecies):
-                            pd[ir[j,1], i] += corr   
-                        if ir[j,2] != -1:
-                            pd[ir[j,2], ip[j,2]] += deriv  
-                            for i in xrange(numCoreSpecies):
-                                pd[ir[j,2], i] += corr     
-                    
-                    
-                elif ip[j,1] == ip[j,2]:                    
-                    # derivative with respect to reactant 1
-                    deriv = k * C[ip[j,1]] * C[ip[j,1]] 
-                    pd[ip[j,0], ip[j,0]] -= deriv                    
-                    pd[ip[j,1], ip[j,0]] -= 2 * deriv
-                    
-                    pd[ir[j,0], ip[j,0]] += deriv       
-                    if ir[j,1] != -1:
-                        pd[ir[j,1], ip[j,0]] += deriv
-                        if ir[j,2] != -1:
-                            pd[ir[j,2], ip[j,0]] += deriv                 
-                    
-                    # derivative with respect to reactant 2
-                    deriv = 2 * k * C[ip[j,0]] * C[ip[j,1]] 
-                    pd[ip[j,0], ip[j,1]] -= deriv                    
-                    pd[ip[j,1], ip[j,1]] -= 2 * deriv   
-                    for i in xrange(numCoreSpecies):
-                        pd[ip[j,0], i] -= corr
-                        pd[ip[j,1], i] -= 2 * corr
-                        
-                    pd[ir[j,0], ip[j,1]] += deriv                
-                    for i in xrange(numCoreSpecies):
-                        pd[ir[j,0], i] += corr   
-                    if ir[j,1] != -1:
-                        pd[ir[j,1], ip[j,1]] += deriv          
-                        for i in xrange(numCoreSpecies):
-                            pd[ir[j,1], i] += corr   
-                        if ir[j,2] != -1:
-                            pd[ir[j,2], ip[j,1]] += deriv  
-                            for i in xrange(numCoreSpecies):
-                                pd[ir[j,2], i] += corr                    
-                                
-                elif ip[j,0] == ip[j,2]:                    
-                    # derivative with respect to reactant 1
-                    deriv = 2 * k * C[ip[j,0]] * C[ip[j,1]]
-                    pd[ip[j,0], ip[j,0]] -= 2 * deriv                  
-                    pd[ip[j,1], ip[j,0]] -= deriv    
-                    
-                    pd[ir[j,0], ip[j,0]] += deriv       
-                    if ir[j,1] != -1:
-                        pd[ir[j,1], ip[j,0]] += deriv
-                        if ir[j,2] != -1:
-                            pd[ir[j,2], ip[j,0]] += deriv
-                    # derivative with respect to reactant 2
-                    deriv = k * C[ip[j,0]] * C[ip[j,0]] 
-                    pd[ip[j,0], ip[j,1]] -= 2 * deriv                    
-                    pd[ip[j,1], ip[j,1]] -= deriv                                                                                                         
-                    for i in xrange(numCoreSpecies):
-                        pd[ip[j,0], i] -= 2 * corr
-                        pd[ip[j,1], i] -= corr
-
-                    pd[ir[j,0], ip[j,1]] += deriv                       
-                    for i in xrange(numCoreSpecies):
-                        pd[ir[j,0], i] += corr    
-                    if ir[j,1] != -1:
-                        pd[ir[j,1], ip[j,1]] += deriv                                               
-                        for i in xrange(numCoreSpecies):
-                            pd[ir[j,1], i] += corr    
-                        if ir[j,2] != -1:
-                            pd[ir[j,2], ip[j,1]] += deriv                                          
-                            for i in xrange(numCoreSpecies):
-                                pd[ir[j,2], i] += corr     
-                                
-                else:
-                    # derivative with respect to reactant 1
-                    deriv = k * C[ip[j,1]] * C[ip[j,2]] 
-                    pd[ip[j,0], ip[j,0]] -= deriv                    
-                    pd[ip[j,1], ip[j,0]] -= deriv
-                    pd[ip[j,2], ip[j,0]] -= deriv
-                    
-                    pd[ir[j,0], ip[j,0]] += deriv       
-                    if ir[j,1] != -1:
-                        pd[ir[j,1], ip[j,0]] += deriv
-                        if ir[j,2] != -1:
-                            pd[ir[j,2], ip[j,0]] += deriv     
-                                    
-                    # derivative with respect to reactant 2
-                    deriv = k * C[ip[j,0]] * C[ip[j,2]] 
-                    pd[ip[j,0], ip[j,1]] -= deriv                    
-                    pd[ip[j,1], ip[j,1]] -= deriv   
-                    pd[ip[j,2], ip[j,1]] -= deriv
-                    
-                    pd[ir[j,0], ip[j,1]] += deriv       
-                    if ir[j,1] != -1:
-                        pd[ir[j,1], ip[j,1]] += deriv
-                        if ir[j,2] != -1:
-                            pd[ir[j,2], ip[j,1]] += deriv 
-                                 
-                    # derivative with respect to reactant 3
-                    deriv = k * C[ip[j,0]] * C[ip[j,1]] 
-                    pd[ip[j,0], ip[j,2]] -= deriv                    
-                    pd[ip[j,1], ip[j,2]] -= deriv   
-                    pd[ip[j,2], ip[j,2]] -= deriv 
-                    for i in xrange(numCoreSpecies):
-                        pd[ip[j,0], i] -= corr
-                        pd[ip[j,1], i] -= corr
-                        pd[ip[j,2], i] -= corr
-                    
-                    pd[ir[j,0], ip[j,2]] += deriv                
-                    for i in xrange(numCoreSpecies):
-                        pd[ir[j,0], i] += corr   
-                    if ir[j,1] != -1:
-                        pd[ir[j,1], ip[j,2]] += deriv          
-                        for i in xrange(numCoreSpecies):
-                            pd[ir[j,1], i] += corr   
-                        if ir[j,2] != -1:
-                            pd[ir[j,2], ip[j,2]] += deriv  
-                            for i in xrange(numCoreSpecies):
-                                pd[ir[j,2], i] += corr  
-
-        self.jacobianMatrix = pd + cj * numpy.identity(numCoreSpecies, numpy.float64)
-        return pd
\ No newline at end of file
+        C = y[:numCoreSpecies] / V
+
+        matrix = self.sparseJacobian.getMatrix(C, self.kf, self.kb)
+        correction = self.sparseJacobian.getVolumeCorrection(C, self.kf, self.kb, Ctot)
+        return matrix, correction
+
+    @cython.boundscheck(False)
+    def jacobian(self, double t, numpy.ndarray[numpy.float64_t, ndim=1] y, numpy.ndarray[numpy.float64_t, ndim=1] dydt, double cj, numpy.ndarray[numpy.float64_t, ndim=1] senpar = numpy.zeros(1, numpy.float64)):
+        """
+        Return the analytical Jacobian for the reaction system.
+
+        The Jacobian is assembled from the sparse Jacobian at constant volume
+        and the rank-one update from the change in volume with the total
+        number of moles at constant pressure, so no reaction loops over all
+        of the core species. The iteration matrix is assembled in the array
+        `jacobianMatrix`, which is reused by the next call.
+        """
+        matrix, correction = self.get_sparse_jacobian(y)
+
+        self.jacobianMatrix = self.sparseJacobian.getIterationMatrix(matrix, cj, correction, self.jacobianMatrix)
+        return self.jacobianMatrix
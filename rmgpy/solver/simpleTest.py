@@ -4,6 +4,10 @@
 import unittest
 import numpy
 import os
+import copy
+import csv
+import shutil
+import tempfile
 
 import rmgpy.quantity
 
@@ -19,6 +23,62 @@ from rmgpy.chemkin import loadChemkinFile
 
 ################################################################################
 
+def loopRates(rxnSystem, C):
+    """
+    Return the reaction rates and the core and edge species rates of
+    `rxnSystem` at the core species concentrations `C`, computed with a loop
+    over the reactions as the residual did before its rates were vectorized.
+    """
+    ir = rxnSystem.reactantIndices
+    ip = rxnSystem.productIndices
+    kf = rxnSystem.kf
+    kr = rxnSystem.kb
+    numCoreSpecies = rxnSystem.numCoreSpecies
+    numCoreReactions = rxnSystem.numCoreReactions
+
+    reactionRates = numpy.zeros(ir.shape[0], numpy.float64)
+    coreSpeciesRates = numpy.zeros(numCoreSpecies, numpy.float64)
+    edgeSpeciesRates = numpy.zeros(rxnSystem.numEdgeSpecies, numpy.float64)
+    for j in range(ir.shape[0]):
+        k = kf[j]
+        if ir[j,0] >= numCoreSpecies or ir[j,1] >= numCoreSpecies or ir[j,2] >= numCoreSpecies:
+            reactionRate = 0.0
+        elif ir[j,1] == -1:
+            reactionRate = k * C[ir[j,0]]
+        elif ir[j,2] == -1:
+            reactionRate = k * C[ir[j,0]] * C[ir[j,1]]
+        else:
+            reactionRate = k * C[ir[j,0]] * C[ir[j,1]] * C[ir[j,2]]
+        k = kr[j]
+        if ip[j,0] >= numCoreSpecies or ip[j,1] >= numCoreSpecies or ip[j,2] >= numCoreSpecies:
+            pass
+        elif ip[j,1] == -1:
+            reactionRate -= k * C[ip[j,0]]
+        elif ip[j,2] == -1:
+            reactionRate -= k * C[ip[j,0]] * C[ip[j,1]]
+        else:
+            reactionRate -= k * C[ip[j,0]] * C[ip[j,1]] * C[ip[j,2]]
+        reactionRates[j] = reactionRate
+
+        for indices, sign in [(ir[j], -1), (ip[j], 1)]:
+            for i in indices:
+                if i == -1:
+                    break
+                if j < numCoreReactions:
+                    if sign < 0:
+                        coreSpeciesRates[i] -= reactionRate
+                    else:
+                        coreSpeciesRates[i] += reactionRate
+                elif i >= numCoreSpecies:
+                    if sign < 0:
+                        edgeSpeciesRates[i-numCoreSpecies] -= reactionRate
+                    else:
+                        edgeSpeciesRates[i-numCoreSpecies] += reactionRate
+
+    return reactionRates, coreSpeciesRates, edgeSpeciesRates
+
+################################################################################
+
 class SimpleReactorCheck(unittest.TestCase):
 
     def testSolve(self):
@@ -282,4 +342,258 @@ class SimpleReactorCheck(unittest.TestCase):
         expectedMoleFracs = numpy.array([0,0,0,0.5487241, 0.137181,0, 0.1083234, 0.0685777, 1.280687000000000E-05,  0,0,0,   0.1083362, 0.02884481])
         for i in range(len(simulatedMoleFracs)):
             self.assertAlmostEqual(simulatedMoleFracs[i],expectedMoleFracs[i])
-            
\ No newline at end of file
+            
+
+    def testEffectivePressures(self):
+        """
+        Test that the effective pressures of the reactions with collision
+        efficiencies are looked up by reaction, and that their rate
+        coefficients are only evaluated again in the residual when the
+        effective pressure changes by more than the tolerance.
+        """
+        chemFile = os.path.join(os.path.dirname(__file__),'files','collider_model','chem.inp')
+        dictionaryFile = os.path.join(os.path.dirname(__file__),'files','collider_model','species_dictionary.txt')
+        speciesList, reactionList = loadChemkinFile(chemFile, dictionaryFile)
+        initialMoleFractions = dict([(species, 1.0) for species in speciesList])
+        numSpecies = len(speciesList)
+
+        rxnSystem = SimpleReactor(1000, 1.0e5, initialMoleFractions=initialMoleFractions, termination=None)
+        rxnSystem.initializeModel(speciesList, reactionList, [], [])
+        self.assertTrue(len(rxnSystem.colliderReactionRows) > 0)
+        y0 = rxnSystem.y0[:numSpecies]
+        for rxn in reactionList:
+            if rxn.kinetics.isPressureDependent() and rxn.kinetics.efficiencies:
+                efficiencies = rxn.kinetics.getEffectiveColliderEfficiencies(speciesList)
+                Peff = 1.0e5 * numpy.sum(efficiencies * y0) / numpy.sum(y0)
+            else:
+                Peff = 1.0e5
+            self.assertAlmostEqual(rxnSystem.calculate_effective_pressure(rxn) / Peff, 1.0, 12)
+
+        y = numpy.random.RandomState(0).rand(numSpecies)
+        indices = rxnSystem.pdepColliderReactionIndices
+        kf = rxnSystem.kf[indices].copy()
+        rxnSystem.colliderPressureTolerance = 1e100
+        rxnSystem.residual(0.0, y, numpy.zeros(numSpecies))
+        self.assertEqual(rxnSystem.kf[indices].tolist(), kf.tolist())
+
+        rxnSystem.colliderPressureTolerance = 0.0
+        rxnSystem.residual(0.0, y, numpy.zeros(numSpecies))
+        Peffs = rxnSystem.calculate_effective_pressures(y)
+        self.assertEqual(rxnSystem.colliderPressures.tolist(), Peffs.tolist())
+        for i, j in enumerate(indices):
+            self.assertEqual(rxnSystem.kf[j], rxnSystem.pdepColliderKinetics[i].getRateCoefficient(1000, Peffs[i]))
+
+    def testResidualRates(self):
+        """
+        Test that the vectorized rates of the residual are identical to those
+        of a loop over the reactions, for a model with core and edge species
+        and reactions with collision efficiencies.
+        """
+        chemFile = os.path.join(os.path.dirname(__file__),'files','collider_model','chem.inp')
+        dictionaryFile = os.path.join(os.path.dirname(__file__),'files','collider_model','species_dictionary.txt')
+        speciesList, reactionList = loadChemkinFile(chemFile, dictionaryFile)
+
+        edgeSpecies = [species for species in speciesList if species.isIsomorphic(Molecule(SMILES='[CH3]')) or species.isIsomorphic(Molecule(SMILES='C'))]
+        coreSpecies = [species for species in speciesList if species not in edgeSpecies]
+        coreReactions = [rxn for rxn in reactionList if all([species in coreSpecies for species in rxn.reactants + rxn.products])]
+        edgeReactions = [rxn for rxn in reactionList if rxn not in coreReactions]
+        self.assertTrue(len(edgeReactions) > 0)
+        initialMoleFractions = dict([(species, 1.0) for species in coreSpecies])
+
+        rxnSystem = SimpleReactor(1000, 1.0e5, initialMoleFractions=initialMoleFractions, termination=None)
+        rxnSystem.initializeModel(coreSpecies, coreReactions, edgeSpecies, edgeReactions)
+        numCoreSpecies = len(coreSpecies)
+
+        random = numpy.random.RandomState(0)
+        for y in [rxnSystem.y0.copy(), random.rand(numCoreSpecies), random.rand(numCoreSpecies) * 1e-6]:
+            rxnSystem.residual(0.0, y, numpy.zeros(numCoreSpecies))
+            V = constants.R * rxnSystem.T.value_si * numpy.sum(y) / rxnSystem.P.value_si
+            reactionRates, coreSpeciesRates, edgeSpeciesRates = loopRates(rxnSystem, y / V)
+            self.assertEqual(rxnSystem.coreReactionRates.tolist(), reactionRates[:len(coreReactions)].tolist())
+            self.assertEqual(rxnSystem.edgeReactionRates.tolist(), reactionRates[len(coreReactions):].tolist())
+            self.assertEqual(rxnSystem.coreSpeciesRates.tolist(), coreSpeciesRates.tolist())
+            self.assertEqual(rxnSystem.edgeSpeciesRates.tolist(), edgeSpeciesRates.tolist())
+
+    def testRateCoefficientCache(self):
+        """
+        Test that the rate coefficients are only computed again for the
+        reactions that are new or whose kinetics or thermo were replaced when
+        the model is initialized again, that they are all computed again when
+        the conditions change or the cache is cleared, and that the values of
+        the remaining reactions are moved to their new indices when reactions
+        are removed.
+        """
+        chemFile = os.path.join(os.path.dirname(__file__),'files','collider_model','chem.inp')
+        dictionaryFile = os.path.join(os.path.dirname(__file__),'files','collider_model','species_dictionary.txt')
+        speciesList, reactionList = loadChemkinFile(chemFile, dictionaryFile)
+        rxn1 = [rxn for rxn in reactionList if isinstance(rxn.kinetics, Arrhenius)][0]
+        rxn2 = [rxn for rxn in reactionList if rxn is not rxn1][0]
+        initialMoleFractions = dict([(species, 1.0) for species in speciesList])
+
+        rxnSystem = SimpleReactor(1000, 1.0e5, initialMoleFractions=initialMoleFractions, termination=None)
+        rxnSystem.initializeModel(speciesList, reactionList, [], [])
+        kf = rxnSystem.kf.copy()
+        self.assertEqual(set(rxnSystem.rateCoefficientCache.keys()), set(reactionList))
+
+        # Replacing the kinetics of a reaction, e.g. in fixBarrierHeight(),
+        # gives the new rate coefficient
+        kinetics = copy.deepcopy(rxn1.kinetics)
+        kinetics.A.value_si *= 2
+        rxn1.kinetics = kinetics
+        rxnSystem.initializeModel(speciesList, reactionList, [], [])
+        j = rxnSystem.reactionIndex[rxn1]
+        self.assertAlmostEqual(rxnSystem.kf[j] / kf[j], 2.0, 6)
+        kf[j] = rxnSystem.kf[j]
+        self.assertEqual(rxnSystem.kf.tolist(), kf.tolist())
+
+        # The indices and the cache only contain the reactions in the model,
+        # and the remaining values move to the compacted indices
+        kf = dict([(rxn, kf[rxnSystem.reactionIndex[rxn]]) for rxn in reactionList])
+        reactionList.remove(rxn2)
+        rxnSystem.initializeModel(speciesList, reactionList, [], [])
+        self.assertEqual(set(rxnSystem.rateCoefficientCache.keys()), set(reactionList))
+        self.assertEqual(sorted(rxnSystem.reactionIndex.values()), range(len(reactionList)))
+        self.assertNotIn(rxn2, rxnSystem.reactionIndex)
+        for rxn in reactionList:
+            self.assertEqual(rxnSystem.kf[rxnSystem.reactionIndex[rxn]], kf[rxn])
+        kf = rxnSystem.kf.copy()
+
+        # Replacing the thermo of a species only computes the reactions of
+        # that species again; the cached values are zeroed to tell them apart
+        species = rxn1.products[0]
+        species.thermo = copy.deepcopy(species.thermo)
+        rxnSystem.cachedRateCoefficients[:] = 0
+        rxnSystem.initializeModel(speciesList, reactionList, [], [])
+        for rxn in reactionList:
+            j = rxnSystem.reactionIndex[rxn]
+            if species in rxn.reactants or species in rxn.products:
+                self.assertEqual(rxnSystem.kf[j], kf[j])
+            else:
+                self.assertEqual(rxnSystem.kf[j], 0)
+
+        # Changing the temperature computes all the rate coefficients again
+        rxnSystem.cachedRateCoefficients[:] = 0
+        rxnSystem.T = rmgpy.quantity.Quantity(1200, 'K')
+        rxnSystem.initializeModel(speciesList, reactionList, [], [])
+        self.assertEqual(rxnSystem.rateCoefficientConditions[:2], (1200., 1.0e5))
+        self.assertTrue(numpy.all(rxnSystem.kf > 0))
+        kf = rxnSystem.kf.copy()
+
+        # Kinetics changed in place are only used once the cache is cleared
+        rxn1.kinetics.changeRate(2)
+        j = rxnSystem.reactionIndex[rxn1]
+        rxnSystem.initializeModel(speciesList, reactionList, [], [])
+        self.assertEqual(rxnSystem.kf[j], kf[j])
+        rxnSystem.clear_rate_coefficient_cache()
+        rxnSystem.initializeModel(speciesList, reactionList, [], [])
+        self.assertAlmostEqual(rxnSystem.kf[j] / kf[j], 2.0, 6)
+
+    def testSensitivityResidual(self):
+        """
+        Test that the residual of the sensitivity equations is the product of
+        the Jacobian with the sensitivities plus the derivatives of the rates
+        with respect to the parameters, for all parameters and for a subset.
+        """
+        chemFile = os.path.join(os.path.dirname(__file__),'files','collider_model','chem.inp')
+        dictionaryFile = os.path.join(os.path.dirname(__file__),'files','collider_model','species_dictionary.txt')
+        speciesList, reactionList = loadChemkinFile(chemFile, dictionaryFile)
+        initialMoleFractions = dict([(species, 1.0) for species in speciesList])
+        numCoreSpecies = len(speciesList)
+        numCoreReactions = len(reactionList)
+
+        rxnSystem = SimpleReactor(1000, 1.0e5, initialMoleFractions=initialMoleFractions, termination=None)
+        random = numpy.random.RandomState(0)
+        for sensitiveParameters in [None, [reactionList[-1], speciesList[0]]]:
+            rxnSystem.sensitiveParameters = sensitiveParameters
+            rxnSystem.initializeModel(speciesList, reactionList, [], [], sensitivity=True)
+            parameters = rxnSystem.sensitivityParameterIndices
+            if sensitiveParameters is None:
+                self.assertEqual(parameters.tolist(), range(numCoreReactions + numCoreSpecies))
+            else:
+                self.assertEqual(parameters.tolist(), [numCoreReactions - 1, numCoreReactions])
+            self.assertEqual(rxnSystem.neq, numCoreSpecies * (len(parameters) + 1))
+
+            y = random.rand(rxnSystem.neq)
+            delta = rxnSystem.residual(0.0, y, numpy.zeros(rxnSystem.neq))[0]
+            jacobian = rxnSystem.jacobian(0.0, y, numpy.zeros(rxnSystem.neq), 0.0)
+            dgdk = rxnSystem.computeRateDerivative()[:,parameters]
+            for j in range(len(parameters)):
+                expected = numpy.dot(jacobian, y[(j+1)*numCoreSpecies:(j+2)*numCoreSpecies]) + dgdk[:,j]
+                for i in range(numCoreSpecies):
+                    self.assertAlmostEqual(delta[(j+1)*numCoreSpecies + i], expected[i], delta=1e-10*abs(expected[i]))
+
+    def testAdjointSensitivity(self):
+        """
+        Test that the adjoint sensitivity method gives the same normalized
+        sensitivities at the final time as the forward method, and that its
+        worksheet only has a row at the final time.
+        """
+        chemFile = os.path.join(os.path.dirname(__file__),'files','collider_model','chem.inp')
+        dictionaryFile = os.path.join(os.path.dirname(__file__),'files','collider_model','species_dictionary.txt')
+        speciesList, reactionList = loadChemkinFile(chemFile, dictionaryFile)
+        initialMoleFractions = dict([(species, 1.0) for species in speciesList])
+        sensitiveSpecies = [species for species in speciesList if species.isIsomorphic(Molecule(SMILES='C'))]
+        directory = tempfile.mkdtemp()
+
+        sensitivities = {}
+        try:
+            for sensitivityMethod in ['forward', 'adjoint']:
+                rxnSystem = SimpleReactor(1000, 1.0e5, initialMoleFractions=initialMoleFractions, termination=[TerminationTime((1e-3,'s'))], sensitiveSpecies=sensitiveSpecies)
+                rxnSystem.sensitivityMethod = sensitivityMethod
+                worksheet = os.path.join(directory, '{0}.csv'.format(sensitivityMethod))
+                rxnSystem.simulate(speciesList, reactionList, [], [], 0, 1, 1, sensitivity=True, sensWorksheet=[worksheet])
+                with open(worksheet) as csvFile:
+                    rows = list(csv.reader(csvFile))
+                if sensitivityMethod == 'adjoint':
+                    self.assertEqual(len(rows), 2)
+                sensitivities[sensitivityMethod] = dict(zip(rows[0][1:], [float(value) for value in rows[-1][1:]]))
+        finally:
+            shutil.rmtree(directory)
+
+        self.assertTrue(len(sensitivities['forward']) > 0)
+        for header, value in sensitivities['forward'].iteritems():
+            self.assertAlmostEqual(sensitivities['adjoint'].get(header, 0.0), value, delta=1e-3*abs(value) + 1e-6)
+
+    def testSnapshotPolicies(self):
+        """
+        Test that the snapshot policies keep the expected solver steps, and
+        that the snapshots are written to the same file in each simulation.
+        """
+        chemFile = os.path.join(os.path.dirname(__file__),'files','collider_model','chem.inp')
+        dictionaryFile = os.path.join(os.path.dirname(__file__),'files','collider_model','species_dictionary.txt')
+        speciesList, reactionList = loadChemkinFile(chemFile, dictionaryFile)
+        initialMoleFractions = dict([(species, 1.0) for species in speciesList])
+        rxnSystem = SimpleReactor(1000, 1.0e5, initialMoleFractions=initialMoleFractions, termination=[TerminationTime((1e-3,'s'))])
+
+        try:
+            rxnSystem.simulate(speciesList, reactionList, [], [], 0, 1, 1)
+            path = rxnSystem.snapshots.path
+            allSnapshots = list(rxnSystem.snapshots)
+            self.assertEqual(len(allSnapshots), len(rxnSystem.snapshots))
+            self.assertEqual(len(allSnapshots[0]), 2 + len(speciesList))
+            self.assertAlmostEqual(allSnapshots[-1][0], 1e-3)
+
+            rxnSystem.snapshotPolicy = 'decimated'
+            rxnSystem.snapshotInterval = 5
+            rxnSystem.simulate(speciesList, reactionList, [], [], 0, 1, 1)
+            self.assertEqual(rxnSystem.snapshots.path, path)
+            snapshots = list(rxnSystem.snapshots)
+            expected = allSnapshots[::5]
+            if (len(allSnapshots) - 1) % 5 != 0:
+                expected.append(allSnapshots[-1])
+            self.assertEqual([row[0] for row in snapshots], [row[0] for row in expected])
+
+            rxnSystem.snapshotPolicy = 'logarithmic'
+            rxnSystem.snapshotInterval = 2
+            rxnSystem.simulate(speciesList, reactionList, [], [], 0, 1, 1)
+            times = [row[0] for row in rxnSystem.snapshots]
+            self.assertEqual(times[-1], allSnapshots[-1][0])
+            for decade in range(-15, -2):
+                self.assertTrue(len([t for t in times[:-1] if 10**decade <= t < 10**(decade+1)]) <= 2)
+
+            rxnSystem.snapshotPolicy = 'off'
+            rxnSystem.simulate(speciesList, reactionList, [], [], 0, 1, 1)
+            self.assertEqual(len(rxnSystem.snapshots), 0)
+            self.assertEqual(list(rxnSystem.snapshots), [])
+        finally:
+            rxnSystem.snapshots.remove()
@@ -0,0 +1,212 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+################################################################################
+#
+#   RMG - Reaction Mechanism Generator
+#
+#   Copyright (c) 2002-2010 Prof. William H. Green (whgreen@mit.edu) and the
+#   RMG Team (rmg_dev@mit.edu)
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a
+#   copy of this software and associated documentation files (the 'Software'),
+#   to deal in the Software without restriction, including without limitation
+#   the rights to use, copy, modify, merge, publish, distribute, sublicense,
+#   and/or sell copies of the Software, and to permit persons to whom the
+#   Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included in
+#   all copies or substantial portions of the Software.
+#
+#   THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#   IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#   FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#   AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#   LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#   FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#   DEALINGS IN THE SOFTWARE.
+#
+################################################################################
+
+"""
+Contains the :class:`SnapshotFile` class, which streams the rows of a
+simulation profile to a CSV file as the solver steps, so that they do not
+have to be kept in memory.
+"""
+
+import csv
+import math
+import os
+import tempfile
+
+# The policies that select which solver steps are kept as snapshots
+SNAPSHOT_POLICIES = ['all', 'off', 'decimated', 'logarithmic']
+
+################################################################################
+
+class SnapshotFile(object):
+    """
+    A sequence of the rows of a simulation profile, each a list of floats,
+    that are written to a CSV file as they are appended and read back from it
+    lazily when the sequence is iterated over. The attributes are:
+
+    =============== ============================================================
+    Attribute       Description
+    =============== ============================================================
+    `path`          The path of the CSV file, or ``None`` to create a temporary file when the first row is appended
+    `policy`        Which solver steps are kept: 'all', 'off', 'decimated' or 'logarithmic'
+    `interval`      The number of steps between kept steps ('decimated') or the number of kept steps per decade of time ('logarithmic')
+    `count`         The number of rows in the file
+    `temporary`     ``True`` if the file is a temporary file created by this object, ``False`` otherwise
+    =============== ============================================================
+
+    The policy is only applied by :meth:`keep`; rows passed to
+    :meth:`append` are always written.
+
+    A temporary file is deleted when the object that created it is garbage
+    collected. Copies of the object made by pickling, e.g. to send it to or
+    from a worker process, refer to the same file but never delete it.
+    """
+
+    def __init__(self, path=None, policy='all', interval=10):
+        if policy not in SNAPSHOT_POLICIES:
+            raise ValueError('Invalid snapshot policy "{0}"; expected one of {1}.'.format(policy, ', '.join(SNAPSHOT_POLICIES)))
+        if interval < 1:
+            raise ValueError('Invalid snapshot interval {0}; expected a positive integer.'.format(interval))
+        self.path = path
+        self.policy = policy
+        self.interval = interval
+        self.count = 0
+        self.step = 0
+        self.nextTime = 0.0
+        self.temporary = False
+        self._file = None
+        self._writer = None
+
+    def __del__(self):
+        """
+        Delete the file if it is a temporary file created by this object.
+        """
+        # The attribute is missing if the initialization failed
+        if getattr(self, 'temporary', False):
+            self.remove()
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        """
+        Iterate over the rows of the file, which are read one at a time.
+        """
+        if self.count == 0:
+            return
+        if self._file is not None:
+            self._file.flush()
+        with open(self.path, 'rb') as csvfile:
+            for row in csv.reader(csvfile):
+                yield [float(value) for value in row]
+
+    def __getstate__(self):
+        """
+        Return the state of the object for pickling, which does not include
+        the open file or the ownership of a temporary file.
+        """
+        state = self.__dict__.copy()
+        if self._file is not None:
+            self._file.flush()
+        state['temporary'] = False
+        state['_file'] = None
+        state['_writer'] = None
+        return state
+
+    def create(self):
+        """
+        Create a temporary file to write the rows to, if there is no path yet.
+        """
+        if self.path is None:
+            fd, self.path = tempfile.mkstemp(prefix='snapshots-', suffix='.csv')
+            os.close(fd)
+            self.temporary = True
+
+    def reset(self, policy, interval):
+        """
+        Empty the sequence and select the steps kept in the next simulation
+        with the snapshot `policy` and `interval`. The same file is written
+        again by the following calls to :meth:`append`.
+        """
+        if policy not in SNAPSHOT_POLICIES:
+            raise ValueError('Invalid snapshot policy "{0}"; expected one of {1}.'.format(policy, ', '.join(SNAPSHOT_POLICIES)))
+        if interval < 1:
+            raise ValueError('Invalid snapshot interval {0}; expected a positive integer.'.format(interval))
+        self.close()
+        self.policy = policy
+        self.interval = interval
+        self.count = 0
+        self.step = 0
+        self.nextTime = 0.0
+
+    def update(self, other):
+        """
+        Take the rows written to the file of this object by `other`, a copy
+        of it used in another process.
+        """
+        if other.path != self.path:
+            raise ValueError('Snapshot file {0} is not a copy of {1}.'.format(other.path, self.path))
+        self.close()
+        self.policy = other.policy
+        self.interval = other.interval
+        self.count = other.count
+        self.step = other.step
+        self.nextTime = other.nextTime
+
+    def keep(self, t):
+        """
+        Return ``True`` if the solver step that ended at time `t` in s should
+        be kept as a snapshot according to the policy, or ``False`` if not.
+        This method must be called once for each step, in order.
+        """
+        self.step += 1
+        if self.policy == 'all':
+            return True
+        elif self.policy == 'off':
+            return False
+        elif self.policy == 'decimated':
+            return (self.step - 1) % self.interval == 0
+        # Keep the first step after each of `interval` evenly spaced points
+        # per decade of time
+        if t < self.nextTime:
+            return False
+        if t > 0:
+            self.nextTime = 10 ** ((math.floor(math.log10(t) * self.interval) + 1) / self.interval)
+        return True
+
+    def append(self, row):
+        """
+        Write `row` to the end of the file.
+        """
+        if self._file is None:
+            self.create()
+            # Files of unpickled objects are appended to
+            self._file = open(self.path, 'ab' if self.count else 'wb')
+            self._writer = csv.writer(self._file)
+        self._writer.writerow(row)
+        self.count += 1
+
+    def close(self):
+        """
+        Close the file; rows can still be read, and appended to it.
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._writer = None
+
+    def remove(self):
+        """
+        Close and delete the file, leaving an empty sequence.
+        """
+        self.close()
+        if self.path is not None and os.path.exists(self.path):
+            os.remove(self.path)
+        self.count = 0
+        self.temporary = False
@@ -0,0 +1,112 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import cPickle
+import os
+import unittest
+
+from rmgpy.solver.snapshot import SnapshotFile
+
+################################################################################
+
+class TestSnapshotFile(unittest.TestCase):
+    """
+    Contains unit tests of the :class:`SnapshotFile` class.
+    """
+
+    def setUp(self):
+        """
+        A function run before each unit test in this class.
+        """
+        self.snapshots = SnapshotFile()
+
+    def tearDown(self):
+        """
+        A function run after each unit test in this class.
+        """
+        self.snapshots.remove()
+
+    def testAppendAndRead(self):
+        """
+        Test that the appended rows are written to a file and read back.
+        """
+        self.assertEqual(list(self.snapshots), [])
+        rows = [[1e-12, 0.5, 0.25, 0.75], [0.1, 0.5, 1.0/3, 2.0/3]]
+        for row in rows:
+            self.snapshots.append(row)
+        self.assertTrue(os.path.exists(self.snapshots.path))
+        self.assertEqual(len(self.snapshots), 2)
+        self.assertEqual(list(self.snapshots), rows)
+        self.snapshots.close()
+        self.assertEqual(list(self.snapshots), rows)
+
+    def testPickle(self):
+        """
+        Test that a pickled snapshot file refers to the same file, and that
+        rows appended to it are added to the end of the file.
+        """
+        self.snapshots.append([1.0, 2.0])
+        snapshots = cPickle.loads(cPickle.dumps(self.snapshots, -1))
+        self.assertEqual(snapshots.path, self.snapshots.path)
+        self.assertEqual(list(snapshots), [[1.0, 2.0]])
+        self.snapshots.close()
+        snapshots.append([3.0, 4.0])
+        snapshots.close()
+        self.assertEqual(list(snapshots), [[1.0, 2.0], [3.0, 4.0]])
+
+    def testTemporaryFile(self):
+        """
+        Test that a temporary file is only deleted by the object that created
+        it, and that the file is emptied and written again after a reset.
+        """
+        self.snapshots.append([1.0, 2.0])
+        path = self.snapshots.path
+        self.assertTrue(self.snapshots.temporary)
+
+        # A copy, e.g. sent back by a worker process, does not delete the file
+        snapshots = cPickle.loads(cPickle.dumps(self.snapshots, -1))
+        self.assertFalse(snapshots.temporary)
+        self.snapshots.close()
+        snapshots.reset('all', 10)
+        snapshots.append([3.0, 4.0])
+        snapshots.close()
+        del snapshots
+        self.assertTrue(os.path.exists(path))
+
+        # The rows written by the copy are taken back
+        copy = SnapshotFile(path)
+        copy.count = 1
+        self.snapshots.update(copy)
+        self.assertEqual(list(self.snapshots), [[3.0, 4.0]])
+        self.assertRaises(ValueError, self.snapshots.update, SnapshotFile())
+
+        # A file with a given path is never deleted automatically
+        copy.close()
+        del copy
+        self.assertTrue(os.path.exists(path))
+
+        self.snapshots = SnapshotFile()
+        self.assertFalse(os.path.exists(path))
+
+    def testPolicies(self):
+        """
+        Test that the policies keep the expected steps.
+        """
+        # Four steps per decade, between the points kept by the logarithmic
+        # policy
+        times = [10**((i + 0.5) / 4) for i in range(-40, 0)]
+        snapshots = SnapshotFile(policy='all')
+        self.assertEqual([t for t in times if snapshots.keep(t)], times)
+        snapshots = SnapshotFile(policy='off')
+        self.assertEqual([t for t in times if snapshots.keep(t)], [])
+        snapshots = SnapshotFile(policy='decimated', interval=3)
+        self.assertEqual([t for t in times if snapshots.keep(t)], times[::3])
+        snapshots = SnapshotFile(policy='logarithmic', interval=2)
+        self.assertEqual([t for t in times if snapshots.keep(t)], times[::2])
+        self.assertRaises(ValueError, SnapshotFile, policy='sometimes')
+        self.assertRaises(ValueError, SnapshotFile, policy='decimated', interval=0)
+
+################################################################################
+
+if __name__ == '__main__':
+    unittest.main(testRunner=unittest.TextTestRunner(verbosity=2))
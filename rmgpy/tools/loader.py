@@ -91,6 +91,7 @@ def loadRMGPyJob(inputFile, chemkinFile=None, speciesDict=None, generateImages=T
     # Set reaction model to match model loaded from Chemkin file
     rmg.reactionModel.core.species = speciesList
     rmg.reactionModel.core.reactions = reactionList
+    rmg.reactionModel.initializeMembershipSets()
 
     # Generate species images
     if generateImages:
@@ -161,6 +162,7 @@ def loadRMGJavaJob(inputFile, chemkinFile=None, speciesDict=None, useChemkinName
     # Set reaction model to match model loaded from Chemkin file
     rmg.reactionModel.core.species = speciesList
     rmg.reactionModel.core.reactions = reactionList
+    rmg.reactionModel.initializeMembershipSets()
     
     # RMG-Java doesn't generate species images, so draw them ourselves now
     speciesPath = os.path.join(os.path.dirname(inputFile), 'species')
@@ -97,6 +97,9 @@ def simulate(rmg):
         else:
             worksheet = None
             
+        reactionSystem.sensitivityMethod = rmg.sensitivityMethod
+        reactionSystem.snapshotPolicy = rmg.snapshotPolicy
+        reactionSystem.snapshotInterval = rmg.snapshotInterval
         sensWorksheet = []
         for spec in reactionSystem.sensitiveSpecies:
             csvfilePath = os.path.join(rmg.outputDirectory, 'solver', 'sensitivity_{0}_SPC_{1}.csv'.format(index+1, spec.index))
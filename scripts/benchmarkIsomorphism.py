@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+This script measures how many full graph isomorphism (VF2) checks are avoided
+by comparing the graph invariants of molecules before running VF2. For each
+set of isomers (including their resonance isomers), the number of pairs that
+pass the formula fingerprint check and the number that also pass the invariant
+prefilter, and thus need VF2, are reported along with the time taken to compare
+all pairs with :meth:`Molecule.isIsomorphic`.
+
+Example usage::
+
+    python benchmarkIsomorphism.py --repeats 10
+
+"""
+
+import argparse
+import itertools
+import time
+
+from rmgpy.molecule import Molecule
+
+################################################################################
+
+# Sets of isomers with the same molecular formula
+ISOMER_SETS = {
+    'C6H14': ['CCCCCC', 'CC(C)CCC', 'CCC(C)CC', 'CC(C)C(C)C', 'CC(C)(C)CC'],
+    'C6H12': ['C=CCCCC', 'CC=CCCC', 'CCC=CCC', 'C=C(C)CCC', 'CC=C(C)CC', 'CC(C)=C(C)C',
+              'C=CC(C)(C)C', 'C1CCCCC1', 'CC1CCCC1', 'CC1CC1CC', 'CC1(C)CCC1'],
+    'C6H9': ['C=CC=C[CH]C', 'C=C[CH]C=CC', '[CH2]C=CC=CC', 'C=CC(=C)[CH]C', 'C=CCC=C[CH2]',
+             'C=C[CH]CC=C', '[CH2]C1=CCCC1', 'C1=C[CH]CCC1', 'C1=CC[CH]CC1'],
+    'C5H8O': ['C=CCCC=O', 'CC=CCC=O', 'CC(=O)CC=C', 'CCC(=O)C=C', 'C=CC(C)C=O',
+              'C1CCC(=O)C1', 'CC1CCC1=O', 'OC1=CCCC1', 'C=CCOC=C'],
+}
+
+def timeComparisons(molecules, repeats):
+    """
+    Compare every pair of the given `molecules` `repeats` times with
+    :meth:`Molecule.isIsomorphic`, and return the elapsed time.
+    """
+    t0 = time.time()
+    for i in range(repeats):
+        for molecule1, molecule2 in itertools.combinations(molecules, 2):
+            molecule1.isIsomorphic(molecule2)
+    return time.time() - t0
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeats', metavar='N', type=int, default=10,
+                        help='number of times to compare each pair of isomers')
+    args = parser.parse_args()
+
+    print '{0:>8} {1:>8} {2:>12} {3:>12} {4:>12}'.format('formula', 'pairs', 'formula only', 'VF2 calls', 'time (s)')
+    for formula, smilesList in sorted(ISOMER_SETS.iteritems()):
+        molecules = []
+        for smiles in smilesList:
+            molecule = Molecule().fromSMILES(smiles)
+            molecules.extend(molecule.generateResonanceIsomers())
+        # Pairs passing the formula fingerprint and multiplicity checks would
+        # all have gone to VF2 without the invariant prefilter; only the pairs
+        # that also have matching invariants go to VF2 now
+        numPairs = 0
+        formulaPairs = 0
+        invariantPairs = 0
+        for molecule1, molecule2 in itertools.combinations(molecules, 2):
+            numPairs += 1
+            if molecule1.getFingerprint() == molecule2.getFingerprint() and molecule1.multiplicity == molecule2.multiplicity:
+                formulaPairs += 1
+                if molecule1.getInvariants() == molecule2.getInvariants():
+                    invariantPairs += 1
+        elapsed = timeComparisons(molecules, args.repeats)
+        print '{0:>8} {1:8d} {2:12d} {3:12d} {4:12.4f}'.format(formula, numPairs, formulaPairs, invariantPairs, elapsed)
+
+################################################################################
+
+if __name__ == '__main__':
+    main()
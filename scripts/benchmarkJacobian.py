@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+This script measures the cost of the analytical Jacobian of the reaction
+systems of :mod:`rmgpy.solver` and the time needed to simulate a large core.
+The core is either read from a Chemkin file and species dictionary, or
+generated at random, in which case each reaction only involves species whose
+indices are within a given window of each other, so that the Jacobian is
+sparse.
+
+Example usage::
+
+    python benchmarkJacobian.py --species 500 --reactions 5000
+    python benchmarkJacobian.py --chemkin chem.inp --dictionary species_dictionary.txt
+
+"""
+
+import argparse
+import random
+import time
+
+import numpy
+
+from rmgpy.chemkin import loadChemkinFile
+from rmgpy.species import Species
+from rmgpy.reaction import Reaction
+from rmgpy.kinetics import Arrhenius
+from rmgpy.solver.simple import SimpleReactor
+from rmgpy.solver.liquid import LiquidReactor
+from rmgpy.solver.base import TerminationTime
+
+################################################################################
+
+def generateCore(numSpecies, numReactions, window, seed=0):
+    """
+    Return a list of `numSpecies` species and a list of `numReactions`
+    irreversible unimolecular and bimolecular reactions between species whose
+    indices differ by at most `window`.
+    """
+    rand = random.Random(seed)
+    speciesList = [Species(label='S{0:d}'.format(i), index=i+1) for i in xrange(numSpecies)]
+    reactionList = []
+    for j in xrange(numReactions):
+        first = rand.randrange(numSpecies)
+        nearby = [speciesList[min(max(first + rand.randint(-window, window), 0), numSpecies - 1)] for i in xrange(3)]
+        if rand.random() < 0.5:
+            reactants = [speciesList[first]]
+            products = nearby[:2]
+            kinetics = Arrhenius(A=(rand.uniform(1e10, 1e13),'1/s'), n=0, Ea=(rand.uniform(20,40),'kcal/mol'), T0=(1,'K'))
+        else:
+            reactants = [speciesList[first], nearby[0]]
+            products = nearby[1:]
+            kinetics = Arrhenius(A=(rand.uniform(1e5, 1e8),'m^3/(mol*s)'), n=0, Ea=(rand.uniform(0,10),'kcal/mol'), T0=(1,'K'))
+        reactionList.append(Reaction(index=j+1, reactants=reactants, products=products, kinetics=kinetics, reversible=False))
+    return speciesList, reactionList
+
+def timeJacobian(reactionSystem, count):
+    """
+    Return the mean wall clock time of `count` evaluations of the Jacobian of
+    the initialized `reactionSystem`.
+    """
+    y = reactionSystem.y.copy()
+    dydt = numpy.zeros_like(y)
+    t0 = time.time()
+    for i in xrange(count):
+        reactionSystem.jacobian(0.0, y, dydt, 1.0)
+    return (time.time() - t0) / count
+
+def timeSimulation(reactionSystem, speciesList, reactionList, endTime):
+    """
+    Return the wall clock time needed to initialize `reactionSystem` and
+    simulate it to `endTime` in s.
+    """
+    reactionSystem.termination = [TerminationTime((endTime,'s'))]
+    t0 = time.time()
+    reactionSystem.simulate(speciesList, reactionList, [], [], 0.0, 1.0, 1.0)
+    return time.time() - t0
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--chemkin', metavar='FILE', help='the Chemkin file of the core')
+    parser.add_argument('--dictionary', metavar='FILE', help='the species dictionary of the Chemkin file')
+    parser.add_argument('--species', type=int, default=500, help='the number of species to generate (default: %(default)s)')
+    parser.add_argument('--reactions', type=int, default=5000, help='the number of reactions to generate (default: %(default)s)')
+    parser.add_argument('--window', type=int, default=10, help='the maximum index difference between species of a generated reaction (default: %(default)s)')
+    parser.add_argument('--count', type=int, default=20, help='the number of Jacobian evaluations to time (default: %(default)s)')
+    parser.add_argument('--time', type=float, default=1e-3, help='the simulated time in s (default: %(default)s)')
+    args = parser.parse_args()
+
+    if args.chemkin:
+        if not args.dictionary:
+            parser.error('A species dictionary is required to read a Chemkin file.')
+        speciesList, reactionList = loadChemkinFile(args.chemkin, args.dictionary)
+    else:
+        speciesList, reactionList = generateCore(args.species, args.reactions, args.window)
+    print 'Core of {0:d} species and {1:d} reactions'.format(len(speciesList), len(reactionList))
+
+    moleFractions = dict([(spec, 1.0 / len(speciesList)) for spec in speciesList])
+    concentrations = dict([(spec, 10.0 / len(speciesList)) for spec in speciesList])
+
+    reactionSystem = SimpleReactor(1000.0, 1.0e5, moleFractions, [])
+    reactionSystem.initializeModel(speciesList, reactionList, [], [])
+    print '{0:<40}{1:10.4g} s'.format('Simple reactor Jacobian evaluation:', timeJacobian(reactionSystem, args.count))
+    print '{0:<40}{1:10.4g} s'.format('Simple reactor simulation:', timeSimulation(reactionSystem, speciesList, reactionList, args.time))
+
+    reactionSystem = LiquidReactor(1000.0, concentrations, [])
+    reactionSystem.initializeModel(speciesList, reactionList, [], [])
+    print '{0:<40}{1:10.4g} s'.format('Liquid reactor Jacobian evaluation:', timeJacobian(reactionSystem, args.count))
+    print '{0:<40}{1:10.4g} s'.format('Liquid reactor simulation:', timeSimulation(reactionSystem, speciesList, reactionList, args.time))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+This script measures how the species and reaction bookkeeping of a model
+enlargement step scales with the size of the model edge. A synthetic
+:class:`CoreEdgeReactionModel` is populated with an edge of the requested
+size, and then the time needed to process a batch of new reactions and to
+move a species from the edge to the core is reported. No kinetics database
+is needed, since reaction generation and kinetics estimation are skipped.
+
+Example usage::
+
+    python benchmarkModelEnlarge.py --edge-sizes 1000 10000 50000
+
+"""
+
+import argparse
+import random
+import time
+
+from rmgpy.molecule import Molecule
+from rmgpy.reaction import Reaction
+from rmgpy.rmg.model import CoreEdgeReactionModel, Species
+
+################################################################################
+
+class BenchmarkModel(CoreEdgeReactionModel):
+    """
+    A :class:`CoreEdgeReactionModel` that treats every reaction it is given
+    as new, so that :meth:`processNewReactions` can be exercised without
+    a loaded kinetics database.
+    """
+
+    def makeNewReaction(self, forward, checkExisting=True):
+        return forward, True
+
+def buildModel(numCoreSpecies, numEdgeSpecies, reactionsPerSpecies, molecule):
+    """
+    Return a :class:`BenchmarkModel` with `numCoreSpecies` core species and
+    `numEdgeSpecies` edge species, connected by `reactionsPerSpecies` edge
+    reactions for each edge species.
+    """
+    model = BenchmarkModel()
+    for index in range(numCoreSpecies):
+        model.addSpeciesToCore(Species(index=index+1, label='C{0:d}'.format(index+1), molecule=[molecule]))
+    for index in range(numEdgeSpecies):
+        model.addSpeciesToEdge(Species(index=numCoreSpecies+index+1, label='E{0:d}'.format(index+1), molecule=[molecule]))
+    for spec in model.edge.species:
+        for i in range(reactionsPerSpecies):
+            reactant = random.choice(model.core.species)
+            model.addReactionToEdge(Reaction(reactants=[reactant], products=[spec]))
+    return model
+
+def timeEnlargeStep(model, numNewReactions, molecule):
+    """
+    Return the wall-clock time needed to move one edge species to the core
+    and process `numNewReactions` new reactions involving it.
+    """
+    newSpecies = model.edge.species[-1]
+    newReactions = []
+    for index in range(numNewReactions):
+        if index % 2 == 0:
+            # A reaction to an existing core or edge species
+            product = random.choice(model.core.species + model.edge.species[:100])
+        else:
+            # A reaction to a brand new edge species
+            product = Species(label='N{0:d}'.format(index), molecule=[molecule])
+        newReactions.append(Reaction(reactants=[newSpecies], products=[product]))
+
+    t0 = time.time()
+    model.addSpeciesToCore(newSpecies)
+    model.processNewReactions(newReactions, newSpecies)
+    return time.time() - t0
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--edge-sizes', metavar='N', type=int, nargs='+', default=[1000, 5000, 10000, 50000],
+                        help='edge sizes to benchmark')
+    parser.add_argument('--core-size', metavar='N', type=int, default=100,
+                        help='number of core species')
+    parser.add_argument('--new-reactions', metavar='N', type=int, default=1000,
+                        help='number of new reactions per enlarge step')
+    parser.add_argument('--repeats', metavar='N', type=int, default=5,
+                        help='number of enlarge steps to average over')
+    args = parser.parse_args()
+
+    random.seed(0)
+    molecule = Molecule().fromSMILES('C')
+
+    print '{0:>12} {1:>16} {2:>16}'.format('edge species', 'edge reactions', 'time/step (s)')
+    for numEdgeSpecies in args.edge_sizes:
+        model = buildModel(args.core_size, numEdgeSpecies, 2, molecule)
+        numEdgeReactions = len(model.edge.reactions)
+        elapsed = 0.0
+        for i in range(args.repeats):
+            elapsed += timeEnlargeStep(model, args.new_reactions, molecule)
+        print '{0:12d} {1:16d} {2:16.4f}'.format(numEdgeSpecies, numEdgeReactions, elapsed / args.repeats)
+
+################################################################################
+
+if __name__ == '__main__':
+    main()
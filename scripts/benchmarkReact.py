@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+This script compares the throughput of the reaction generation backends of
+:mod:`rmgpy.rmg.react`. The species of a species dictionary are reacted with
+each other, as in an enlarge step of the model edge, and the number of
+reactions generated per second is reported for each backend. The kinetics
+families are loaded from the RMG database in the RMG settings.
+
+The ``scoop`` backend only runs in parallel when the script is started with
+SCOOP, and runs serially otherwise.
+
+Example usage::
+
+    python benchmarkReact.py --backends serial pool --processes 4
+    python -m scoop -n 4 benchmarkReact.py --backends scoop
+
+"""
+
+import argparse
+import os.path
+import time
+
+import rmgpy
+from rmgpy import settings
+from rmgpy.chemkin import loadSpeciesDictionary
+from rmgpy.data.rmg import RMGDatabase
+from rmgpy.rmg.react import react, setBackend, closePool
+
+################################################################################
+
+def loadSpecies(path):
+    """
+    Return the reactive species of the species dictionary at `path`, indexed
+    from 1 as core species are.
+    """
+    speciesDict = loadSpeciesDictionary(path)
+    speciesList = [spec for label, spec in sorted(speciesDict.items()) if spec.reactive and len(spec.molecule[0].atoms) > 1]
+    for index, spec in enumerate(speciesList):
+        spec.index = index + 1
+    return speciesList
+
+def timeBackend(name, speciesList, processes=None, batchSize=None):
+    """
+    Return the number of reactions generated by reacting every species in
+    `speciesList` with itself and with the species before it, and the wall
+    clock time needed, using the backend `name`.
+    """
+    setBackend(name, processes, batchSize)
+    t0 = time.time()
+    count = 0
+    for index, spec in enumerate(speciesList):
+        count += len(list(react(spec.copy(deep=True), speciesList[:index+1])))
+    elapsed = time.time() - t0
+    closePool()
+    return count, elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--dictionary', metavar='PATH', type=str,
+                        default=os.path.join(os.path.dirname(rmgpy.__file__), 'rmg', 'test_data', 'saveOutputHTML', 'eg6', 'species_dictionary.txt'),
+                        help='species dictionary with the species to react')
+    parser.add_argument('--backends', metavar='NAME', type=str, nargs='+', default=['serial', 'scoop', 'pool'],
+                        help='backends to benchmark')
+    parser.add_argument('--processes', metavar='N', type=int, default=None,
+                        help='number of worker processes of the pool backend')
+    parser.add_argument('--batch-size', metavar='N', type=int, default=None,
+                        help='number of combinations per task of the pool backend')
+    parser.add_argument('--families', metavar='NAME', type=str, nargs='+', default=None,
+                        help='kinetics families to load (default all)')
+    args = parser.parse_args()
+
+    database = RMGDatabase()
+    path = settings['database.directory']
+    database.loadForbiddenStructures(os.path.join(path, 'forbiddenStructures.py'))
+    database.loadKinetics(os.path.join(path, 'kinetics'), kineticsFamilies=args.families, reactionLibraries=[])
+
+    speciesList = loadSpecies(args.dictionary)
+    print 'Reacting {0:d} species from {1}'.format(len(speciesList), args.dictionary)
+
+    print '{0:>8} {1:>10} {2:>10} {3:>14}'.format('backend', 'reactions', 'time (s)', 'reactions/s')
+    for name in args.backends:
+        count, elapsed = timeBackend(name, speciesList, args.processes, args.batch_size)
+        print '{0:>8} {1:10d} {2:10.2f} {3:14.1f}'.format(name, count, elapsed, count / elapsed if elapsed > 0 else 0.0)
+
+################################################################################
+
+if __name__ == '__main__':
+    main()
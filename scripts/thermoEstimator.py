@@ -13,16 +13,19 @@ from rmgpy.rmg.main import RMG
 from rmgpy.data.thermo import ThermoLibrary
 from rmgpy.chemkin import writeThermoEntry
 from rmgpy.rmg.model import Species
+from rmgpy.data.databasecache import DEFAULT_CACHE_DIRECTORY
 
 ################################################################################
 
-def runThermoEstimator(inputFile):
+def runThermoEstimator(inputFile, databaseCache=None):
     """
     Estimate thermo for a list of species using RMG and the settings chosen inside a thermo input file.
+    If `databaseCache` is given, the database is loaded from the compiled database cache in that directory if possible.
     """
     
     rmg = RMG()
     rmg.loadThermoInput(inputFile)
+    rmg.databaseCache = databaseCache
     
     # initialize and load the database as well as any QM settings
     rmg.loadDatabase()
@@ -63,8 +66,13 @@ if __name__ == '__main__':
     parser = argparse.ArgumentParser()
     parser.add_argument('input', metavar='INPUT', type=str, nargs=1,
         help='Thermo input file')
+    parser.add_argument('-c', '--database-cache', action='store_true',
+        help='load the database from a compiled database cache if possible')
+    parser.add_argument('--database-cache-directory', type=str, nargs=1, default=[DEFAULT_CACHE_DIRECTORY],
+        metavar='DIR', help='use DIR as compiled database cache directory (default: {0})'.format(DEFAULT_CACHE_DIRECTORY))
     args = parser.parse_args()
     
     inputFile = os.path.abspath(args.input[0])
+    databaseCache = os.path.abspath(args.database_cache_directory[0]) if args.database_cache else None
     
-    runThermoEstimator(inputFile)
\ No newline at end of file
+    runThermoEstimator(inputFile, databaseCache)
\ No newline at end of file
@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+This script warms up a persistent thermo cache, as used by the `thermoCache`
+option of RMG, with the thermo of the species in an existing Chemkin file. The
+thermo database is loaded with the given libraries so that the cache entries
+are stored for the same database version an RMG job using those libraries
+would use. The thermo of the Chemkin file is used as it is by the RMG jobs,
+so `--solvent` must be the solvent of the job that wrote it, and omitted for
+a gas-phase job.
+
+Example usage::
+
+    python warmThermoCache.py thermo.sqlite chem.inp species_dictionary.txt --libraries primaryThermoLibrary
+
+"""
+
+import argparse
+import logging
+import os.path
+
+from rmgpy import settings
+from rmgpy.data.thermo import ThermoDatabase
+from rmgpy.data.thermocache import ThermoCache, getThermoDatabaseHash
+
+################################################################################
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('cache', metavar='CACHE', type=str, nargs=1,
+                        help='the thermo cache file')
+    parser.add_argument('chemkin', metavar='CHEMKIN', type=str, nargs=1,
+                        help='the Chemkin file')
+    parser.add_argument('dictionary', metavar='DICTIONARY', type=str, nargs=1,
+                        help='the RMG species dictionary')
+    parser.add_argument('--thermo', metavar='THERMO', type=str,
+                        help='a separate Chemkin thermo file')
+    parser.add_argument('--libraries', metavar='LIBRARY', type=str, nargs='+', default=[],
+                        help='the thermo libraries used by the RMG jobs, in order')
+    parser.add_argument('--solvent', metavar='SOLVENT', type=str,
+                        help='the solvent of the job that wrote the Chemkin file, which must also be used by the RMG jobs')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    database = ThermoDatabase()
+    database.load(os.path.join(settings['database.directory'], 'thermo'), libraries=args.libraries, depository=False)
+
+    cache = ThermoCache(args.cache[0], getThermoDatabaseHash(database))
+    cache.loadChemkinFile(args.chemkin[0], args.dictionary[0], thermoPath=args.thermo, solvent=args.solvent)
+    cache.close()
+
+################################################################################
+
+if __name__ == '__main__':
+    main()